@@ -160,6 +160,24 @@ def create_app(config_object='web_config.Config'):
     from app.wallet_pass.services.auto_refresh import install_listeners as _install_wallet_auto_refresh
     _install_wallet_auto_refresh()
 
+    # Commit marks: each of these registers a tracker on import that collects
+    # what a transaction wrote and publishes it to Redis after commit
+    # (see app/services/commit_marks.py):
+    # - participation_rollup: RSVP / check-in / roster writes dirty rollup rows
+    # - etag_versions: writes to matches, teams, RSVPs or profiles bump mobile
+    #   ETag scope counters
+    # - player_search_index: writes to players, accounts or rosters mark search
+    #   documents for reload
+    # - live_session_registry: starting or stopping a LiveReportingSession
+    #   notifies the realtime service through a Redis stream
+    # - table_watermarks: writes bump a counter per watched table, so automation
+    #   detectors can skip re-running over unchanged inputs
+    from app.services import (  # noqa: F401
+        etag_versions, live_session_registry, participation_rollup, player_search_index,
+        table_watermarks)
+    from app.services.commit_marks import install_listeners as _install_commit_marks
+    _install_commit_marks()
+
     # Phase 6: Middleware and session
     apply_middleware(app)
     if not skip_redis and redis_manager:
@@ -174,6 +192,14 @@ def create_app(config_object='web_config.Config'):
         logger.info("Skipping services initialization (SKIP_CELERY=true)")
     init_cli_commands(app)
 
+    # Schedule poster fonts/logo/emoji from the on-disk bundle (disk only; see
+    # app/utils/schedule_image_generator.py). Missing assets load on first use.
+    try:
+        from app.utils.schedule_image_generator import preload_assets
+        preload_assets()
+    except Exception as e:
+        logger.warning(f"Schedule image asset preload failed: {e}")
+
     # Bulletproof JS/CSS content-type. Some container mime databases map .js ->
     # text/plain, which makes browsers BLOCK <script type="module"> (Vite chunks,
     # admin-entry, main-entry) — breaking JS app-wide. Force the correct type on
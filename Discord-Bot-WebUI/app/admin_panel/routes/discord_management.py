@@ -1227,6 +1227,10 @@ def sync_role_to_discord():
     data = request.json
 
     role_id = data.get('role_id')
+    # dry_run: report the planned adds/removes without sending them.
+    # prune: also take the Discord role off linked users without the Flask role.
+    dry_run = bool(data.get('dry_run'))
+    prune = bool(data.get('prune'))
 
     try:
         role = session.query(Role).get(role_id)
@@ -1239,7 +1243,14 @@ def sync_role_to_discord():
         # Use the sync service for the operation (synchronous; gevent-safe)
         service = get_discord_role_sync_service()
 
-        result = service.sync_flask_role_to_discord(role)
+        result = service.sync_flask_role_to_discord(role, dry_run=dry_run, prune=prune)
+        if dry_run:
+            return jsonify({
+                'success': result.get('success', False),
+                'dry_run': True,
+                'plan': result.get('plan'),
+                'error': result.get('error'),
+            })
 
         # Log the action
         AdminAuditLog.log_action(
@@ -1247,7 +1258,8 @@ def sync_role_to_discord():
             action='sync_role_to_discord',
             resource_type='role',
             resource_id=str(role_id),
-            new_value=f"Synced {result.get('synced', 0)} users, {result.get('failed', 0)} errors",
+            new_value=(f"Synced {result.get('synced', 0)} users ({result.get('added', 0)} added, "
+                       f"{result.get('removed', 0)} removed), {result.get('failed', 0)} errors"),
             ip_address=request.remote_addr,
             user_agent=request.headers.get('User-Agent')
         )
@@ -1259,6 +1271,8 @@ def sync_role_to_discord():
                 'total': result.get('total_users', 0),
                 'success': result.get('synced', 0),
                 'skipped': result.get('skipped', 0),
+                'added': result.get('added', 0),
+                'removed': result.get('removed', 0),
                 'errors': result.get('failed', 0)
             }
         })
@@ -80,6 +80,25 @@ def _sub_player_ids(session):
     return pids
 
 
+def _person_search_clause(session, search):
+    """Filter clause for the person search box (queries joined/outerjoined to Player).
+
+    People with a player row match through the player search index (name,
+    username, Discord username, team, email); accounts without one fall back to
+    a username match. Terms too short for the index match name or username in SQL.
+    """
+    from sqlalchemy import and_, or_
+    from app.models import User, Player
+    from app.services.player_search_index import indexable, search_player_ids
+
+    if not indexable(search):
+        like = f'%{search}%'
+        return or_(Player.name.ilike(like), User.username.ilike(like))
+    ids = search_player_ids(session, search, limit=None, include_email=True, fuzzy=False)
+    return or_(Player.id.in_(ids),
+               and_(Player.id.is_(None), User.username.ilike(f'%{search}%')))
+
+
 def _subs_list(session, sub_pids, search='', lane='', status=''):
     """(users, sub_summary) for the Subs tab — shared by the page and the export.
 
@@ -99,8 +118,7 @@ def _subs_list(session, sub_pids, search='', lane='', status=''):
          .join(Player, Player.user_id == User.id)
          .filter(Player.id.in_(sub_pids), not_denied))
     if search:
-        like = f'%{search}%'
-        q = q.filter(or_(Player.name.ilike(like), User.username.ilike(like)))
+        q = q.filter(_person_search_clause(session, search))
     users = q.order_by(Player.name).all()
     summary = _sub_summary(session, sub_pids)
 
@@ -153,7 +171,7 @@ def _all_tab_query(session, f):
             q = q.filter(or_(User.username.ilike(like), User.email_hash == email_hash))
         else:
             q = q.outerjoin(Player, Player.user_id == User.id).filter(
-                or_(Player.name.ilike(like), User.username.ilike(like)))
+                _person_search_clause(session, f['search']))
     if f['role']:
         q = q.join(User.roles).filter(Role.name == f['role'])
     # Approval: DENIED are hidden by default (empty filter); opt in to see them.
@@ -293,9 +311,8 @@ def members_worklist():
         elif approval_filter != 'all':
             wq = wq.filter(not_denied)   # default view: hide denied
         if search:
-            like = f'%{search}%'
             wq = wq.outerjoin(Player, Player.user_id == User.id).filter(
-                or_(Player.name.ilike(like), User.username.ilike(like)))
+                _person_search_clause(db.session, search))
         if lane_filter == 'undecided':
             wq = wq.filter(or_(User.waitlist_league.is_(None), User.waitlist_league == '',
                                User.waitlist_league.ilike('%not_sure%')))
@@ -319,9 +336,8 @@ def members_worklist():
     elif tab == 'pending':
         pq = pending_q.options(joinedload(User.player), joinedload(User.roles))
         if search:
-            like = f'%{search}%'
             pq = pq.outerjoin(Player, Player.user_id == User.id).filter(
-                or_(Player.name.ilike(like), User.username.ilike(like)))
+                _person_search_clause(db.session, search))
         if lane_filter:
             clauses = [c for c in (_lane_clause(User.approval_league, lane_filter),
                                    _lane_clause(User.preferred_league, lane_filter)) if c is not None]
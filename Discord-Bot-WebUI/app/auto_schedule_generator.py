@@ -24,6 +24,8 @@ from app.models import (
     League, Team, AutoScheduleConfig, ScheduleTemplate, 
     Schedule, Match, WeekConfiguration, SeasonConfiguration
 )
+from app.schedule_scoring import ScheduleScorer, pair_key
+from app.schedule_search import ScheduleSearchEngine
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +39,11 @@ class ScheduleConstraintError(ValueError):
 
 class AutoScheduleGenerator:
     """Generates randomized round-robin schedules for soccer leagues."""
+
+    # Search budget for the generic (non 4/8-team) scheduler. Generation runs inside
+    # a web request, so the search stops here and returns the best schedule so far.
+    GENERIC_SEARCH_TIME_BUDGET = 1.5  # seconds
+    GENERIC_SEARCH_MAX_ITERATIONS = None
     
     def __init__(self, league_id: int, session):
         """
@@ -363,307 +370,57 @@ class AutoScheduleGenerator:
     #   - no consecutive-week rematch
     #   - balanced home/away (each team N-1 home, N-1 away)
     #   - full single round-robin before any opponent repeats
-    # Time-slot/field/morning-afternoon fairness are optimized (best of many randomized
-    # attempts) and reported, since perfect fairness is impossible for some sizes.
+    # Time-slot/field/morning-afternoon fairness are optimized by ScheduleSearchEngine
+    # (app/schedule_search.py) within a time budget and reported, since perfect
+    # fairness is impossible for some sizes.
     # The match ordering it returns encodes slot = index // num_fields and
     # field = index % num_fields, matching the downstream fallback in
     # _assign_matches_to_fields (North for even field index, South for odd).
     # ------------------------------------------------------------------
 
-    def _circle_method_rounds(self, teams: List[int]) -> List[List[Tuple[int, int]]]:
-        """Single round-robin via the circle method. Returns N-1 rounds; each round is a
-        perfect matching (list of (home, away)). Each unordered pair appears once."""
-        n = len(teams)
-        arr = list(teams)
-        fixed = arr[0]
-        rot = arr[1:]
-        rounds = []
-        for r in range(n - 1):
-            order = [fixed] + rot
-            pairs = []
-            for i in range(n // 2):
-                a = order[i]
-                b = order[n - 1 - i]
-                if (i + r) % 2 == 0:
-                    pairs.append((a, b))
-                else:
-                    pairs.append((b, a))
-            rounds.append(pairs)
-            rot = [rot[-1]] + rot[:-1]
-        return rounds
-
-    def _place_generic_week(self, round_a, round_b, num_fields, slot_count,
-                            team_slot, team_field, team_window):
-        """Place one week's matches (two perfect matchings) into slot_count time slots x
-        num_fields fields. Hard: each team's two games land in different slots. Soft:
-        prefer back-to-back (adjacent) slots and balance season-long slot/field/window
-        counts. Returns an ordered list of length num_teams (index encodes slot/field),
-        or None if no valid placement was found."""
-        from itertools import permutations
-
-        matches = list(round_a) + list(round_b)
-        capacity = slot_count * num_fields
-        if len(matches) != capacity:
-            return None
-
-        order = matches[:]
-        random.shuffle(order)
-        used = [False] * len(order)
-        grid = [None] * capacity
-        slot_members = defaultdict(set)
-
-        def team_slots_used(team):
-            return [s for s in range(slot_count) if team in slot_members[s]]
-
-        def backtrack(pos):
-            if pos == capacity:
-                return True
-            slot = pos // num_fields
-            cand = []
-            for i, m in enumerate(order):
-                if used[i]:
-                    continue
-                h, a = m
-                if h in slot_members[slot] or a in slot_members[slot]:
-                    continue
-                btb_cost = 0
-                for t in (h, a):
-                    su = team_slots_used(t)
-                    if su:
-                        btb_cost += -4 if abs(su[0] - slot) == 1 else 4
-                fair_cost = team_slot[h][slot] + team_slot[a][slot]
-                half = 0 if slot < slot_count / 2 else 1
-                window_cost = 3 * (team_window[h][half] + team_window[a][half])
-                cand.append((btb_cost + fair_cost + window_cost, random.random(), i))
-            cand.sort()
-            for _, _, i in cand:
-                m = order[i]
-                h, a = m
-                used[i] = True
-                slot_members[slot].add(h)
-                slot_members[slot].add(a)
-                grid[pos] = m
-                if backtrack(pos + 1):
-                    return True
-                grid[pos] = None
-                slot_members[slot].discard(h)
-                slot_members[slot].discard(a)
-                used[i] = False
-            return False
-
-        if not backtrack(0):
-            return None
-
-        # Assign fields within each slot to balance per-team field counts.
-        ordered = [None] * capacity
-        for slot in range(slot_count):
-            slot_matches = [grid[slot * num_fields + f] for f in range(num_fields)]
-            best, best_cost = None, None
-            for perm in permutations(range(num_fields)):
-                cost = 0
-                for f, mi in enumerate(perm):
-                    h, a = slot_matches[mi]
-                    cost += team_field[h][f] + team_field[a][f]
-                if best_cost is None or cost < best_cost:
-                    best_cost, best = cost, perm
-            for f, mi in enumerate(best):
-                ordered[slot * num_fields + f] = slot_matches[mi]
-        return ordered
-
     def _generate_generic_pairings(self) -> List[List[Tuple[int, int]]]:
         """Build a constraint-validated double round-robin for any even team count."""
         n = self.num_teams
         team_ids = [team.id for team in self.teams]
         num_fields = max(1, len(self.fields))
-        if n % num_fields != 0:
-            # Fields must evenly divide the matches/week (= n). Fall back to 2 fields,
-            # which always works for an even team count.
+        if n % num_fields != 0 or n // num_fields < 2:
+            # Fields must evenly divide the matches/week (= n) and leave at least two
+            # time slots. Fall back to 2 fields, which always works for an even team count.
             logger.warning(
-                f"{num_fields} fields do not evenly divide {n} matches/week; "
+                f"{num_fields} fields do not fit {n} matches/week; "
                 f"using 2 fields (North/South) for generation."
             )
             num_fields = 2
             self.fields = ['North', 'South']
         slot_count = n // num_fields
 
-        attempts = 1200
-        best_weeks = None
-        best_score = None
-        last_weeks = None
-
-        for _ in range(attempts):
-            shuffled = random.sample(team_ids, n)
-            leg1 = self._circle_method_rounds(shuffled)
-            random.shuffle(leg1)
-            leg2 = [[(a, h) for (h, a) in rnd] for rnd in leg1]
-            random.shuffle(leg2)
-            rounds = leg1 + leg2  # leg1 entirely first guarantees C7
-
-            team_slot = {t: [0] * slot_count for t in team_ids}
-            team_field = {t: [0] * num_fields for t in team_ids}
-            team_window = {t: [0, 0] for t in team_ids}
-            weeks = []
-            ok = True
-            for w in range(0, len(rounds), 2):
-                placed = self._place_generic_week(
-                    rounds[w], rounds[w + 1], num_fields, slot_count,
-                    team_slot, team_field, team_window
-                )
-                if placed is None:
-                    ok = False
-                    break
-                for p, (h, a) in enumerate(placed):
-                    slot = p // num_fields
-                    field = p % num_fields
-                    half = 0 if slot < slot_count / 2 else 1
-                    team_slot[h][slot] += 1
-                    team_slot[a][slot] += 1
-                    team_field[h][field] += 1
-                    team_field[a][field] += 1
-                    team_window[h][half] += 1
-                    team_window[a][half] += 1
-                weeks.append(placed)
-            if not ok:
-                continue
-
-            hard, score, summary = self._evaluate_generic(weeks, team_ids, num_fields, slot_count)
-            last_weeks = weeks
-            if not hard and (best_score is None or score < best_score):
-                best_score = score
-                best_weeks = weeks
-                best_summary = summary
-                if score <= -0.99:  # ~100% back-to-back and zero fairness deviation
-                    break
-
-        if best_weeks is None:
-            # No fully valid schedule found - re-validate the last attempt to raise
-            # a detailed ScheduleConstraintError (should not happen for even N).
-            hard, _, _ = self._evaluate_generic(last_weeks or [], team_ids, num_fields, slot_count)
-            raise ScheduleConstraintError(hard or ["Could not generate a valid schedule"])
-
-        logger.info(f"Generic schedule for {n}-team league: {best_summary}")
-        return best_weeks
+        engine = ScheduleSearchEngine(
+            team_ids, num_fields,
+            time_budget=self.GENERIC_SEARCH_TIME_BUDGET,
+            max_iterations=self.GENERIC_SEARCH_MAX_ITERATIONS,
+        )
+        result = engine.search()
+        if result is None:
+            raise ScheduleConstraintError(["Could not generate a valid schedule"])
+
+        # The search keeps every move inside C1-C7; re-validate the winner once
+        # before it reaches the admin UI.
+        hard, _, summary = self._evaluate_generic(result.weeks, team_ids, num_fields, slot_count)
+        if hard:
+            raise ScheduleConstraintError(hard)
+
+        logger.info(
+            f"Generic schedule for {n}-team league: {summary} "
+            f"(score={result.score:.3f}, bound={result.lower_bound:.3f}, "
+            f"{result.restarts} restarts, {result.iterations} iterations, {result.elapsed:.2f}s)"
+        )
+        return result.weeks
 
     def _evaluate_generic(self, weeks, team_ids, num_fields, slot_count):
         """Validate hard constraints and score fairness for a generic schedule.
         Returns (hard_violations, fairness_score, summary_string)."""
-        n = len(team_ids)
-        hard = []
-
-        # C1: each pair plays exactly twice
-        pair = defaultdict(int)
-        for week in weeks:
-            for h, a in week:
-                pair[self._get_pair_key(h, a)] += 1
-        for k, c in pair.items():
-            if c != 2:
-                hard.append(f"C1: pair {k} plays {c} times (expected 2)")
-
-        # C2 + different-slot: 2 games per week, in different slots
-        for wi, week in enumerate(weeks):
-            gpt = defaultdict(int)
-            slots = defaultdict(list)
-            for p, (h, a) in enumerate(week):
-                gpt[h] += 1
-                gpt[a] += 1
-                slots[h].append(p // num_fields)
-                slots[a].append(p // num_fields)
-            for t in team_ids:
-                if gpt[t] != 2:
-                    hard.append(f"C2: team {t} plays {gpt[t]} games in week {wi+1}")
-                if len(set(slots[t])) != len(slots[t]):
-                    hard.append(f"C2: team {t} has two games in the same slot in week {wi+1}")
-
-        # C3: no consecutive-week rematch
-        for w in range(1, len(weeks)):
-            prev = defaultdict(set)
-            for h, a in weeks[w - 1]:
-                prev[h].add(a)
-                prev[a].add(h)
-            cur = defaultdict(set)
-            for h, a in weeks[w]:
-                cur[h].add(a)
-                cur[a].add(h)
-            for t in team_ids:
-                if prev[t] & cur[t]:
-                    hard.append(f"C3: team {t} rematch in weeks {w} and {w+1}")
-
-        # C4: home/away balance
-        home = defaultdict(int)
-        away = defaultdict(int)
-        for week in weeks:
-            for h, a in week:
-                home[h] += 1
-                away[a] += 1
-        for t in team_ids:
-            if home[t] != n - 1 or away[t] != n - 1:
-                hard.append(f"C4: team {t} has {home[t]}H/{away[t]}A (expected {n-1}/{n-1})")
-
-        # C7: full single round-robin before any repeat (week granularity)
-        def opps_of(team, week):
-            out = []
-            for h, a in week:
-                if h == team:
-                    out.append(a)
-                elif a == team:
-                    out.append(h)
-            return out
-
-        for t in team_ids:
-            seen = set()
-            w_complete = None
-            for wi, week in enumerate(weeks):
-                for opp in opps_of(t, week):
-                    seen.add(opp)
-                if w_complete is None and len(seen) >= n - 1:
-                    w_complete = wi
-            if len(seen) != n - 1:
-                hard.append(f"C7: team {t} plays {len(seen)} opponents (expected {n-1})")
-                continue
-            seen = set()
-            for wi, week in enumerate(weeks):
-                wk = opps_of(t, week)
-                for opp in wk:
-                    if opp in seen and wi < w_complete:
-                        hard.append(f"C7: team {t} repeats an opponent before completing the round-robin")
-                        break
-                for opp in wk:
-                    seen.add(opp)
-
-        # Soft fairness scoring
-        field = {t: [0] * num_fields for t in team_ids}
-        slot = {t: [0] * slot_count for t in team_ids}
-        window = {t: [0, 0] for t in team_ids}
-        for week in weeks:
-            for p, (h, a) in enumerate(week):
-                s = p // num_fields
-                f = p % num_fields
-                half = 0 if s < slot_count / 2 else 1
-                for x in (h, a):
-                    field[x][f] += 1
-                    slot[x][s] += 1
-                    window[x][half] += 1
-        field_dev = max(max(field[t]) - min(field[t]) for t in team_ids)
-        slot_dev = max(max(slot[t]) - min(slot[t]) for t in team_ids)
-        even_slots = (slot_count % 2 == 0)
-        window_dev = max(abs(window[t][0] - window[t][1]) for t in team_ids) if even_slots else 0
-
-        btb_ok = btb_tot = 0
-        for week in weeks:
-            slots_of = defaultdict(list)
-            for p, (h, a) in enumerate(week):
-                slots_of[h].append(p // num_fields)
-                slots_of[a].append(p // num_fields)
-            for t in team_ids:
-                btb_tot += 1
-                s = sorted(slots_of[t])
-                if len(s) == 2 and abs(s[0] - s[1]) == 1:
-                    btb_ok += 1
-        btb_pct = (100 * btb_ok / btb_tot) if btb_tot else 0
-        score = field_dev + slot_dev + window_dev * 2 - btb_pct / 100.0
-        summary = (f"back-to-back={btb_pct:.0f}%, field_dev={field_dev}, "
-                   f"slot_dev={slot_dev}, morning/afternoon_dev={window_dev}")
-        return hard, score, summary
+        scorer = ScheduleScorer.from_weeks(weeks, team_ids, num_fields, slot_count)
+        return scorer.violations(), scorer.score(), scorer.summary()
 
     def _balance_window_assignments(self, weeks: List[List[Tuple[int, int]]],
                                       team_ids: List[int]) -> List[List[Tuple[int, int]]]:
@@ -857,123 +614,12 @@ class AutoScheduleGenerator:
                                     team_ids: List[int]) -> None:
         """
         Validate all constraints C1-C7. Raises ScheduleConstraintError on failure.
-        """
-        violations = []
-
-        # Flatten all matches
-        all_matches = [(w, h, a) for w, week in enumerate(weeks) for h, a in week]
-
-        # C1: Each unordered pair appears exactly twice
-        pair_count = defaultdict(int)
-        for _, h, a in all_matches:
-            key = self._get_pair_key(h, a)
-            pair_count[key] += 1
-
-        for key, count in pair_count.items():
-            if count != 2:
-                violations.append(f"C1: Pair {key} plays {count} times (expected 2)")
-
-        # C2: Each team plays exactly 2 games per week
-        for w, week in enumerate(weeks):
-            games_per_team = defaultdict(int)
-            for h, a in week:
-                games_per_team[h] += 1
-                games_per_team[a] += 1
-            for tid in team_ids:
-                if games_per_team[tid] != 2:
-                    violations.append(f"C2: Team {tid} plays {games_per_team[tid]} games in week {w+1}")
-
-        # C3: No consecutive-week rematches
-        for w in range(1, len(weeks)):
-            prev_opp = defaultdict(set)
-            for h, a in weeks[w - 1]:
-                prev_opp[h].add(a)
-                prev_opp[a].add(h)
-            curr_opp = defaultdict(set)
-            for h, a in weeks[w]:
-                curr_opp[h].add(a)
-                curr_opp[a].add(h)
-            for tid in team_ids:
-                common = prev_opp[tid] & curr_opp[tid]
-                if common:
-                    violations.append(f"C3: Team {tid} plays {common} in weeks {w} and {w+1}")
-
-        # C4: 7 home / 7 away per team
-        home_count = defaultdict(int)
-        away_count = defaultdict(int)
-        for _, h, a in all_matches:
-            home_count[h] += 1
-            away_count[a] += 1
-        for tid in team_ids:
-            if home_count[tid] != 7 or away_count[tid] != 7:
-                violations.append(f"C4: Team {tid} has {home_count[tid]}H/{away_count[tid]}A (expected 7/7)")
-
-        # C5: Field balance - check positional encoding
-        # Positions 0,2,4,6 = North; 1,3,5,7 = South
-        north_count = defaultdict(int)
-        south_count = defaultdict(int)
-        for week in weeks:
-            for i, (h, a) in enumerate(week):
-                if i % 2 == 0:  # North
-                    north_count[h] += 1
-                    north_count[a] += 1
-                else:  # South
-                    south_count[h] += 1
-                    south_count[a] += 1
-        for tid in team_ids:
-            n, s = north_count.get(tid, 0), south_count.get(tid, 0)
-            if abs(n - s) > 2:  # Allow ±1 from perfect 7/7
-                violations.append(f"C5: Team {tid} has {n}N/{s}S (max deviation ±2)")
-
-        # C6: Window balance - early (positions 0-3) vs late (positions 4-7)
-        early_count = defaultdict(int)
-        late_count = defaultdict(int)
-        for week in weeks:
-            for i, (h, a) in enumerate(week):
-                if i < 4:
-                    early_count[h] += 1
-                    early_count[a] += 1
-                else:
-                    late_count[h] += 1
-                    late_count[a] += 1
-        for tid in team_ids:
-            e, l = early_count.get(tid, 0), late_count.get(tid, 0)
-            if abs(e - l) > 2:
-                violations.append(f"C6: Team {tid} has {e} early/{l} late (max deviation ±2)")
-
-        # C7: Complete single round-robin before repeats
-        # No opponent should appear in two DIFFERENT weeks within weeks 0-2.
-        # The earliest a repeat can occur is week 3 (the 4th week), which is acceptable
-        # since 7 opponents across 4 weeks (8 games) requires exactly one repeat in week 4.
-        for tid in team_ids:
-            opponent_first_week = {}  # opponent -> first week index they were played
-            for w_idx, week in enumerate(weeks):
-                week_opponents = []
-                for h, a in week:
-                    if h == tid:
-                        week_opponents.append(a)
-                    elif a == tid:
-                        week_opponents.append(h)
-
-                for opp in week_opponents:
-                    if opp in opponent_first_week:
-                        first_week = opponent_first_week[opp]
-                        if first_week < 3 and w_idx < 3:
-                            # Repeat within the first 3 weeks (games 1-6)
-                            violations.append(
-                                f"C7: Team {tid} plays {opp} in week {first_week+1} "
-                                f"and week {w_idx+1} (no repeats before week 4)"
-                            )
-                    else:
-                        opponent_first_week[opp] = w_idx
-
-            # Also verify all 7 opponents are covered by end of week 3 (7th opponent can be in week 4)
-            if len(opponent_first_week) < len(team_ids) - 1:
-                violations.append(
-                    f"C7: Team {tid} only plays {len(opponent_first_week)} "
-                    f"unique opponents (expected {len(team_ids) - 1})"
-                )
 
+        Weeks use the 8-team template layout: 4 time slots x North/South, so even
+        positions are North and positions 0-3 form the early window.
+        """
+        scorer = ScheduleScorer.from_weeks(weeks, team_ids, num_fields=2, slot_count=4)
+        violations = scorer.premier_violations()
         if violations:
             raise ScheduleConstraintError(violations)
 
@@ -1013,7 +659,7 @@ class AutoScheduleGenerator:
     
     def _get_pair_key(self, team1_id: int, team2_id: int) -> str:
         """Get a consistent key for team pairs (unordered)."""
-        return f"{min(team1_id, team2_id)}_{max(team1_id, team2_id)}"
+        return pair_key(team1_id, team2_id)
     
     def _validate_week_constraints(self, week_matches: List[Tuple[int, int]], 
                                  team_ids: List[int], last_week_opponents: Dict[int, set]) -> bool:
@@ -1063,9 +709,9 @@ class AutoScheduleGenerator:
         violations = []
 
         # C1: Double round-robin - each pair plays exactly twice
-        for pair_key, count in pair_count.items():
+        for pair, count in pair_count.items():
             if count != 2:
-                violations.append(f"C1: Pair {pair_key}: {count} games (should be 2)")
+                violations.append(f"C1: Pair {pair}: {count} games (should be 2)")
 
         # C4: Home/away balance - each team should have 7 home, 7 away
         for team_id in team_ids:
@@ -2048,8 +1694,7 @@ class AutoScheduleGenerator:
             weekly_matches[week].append(match)
             
             # Count pair occurrences (unordered)
-            pair_key = f"{min(home_id, away_id)}_{max(home_id, away_id)}"
-            pair_counts[pair_key] += 1
+            pair_counts[f"{min(home_id, away_id)}_{max(home_id, away_id)}"] += 1
         
         # C1: Double round-robin - each pair appears exactly twice
         team_ids = list(range(1, team_count + 1))  # Assuming teams are numbered 1-8
@@ -2058,8 +1703,7 @@ class AutoScheduleGenerator:
         for t1 in team_ids:
             for t2 in team_ids:
                 if t1 < t2:  # Avoid duplicate pairs
-                    pair_key = f"{t1}_{t2}"
-                    count = pair_counts.get(pair_key, 0)
+                    count = pair_counts.get(f"{t1}_{t2}", 0)
                     if count != 2:
                         results['C1_double_round_robin'] = False
                         results['violations'].append(f"Pair {t1}-{t2}: {count} games (should be 2)")
@@ -1304,6 +1304,114 @@ def get_message_info(message_id):
         return jsonify({'error': 'Internal Server Error'}), 500
 
 
+@availability_bp.route('/get_rsvp_sync_state', methods=['POST'], endpoint='get_rsvp_sync_state')
+def get_rsvp_sync_state():
+    """
+    Bulk reconciliation state for the Discord bot's full RSVP sync.
+
+    One round trip replaces a get_message_info plus a get_match_rsvps call per
+    managed message: a single query resolves every message to its match, team
+    and channel, and a second query loads the RSVPs of every recent
+    (match, team) pair.
+
+    POST body: {"message_ids": ["123", "456"]}
+
+    Returns:
+        {"messages": {"123": {channel_id, match_id, team_id, is_home,
+         message_type, match_date, match_time, is_recent_match,
+         rsvps: {"yes": [{player_name, player_id, discord_id}], "no": [...],
+         "maybe": [...]} or null}}, "missing": ["456"]}
+
+        rsvps is null for matches outside the 7-day window and for rosters
+        hidden from this caller.
+    """
+    data = request.get_json(silent=True) or {}
+    message_ids = data.get('message_ids')
+    if not isinstance(message_ids, list) or not message_ids:
+        return jsonify({'error': 'message_ids must be a non-empty list'}), 400
+    message_ids = list(dict.fromkeys(str(message_id) for message_id in message_ids))
+    if len(message_ids) > 500:
+        return jsonify({'error': 'At most 500 message_ids per request'}), 400
+
+    try:
+        from sqlalchemy.orm import joinedload
+        from app.models import player_teams
+
+        with managed_session() as session_db:
+            scheduled_msgs = session_db.query(ScheduledMessage).options(
+                joinedload(ScheduledMessage.match)
+            ).filter(
+                (ScheduledMessage.home_message_id.in_(message_ids)) |
+                (ScheduledMessage.away_message_id.in_(message_ids))
+            ).all()
+
+            week_ago = datetime.utcnow().date() - timedelta(days=7)
+            wanted = set(message_ids)
+            messages = {}
+            for scheduled_msg in scheduled_msgs:
+                match = scheduled_msg.match
+                if not match:
+                    continue
+                for is_home in (True, False):
+                    message_id = scheduled_msg.home_message_id if is_home else scheduled_msg.away_message_id
+                    if message_id not in wanted:
+                        continue
+                    messages[message_id] = {
+                        'channel_id': scheduled_msg.home_channel_id if is_home else scheduled_msg.away_channel_id,
+                        'match_id': match.id,
+                        'team_id': match.home_team_id if is_home else match.away_team_id,
+                        'is_home': is_home,
+                        'message_type': 'home' if is_home else 'away',
+                        'match_date': match.date.isoformat(),
+                        'match_time': match.time.isoformat() if match.time else None,
+                        'is_recent_match': match.date >= week_ago,
+                        'rsvps': None,
+                    }
+
+            # RSVPs for every recent (match, team) pair in one query.
+            pairs = {(info['match_id'], info['team_id'])
+                     for info in messages.values() if info['is_recent_match']}
+            hidden_teams = {team_id for _, team_id in pairs
+                            if _roster_hidden_for_request(session_db, [team_id])}
+            pairs = {pair for pair in pairs if pair[1] not in hidden_teams}
+            rsvps = {pair: {'yes': [], 'no': [], 'maybe': []} for pair in pairs}
+            if pairs:
+                rows = session_db.query(
+                    Availability.match_id,
+                    player_teams.c.team_id,
+                    Availability.response,
+                    Player.name,
+                    Player.id,
+                    Player.discord_id,
+                ).join(
+                    Player, Player.id == Availability.player_id
+                ).join(
+                    player_teams, Player.id == player_teams.c.player_id
+                ).filter(
+                    Availability.match_id.in_({match_id for match_id, _ in pairs}),
+                    player_teams.c.team_id.in_({team_id for _, team_id in pairs}),
+                ).order_by(Availability.id).all()
+                for match_id, team_id, response, player_name, player_id, discord_id in rows:
+                    bucket = rsvps.get((match_id, team_id))
+                    if bucket is not None and response in bucket:
+                        bucket[response].append({
+                            'player_name': player_name,
+                            'player_id': player_id,
+                            'discord_id': discord_id,
+                        })
+            for info in messages.values():
+                info['rsvps'] = rsvps.get((info['match_id'], info['team_id']))
+
+            missing = [message_id for message_id in message_ids if message_id not in messages]
+            logger.info(f"🟢 [AVAILABILITY_API] RSVP sync state for {len(messages)} messages "
+                        f"({len(missing)} unknown, {len(pairs)} match/team RSVP sets)")
+            return jsonify({'messages': messages, 'missing': missing})
+
+    except Exception as e:
+        logger.error(f"🔴 [AVAILABILITY_API] Error building RSVP sync state: {str(e)}", exc_info=True)
+        return jsonify({'error': 'Internal Server Error'}), 500
+
+
 @availability_bp.route('/force_discord_sync', methods=['POST'], endpoint='force_discord_sync')
 @login_required
 def force_discord_sync():
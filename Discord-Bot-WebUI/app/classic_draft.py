@@ -44,7 +44,13 @@ def balanced_draft_access_required(f):
 @balanced_draft_access_required
 def state():
     """Full board state: teams + rosters + metric totals, pool, gaps, config.
-    Used for bootstrap and as the authoritative resync after socket events."""
+    Used for bootstrap and as the authoritative resync after socket events.
+    ?since=<version> returns only the moves since that board version (or the
+    full state with full=true when the log can't cover it)."""
+    since = request.args.get('since', type=int)
+    if since is not None:
+        return jsonify({'success': True,
+                        **classic_draft_service.board_changes_since(g.db_session, since)}), 200
     return jsonify({'success': True, **classic_draft_service.get_board_state(g.db_session)}), 200
 
 
@@ -24,6 +24,23 @@ def build_assets():
         bundle.build()
 
 
+@click.command()
+def build_schedule_assets():
+    """
+    Download the schedule image font, logo and emoji into the asset bundle.
+
+    Needs no app context, so the image build can run it before the app's
+    Redis and database exist.
+    """
+    from app.utils.schedule_image_generator import ASSET_BUNDLE_DIR, build_asset_bundle
+
+    result = build_asset_bundle()
+    click.echo(f"Asset bundle: {ASSET_BUNDLE_DIR}")
+    click.echo(f"Font: {'ok' if result['font'] else 'MISSING'}")
+    click.echo(f"Logo: {'ok' if result['logo'] else 'MISSING'}")
+    click.echo(f"Emoji: {result['emoji']}/{result['emoji_expected']}")
+
+
 @click.command()
 @with_appcontext
 def init_discord_roles():
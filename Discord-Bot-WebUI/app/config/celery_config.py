@@ -310,14 +310,23 @@ class CeleryConfig:
             'schedule': crontab(hour=4, minute=0),
             'options': {'queue': 'celery'},
         },
-        # Analytics spine. Runs BEFORE the legacy attendance recompute so the
-        # reports read a rollup that already reflects yesterday's matches. Cheap
-        # (set-based, one statement per season), so a daily cadence is comfortable.
+        # Analytics spine. Kept current by the flush below; this nightly run is
+        # the reconciliation check (full rebuild + drift report). Runs BEFORE
+        # the legacy attendance recompute. Cheap (set-based, one statement per
+        # season), so a daily cadence is comfortable.
         'refresh-participation-rollup': {
             'task': 'app.tasks.tasks_maintenance.refresh_participation_rollup',
             'schedule': crontab(hour=3, minute=30),
             'options': {'queue': 'celery'},
         },
+        # Incremental rollup: recompute rows marked dirty by RSVP / check-in /
+        # roster writes once their 10s coalescing window has passed.
+        # expires=25 so a stalled worker doesn't pile up flushes (30s cadence).
+        'flush-participation-rollup': {
+            'task': 'app.tasks.tasks_maintenance.flush_participation_rollup',
+            'schedule': 30.0,
+            'options': {'queue': 'celery', 'expires': 25},
+        },
         'expire-past-match-sub-requests': {
             'task': 'app.tasks.tasks_maintenance.expire_past_match_sub_requests',
             'schedule': crontab(hour=3, minute=0),
@@ -628,6 +637,14 @@ class CeleryConfig:
             'options': {'queue': 'celery', 'expires': 3600},
         },
 
+        # Drain buffered API-log batches from the api:request_log stream (only
+        # filled when API_LOG_SINK=redis; otherwise a single empty XRANGE).
+        'drain-api-log-stream': {
+            'task': 'app.tasks.tasks_api_logging.drain_api_log_stream',
+            'schedule': 15.0,
+            'options': {'queue': 'celery', 'expires': 14},
+        },
+
         'monitor-stalled-live-sessions': {
             'task': 'app.tasks.tasks_live_reporting_recovery.monitor_stalled_sessions',
             # was queue 'monitoring' — NO WORKER CONSUMES IT, so the live-reporting stall
@@ -87,6 +87,8 @@ def _json_truncate(value, limit=4000):
 # "it worked again, for the 237,000th time" rows are dropped.
 _TASK_EXECUTION_RECORDING_DENYLIST = frozenset({
     'app.tasks.tasks_api_logging.log_api_request_async',
+    'app.tasks.tasks_maintenance.flush_participation_rollup',  # 30s beat
+    'app.tasks.tasks_api_logging.drain_api_log_stream',  # 15s beat
 })
 
 
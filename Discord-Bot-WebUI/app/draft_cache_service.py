@@ -377,12 +377,18 @@ class DraftCacheService:
                 return False
     
     @staticmethod
-    def invalidate_player_cache_ultra_safe(player_id: int, league_name: str = None) -> int:
+    def invalidate_player_cache_ultra_safe(player_id: int, league_name: str = None,
+                                           reset_board: bool = True) -> int:
         """
         Ultra-safe player cache invalidation that NEVER blocks during active drafts.
         
         Uses aggressive timeouts and circuit breaker to prevent any delays.
+        reset_board=False skips the balanced-board rebuild when the caller
+        already appended the change to the board log.
         """
+        if reset_board:
+            DraftCacheService.reset_board(league_name)
+
         # For active drafts, use minimal invalidation to prevent any blocking
         if league_name and DraftCacheService.is_draft_active(league_name):
             logger.info(f"🎯 ACTIVE DRAFT detected for {league_name} - using minimal cache invalidation for player {player_id}")
@@ -682,7 +688,7 @@ class DraftCacheService:
                 return False
 
     @staticmethod
-    def clear_all_league_caches(league_name: str = None) -> int:
+    def clear_all_league_caches(league_name: str = None, reset_board: bool = True) -> int:
         """
         Clear ALL draft caches for a specific league or all leagues.
 
@@ -690,11 +696,15 @@ class DraftCacheService:
 
         Args:
             league_name: Specific league name to clear, or None for all leagues
+            reset_board: Also force a balanced-board rebuild. Pass False when the
+                change was already appended to the board log.
 
         Returns:
             Number of cache keys deleted
         """
         logger.info(f"🗑️ Clearing all draft caches for: {league_name or 'ALL LEAGUES'}")
+        if reset_board:
+            DraftCacheService.reset_board(league_name)
 
         with DraftCacheService._redis_connection_safe() as redis_conn:
             if not redis_conn:
@@ -854,6 +864,122 @@ class DraftCacheService:
                 logger.warning(f"Draft status cache write failed for {league_name}: {e}")
                 return False
 
+    # --- versioned board log (balanced-draft delta sync) -------------------
+    #
+    # Every pick used to make every connected coach refetch the full board
+    # (state.json), each one re-running the whole board build. Instead each
+    # pick/removal appends {v, player_id, team_id} to a short per-league log
+    # under a shared INCR version, and clients ask for "changes since v".
+    # A periodic full snapshot lets other workers seed their in-memory model
+    # without touching the DB (classic_draft_service.current_board).
+    #
+    # Like the clock key, these are NOT in the per-league key registry: a
+    # clear_all_league_caches() must not wipe the log the next reader needs to
+    # catch up. It appends a {'reset': True} entry instead, which forces a
+    # rebuild for any reader whose model predates it.
+
+    BOARD_LOG_SIZE = 200         # entries kept; older 'since' gets a full payload
+    BOARD_LOG_TTL = 21600        # 6h, refreshed on every append
+    BOARD_SNAPSHOT_TTL = 120     # bounds staleness from edits that bypass the log
+
+    @staticmethod
+    def _board_key(league_name: str, part: str) -> str:
+        return f"{DraftCacheService._poll_cache_key('board', league_name)}:{part}"
+
+    @staticmethod
+    def append_board_delta(league_name: str, delta: Dict) -> Optional[int]:
+        """Append one board change under the next shared version. Returns the
+        version, or None when Redis is unavailable (readers then rebuild)."""
+        with DraftCacheService._redis_connection_safe() as redis_conn:
+            if not redis_conn:
+                return None
+            try:
+                version_key = DraftCacheService._board_key(league_name, 'version')
+                log_key = DraftCacheService._board_key(league_name, 'log')
+                version = int(redis_conn.incr(version_key))
+                pipe = redis_conn.pipeline()
+                pipe.rpush(log_key, DraftCacheService._serialize_data({**delta, 'v': version}))
+                pipe.ltrim(log_key, -DraftCacheService.BOARD_LOG_SIZE, -1)
+                pipe.expire(log_key, DraftCacheService.BOARD_LOG_TTL)
+                pipe.expire(version_key, DraftCacheService.BOARD_LOG_TTL)
+                pipe.execute()
+                return version
+            except Exception as e:
+                logger.warning(f"Board delta append failed for {league_name}: {e}")
+                return None
+
+    @staticmethod
+    def get_board_version(league_name: str) -> Optional[int]:
+        """Current shared board version (0 before any change), or None."""
+        with DraftCacheService._redis_connection_safe() as redis_conn:
+            if not redis_conn:
+                return None
+            try:
+                value = redis_conn.get(DraftCacheService._board_key(league_name, 'version'))
+                return int(value) if value else 0
+            except Exception as e:
+                logger.warning(f"Board version read failed for {league_name}: {e}")
+                return None
+
+    @staticmethod
+    def get_board_deltas(league_name: str, after_version: int, upto_version: int) -> Optional[List[Dict]]:
+        """Log entries after_version+1 .. upto_version in order, or None if any
+        are missing (trimmed, expired, or Redis trouble)."""
+        if upto_version <= after_version:
+            return []
+        with DraftCacheService._redis_connection_safe() as redis_conn:
+            if not redis_conn:
+                return None
+            try:
+                raw = redis_conn.lrange(DraftCacheService._board_key(league_name, 'log'), 0, -1)
+            except Exception as e:
+                logger.warning(f"Board log read failed for {league_name}: {e}")
+                return None
+        # INCR and RPUSH are separate round trips, so concurrent picks can land
+        # out of order in the list — order by version and require no holes.
+        by_version = {}
+        for item in raw:
+            entry = DraftCacheService._deserialize_data(item)
+            by_version[entry['v']] = entry
+        wanted = range(after_version + 1, upto_version + 1)
+        if any(v not in by_version for v in wanted):
+            return None
+        return [by_version[v] for v in wanted]
+
+    @staticmethod
+    def get_board_snapshot(league_name: str) -> Optional[Dict]:
+        with DraftCacheService._redis_connection_safe() as redis_conn:
+            if not redis_conn:
+                return None
+            try:
+                cached = redis_conn.get(DraftCacheService._board_key(league_name, 'snapshot'))
+                return DraftCacheService._deserialize_data(cached) if cached else None
+            except Exception as e:
+                logger.warning(f"Board snapshot read failed for {league_name}: {e}")
+                return None
+
+    @staticmethod
+    def set_board_snapshot(league_name: str, snapshot: Dict) -> bool:
+        with DraftCacheService._redis_connection_safe() as redis_conn:
+            if not redis_conn:
+                return False
+            try:
+                return bool(redis_conn.setex(
+                    DraftCacheService._board_key(league_name, 'snapshot'),
+                    DraftCacheService.BOARD_SNAPSHOT_TTL,
+                    DraftCacheService._serialize_data(snapshot)))
+            except Exception as e:
+                logger.warning(f"Board snapshot write failed for {league_name}: {e}")
+                return False
+
+    @staticmethod
+    def reset_board(league_name: str = None) -> None:
+        """Force board readers to rebuild after a change that bypassed the log.
+        Only the Classic balanced board keeps a log; other leagues are a no-op."""
+        norm = re.sub(r'[\s_]+', '_', (league_name or '').strip().lower())
+        if league_name is None or norm == 'classic':
+            DraftCacheService.append_board_delta('classic', {'reset': True})
+
     @staticmethod
     def get_cache_stats() -> Dict[str, Any]:
         """Get comprehensive cache statistics including active draft status."""
@@ -28,38 +28,35 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
-def send_email(to, subject, body):
+SCOPES = ['https://www.googleapis.com/auth/gmail.send']
+SENDER_ADDRESS = 'donotreply@weareecs.com'
+
+
+def build_gmail_service():
     """
-    Sends an HTML email using the Gmail API with a service account.
+    Builds an authorized Gmail API service from the delegated service account.
 
-    Parameters:
-        to (str or list): Recipient email address or a list of email addresses.
-        subject (str): The subject of the email.
-        body (str): The HTML body content of the email.
+    Building the service loads credentials and the API discovery document, so
+    callers that send many messages (email broadcasts) build it once and pass
+    it to send_with_service for every message.
 
     Returns:
-        dict or None: The sent message data on success, or None if an error occurred.
+        Resource or None: The Gmail service, or None if credentials are unavailable.
     """
-    SCOPES = ['https://www.googleapis.com/auth/gmail.send']
-    
-    logging.debug("Starting send_email function")
-    
     credentials_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
     if not credentials_path:
         logging.error("GOOGLE_APPLICATION_CREDENTIALS is not set or is empty.")
         return None
-    
+
     logging.debug(f"GOOGLE_APPLICATION_CREDENTIALS is set to: {credentials_path}")
-    
+
     if not os.path.exists(credentials_path):
         logging.error(f"Service account JSON file not found at {credentials_path}")
         return None
-    else:
-        logging.debug(f"Service account JSON file found at {credentials_path}")
 
     try:
         delegated_credentials = service_account.Credentials.from_service_account_file(
-            credentials_path, scopes=SCOPES, subject='donotreply@weareecs.com'
+            credentials_path, scopes=SCOPES, subject=SENDER_ADDRESS
         )
         logging.debug("Successfully loaded delegated credentials from the service account file")
     except Exception as e:
@@ -70,17 +67,48 @@ def send_email(to, subject, body):
     try:
         service = build('gmail', 'v1', credentials=delegated_credentials)
         logging.debug("Gmail service built successfully with delegated credentials")
+        return service
     except Exception as e:
         logging.error(f"Failed to build Gmail service: {e}")
         traceback.print_exc()
         return None
 
+
+def build_message(to, subject, body, bcc=None):
+    """
+    Builds the HTML MIME message sent by every sender in this module.
+
+    Parameters:
+        to (str or list): Recipient email address or a list of email addresses.
+        subject (str): The subject of the email.
+        body (str): The HTML body content of the email.
+        bcc (list, optional): Addresses for the BCC header.
+
+    Returns:
+        MIMEText: The message, ready for the Gmail API or an SMTP session.
+    """
+    # Set the MIME type as 'html' to ensure the email is rendered as HTML
+    message = MIMEText(body, "html")
+    message['to'] = ', '.join(to) if isinstance(to, list) else to
+    message['from'] = SENDER_ADDRESS
+    if bcc:
+        message['bcc'] = ', '.join(bcc)
+    message['subject'] = subject
+    return message
+
+
+def send_with_service(service, message):
+    """
+    Sends a built message through an existing Gmail service.
+
+    Parameters:
+        service: Gmail service from build_gmail_service.
+        message (MIMEText): Message from build_message.
+
+    Returns:
+        dict or None: The sent message data on success, or None if an error occurred.
+    """
     try:
-        # Set the MIME type as 'html' to ensure the email is rendered as HTML
-        message = MIMEText(body, "html")
-        message['to'] = ', '.join(to) if isinstance(to, list) else to
-        message['from'] = 'donotreply@weareecs.com'
-        message['subject'] = subject
         raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
         message_body = {'raw': raw}
         sent_message = service.users().messages().send(userId="me", body=message_body).execute()
@@ -92,6 +120,27 @@ def send_email(to, subject, body):
         return None
 
 
+def send_email(to, subject, body):
+    """
+    Sends an HTML email using the Gmail API with a service account.
+
+    Parameters:
+        to (str or list): Recipient email address or a list of email addresses.
+        subject (str): The subject of the email.
+        body (str): The HTML body content of the email.
+
+    Returns:
+        dict or None: The sent message data on success, or None if an error occurred.
+    """
+    logging.debug("Starting send_email function")
+
+    service = build_gmail_service()
+    if service is None:
+        return None
+
+    return send_with_service(service, build_message(to, subject, body))
+
+
 def send_email_bcc(bcc_list, subject, body):
     """
     Sends an HTML email to multiple recipients using BCC via the Gmail API.
@@ -111,45 +160,11 @@ def send_email_bcc(bcc_list, subject, body):
         logging.warning("send_email_bcc called with empty bcc_list")
         return None
 
-    SCOPES = ['https://www.googleapis.com/auth/gmail.send']
-
-    credentials_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-    if not credentials_path:
-        logging.error("GOOGLE_APPLICATION_CREDENTIALS is not set or is empty.")
-        return None
-
-    if not os.path.exists(credentials_path):
-        logging.error(f"Service account JSON file not found at {credentials_path}")
+    service = build_gmail_service()
+    if service is None:
         return None
 
-    try:
-        delegated_credentials = service_account.Credentials.from_service_account_file(
-            credentials_path, scopes=SCOPES, subject='donotreply@weareecs.com'
-        )
-    except Exception as e:
-        logging.error(f"Failed to load credentials: {e}")
-        traceback.print_exc()
-        return None
-
-    try:
-        service = build('gmail', 'v1', credentials=delegated_credentials)
-    except Exception as e:
-        logging.error(f"Failed to build Gmail service: {e}")
-        traceback.print_exc()
-        return None
-
-    try:
-        message = MIMEText(body, "html")
-        message['to'] = 'donotreply@weareecs.com'
-        message['from'] = 'donotreply@weareecs.com'
-        message['bcc'] = ', '.join(bcc_list)
-        message['subject'] = subject
-        raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        message_body = {'raw': raw}
-        sent_message = service.users().messages().send(userId="me", body=message_body).execute()
-        logging.debug(f"BCC email sent successfully to {len(bcc_list)} recipients, Message Id: {sent_message['id']}")
-        return sent_message
-    except Exception as error:
-        logging.error(f"An error occurred while sending BCC email: {error}")
-        traceback.print_exc()
-        return None
\ No newline at end of file
+    sent_message = send_with_service(service, build_message(SENDER_ADDRESS, subject, body, bcc=bcc_list))
+    if sent_message:
+        logging.debug(f"BCC email sent successfully to {len(bcc_list)} recipients")
+    return sent_message
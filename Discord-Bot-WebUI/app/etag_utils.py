@@ -1,10 +1,18 @@
 """
 ETag utility functions for mobile API endpoints.
 Provides efficient caching with 304 Not Modified responses.
+
+Two ETag modes:
+- version ETags (version_etag): hashed from Redis dependency counters
+  (app/services/etag_versions.py), the user id and the query string, so a
+  matching If-None-Match is answered before any database work;
+- content ETags (generate_etag): a hash of the built payload. Used whenever the
+  counters are unavailable, and by endpoints without declared dependencies.
 """
 
 import hashlib
 import json
+import time
 from flask import request, jsonify, Response
 from typing import Any, Dict, Optional, Tuple
 import logging
@@ -32,6 +40,51 @@ def generate_etag(data: Any) -> str:
     return hashlib.sha256(data_str.encode()).hexdigest()[:32]
 
 
+def version_etag(scopes, user_id=None, refresh_seconds: Optional[int] = None) -> Optional[str]:
+    """
+    Generate an ETag from the current versions of the data an endpoint reads.
+
+    Call this BEFORE running any query: if a write lands while the response is
+    being built, the body is newer than the ETag and the next request simply
+    refetches, whereas reading the versions afterwards could pin stale data.
+
+    Args:
+        scopes: Version scopes the response depends on (etag_versions.MATCHES, ...)
+        user_id: Requesting user; responses are user-scoped
+        refresh_seconds: For payloads that embed TTL-cached derived data (team
+            stats, cached team lists): roll the ETag over at that interval so a
+            body built from a stale cache entry isn't pinned until the next bump
+
+    Returns:
+        ETag string, or None if the counters are unavailable (use the content hash)
+    """
+    from app.services.etag_versions import get_versions
+    from app.utils.pacific_time import pacific_today
+
+    scopes = list(scopes)
+    versions = get_versions(scopes)
+    if versions is None:
+        return None
+    parts = [f'{scope}={version}' for scope, version in zip(scopes, versions)]
+    # The date covers "upcoming"/"completed" windows rolling over, and bounds how
+    # long a missed bump can keep an ETag alive.
+    parts += [f'user={user_id}', f'day={pacific_today().isoformat()}',
+              f'q={request.query_string.decode(errors="replace")}', f'path={request.host}{request.path}']
+    if refresh_seconds:
+        parts.append(f'window={int(time.time() // refresh_seconds)}')
+    return 'v-' + hashlib.sha256('|'.join(parts).encode()).hexdigest()[:32]
+
+
+def not_modified_response(etag: str, cache_type: str = 'default',
+                          max_age: int = 3600) -> Response:
+    """Bodyless 304 for a client that already holds the current version."""
+    response = Response(status=304)
+    response.headers['ETag'] = f'"{etag}"'
+    response.headers['Cache-Control'] = f'private, max-age={max_age}'
+    logger.debug(f"ETag match for {cache_type} - returning 304")
+    return response
+
+
 def check_etag_match(etag: str) -> bool:
     """
     Check if client's If-None-Match header matches the provided ETag.
@@ -47,7 +100,7 @@ def check_etag_match(etag: str) -> bool:
 
 
 def make_etag_response(data: Any, cache_type: str = 'default', 
-                      max_age: int = 3600) -> Response:
+                      max_age: int = 3600, etag: Optional[str] = None) -> Response:
     """
     Create response with ETag headers for mobile app caching.
     
@@ -55,6 +108,7 @@ def make_etag_response(data: Any, cache_type: str = 'default',
         data: The response data
         cache_type: Type of cache (match_schedule, team_stats, etc.)
         max_age: Cache duration in seconds
+        etag: Precomputed version ETag (version_etag); hashes data when None
         
     Returns:
         Flask Response object with appropriate headers
@@ -64,16 +118,13 @@ def make_etag_response(data: Any, cache_type: str = 'default',
     # shared cache — CDN, corporate proxy, ISP — to store one user's payload and
     # hand it to the next. 'private' still lets the phone cache and still serves
     # 304s, so nothing is lost but the cross-user leak.
-    etag = generate_etag(data)
+    if etag is None:
+        etag = generate_etag(data)
 
     # Check if client has current version
     if check_etag_match(etag):
         # Return 304 Not Modified - no body needed
-        response = Response(status=304)
-        response.headers['ETag'] = f'"{etag}"'
-        response.headers['Cache-Control'] = f'private, max-age={max_age}'
-        logger.debug(f"ETag match for {cache_type} - returning 304")
-        return response
+        return not_modified_response(etag, cache_type, max_age)
     
     # Return full response with ETag headers
     response = jsonify(data)
@@ -56,7 +56,7 @@ class EventPublisher:
             },
             'rsvp:analytics': {
                 'maxlen': 50000,  # Keep more for analytics
-                'consumer_groups': ['analytics_processors']
+                'consumer_groups': ['analytics_processors', 'participation_rollups']
             },
             'rsvp:audit': {
                 'maxlen': 100000,  # Long retention for compliance
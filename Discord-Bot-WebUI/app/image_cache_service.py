@@ -11,8 +11,6 @@ import logging
 import requests
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-from PIL import Image
-import io
 from pathlib import Path
 
 from app.core import db
@@ -32,6 +30,23 @@ class ImageCacheService:
     WEBP_QUALITY = 85
     JPEG_QUALITY = 90
     CACHE_EXPIRY_DAYS = 30
+
+    # Bulk pipeline (app/services/image_pipeline.py)
+    DOWNLOAD_WORKERS = 8        # concurrent downloads over one pooled HTTP session
+    TRANSFORM_WORKERS = 2       # decode/resize/encode processes (0 = threads)
+    PIPELINE_QUEUE_SIZE = 32    # bound of each stage's queue
+    STATUS_BATCH_SIZE = 50      # cache rows updated per commit
+
+    @classmethod
+    def render_spec(cls):
+        from app.services.image_pipeline import RenderSpec
+        return RenderSpec(thumbnail_size=cls.THUMBNAIL_SIZE, medium_size=cls.MEDIUM_SIZE,
+                          jpeg_quality=cls.JPEG_QUALITY, webp_quality=cls.WEBP_QUALITY)
+
+    @classmethod
+    def variant_store(cls):
+        from app.services.image_pipeline import VariantStore
+        return VariantStore(cls.CACHE_DIR)
     
     @classmethod
     def initialize_cache_directory(cls):
@@ -430,44 +445,29 @@ class ImageCacheService:
                         fail_session.commit()
                 return False
             
-            # Open and validate image
-            image = Image.open(io.BytesIO(image_data))
-            if image.mode in ('RGBA', 'LA', 'P'):
-                # Convert to RGB for JPEG
-                rgb_image = Image.new('RGB', image.size, (255, 255, 255))
-                rgb_image.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-                image = rgb_image
-            
-            # Generate filenames
-            base_name = f"player_{player_id}"
-            timestamp = int(datetime.now().timestamp())
-            
-            # Create thumbnail
-            thumbnail = image.copy()
-            thumbnail.thumbnail(ImageCacheService.THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-            thumbnail_path = ImageCacheService.CACHE_DIR / "thumbnails" / f"{base_name}_thumb_{timestamp}.jpg"
-            thumbnail.save(thumbnail_path, 'JPEG', quality=ImageCacheService.JPEG_QUALITY, optimize=True)
-            
-            # Create medium size
-            medium = image.copy()
-            medium.thumbnail(ImageCacheService.MEDIUM_SIZE, Image.Resampling.LANCZOS)
-            medium_path = ImageCacheService.CACHE_DIR / "medium" / f"{base_name}_med_{timestamp}.jpg"
-            medium.save(medium_path, 'JPEG', quality=ImageCacheService.JPEG_QUALITY, optimize=True)
-            
-            # Create WebP version (best compression)
-            webp_path = ImageCacheService.CACHE_DIR / "webp" / f"{base_name}_{timestamp}.webp"
-            medium.save(webp_path, 'WEBP', quality=ImageCacheService.WEBP_QUALITY, optimize=True)
-            
+            # Variants are content-addressed: a source already rendered for any
+            # player (or an earlier season) is reused instead of re-encoded.
+            from app.services.image_pipeline import content_hash, render_variants
+            spec = ImageCacheService.render_spec()
+            store = ImageCacheService.variant_store()
+            digest = content_hash(image_data, spec)
+            stored = store.lookup(digest)
+            if stored is None:
+                rendered = render_variants(image_data, spec)
+                stored = (rendered['width'], rendered['height'], store.save(digest, rendered))
+            width, height, file_size = stored
+            urls = store.urls(digest)
+
             # Phase 3: Update cache entry with new session
             with managed_session() as update_session:
                 cache_entry = update_session.query(PlayerImageCache).get(cache_entry_id)
                 if cache_entry:
-                    cache_entry.thumbnail_url = f"/static/img/cache/players/thumbnails/{thumbnail_path.name}"
-                    cache_entry.cached_url = f"/static/img/cache/players/medium/{medium_path.name}"
-                    cache_entry.webp_url = f"/static/img/cache/players/webp/{webp_path.name}"
-                    cache_entry.width = medium.width
-                    cache_entry.height = medium.height
-                    cache_entry.file_size = medium_path.stat().st_size
+                    cache_entry.thumbnail_url = urls['thumbnail']
+                    cache_entry.cached_url = urls['medium']
+                    cache_entry.webp_url = urls['webp']
+                    cache_entry.width = width
+                    cache_entry.height = height
+                    cache_entry.file_size = file_size
                     cache_entry.is_optimized = True
                     cache_entry.cache_status = 'ready'
                     cache_entry.last_cached = datetime.utcnow()
@@ -491,61 +491,158 @@ class ImageCacheService:
             return False
     
     @staticmethod
-    def bulk_optimize_images(player_ids: List[int] = None, max_workers: int = 1) -> Dict[str, int]:
+    def bulk_optimize_images(player_ids: List[int] = None, max_workers: int = None,
+                             force_refresh: bool = False) -> Dict[str, int]:
         """
         Optimize images for multiple players.
         If player_ids is None, optimizes all current players.
-        Using sequential processing to avoid Flask context issues.
+
+        Runs the concurrent pipeline in app/services/image_pipeline.py: downloads
+        in parallel (max_workers threads, default DOWNLOAD_WORKERS), renders in
+        the persistent transform pool, and writes cache-status updates in
+        batches of STATUS_BATCH_SIZE. Sources shared by several players are
+        downloaded and rendered once.
         """
+        from app.core.session_manager import managed_session
+        from app.services.image_pipeline import ImagePipeline
+
         try:
-            if player_ids is None:
-                # Get all current players with images (filter out empty/null URLs)
-                players = Player.query.filter(
-                    Player.is_current_player == True,
-                    Player.profile_picture_url.isnot(None),
-                    Player.profile_picture_url != ''
-                ).all()
-                
-                # Further filter to only players with actual image URLs (not just empty strings)
-                player_ids = []
-                for player in players:
-                    if player.profile_picture_url and player.profile_picture_url.strip():
-                        player_ids.append(player.id)
-                
-                logger.info(f"Found {len(player_ids)} players with profile pictures")
-            
-            if not player_ids:
-                logger.info("No players with profile pictures found")
-                return {'success': 0, 'failed': 0, 'skipped': 0}
-                
-            logger.info(f"Starting bulk image optimization for {len(player_ids)} players")
-            
-            results = {'success': 0, 'failed': 0, 'skipped': 0}
-            
-            # Process sequentially to avoid Flask context issues
-            for i, player_id in enumerate(player_ids):
-                try:
-                    success = ImageCacheService.optimize_player_image(player_id)
-                    if success:
-                        results['success'] += 1
-                    else:
-                        results['failed'] += 1
-                    
-                    # Log progress every 20 players
-                    if (i + 1) % 20 == 0:
-                        logger.info(f"Processed {i + 1}/{len(player_ids)} players...")
-                        
-                except Exception as e:
-                    logger.error(f"Error processing player {player_id}: {e}")
-                    results['failed'] += 1
-            
-            logger.info(f"Bulk optimization completed: {results}")
+            ImageCacheService.initialize_cache_directory()
+            with managed_session() as session:
+                jobs, skipped = ImageCacheService._prepare_bulk_jobs(session, player_ids,
+                                                                     force_refresh)
+            total = sum(len(job.player_ids) for job in jobs)
+            if not total:
+                logger.info("No player images need optimization")
+                return {'success': 0, 'failed': 0, 'skipped': skipped}
+
+            logger.info(f"Starting bulk image optimization for {total} players "
+                        f"({len(jobs)} distinct sources)")
+            pipeline = ImagePipeline(
+                ImageCacheService.variant_store(),
+                spec=ImageCacheService.render_spec(),
+                download_workers=max_workers or ImageCacheService.DOWNLOAD_WORKERS,
+                transform_workers=ImageCacheService.TRANSFORM_WORKERS,
+                queue_size=ImageCacheService.PIPELINE_QUEUE_SIZE,
+                status_batch_size=ImageCacheService.STATUS_BATCH_SIZE,
+            )
+            try:
+                summary = pipeline.run(jobs, ImageCacheService._apply_bulk_outcomes)
+            except Exception:
+                ImageCacheService._fail_processing_rows(
+                    [pid for job in jobs for pid in job.player_ids])
+                raise
+
+            results = {'success': summary.success, 'failed': summary.failed, 'skipped': skipped,
+                       'rendered': summary.rendered, 'reused': summary.reused}
+            logger.info(f"Bulk optimization completed in {summary.elapsed:.1f}s: {results}")
             return results
-            
+
         except Exception as e:
             logger.error(f"Error in bulk image optimization: {e}")
             return {'success': 0, 'failed': len(player_ids or []), 'skipped': 0}
-    
+
+    @staticmethod
+    def _prepare_bulk_jobs(session, player_ids: Optional[List[int]], force_refresh: bool):
+        """
+        Create/mark cache rows 'processing' in one commit and group players by
+        source URL. Returns (jobs, skipped).
+        """
+        from app.services.image_pipeline import ImageJob
+
+        query = session.query(Player.id, Player.profile_picture_url)
+        if player_ids is None:
+            query = query.filter(Player.is_current_player == True)  # noqa: E712
+        else:
+            query = query.filter(Player.id.in_(player_ids))
+        players = query.all()
+        entries = {
+            entry.player_id: entry
+            for entry in session.query(PlayerImageCache).filter(
+                PlayerImageCache.player_id.in_([p.id for p in players])
+            )
+        }
+
+        by_url: Dict[str, List[int]] = {}
+        skipped = 0
+        for player_id, picture_url in players:
+            entry = entries.get(player_id)
+            # An existing row's original_url is what the single-player path uses;
+            # a player with no row yet starts from their profile picture.
+            url = (entry.original_url if entry and entry.original_url else picture_url) or ''
+            url = url.strip()
+            if not url or (entry is not None and entry.is_optimized and not force_refresh):
+                skipped += 1
+                continue
+            if entry is None:
+                session.add(PlayerImageCache(player_id=player_id, original_url=url,
+                                             cache_status='processing'))
+            else:
+                entry.cache_status = 'processing'
+            by_url.setdefault(url, []).append(player_id)
+        session.commit()
+        return [ImageJob(url, ids) for url, ids in by_url.items()], skipped
+
+    @staticmethod
+    def _apply_bulk_outcomes(outcomes) -> None:
+        """Write one pipeline batch of cache-status updates in a single commit."""
+        from app.core.session_manager import managed_session
+
+        store = ImageCacheService.variant_store()
+        now = datetime.utcnow()
+        by_player = {outcome.player_id: outcome for outcome in outcomes}
+        try:
+            with managed_session() as session:
+                rows = session.query(PlayerImageCache.id, PlayerImageCache.player_id).filter(
+                    PlayerImageCache.player_id.in_(list(by_player))
+                ).all()
+                mappings = []
+                for row_id, player_id in rows:
+                    outcome = by_player[player_id]
+                    if not outcome.ok:
+                        mappings.append({'id': row_id, 'cache_status': 'failed'})
+                        continue
+                    urls = store.urls(outcome.content_hash)
+                    mappings.append({
+                        'id': row_id,
+                        'thumbnail_url': urls['thumbnail'],
+                        'cached_url': urls['medium'],
+                        'webp_url': urls['webp'],
+                        'width': outcome.width,
+                        'height': outcome.height,
+                        'file_size': outcome.file_size,
+                        'is_optimized': True,
+                        'cache_status': 'ready',
+                        'last_cached': now,
+                        'cache_expiry': now + timedelta(days=ImageCacheService.CACHE_EXPIRY_DAYS),
+                    })
+                session.bulk_update_mappings(PlayerImageCache, mappings)
+                session.commit()
+        except Exception as e:
+            logger.error(f"Failed to record {len(outcomes)} image optimization results: {e}")
+            ImageCacheService._fail_processing_rows(list(by_player))
+
+    @staticmethod
+    def _fail_processing_rows(player_ids: List[int]) -> None:
+        """
+        Mark rows a bulk run left 'processing' as 'failed'. A forced refresh of an
+        already-optimized row would otherwise stay 'processing' for good, since
+        later non-forced runs skip optimized rows.
+        """
+        from app.core.session_manager import managed_session
+
+        if not player_ids:
+            return
+        try:
+            with managed_session() as session:
+                session.query(PlayerImageCache).filter(
+                    PlayerImageCache.player_id.in_(player_ids),
+                    PlayerImageCache.cache_status == 'processing',
+                ).update({'cache_status': 'failed'}, synchronize_session=False)
+                session.commit()
+        except Exception as e:
+            logger.error(f"Failed to reset {len(player_ids)} image cache rows: {e}")
+
     @staticmethod
     def cleanup_expired_cache(session=None):
         """Remove expired cache entries and files."""
@@ -559,11 +656,14 @@ class ImageCacheService:
             expired_entries = session.query(PlayerImageCache).filter(
                 PlayerImageCache.cache_expiry < datetime.utcnow()
             ).all()
+            # Variant files are content-addressed and may be shared with rows
+            # that haven't expired; those stay on disk.
+            in_use = _referenced_variant_urls(session, expired_entries)
             
             for entry in expired_entries:
                 # Remove files with path traversal protection
                 for url in [entry.thumbnail_url, entry.cached_url, entry.webp_url]:
-                    if url and url.startswith('/static/'):
+                    if url and url.startswith('/static/') and url not in in_use:
                         try:
                             file_path = Path("app") / url.lstrip('/')
                             # Validate path is within static directory
@@ -583,6 +683,22 @@ class ImageCacheService:
             logger.error(f"Error cleaning up expired cache: {e}")
 
 
+def _referenced_variant_urls(session, entries) -> set:
+    """Variant URLs of these entries that other cache rows still reference."""
+    from sqlalchemy import or_
+    urls = {url for entry in entries
+            for url in (entry.thumbnail_url, entry.cached_url, entry.webp_url) if url}
+    if not urls:
+        return set()
+    columns = (PlayerImageCache.thumbnail_url, PlayerImageCache.cached_url,
+               PlayerImageCache.webp_url)
+    rows = session.query(*columns).filter(
+        or_(*(column.in_(urls) for column in columns)),
+        PlayerImageCache.id.notin_([entry.id for entry in entries]),
+    )
+    return {url for row in rows for url in row if url in urls}
+
+
 def invalidate_player_image_cache(player_id: int, session) -> None:
     """
     Remove a player's PlayerImageCache row (and its derived files) after their
@@ -597,9 +713,11 @@ def invalidate_player_image_cache(player_id: int, session) -> None:
     """
     try:
         entries = session.query(PlayerImageCache).filter_by(player_id=player_id).all()
+        in_use = _referenced_variant_urls(session, entries)
         for entry in entries:
             for url in (entry.thumbnail_url, entry.cached_url, entry.webp_url):
-                if url and url.startswith('/static/'):
+                # Another player with the same source photo shares these files.
+                if url and url.startswith('/static/') and url not in in_use:
                     try:
                         file_path = Path("app") / url.lstrip('/')
                         validate_path_within_directory(str(file_path), "app/static")
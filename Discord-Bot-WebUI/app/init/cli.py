@@ -19,7 +19,7 @@ def init_cli_commands(app):
         app: The Flask application instance.
     """
     from app.cli import (
-        build_assets, init_discord_roles, sync_coach_roles,
+        build_assets, build_schedule_assets, init_discord_roles, sync_coach_roles,
         fix_duplicate_user_roles, add_user_roles_constraint,
         regenerate_phone_hashes, sync_profile_pictures,
         reencode_profile_pictures, backfill_league_membership,
@@ -28,6 +28,7 @@ def init_cli_commands(app):
         preview_discord_role_drain, backfill_order_revenue,
     )
     app.cli.add_command(build_assets)
+    app.cli.add_command(build_schedule_assets)
     app.cli.add_command(reencode_profile_pictures)
     app.cli.add_command(init_discord_roles)
     app.cli.add_command(sync_coach_roles)
@@ -5,10 +5,15 @@ API Request Logger Middleware
 
 Logs API requests for analytics and monitoring.
 Only logs requests to /api/ endpoints to reduce noise.
+
+Rows are queued on the process's APILogBuffer (app/services/api_log_buffer.py)
+and written in batches; every request also feeds the per-endpoint latency
+histograms, even when the per-minute row cap is reached.
 """
 
 import logging
 import time
+from datetime import datetime
 from functools import wraps
 
 from flask import request, g
@@ -23,7 +28,8 @@ EXCLUDED_ENDPOINTS = [
     '/api/status',
 ]
 
-# Maximum requests to log per minute to avoid overwhelming the database
+# Maximum request ROWS to log per minute to avoid overwhelming the database
+# (latency histograms still count every request)
 MAX_LOGS_PER_MINUTE = 1000
 _log_count_this_minute = 0
 _last_minute = 0
@@ -36,6 +42,8 @@ def init_api_logger(app):
     Args:
         app: Flask application instance
     """
+    from app.services.api_log_buffer import create_api_log_buffer
+    app.extensions['api_log_buffer'] = buffer = create_api_log_buffer(app)
 
     @app.before_request
     def start_timer():
@@ -62,9 +70,6 @@ def init_api_logger(app):
             _log_count_this_minute = 0
             _last_minute = current_minute
 
-        if _log_count_this_minute >= MAX_LOGS_PER_MINUTE:
-            return response
-
         try:
             # Calculate response time
             start_time = getattr(g, 'api_request_start_time', None)
@@ -73,36 +78,33 @@ def init_api_logger(app):
             else:
                 response_time_ms = 0
 
-            # Get user ID if authenticated
-            user_id = None
-            try:
-                if current_user and current_user.is_authenticated:
-                    user_id = current_user.id
-            except Exception:
-                pass
-
-            # Get client info
-            ip_address = request.remote_addr
-            user_agent = request.headers.get('User-Agent', '')
-
-            # Queue async logging via Celery to prevent connection pool exhaustion
-            from datetime import datetime
-            from app.tasks.tasks_api_logging import log_api_request_async
-
-            try:
-                log_api_request_async.delay(
-                    endpoint_path=request.path,
-                    method=request.method,
-                    status_code=response.status_code,
-                    response_time_ms=response_time_ms,
-                    user_id=user_id,
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                    timestamp_iso=datetime.utcnow().isoformat()
-                )
+            row = None
+            if _log_count_this_minute < MAX_LOGS_PER_MINUTE:
+                # Get user ID if authenticated
+                user_id = None
+                try:
+                    if current_user and current_user.is_authenticated:
+                        user_id = current_user.id
+                except Exception:
+                    pass
+
+                user_agent = request.headers.get('User-Agent', '')
+                row = {
+                    'endpoint_path': request.path[:500],
+                    'method': request.method,
+                    'status_code': response.status_code,
+                    'response_time_ms': response_time_ms,
+                    'user_id': user_id,
+                    'ip_address': request.remote_addr,
+                    'user_agent': user_agent[:500] if user_agent else None,
+                    'timestamp': datetime.utcnow(),
+                }
                 _log_count_this_minute += 1
-            except Exception as queue_error:
-                logger.debug(f"Failed to queue API log: {queue_error}")
+
+            # Histograms are keyed by the route TEMPLATE (/api/v1/matches/<int:match_id>)
+            # so per-id paths don't each get their own histogram.
+            route = request.url_rule.rule if request.url_rule else request.path
+            buffer.record(row, f'{request.method} {route}', response_time_ms, response.status_code)
 
         except Exception as e:
             # Don't let logging errors affect the response
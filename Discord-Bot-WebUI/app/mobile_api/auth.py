@@ -33,7 +33,10 @@ from app.app_api_helpers import (
     build_player_season_stats_data,
     build_player_team_history_data,
 )
-from app.etag_utils import make_etag_response, CACHE_DURATIONS
+from app.etag_utils import (
+    make_etag_response, CACHE_DURATIONS, version_etag, check_etag_match, not_modified_response,
+)
+from app.services import etag_versions
 from app.utils.session_utils import create_user_session
 from app.utils.log_sanitizer import mask_code
 
@@ -586,6 +589,15 @@ def get_user_profile():
     logger.info(f"[MOBILE_API] get_user_profile called for user_id: {current_user_id}")
     logger.debug(f"[MOBILE_API] Request args: {dict(request.args)}")
 
+    scopes = [etag_versions.profile_scope(current_user_id), etag_versions.PROFILES,
+              etag_versions.TEAMS]
+    if any(request.args.get(flag, 'false').lower() == 'true'
+           for flag in ('include_stats', 'include_season_history', 'include_team_history')):
+        scopes.append(etag_versions.MATCHES)
+    etag = version_etag(scopes, current_user_id)
+    if etag and check_etag_match(etag):
+        return not_modified_response(etag, 'user_profile', CACHE_DURATIONS['user_profile'])
+
     with managed_session() as session_db:
         # Query user with eager loading for roles to prevent N+1 queries
         user = session_db.query(User).options(
@@ -760,4 +772,5 @@ def get_user_profile():
         logger.info(f"[MOBILE_API] get_user_profile successful for user {user.username} - returning {len(response_data)} fields")
 
         # Return with ETag support - user profiles can change more frequently
-        return make_etag_response(response_data, 'user_profile', CACHE_DURATIONS['user_profile'])
+        return make_etag_response(response_data, 'user_profile', CACHE_DURATIONS['user_profile'],
+                                  etag=etag)
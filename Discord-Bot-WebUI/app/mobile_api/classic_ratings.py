@@ -205,9 +205,13 @@ def _balanced_draft_access_required(f):
 @_balanced_draft_access_required
 def classic_draft_balance():
     """Balanced-draft board state: teams + rosters + per-metric totals, pool,
-    gaps, config."""
+    gaps, config. ?since=<version> returns only the moves since then."""
+    since = request.args.get('since', type=int)
     with managed_session() as session:
-        state = classic_draft_service.get_board_state(session)
+        if since is not None:
+            state = classic_draft_service.board_changes_since(session, since)
+        else:
+            state = classic_draft_service.get_board_state(session)
         return jsonify({"success": True, **state}), 200
 
 
@@ -198,6 +198,19 @@ def _emit_to_draft_rooms(event, payload, url_name, db_name):
     draft_clock.broadcast_draft(event, payload, url_name, db_name)
 
 
+def _record_board_move(db_name, player_id, team_id):
+    """Log a committed Classic pick/removal for balanced-board delta sync.
+    Returns the board version, or None (other leagues, or the log is down)."""
+    from app.services import classic_draft_service
+    if not classic_draft_service.is_board_league(db_name):
+        return None
+    try:
+        return classic_draft_service.record_board_move(player_id, team_id)
+    except Exception as e:
+        logger.warning(f"Board log append skipped for player {player_id}: {e}")
+        return None
+
+
 @mobile_api_v2.route('/draft/leagues', methods=['GET'])
 @jwt_required()
 def get_draft_leagues():
@@ -971,12 +984,13 @@ def draft_player(league_name: str):
     if _sub_removal_notice:
         logger.info(f"📋 {_sub_removal_notice}")
     assign_roles_to_player_task.delay(player_id=player_id, only_add=not _reconcile_removals)
-    DraftCacheService.clear_all_league_caches(db_league_name)
+    board_version = _record_board_move(db_league_name, player_id, team_id)
+    DraftCacheService.clear_all_league_caches(db_league_name, reset_board=board_version is None)
 
     _emit_to_draft_rooms('player_drafted_enhanced', {
         'success': True, 'player': enhanced, 'team_id': team_id, 'team_name': team_name,
         'league_name': url_name, 'position': position, 'draft_position': draft_position,
-        'sub_removal_notice': _sub_removal_notice,
+        'sub_removal_notice': _sub_removal_notice, 'board_version': board_version,
     }, url_name, db_league_name)
     if clock_payload:
         _emit_to_draft_rooms('draft_clock_update', clock_payload, url_name, db_league_name)
@@ -1109,7 +1123,8 @@ def remove_player_from_team(league_name: str, player_id: int):
         remove_player_roles_task.delay(player_id=player_id, team_id=team.id)
 
         # Invalidate cache
-        DraftCacheService.clear_all_league_caches(db_league_name)
+        board_version = _record_board_move(db_league_name, player_id, None)
+        DraftCacheService.clear_all_league_caches(db_league_name, reset_board=board_version is None)
 
         # Broadcast so the web board / other phones drop the card live.
         _emit_to_draft_rooms('player_removed_enhanced', {
@@ -1118,6 +1133,7 @@ def remove_player_from_team(league_name: str, player_id: int):
             'team_id': team.id,
             'team_name': team_name,
             'league_name': league_name.lower(),
+            'board_version': board_version,
         }, league_name.lower(), db_league_name)
 
         return jsonify({
@@ -27,7 +27,10 @@ from app.mobile_api import mobile_api_v2
 from app.core.session_manager import managed_session
 from app.models import Match, Player, User, Team
 from app.models.ecs_fc import EcsFcMatch, EcsFcAvailability
-from app.etag_utils import make_etag_response, CACHE_DURATIONS
+from app.etag_utils import (
+    make_etag_response, CACHE_DURATIONS, version_etag, check_etag_match, not_modified_response,
+)
+from app.services import etag_versions
 from app.app_api_helpers import (
     bulk_player_availability,
     build_match_response,
@@ -203,6 +206,17 @@ def get_all_matches():
     current_user_id = int(get_jwt_identity())
     logger.info(f"get_all_matches called for user_id: {current_user_id}")
 
+    # Answer a current If-None-Match from the version counters, before any query.
+    include_availability = request.args.get('include_availability', 'false').lower() == 'true'
+    cache_duration = CACHE_DURATIONS['match_list'] if not include_availability else 3600
+    scopes = [etag_versions.MATCHES, etag_versions.TEAMS, etag_versions.PROFILES,
+              etag_versions.profile_scope(current_user_id)]
+    if include_availability:
+        scopes.append(etag_versions.RSVPS)
+    etag = version_etag(scopes, current_user_id, refresh_seconds=600)
+    if etag and check_etag_match(etag):
+        return not_modified_response(etag, 'match_list', cache_duration)
+
     with managed_session() as session_db:
         # Get user with roles for access level determination
         user = session_db.query(User).options(
@@ -248,7 +262,6 @@ def get_all_matches():
                 limit = 15 if not (completed or upcoming or all_teams) else 20
 
         include_events = request.args.get('include_events', 'false').lower() == 'true'
-        include_availability = request.args.get('include_availability', 'false').lower() == 'true'
 
         # Query Pub League matches only.
         # ECS FC fixtures are served by /api/v1/ecs-fc-matches; this endpoint
@@ -300,8 +313,7 @@ def get_all_matches():
 
         logger.info(f"Returning {len(all_matches_data)} Pub League matches")
 
-        cache_duration = CACHE_DURATIONS['match_list'] if not include_availability else 3600
-        return make_etag_response(all_matches_data, 'match_list', cache_duration)
+        return make_etag_response(all_matches_data, 'match_list', cache_duration, etag=etag)
 
 
 @mobile_api_v2.route('/matches/schedule', methods=['GET'])
@@ -62,7 +62,8 @@ def get_players():
     Retrieve a list of players.
 
     Query parameters:
-        search: Search by player name or team name (partial match, case-insensitive)
+        search: Search by player name, username, Discord username or team name
+                (partial match, case-insensitive)
         team_id: Filter by team
         league_id: Filter by league
         current_only: If 'true', only return current players (default: true)
@@ -73,7 +74,6 @@ def get_players():
         JSON list of players
     """
     with managed_session() as session_db:
-        from sqlalchemy import or_
         from app.models import Team, player_teams
 
         # Get pagination parameters first
@@ -92,21 +92,26 @@ def get_players():
         # Select both id and name so we can ORDER BY name with DISTINCT
         id_query = session_db.query(Player.id, Player.name)
 
-        # Apply search filter - search player name or team name
+        # Apply search filter - player name, username, Discord username or team
+        # name, substring match through the in-process search index. Terms too
+        # short for the index match player or team name in SQL.
         if search:
-            id_query = id_query.outerjoin(player_teams).outerjoin(
-                Team, Team.id == player_teams.c.team_id
-            ).filter(
-                or_(
-                    Player.name.ilike(f'%{search}%'),
-                    Team.name.ilike(f'%{search}%')
-                )
-            )
+            from app.services.player_search_index import indexable, search_player_ids
+            if indexable(search):
+                id_query = id_query.filter(Player.id.in_(
+                    search_player_ids(session_db, search, limit=None, fuzzy=False)))
+            else:
+                from sqlalchemy import or_, select
+                like = f'%{search}%'
+                id_query = id_query.filter(or_(
+                    Player.name.ilike(like),
+                    Player.id.in_(select(player_teams.c.player_id)
+                                  .join(Team, Team.id == player_teams.c.team_id)
+                                  .where(Team.name.ilike(like)))))
 
         # Filter by team
         if team_id:
-            if not search:  # Only join if not already joined for search
-                id_query = id_query.join(player_teams)
+            id_query = id_query.join(player_teams)
             id_query = id_query.filter(player_teams.c.team_id == team_id)
 
         # Filter by league
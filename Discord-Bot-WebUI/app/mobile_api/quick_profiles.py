@@ -838,7 +838,8 @@ def search_players_for_linking():
     Search for existing players to link a quick profile to.
 
     Query parameters:
-        q: Search query (partial match on name)
+        q: Search query (name, username, Discord username, team or email;
+           ranked, with fuzzy matches after exact ones)
         limit: Max results (default 20, max 50)
 
     Returns:
@@ -854,10 +855,9 @@ def search_players_for_linking():
         }), 200
 
     with managed_session() as session:
-        players = session.query(Player).filter(
-            Player.name.ilike(f'%{search}%'),
-            Player.is_current_player == True
-        ).order_by(Player.name).limit(limit).all()
+        from app.services.player_search_index import search_players
+        players = search_players(session, search, limit=limit, include_email=True,
+                                 current_only=True)
 
         return jsonify({
             'success': True,
@@ -26,7 +26,10 @@ from app.constants.positions import label_for
 from app.core.session_manager import managed_session
 from app.models import Team, League, Season, Match, Player, player_teams, Availability
 from app.models.ecs_fc import EcsFcMatch, EcsFcAvailability
-from app.etag_utils import make_etag_response, CACHE_DURATIONS
+from app.etag_utils import (
+    make_etag_response, CACHE_DURATIONS, version_etag, check_etag_match, not_modified_response,
+)
+from app.services import etag_versions
 from app.utils.pacific_time import pacific_today
 from app.app_api_helpers import (
     build_match_response,
@@ -49,6 +52,13 @@ def get_teams():
     Returns:
         JSON list of teams with league information
     """
+    # Team dicts embed recent form / top scorer, so MATCHES is a dependency too.
+    user_id = get_jwt_identity()
+    etag = version_etag((etag_versions.TEAMS, etag_versions.MATCHES, etag_versions.PROFILES,
+                         etag_versions.profile_scope(user_id)), user_id, refresh_seconds=600)
+    if etag and check_etag_match(etag):
+        return not_modified_response(etag, 'team_list', CACHE_DURATIONS['team_list'])
+
     with managed_session() as session_db:
         # EVERY current season, not just Pub League + ECS FC.
         #
@@ -133,7 +143,7 @@ def get_teams():
             _gated = reveal_gated_league_names(session_db)
             teams_data = [t for t in teams_data if t.get('league_name') not in _gated]
 
-        return make_etag_response(teams_data, 'team_list', CACHE_DURATIONS['team_list'])
+        return make_etag_response(teams_data, 'team_list', CACHE_DURATIONS['team_list'], etag=etag)
 
 
 @mobile_api_v2.route('/teams/<int:team_id>', methods=['GET'])
@@ -483,6 +493,12 @@ def get_team_stats(team_id: int):
     from sqlalchemy import func
     from app.models import Standings, PlayerSeasonStats
 
+    user_id = get_jwt_identity()
+    etag = version_etag((etag_versions.TEAMS, etag_versions.MATCHES, etag_versions.PROFILES,
+                         etag_versions.profile_scope(user_id)), user_id, refresh_seconds=600)
+    if etag and check_etag_match(etag):
+        return not_modified_response(etag, 'team_stats', CACHE_DURATIONS['team_stats'])
+
     with managed_session() as session_db:
         team = session_db.query(Team).get(team_id)
         if not team:
@@ -617,7 +633,7 @@ def get_team_stats(team_id: int):
         stats["players_stats"] = players_stats
 
         # Return with ETag support for mobile app caching
-        return make_etag_response(stats, 'team_stats', CACHE_DURATIONS['team_stats'])
+        return make_etag_response(stats, 'team_stats', CACHE_DURATIONS['team_stats'], etag=etag)
 
 
 @mobile_api_v2.route('/teams/my_team', methods=['GET'])
@@ -338,72 +338,48 @@ class PlayerAttendanceStats(db.Model):
         else:
             invited_match_ids = list(responses.keys())
 
-        # Reset counters
-        self.total_matches_invited = len(invited_match_ids)
-        self.total_responses = 0
-        self.yes_responses = 0
-        self.no_responses = 0
-        self.maybe_responses = 0
-        self.no_response_count = 0
-
         # Count responses across the invited universe (missing row => no-response)
-        for mid in invited_match_ids:
-            response = responses.get(mid, '')
-            if response in ('yes', 'no', 'maybe'):
-                self.total_responses += 1
-                if response == 'yes':
-                    self.yes_responses += 1
-                elif response == 'no':
-                    self.no_responses += 1
-                else:
-                    self.maybe_responses += 1
-            else:
-                self.no_response_count += 1
+        answered = [responses.get(mid, '') for mid in invited_match_ids]
+        self.apply_career_counts(
+            invited=len(invited_match_ids),
+            yes=answered.count('yes'),
+            no=answered.count('no'),
+            maybe=answered.count('maybe'),
+        )
 
-        # Calculate percentages
-        if self.total_matches_invited > 0:
-            self.response_rate = (self.total_responses / self.total_matches_invited) * 100
-            self.attendance_rate = (self.yes_responses / self.total_matches_invited) * 100
-            self.adjusted_attendance_rate = ((self.yes_responses + (self.maybe_responses * 0.5)) / self.total_matches_invited) * 100
-            
-            # Reliability score weights response rate and attendance
-            if self.total_matches_invited >= 5:  # Established players
-                self.reliability_score = (self.response_rate * 0.3) + (self.adjusted_attendance_rate * 0.7)
-            else:  # New players
-                self.reliability_score = (self.response_rate * 0.5) + (self.adjusted_attendance_rate * 0.5)
-        else:
-            self.response_rate = 0.0
-            self.attendance_rate = 0.0
-            self.adjusted_attendance_rate = 0.0
-            self.reliability_score = 0.0
-        
         # Update CURRENT-season stats. Resolve the current season(s) here (is_current=True)
         # so a bulk recompute doesn't need to pre-set current_season_id — that guard was
         # why season attendance read 0% for everyone. Multiple leagues can each have a
         # current season, so we count matches in any of them.
+        stamp_season_id, current_season_ids = self.current_seasons(session)
+        if current_season_ids:
+            self.current_season_id = stamp_season_id
+            self._update_season_stats(session, current_season_ids)
+        else:
+            self.season_matches_invited = 0
+            self.season_yes_responses = 0
+            self.season_attendance_rate = 0.0
+
+        self.last_updated = datetime.utcnow()
+
+    @staticmethod
+    def current_seasons(session):
+        """(season id to stamp as current_season_id, every current season id)."""
         from app.models.core import Season
         # Season.is_current is per league_type, so Pub League AND ECS FC are both current at
         # the same time. This query had no ORDER BY, so `[0]` was whichever row Postgres
         # happened to return — and every coach-dashboard roster join keys on the stamped
         # current_season_id, silently rendering N/A for a whole league when the other one won.
         # Stamp the Pub League season deterministically (that is what the roster pages read);
-        # season match counting below still spans every current season.
+        # season match counting still spans every current season.
         current_rows = (session.query(Season.id, Season.league_type)
                         .filter(Season.is_current.is_(True))
                         .order_by(Season.id.desc()).all())
         current_season_ids = [sid for (sid, _lt) in current_rows]
-        if current_season_ids:
-            self.current_season_id = next(
-                (sid for (sid, lt) in current_rows if lt == 'Pub League'),
-                current_season_ids[0],
-            )
-            self._update_season_stats(session, current_season_ids)
-        else:
-            self.season_matches_invited = 0
-            self.season_yes_responses = 0
-            self.season_attendance_rate = 0.0
-
-        self.last_updated = datetime.utcnow()
+        if not current_season_ids:
+            return None, []
+        stamp = next((sid for (sid, lt) in current_rows if lt == 'Pub League'), current_season_ids[0])
+        return stamp, current_season_ids
 
     def _update_season_stats(self, session, season_ids):
         """Update current-season statistics (same 'bounded by first activity'
@@ -439,9 +415,45 @@ class PlayerAttendanceStats(db.Model):
         else:
             season_match_ids = list(responses.keys())
 
-        self.season_matches_invited = len(season_match_ids)
-        self.season_yes_responses = sum(1 for mid in season_match_ids
-                                        if (responses.get(mid) or '').lower() == 'yes')
+        self.apply_season_counts(
+            invited=len(season_match_ids),
+            yes=sum(1 for mid in season_match_ids if (responses.get(mid) or '').lower() == 'yes'),
+        )
+
+    def apply_career_counts(self, invited, yes, no, maybe):
+        """Set the career counters and derived rates from raw counts.
+
+        Shared by update_stats and the set-based recompute
+        (app/services/attendance_stats_service.py) so both produce the same floats.
+        """
+        self.total_matches_invited = invited
+        self.yes_responses = yes
+        self.no_responses = no
+        self.maybe_responses = maybe
+        self.total_responses = yes + no + maybe
+        self.no_response_count = invited - self.total_responses
+
+        # Calculate percentages
+        if self.total_matches_invited > 0:
+            self.response_rate = (self.total_responses / self.total_matches_invited) * 100
+            self.attendance_rate = (self.yes_responses / self.total_matches_invited) * 100
+            self.adjusted_attendance_rate = ((self.yes_responses + (self.maybe_responses * 0.5)) / self.total_matches_invited) * 100
+            
+            # Reliability score weights response rate and attendance
+            if self.total_matches_invited >= 5:  # Established players
+                self.reliability_score = (self.response_rate * 0.3) + (self.adjusted_attendance_rate * 0.7)
+            else:  # New players
+                self.reliability_score = (self.response_rate * 0.5) + (self.adjusted_attendance_rate * 0.5)
+        else:
+            self.response_rate = 0.0
+            self.attendance_rate = 0.0
+            self.adjusted_attendance_rate = 0.0
+            self.reliability_score = 0.0
+
+    def apply_season_counts(self, invited, yes):
+        """Set the current-season counters and rate from raw counts."""
+        self.season_matches_invited = invited
+        self.season_yes_responses = yes
 
         if self.season_matches_invited > 0:
             self.season_attendance_rate = (self.season_yes_responses / self.season_matches_invited) * 100
@@ -23,7 +23,9 @@ from app.decorators import role_required
 from app.services.calendar import create_league_event_service, create_visibility_service
 from app.services.discord_service import get_discord_service
 from app.dto.calendar_dto import league_event_to_fullcalendar
-from app.utils.schedule_image_generator import generate_schedule_image
+from app.utils.schedule_image_generator import (
+    generate_schedule_image, generate_team_schedule_images, team_week_schedules,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -807,6 +809,100 @@ def import_league_events():
         return jsonify({'error': 'Internal Server Error'}), 500
 
 
+@league_events_bp.route('/league-events/team-schedules', methods=['POST'])
+@login_required
+@role_required(ADMIN_ROLES)
+def post_team_week_schedules():
+    """
+    Post each team's schedule poster for a week to its Discord channel.
+
+    All posters are rendered in one pass (generate_team_schedule_images), so
+    teams sharing a canvas size reuse the same cached base layer.
+
+    Request body (JSON):
+    - week_start: ISO date of the first day of the week (optional, default: today)
+    - dry_run: Render and report without posting (optional, default: false)
+
+    Returns:
+        JSON with the teams posted, skipped and failed
+    """
+    from sqlalchemy import or_
+    from sqlalchemy.orm import joinedload
+    from app.models import Match, Team
+    from app.services.team_visibility import teams_are_public, is_current_pub_league_team
+    from app.utils.pacific_time import pacific_today
+
+    try:
+        data = request.get_json(silent=True) or {}
+        try:
+            week_start = (datetime.fromisoformat(data['week_start']).date()
+                          if data.get('week_start') else pacific_today())
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Invalid week_start format'}), 400
+        week_end = week_start + timedelta(days=6)
+        dry_run = bool(data.get('dry_run', False))
+
+        matches = (
+            g.db_session.query(Match)
+            .options(joinedload(Match.home_team).joinedload(Team.league),
+                     joinedload(Match.away_team).joinedload(Team.league))
+            .filter(Match.date >= week_start, Match.date <= week_end,
+                    or_(Match.home_team_id.isnot(None), Match.away_team_id.isnot(None)))
+            .order_by(Match.date, Match.time)
+            .all()
+        )
+
+        teams = {}
+        for m in matches:
+            for team in (m.home_team, m.away_team):
+                if team is not None:
+                    teams[team.id] = team
+
+        # Pre-reveal, hidden Pub League teams get no poster naming their opponents.
+        hide_gated = not teams_are_public()
+        schedules = {team_id: schedule for team_id, schedule in team_week_schedules(matches).items()
+                     if teams[team_id].discord_channel_id
+                     and not (hide_gated and is_current_pub_league_team(teams[team_id]))}
+        skipped = sorted(teams[team_id].name for team_id in teams if team_id not in schedules)
+
+        logger.info(f"Rendering {len(schedules)} team schedule posters for week of {week_start}")
+        images = generate_team_schedule_images(schedules, footer_url="portal.ecsfc.com")
+        failed = sorted(teams[team_id].name for team_id in schedules if team_id not in images)
+
+        posted = []
+        if not dry_run and images:
+            discord_service = get_discord_service()
+            loop = asyncio.new_event_loop()
+            try:
+                for team_id, image_bytes in images.items():
+                    team = teams[team_id]
+                    result = loop.run_until_complete(
+                        discord_service.post_schedule_image_announcement(
+                            image_bytes=image_bytes,
+                            title=f"📅 {team.name}: Week of {week_start.strftime('%b %d')}",
+                            footer_text="View your full schedule at portal.ecsfc.com",
+                            channel_id=int(team.discord_channel_id)
+                        )
+                    )
+                    (posted if result else failed).append(team.name)
+            finally:
+                loop.close()
+
+        return jsonify({
+            'success': True,
+            'week_start': week_start.isoformat(),
+            'dry_run': dry_run,
+            'rendered': len(images),
+            'posted': posted,
+            'skipped': skipped,
+            'failed': sorted(failed),
+        })
+
+    except Exception as e:
+        logger.error(f"Error posting team schedules: {e}", exc_info=True)
+        return jsonify({'error': 'Internal Server Error'}), 500
+
+
 @league_events_bp.route('/league-events/import/template', methods=['GET'])
 @login_required
 def get_import_template():
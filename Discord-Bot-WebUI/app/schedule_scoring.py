@@ -0,0 +1,367 @@
+# app/schedule_scoring.py
+
+"""
+Schedule Scoring Module
+
+Compact constraint and fairness state for a season of weekly matches.
+AutoScheduleGenerator's validators used to rebuild dicts of sets and lists for
+every candidate schedule (pair counts, per-week slots, consecutive-week
+opponents, field/slot/window tallies). ScheduleScorer keeps the same facts in
+flat per-team counter arrays and integer bitsets (bit i = team index i), and
+updates them per match:
+
+- placing or rewriting one week costs O(matches in that week);
+- swapping two positions inside a week only moves slot/field/window counts of
+  the (at most four) teams involved - opponents, pairs and home/away cannot
+  change inside a week;
+- swapping two whole weeks only moves that week's rows.
+
+Positions inside a week encode slot = index // num_fields and
+field = index % num_fields, the same layout the generators emit.
+
+Hard-violation strings are produced in the exact wording and order the admin
+UI has always shown: violations() matches the generic validator
+(_evaluate_generic) and premier_violations() matches the 8-team template
+validator (_validate_all_constraints).
+"""
+
+from typing import List, Sequence, Tuple
+
+
+def pair_key(team1_id: int, team2_id: int) -> str:
+    """Consistent key for an unordered team pair (AutoScheduleGenerator._get_pair_key)."""
+    return f"{min(team1_id, team2_id)}_{max(team1_id, team2_id)}"
+
+
+class ScheduleScorer:
+    """Incremental counters for a season grid of num_weeks x (slot_count * num_fields)."""
+
+    def __init__(self, team_ids: Sequence[int], num_fields: int, slot_count: int,
+                 num_weeks: int):
+        """
+        Args:
+            team_ids: Team IDs in the schedule; counter rows follow this order
+            num_fields: Fields per time slot
+            slot_count: Time slots per week
+            num_weeks: Weeks in the season
+        """
+        n = len(team_ids)
+        self.team_ids = list(team_ids)
+        self.index = {tid: i for i, tid in enumerate(self.team_ids)}
+        self.n = n
+        self.num_fields = num_fields
+        self.slot_count = slot_count
+        self.num_weeks = num_weeks
+        self.half = [0 if s < slot_count / 2 else 1 for s in range(slot_count)]
+        self.score_windows = slot_count % 2 == 0
+        self._win_weight = 2 if self.score_windows else 0
+
+        self.weeks: List[List[Tuple[int, int]]] = [[] for _ in range(num_weeks)]
+
+        # Season totals per team
+        self.pair = [0] * (n * n)  # pair[i * n + j], symmetric
+        self.home = [0] * n
+        self.away = [0] * n
+        self.slot_cnt = [[0] * slot_count for _ in range(n)]
+        self.field_cnt = [[0] * num_fields for _ in range(n)]
+        self.win_cnt = [[0, 0] for _ in range(n)]
+        self.slot_dev = [0] * n
+        self.field_dev = [0] * n
+        self.win_dev = [0] * n
+
+        # Per week, per team
+        self.games = [[0] * n for _ in range(num_weeks)]
+        self.opp_bits = [[0] * n for _ in range(num_weeks)]
+        self.pos = [[[] for _ in range(n)] for _ in range(num_weeks)]
+        self.btb = [[False] * n for _ in range(num_weeks)]
+        self.btb_ok = 0
+
+        # Sum of squared slot/field/window counts over all teams (window counts
+        # weighted like the score). Smallest when every team's counts are even.
+        self.sq_total = 0
+
+    @classmethod
+    def from_weeks(cls, weeks: List[List[Tuple[int, int]]], team_ids: Sequence[int],
+                   num_fields: int, slot_count: int) -> 'ScheduleScorer':
+        """Load a complete schedule (one pass over its matches)."""
+        scorer = cls(team_ids, num_fields, slot_count, len(weeks))
+        for w, week in enumerate(weeks):
+            scorer.set_week(w, week)
+        return scorer
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _place(self, t: int, p: int, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) team index t's game at position p."""
+        s = p // self.num_fields
+        f = p - s * self.num_fields
+        half = self.half[s]
+        sc, fc, wc = self.slot_cnt[t], self.field_cnt[t], self.win_cnt[t]
+        ww = self._win_weight
+        # (c+1)^2 - c^2 = 2c+1 on add; c^2 - (c-1)^2 = 2c-1 on remove (c read before).
+        self.sq_total += sign * 2 * (sc[s] + fc[f] + ww * wc[half]) + 2 + ww
+        sc[s] += sign
+        fc[f] += sign
+        wc[half] += sign
+
+    def _refresh(self, w: int, t: int) -> None:
+        """Recompute team index t's deviations and week w back-to-back flag."""
+        sc, fc, wc = self.slot_cnt[t], self.field_cnt[t], self.win_cnt[t]
+        self.slot_dev[t] = max(sc) - min(sc)
+        self.field_dev[t] = max(fc) - min(fc)
+        self.win_dev[t] = abs(wc[0] - wc[1])
+        pos = self.pos[w][t]
+        F = self.num_fields
+        ok = len(pos) == 2 and abs(pos[0] // F - pos[1] // F) == 1
+        if ok != self.btb[w][t]:
+            self.btb[w][t] = ok
+            self.btb_ok += 1 if ok else -1
+
+    def set_week(self, w: int, matches: List[Tuple[int, int]]) -> None:
+        """Place (or replace) week w with matches given as (home_id, away_id) by position."""
+        idx, n = self.index, self.n
+        games, opp_bits, pos = self.games[w], self.opp_bits[w], self.pos[w]
+        touched = set()
+        for sign, week in ((-1, self.weeks[w]), (1, list(matches))):
+            for p, (h, a) in enumerate(week):
+                hi, ai = idx[h], idx[a]
+                self.pair[hi * n + ai] += sign
+                self.pair[ai * n + hi] += sign
+                self.home[hi] += sign
+                self.away[ai] += sign
+                for t in (hi, ai):
+                    self._place(t, p, sign)
+                    games[t] += sign
+                    if sign > 0:
+                        pos[t].append(p)
+                    else:
+                        pos[t].remove(p)
+                touched.update((hi, ai))
+            self.weeks[w] = week
+        # A team can meet the same opponent twice in one week, so rebuild the
+        # opponent sets of the touched teams rather than clearing bits.
+        for t in touched:
+            opp_bits[t] = 0
+        for h, a in self.weeks[w]:
+            hi, ai = idx[h], idx[a]
+            opp_bits[hi] |= 1 << ai
+            opp_bits[ai] |= 1 << hi
+        for t in touched:
+            self._refresh(w, t)
+
+    def swap_positions(self, w: int, p1: int, p2: int) -> None:
+        """Swap the matches at positions p1/p2 of week w. Self-inverse."""
+        if p1 == p2:
+            return
+        week, idx, pos = self.weeks[w], self.index, self.pos[w]
+        m1 = (idx[week[p1][0]], idx[week[p1][1]])
+        m2 = (idx[week[p2][0]], idx[week[p2][1]])
+        week[p1], week[p2] = week[p2], week[p1]
+        for team_match, old, new in ((m1, p1, p2), (m2, p2, p1)):
+            for t in team_match:
+                self._place(t, old, -1)
+                self._place(t, new, 1)
+                tp = pos[t]
+                tp[tp.index(old)] = -1
+        for team_match, new in ((m1, p2), (m2, p1)):
+            for t in team_match:
+                tp = pos[t]
+                tp[tp.index(-1)] = new
+        for t in set(m1 + m2):
+            self._refresh(w, t)
+
+    def swap_slots(self, w: int, s1: int, s2: int) -> None:
+        """Swap two whole time slots of week w (fields kept). Self-inverse."""
+        F = self.num_fields
+        for f in range(F):
+            self.swap_positions(w, s1 * F + f, s2 * F + f)
+
+    def swap_weeks(self, w1: int, w2: int) -> None:
+        """Swap two weeks. Season totals don't depend on week order, so only the
+        per-week rows move."""
+        for rows in (self.weeks, self.games, self.opp_bits, self.pos, self.btb):
+            rows[w1], rows[w2] = rows[w2], rows[w1]
+
+    def can_swap(self, w: int, p1: int, p2: int) -> bool:
+        """True if swapping p1/p2 keeps every team's games in week w in distinct slots."""
+        F = self.num_fields
+        s1, s2 = p1 // F, p2 // F
+        if s1 == s2:
+            return True
+        week, idx, pos = self.weeks[w], self.index, self.pos[w]
+        m1 = (idx[week[p1][0]], idx[week[p1][1]])
+        m2 = (idx[week[p2][0]], idx[week[p2][1]])
+        for team_match, here, there, other in ((m1, p1, s2, m2), (m2, p2, s1, m1)):
+            for t in team_match:
+                if t in other:
+                    continue
+                for q in pos[t]:
+                    if q != here and q // F == there:
+                        return False
+        return True
+
+    # ------------------------------------------------------------------
+    # Fairness
+    # ------------------------------------------------------------------
+
+    def window_dev_max(self) -> int:
+        return max(self.win_dev) if self.score_windows else 0
+
+    def btb_pct(self) -> float:
+        total = self.num_weeks * self.n
+        return (100 * self.btb_ok / total) if total else 0
+
+    def score(self) -> float:
+        """field_dev + slot_dev + 2 * window_dev - back-to-back fraction (lower is better)."""
+        return (max(self.field_dev) + max(self.slot_dev) + self.window_dev_max() * 2
+                - self.btb_pct() / 100.0)
+
+    def summary(self) -> str:
+        return (f"back-to-back={self.btb_pct():.0f}%, field_dev={max(self.field_dev)}, "
+                f"slot_dev={max(self.slot_dev)}, morning/afternoon_dev={self.window_dev_max()}")
+
+    # ------------------------------------------------------------------
+    # Hard constraints
+    # ------------------------------------------------------------------
+
+    def _opponents(self, w: int, t: int) -> List[int]:
+        """Team index t's opponents in week w, in match (position) order."""
+        week, idx = self.weeks[w], self.index
+        out = []
+        for p in sorted(self.pos[w][t]):
+            h, a = week[p]
+            out.append(idx[a] if idx[h] == t else idx[h])
+        return out
+
+    def _pair_violations(self, template: str) -> List[str]:
+        """C1 messages for pairs that appear but not exactly twice, in first-appearance order."""
+        if all(c in (0, 2) for c in self.pair):
+            return []
+        out, seen = [], set()
+        for week in self.weeks:
+            for h, a in week:
+                key = pair_key(h, a)
+                if key in seen:
+                    continue
+                seen.add(key)
+                count = self.pair[self.index[h] * self.n + self.index[a]]
+                if count != 2:
+                    out.append(template.format(key=key, count=count))
+        return out
+
+    def _same_slot(self, w: int, t: int) -> bool:
+        slots = [p // self.num_fields for p in self.pos[w][t]]
+        return len(set(slots)) != len(slots)
+
+    def violations(self) -> List[str]:
+        """Hard violations in the generic validator's wording (_evaluate_generic)."""
+        n, ids = self.n, self.team_ids
+        W = len(self.weeks)
+        hard = self._pair_violations("C1: pair {key} plays {count} times (expected 2)")
+
+        # C2 + different-slot
+        for w in range(W):
+            for t in range(n):
+                if self.games[w][t] != 2:
+                    hard.append(f"C2: team {ids[t]} plays {self.games[w][t]} games in week {w+1}")
+                if self._same_slot(w, t):
+                    hard.append(f"C2: team {ids[t]} has two games in the same slot in week {w+1}")
+
+        # C3: no consecutive-week rematch
+        for w in range(1, W):
+            prev, cur = self.opp_bits[w - 1], self.opp_bits[w]
+            for t in range(n):
+                if prev[t] & cur[t]:
+                    hard.append(f"C3: team {ids[t]} rematch in weeks {w} and {w+1}")
+
+        # C4: home/away balance
+        for t in range(n):
+            if self.home[t] != n - 1 or self.away[t] != n - 1:
+                hard.append(f"C4: team {ids[t]} has {self.home[t]}H/{self.away[t]}A "
+                            f"(expected {n-1}/{n-1})")
+
+        # C7: full single round-robin before any repeat (week granularity)
+        for t in range(n):
+            seen = 0
+            w_complete = None
+            for w in range(W):
+                seen |= self.opp_bits[w][t]
+                if w_complete is None and bin(seen).count('1') >= n - 1:
+                    w_complete = w
+            played = bin(seen).count('1')
+            if played != n - 1:
+                hard.append(f"C7: team {ids[t]} plays {played} opponents (expected {n-1})")
+                continue
+            seen = 0
+            for w in range(W):
+                week_opps = self.opp_bits[w][t]
+                if week_opps & seen and w < w_complete:
+                    hard.append(f"C7: team {ids[t]} repeats an opponent before completing "
+                                f"the round-robin")
+                seen |= week_opps
+        return hard
+
+    def premier_violations(self) -> List[str]:
+        """Hard violations C1-C7 in the 8-team template validator's wording
+        (_validate_all_constraints): fixed 7H/7A, North/South and early/late within
+        +/-2, and no repeated opponent before week 4."""
+        n, ids = self.n, self.team_ids
+        W = len(self.weeks)
+        violations = self._pair_violations("C1: Pair {key} plays {count} times (expected 2)")
+
+        # C2: exactly 2 games per week
+        for w in range(W):
+            for t in range(n):
+                if self.games[w][t] != 2:
+                    violations.append(f"C2: Team {ids[t]} plays {self.games[w][t]} games in week {w+1}")
+
+        # C3: no consecutive-week rematches
+        for w in range(1, W):
+            prev, cur = self.opp_bits[w - 1], self.opp_bits[w]
+            for t in range(n):
+                if prev[t] & cur[t]:
+                    # Built in match order like the original sets so the
+                    # message renders identically.
+                    opponents = ({ids[o] for o in self._opponents(w - 1, t)}
+                                 & {ids[o] for o in self._opponents(w, t)})
+                    violations.append(f"C3: Team {ids[t]} plays {opponents} in weeks {w} and {w+1}")
+
+        # C4: 7 home / 7 away
+        for t in range(n):
+            if self.home[t] != 7 or self.away[t] != 7:
+                violations.append(f"C4: Team {ids[t]} has {self.home[t]}H/{self.away[t]}A "
+                                  f"(expected 7/7)")
+
+        # C5: North (even position) vs South (odd position)
+        for t in range(n):
+            north, south = self.field_cnt[t]
+            if abs(north - south) > 2:
+                violations.append(f"C5: Team {ids[t]} has {north}N/{south}S (max deviation ±2)")
+
+        # C6: early (positions 0-3) vs late
+        for t in range(n):
+            early, late = self.win_cnt[t]
+            if abs(early - late) > 2:
+                violations.append(f"C6: Team {ids[t]} has {early} early/{late} late (max deviation ±2)")
+
+        # C7: no opponent in two different weeks within weeks 1-3
+        for t in range(n):
+            first_week = {}
+            for w in range(W):
+                for o in self._opponents(w, t):
+                    if o in first_week:
+                        if first_week[o] < 3 and w < 3:
+                            violations.append(
+                                f"C7: Team {ids[t]} plays {ids[o]} in week {first_week[o]+1} "
+                                f"and week {w+1} (no repeats before week 4)"
+                            )
+                    else:
+                        first_week[o] = w
+            if len(first_week) < n - 1:
+                violations.append(
+                    f"C7: Team {ids[t]} only plays {len(first_week)} "
+                    f"unique opponents (expected {n - 1})"
+                )
+        return violations
@@ -0,0 +1,380 @@
+# app/schedule_search.py
+
+"""
+Schedule Search Engine
+
+Constraint-propagating search for the generic (any even team count) double
+round-robin built by AutoScheduleGenerator. It replaces the old "reshuffle the
+circle method and re-validate the whole season up to 1200 times" loop with
+three phases that keep their constraint state incrementally:
+
+1. Round ordering. The circle method yields N-1 perfect matchings. Leg 1 plays
+   all of them before leg 2 replays their mirrors, so C1 (each pair twice),
+   C4 (home/away balance) and C7 (full round-robin before any repeat) hold by
+   construction. The only way left to break C3 (consecutive-week rematch) is to
+   put a round's mirror in the week right after the original, so leg 2 is
+   ordered by a small backtracker that prunes exactly that.
+2. Week placement. Each week's two rounds are packed into slot x field
+   positions with every team's two games in different slots (C2), greedily
+   favouring back-to-back slots and the season's running slot/field/window
+   counts.
+3. Local search. Simulated annealing over swaps inside a week - whole time
+   slots, or two matches whenever both teams' other games allow it. Every move
+   preserves C1-C7, and ScheduleScorer (app/schedule_scoring.py) updates only
+   the counters of the touched teams; the season is never rescanned.
+
+The engine runs under a wall-clock and/or iteration budget and returns the best
+schedule found so far. The score is the same one _evaluate_generic reports:
+field_dev + slot_dev + 2 * window_dev - back_to_back_fraction (lower is better).
+"""
+
+import math
+import random
+import time
+from dataclasses import dataclass
+from itertools import permutations
+from typing import List, Optional, Tuple
+
+from app.schedule_scoring import ScheduleScorer
+
+# Construction attempts before giving up when no valid week placement is found,
+# regardless of the time budget (matches the old restart loop's ceiling).
+MAX_CONSTRUCTION_ATTEMPTS = 1200
+
+# Annealing temperature range and the weight of the all-teams squared-count
+# term in the energy (see _energy). Tuned with tests/performance/
+# test_schedule_search_benchmark.py across 4-20 teams and 1-4 fields.
+_T_START = 0.5
+_T_END = 0.02
+_SPREAD_WEIGHT = 3.0
+
+
+@dataclass
+class ScheduleSearchResult:
+    """Best schedule found by ScheduleSearchEngine.search()."""
+    weeks: List[List[Tuple[int, int]]]
+    score: float
+    lower_bound: float
+    summary: str
+    iterations: int
+    restarts: int
+    elapsed: float
+
+
+class ScheduleSearchEngine:
+    """Budgeted search for a fair, constraint-valid generic double round-robin.
+
+    Weeks are returned as lists of (home_id, away_id) whose index encodes
+    slot = index // num_fields and field = index % num_fields, the layout
+    _assign_matches_to_fields expects.
+    """
+
+    def __init__(self, team_ids: List[int], num_fields: int, time_budget: Optional[float] = 1.0,
+                 max_iterations: Optional[int] = None, iterations_per_restart: Optional[int] = None,
+                 seed=None):
+        """
+        Args:
+            team_ids: Team IDs to schedule (even count)
+            num_fields: Fields per time slot; must evenly divide the team count
+                and leave at least two time slots
+            time_budget: Wall-clock seconds to search, or None for no limit
+            max_iterations: Local-search iterations across all restarts, or None
+            iterations_per_restart: Annealing run length before reconstructing
+            seed: Optional seed for a reproducible search
+        """
+        n = len(team_ids)
+        if n < 2 or n % 2 != 0:
+            raise ValueError(f"Scheduling requires an even number of teams, got {n}")
+        if num_fields < 1 or n % num_fields != 0:
+            raise ValueError(f"{num_fields} fields do not evenly divide {n} matches/week")
+        if n // num_fields < 2:
+            raise ValueError(
+                f"{num_fields} fields leave {n // num_fields} time slot(s); each team needs "
+                f"two slots for its two weekly games"
+            )
+        if time_budget is None and max_iterations is None:
+            raise ValueError("Provide a time_budget, max_iterations, or both")
+
+        self.team_ids = list(team_ids)
+        self.n = n
+        self.num_fields = num_fields
+        self.slot_count = n // num_fields
+        self.num_weeks = n - 1
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.iterations_per_restart = iterations_per_restart or 1500 + 250 * n
+        self.rng = random.Random(seed)
+
+        self.lower_bound = self._lower_bound()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def search(self) -> Optional[ScheduleSearchResult]:
+        """Run the search until the budget is spent or the score hits its lower bound.
+
+        Returns the best schedule found, or None if no valid schedule could be
+        constructed at all.
+        """
+        started = time.monotonic()
+        deadline = started + self.time_budget if self.time_budget is not None else None
+        best_weeks = None
+        best_score = None
+        best_summary = ''
+        iterations = 0
+        restarts = 0
+        construction_failures = 0
+
+        while True:
+            if best_weeks is not None and self._exhausted(deadline, iterations):
+                break
+            if not self._construct():
+                construction_failures += 1
+                if construction_failures >= MAX_CONSTRUCTION_ATTEMPTS:
+                    break
+                continue
+            restarts += 1
+
+            score = self.scorer.score()
+            if best_score is None or score < best_score:
+                best_score, best_weeks, best_summary = score, self._snapshot(), self.scorer.summary()
+            if best_score <= self.lower_bound + 1e-9:
+                break
+
+            run_best, run_weeks, run_summary, used = self._anneal(deadline, iterations)
+            iterations += used
+            if run_best < best_score:
+                best_score, best_weeks, best_summary = run_best, run_weeks, run_summary
+            if best_score <= self.lower_bound + 1e-9:
+                break
+
+        if best_weeks is None:
+            return None
+        ids = self.team_ids
+        return ScheduleSearchResult(
+            weeks=[[(ids[h], ids[a]) for h, a in week] for week in best_weeks],
+            score=best_score,
+            lower_bound=self.lower_bound,
+            summary=best_summary,
+            iterations=iterations,
+            restarts=restarts,
+            elapsed=time.monotonic() - started,
+        )
+
+    # ------------------------------------------------------------------
+    # Budget / bounds
+    # ------------------------------------------------------------------
+
+    def _exhausted(self, deadline, iterations) -> bool:
+        if deadline is not None and time.monotonic() >= deadline:
+            return True
+        return self.max_iterations is not None and iterations >= self.max_iterations
+
+    def _lower_bound(self) -> float:
+        """Best achievable score: every team plays 2*(N-1) games, so a slot or field
+        count that does not divide that total forces a deviation of at least 1."""
+        games = 2 * (self.n - 1)
+        slot_lb = 0 if games % self.slot_count == 0 else 1
+        field_lb = 0 if games % self.num_fields == 0 else 1
+        return slot_lb + field_lb - 1.0
+
+    # ------------------------------------------------------------------
+    # Phase 1: round ordering
+    # ------------------------------------------------------------------
+
+    def _circle_rounds(self, order: List[int]) -> List[List[Tuple[int, int]]]:
+        """Single round-robin via the circle method."""
+        n = len(order)
+        fixed = order[0]
+        rot = order[1:]
+        rounds = []
+        for r in range(n - 1):
+            seq = [fixed] + rot
+            pairs = []
+            for i in range(n // 2):
+                a, b = seq[i], seq[n - 1 - i]
+                pairs.append((a, b) if (i + r) % 2 == 0 else (b, a))
+            rounds.append(pairs)
+            rot = [rot[-1]] + rot[:-1]
+        return rounds
+
+    def _order_rounds(self) -> Optional[List[List[Tuple[int, int]]]]:
+        """Leg 1 in random order, then leg 2 (mirrors) ordered so that no round's
+        mirror lands in the week adjacent to the original (C3)."""
+        rng = self.rng
+        leg1 = self._circle_rounds(rng.sample(range(self.n), self.n))
+        rng.shuffle(leg1)
+        k = len(leg1)
+        leg1_week = [j // 2 for j in range(k)]
+        used = [False] * k
+        order = []
+
+        def backtrack(p):
+            if p == k:
+                return True
+            week = (k + p) // 2
+            cands = [j for j in range(k) if not used[j] and abs(week - leg1_week[j]) != 1]
+            rng.shuffle(cands)
+            for j in cands:
+                used[j] = True
+                order.append(j)
+                if backtrack(p + 1):
+                    return True
+                order.pop()
+                used[j] = False
+            return False
+
+        if not backtrack(0):
+            return None
+        leg2 = [[(a, h) for (h, a) in leg1[j]] for j in order]
+        return leg1 + leg2
+
+    # ------------------------------------------------------------------
+    # Phase 2: week placement
+    # ------------------------------------------------------------------
+
+    def _construct(self) -> bool:
+        """Build one complete schedule into a fresh ScheduleScorer."""
+        rounds = self._order_rounds()
+        if rounds is None:
+            return False
+        self.scorer = ScheduleScorer(range(self.n), self.num_fields, self.slot_count,
+                                     self.num_weeks)
+        for w in range(0, len(rounds), 2):
+            placed = self._place_week(rounds[w], rounds[w + 1])
+            if placed is None:
+                return False
+            self.scorer.set_week(w // 2, placed)
+        return True
+
+    def _place_week(self, round_a, round_b) -> Optional[List[Tuple[int, int]]]:
+        """Place two perfect matchings into slot_count x num_fields positions. Hard:
+        each team's two games land in different slots. Soft: prefer adjacent slots
+        and the slots/windows/fields each team has had least so far."""
+        F, S = self.num_fields, self.slot_count
+        rng = self.rng
+        order = list(round_a) + list(round_b)
+        rng.shuffle(order)
+        capacity = S * F
+        used = [False] * capacity
+        grid = [None] * capacity
+        team_slot = [-1] * self.n  # slot of the team's first placed game this week
+        slot_members = [set() for _ in range(S)]
+        slot_cnt, win_cnt, half_of = self.scorer.slot_cnt, self.scorer.win_cnt, self.scorer.half
+
+        def backtrack(pos):
+            if pos == capacity:
+                return True
+            slot = pos // F
+            members = slot_members[slot]
+            half = half_of[slot]
+            cand = []
+            for i, (h, a) in enumerate(order):
+                if used[i] or h in members or a in members:
+                    continue
+                cost = 0
+                for t in (h, a):
+                    first = team_slot[t]
+                    if first >= 0:
+                        cost += -4 if abs(first - slot) == 1 else 4
+                cost += slot_cnt[h][slot] + slot_cnt[a][slot]
+                cost += 3 * (win_cnt[h][half] + win_cnt[a][half])
+                cand.append((cost, rng.random(), i))
+            cand.sort()
+            for _, _, i in cand:
+                h, a = order[i]
+                used[i] = True
+                members.add(h)
+                members.add(a)
+                fresh = [t for t in (h, a) if team_slot[t] < 0]
+                for t in fresh:
+                    team_slot[t] = slot
+                grid[pos] = order[i]
+                if backtrack(pos + 1):
+                    return True
+                grid[pos] = None
+                for t in fresh:
+                    team_slot[t] = -1
+                members.discard(h)
+                members.discard(a)
+                used[i] = False
+            return False
+
+        if not backtrack(0):
+            return None
+
+        # Within each slot, assign fields to balance per-team field counts.
+        field_cnt = self.scorer.field_cnt
+        ordered = [None] * capacity
+        for slot in range(S):
+            slot_matches = grid[slot * F:(slot + 1) * F]
+            best, best_cost = None, None
+            for perm in permutations(range(F)):
+                cost = 0
+                for f, mi in enumerate(perm):
+                    h, a = slot_matches[mi]
+                    cost += field_cnt[h][f] + field_cnt[a][f]
+                if best_cost is None or cost < best_cost:
+                    best_cost, best = cost, perm
+            for f, mi in enumerate(best):
+                ordered[slot * F + f] = slot_matches[mi]
+        return ordered
+
+    def _energy(self) -> float:
+        """Annealing objective: the score plus every team's summed squared
+        slot/field/window counts (per team). The score alone only sees the worst
+        team, so most moves would look flat; for a fixed number of games the
+        squares are smallest when each team's counts are even, which gives every
+        move a gradient towards a better worst case."""
+        return self.scorer.score() + _SPREAD_WEIGHT * self.scorer.sq_total / self.n
+
+    def _snapshot(self):
+        return [list(week) for week in self.scorer.weeks]
+
+    # ------------------------------------------------------------------
+    # Phase 3: local search
+    # ------------------------------------------------------------------
+
+    def _anneal(self, deadline, iterations_so_far):
+        """Simulated annealing from the current state. Returns
+        (best_score, best_weeks, best_summary, iterations_used)."""
+        rng, scorer = self.rng, self.scorer
+        S, capacity = self.slot_count, self.n
+        run_len = self.iterations_per_restart
+        if self.max_iterations is not None:
+            run_len = min(run_len, max(0, self.max_iterations - iterations_so_far))
+
+        current = self._energy()
+        best, best_weeks, best_summary = self.scorer.score(), self._snapshot(), self.scorer.summary()
+        ratio = _T_END / _T_START
+        i = 0
+        while i < run_len:
+            if (i & 31) == 0 and deadline is not None and time.monotonic() >= deadline:
+                break
+            temp = _T_START * ratio ** (i / run_len)
+            i += 1
+            w = rng.randrange(self.num_weeks)
+            if rng.random() < 0.25:
+                s1, s2 = rng.sample(range(S), 2)
+                scorer.swap_slots(w, s1, s2)
+                undo = (scorer.swap_slots, (w, s1, s2))
+            else:
+                p1, p2 = rng.sample(range(capacity), 2)
+                if not scorer.can_swap(w, p1, p2):
+                    continue
+                scorer.swap_positions(w, p1, p2)
+                undo = (scorer.swap_positions, (w, p1, p2))
+
+            energy = self._energy()
+            delta = energy - current
+            if delta <= 0 or rng.random() < math.exp(-delta / temp):
+                current = energy
+                score = self.scorer.score()
+                if score < best - 1e-12:
+                    best, best_weeks, best_summary = score, self._snapshot(), self.scorer.summary()
+                    if best <= self.lower_bound + 1e-9:
+                        break
+            else:
+                undo[0](*undo[1])
+        return best, best_weeks, best_summary, i
@@ -10,7 +10,7 @@ search operations within the application, such as searching for players by name.
 from flask import Blueprint, request, jsonify, url_for, g
 from flask_login import login_required
 from app.core.limiter import limiter
-from app.models import Player
+from app.services import player_search_index
 
 # Create a new blueprint for search routes with a URL prefix.
 search_bp = Blueprint('search', __name__, url_prefix='/search')
@@ -23,10 +23,11 @@ search_bp = Blueprint('search', __name__, url_prefix='/search')
 @limiter.limit("120 per minute")
 def search_players():
     """
-    Search for players by name.
+    Search for players by name, username, Discord username or team name.
 
     Query Parameters:
-        term (str): The search term used to filter player names.
+        term (str): The search term. Matches are ranked current players first,
+            then name prefix, then fuzzy (see app/services/player_search_index.py).
 
     Returns:
         A JSON response containing a list of players that match the search term.
@@ -37,17 +38,7 @@ def search_players():
     if len(term) < 2:
         return jsonify([])
 
-    # Treat LIKE metacharacters as literals — otherwise "%%" matches everyone
-    like_term = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
-
-    session = g.db_session
-    players = (
-        session.query(Player)
-        .filter(Player.name.ilike(f'%{like_term}%'))
-        .order_by(Player.is_current_player.desc().nullslast(), Player.name)
-        .limit(10)
-        .all()
-    )
+    players = player_search_index.search_players(g.db_session, term, limit=10)
 
     results = [{
         'id': player.id,
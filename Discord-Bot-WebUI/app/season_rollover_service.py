@@ -111,8 +111,8 @@ def _team_labels(count: int, offset: int = 0) -> list:
 def _sample_matchups(labels: list) -> list:
     """
     Read-only round-robin pairing preview using the same circle method the
-    generator uses (``AutoScheduleGenerator._circle_method_rounds``), computed
-    purely in-memory. Returns up to ``_MAX_SAMPLE_MATCHUPS`` "Team A vs Team C"
+    schedule search uses (``ScheduleSearchEngine._circle_rounds`` in
+    app/schedule_search.py), computed purely in-memory. Returns up to ``_MAX_SAMPLE_MATCHUPS`` "Team A vs Team C"
     strings from the first round. Does NOT create any rows.
     """
     n = len(labels)
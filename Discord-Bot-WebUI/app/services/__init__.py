@@ -28,6 +28,7 @@ from .event_consumer import (
     EventConsumer, 
     WebSocketBroadcaster, 
     DiscordEmbedUpdater,
+    ParticipationRollupUpdater,
     initialize_default_consumers,
     start_all_consumers,
     stop_all_consumers,
@@ -66,6 +67,7 @@ __all__ = [
     'EventConsumer',
     'WebSocketBroadcaster',
     'DiscordEmbedUpdater',
+    'ParticipationRollupUpdater',
     'initialize_default_consumers',
     'start_all_consumers',
     'stop_all_consumers',
@@ -0,0 +1,319 @@
+# app/services/api_log_buffer.py
+
+"""
+API Request Log Buffer
+======================
+
+In-process buffering for the /api/* request log (api_request_logs).
+
+The middleware used to enqueue one Celery task per request, and each task
+opened a session to insert ONE row -- at mobile peak that doubled broker
+traffic and filled the worker queue with trivial inserts. Now each web process
+keeps a bounded ring buffer of pending rows and drains it, on size or on time,
+from a background thread:
+
+- sink 'db' (default): one multi-row INSERT per batch on a single pooled
+  connection;
+- sink 'redis': one Redis stream entry per batch, bulk-inserted by the
+  drain_api_log_stream beat task (for deployments that keep web processes off
+  the database write path).
+
+The buffer is bounded: if the sink stalls, the oldest pending rows are dropped
+(and counted) rather than growing without limit. Request logging is
+best-effort by design.
+
+Alongside the rows, every request (even ones past the per-minute row cap) is
+counted into a per-endpoint latency histogram with fixed buckets. Histograms
+are aggregated in memory and merged into hourly Redis hashes on each drain, so
+dashboards read pre-aggregated percentiles (get_latency_summary) instead of
+scanning raw rows. Percentiles are bucket upper bounds, e.g. "p95 <= 250ms".
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.utils.redis_manager import get_app_redis
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency buckets; the last bucket is open-ended.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 150, 250, 400, 600, 1000, 1500, 2500, 5000, 10000)
+
+STREAM_KEY = 'api:request_log'
+HISTOGRAM_KEY = 'api:latency:{hour}'
+HISTOGRAM_TTL = 48 * 3600
+
+
+class LatencyHistogram:
+    """Fixed-bucket response-time histogram for one endpoint."""
+
+    __slots__ = ('counts', 'total', 'sum_ms', 'errors')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.errors = 0
+
+    @staticmethod
+    def bucket_for(ms: float) -> int:
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                return index
+        return len(LATENCY_BUCKETS_MS)
+
+    def add(self, ms: float, error: bool = False):
+        self.counts[self.bucket_for(ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+        if error:
+            self.errors += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound (ms) of the bucket holding the q-quantile; None for the open bucket."""
+        if not self.total:
+            return 0
+        target = q * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else None
+        return None
+
+    def to_fields(self, key: str) -> Dict[str, float]:
+        """Redis hash increments: '<key>|<bucket>' counts plus n/sum/err."""
+        fields = {f'{key}|{i}': c for i, c in enumerate(self.counts) if c}
+        fields.update({f'{key}|n': self.total, f'{key}|sum': self.sum_ms, f'{key}|err': self.errors})
+        return fields
+
+
+class DatabaseSink:
+    """Writes a batch as one multi-row INSERT on one pooled connection."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def write(self, rows: List[Dict[str, Any]]):
+        from app.core import db
+        from app.models.api_logs import APIRequestLog
+        with self.app.app_context():
+            with db.engine.begin() as conn:
+                conn.execute(APIRequestLog.__table__.insert(), rows)
+
+
+class RedisStreamSink:
+    """Writes a batch as one stream entry; drain_api_log_stream inserts it."""
+
+    def __init__(self, redis_client, maxlen: int = 10000):
+        self.redis = redis_client
+        self.maxlen = maxlen
+
+    def write(self, rows: List[Dict[str, Any]]):
+        payload = json.dumps(rows, default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v))
+        self.redis.xadd(STREAM_KEY, {'rows': payload}, maxlen=self.maxlen, approximate=True)
+
+
+def decode_stream_rows(payload) -> List[Dict[str, Any]]:
+    """Inverse of RedisStreamSink.write: rows ready for an APIRequestLog insert."""
+    if isinstance(payload, bytes):
+        payload = payload.decode()
+    rows = json.loads(payload)
+    for row in rows:
+        try:
+            row['timestamp'] = datetime.fromisoformat(row['timestamp'])
+        except (KeyError, TypeError, ValueError):
+            row['timestamp'] = datetime.utcnow()
+    return rows
+
+
+class APILogBuffer:
+    """
+    Bounded ring buffer of request-log rows plus in-memory latency histograms.
+
+    record() is O(1) and never blocks on I/O. flush() drains everything pending
+    to the sink and merges histograms into Redis; a daemon thread calls it every
+    flush_interval seconds, or as soon as batch_size rows are pending.
+    """
+
+    def __init__(self, sink, histogram_redis=None, capacity: int = 5000,
+                 batch_size: int = 200, flush_interval: float = 5.0, background: bool = True):
+        self.sink = sink
+        self.histogram_redis = histogram_redis
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.background = background
+        self._rows = deque(maxlen=max(capacity, self.batch_size))
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+    def record(self, row: Optional[Dict[str, Any]], route: str, response_time_ms: float,
+               status_code: int):
+        """Count the request in its endpoint histogram and queue its row (if any)."""
+        with self._lock:
+            histogram = self._histograms.get(route)
+            if histogram is None:
+                histogram = self._histograms[route] = LatencyHistogram()
+            histogram.add(response_time_ms, status_code >= 400)
+            if row is not None:
+                if len(self._rows) == self._rows.maxlen:
+                    self.dropped += 1
+                self._rows.append(row)
+                self.recorded += 1
+                pending = len(self._rows)
+            else:
+                pending = 0
+        self._ensure_thread()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Drain pending rows and histograms. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                rows = list(self._rows)
+                self._rows.clear()
+                histograms, self._histograms = self._histograms, {}
+
+            written = 0
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start:start + self.batch_size]
+                try:
+                    self.sink.write(batch)
+                    written += len(batch)
+                except Exception as e:
+                    # Best-effort: a failed batch is dropped, not retried forever.
+                    self.failed += len(batch)
+                    logger.debug(f"API log batch of {len(batch)} dropped: {e}")
+            self.written += written
+
+            if histograms and self.histogram_redis is not None:
+                self._merge_histograms(histograms)
+            return written
+
+    def _merge_histograms(self, histograms: Dict[str, LatencyHistogram]):
+        key = HISTOGRAM_KEY.format(hour=datetime.utcnow().strftime('%Y%m%d%H'))
+        try:
+            pipe = self.histogram_redis.pipeline()
+            for route, histogram in histograms.items():
+                for field, value in histogram.to_fields(route).items():
+                    if isinstance(value, float):
+                        pipe.hincrbyfloat(key, field, value)
+                    else:
+                        pipe.hincrby(key, field, value)
+            pipe.expire(key, HISTOGRAM_TTL)
+            pipe.execute()
+        except Exception as e:
+            logger.debug(f"API latency histogram merge failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            pending = len(self._rows)
+        return {'recorded': self.recorded, 'written': self.written, 'dropped': self.dropped,
+                'failed': self.failed, 'pending': pending}
+
+    def _ensure_thread(self):
+        # Started lazily and per-PID, so a buffer created before a gunicorn fork
+        # gets its own flusher in each worker.
+        if not self.background:
+            return
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='api-log-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.debug(f"API log flush failed: {e}")
+
+
+def create_api_log_buffer(app) -> APILogBuffer:
+    """Build the buffer for an app from its API_LOG_* settings."""
+    config = app.config
+    redis_client = get_app_redis(app)
+    if (config.get('API_LOG_SINK') or 'db').lower() == 'redis' and redis_client is not None:
+        sink = RedisStreamSink(redis_client)
+    else:
+        sink = DatabaseSink(app)
+    buffer = APILogBuffer(
+        sink,
+        histogram_redis=redis_client,
+        capacity=int(config.get('API_LOG_BUFFER_CAPACITY', 5000)),
+        batch_size=int(config.get('API_LOG_BATCH_SIZE', 200)),
+        flush_interval=float(config.get('API_LOG_FLUSH_INTERVAL', 5.0)),
+        background=bool(config.get('API_LOG_FLUSH_IN_BACKGROUND', True)),
+    )
+    if buffer.background:
+        atexit.register(buffer.flush)
+    return buffer
+
+
+def get_latency_summary(hours: int = 24, limit: int = 10, redis_client=None,
+                        now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Per-endpoint latency percentiles from the hourly histograms, busiest first.
+
+    Returns:
+        list of {'endpoint', 'count', 'avg_ms', 'errors', 'p50', 'p95', 'p99'};
+        a percentile of None means "above the largest bucket".
+    """
+    redis_client = redis_client or get_app_redis()
+    if redis_client is None:
+        return []
+    now = now or datetime.utcnow()
+    keys = [HISTOGRAM_KEY.format(hour=(now - timedelta(hours=h)).strftime('%Y%m%d%H'))
+            for h in range(hours)]
+    pipe = redis_client.pipeline()
+    for key in keys:
+        pipe.hgetall(key)
+    merged: Dict[str, LatencyHistogram] = {}
+    for fields in pipe.execute():
+        for field, value in (fields or {}).items():
+            field = field.decode() if isinstance(field, bytes) else field
+            route, _, slot = field.rpartition('|')
+            histogram = merged.get(route)
+            if histogram is None:
+                histogram = merged[route] = LatencyHistogram()
+            value = float(value)
+            if slot == 'n':
+                histogram.total += int(value)
+            elif slot == 'sum':
+                histogram.sum_ms += value
+            elif slot == 'err':
+                histogram.errors += int(value)
+            else:
+                histogram.counts[int(slot)] += int(value)
+
+    busiest = sorted(merged.items(), key=lambda item: item[1].total, reverse=True)[:limit]
+    return [{
+        'endpoint': route,
+        'count': h.total,
+        'avg_ms': round(h.sum_ms / h.total, 1) if h.total else 0,
+        'errors': h.errors,
+        'p50': h.percentile(0.50),
+        'p95': h.percentile(0.95),
+        'p99': h.percentile(0.99),
+    } for route, h in busiest]
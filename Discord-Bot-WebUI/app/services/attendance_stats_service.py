@@ -0,0 +1,251 @@
+# app/services/attendance_stats_service.py
+
+"""
+Set-based recompute of the PlayerAttendanceStats cache.
+
+Design notes
+------------
+``PlayerAttendanceStats.update_stats`` answers one player at a time with ~11
+queries (teams, first activity, every Availability row, the invited-match
+universe across seasons, then the same again for the current season). Run for
+every cached player by the nightly/admin recompute, that was thousands of round
+trips, each holding a PgBouncer slot. This module computes the SAME numbers for
+every player in two aggregate statements -- one for career, one for the current
+season(s) -- and writes them back in batches, following the set-based shape of
+participation_service.
+
+It is written with SQLAlchemy Core (no Postgres-only SQL) so the same statements
+run in the SQLite test suite, where ``compare_with_update_stats`` checks them
+against update_stats player by player.
+
+Matching update_stats exactly
+-----------------------------
+Career "invited" universe per player, first branch that applies:
+
+1. the player has player_team_season history: REGULAR, played, non-self matches
+   of any team they were ever rostered on (no first-activity bound);
+2. the player is on a current team AND has RSVP'd at least once: REGULAR,
+   played, non-self matches of their current team(s) dated on/after the first
+   RSVP;
+3. otherwise: every match they have an Availability row for.
+
+Current-season universe: branch 2 restricted to current-season schedules, else
+every current-season match they have an Availability row for.
+
+A match with no response counts as a no-response. Availability has no unique
+(match, player) constraint; when a player has several rows for one match the
+highest id wins, which is what update_stats' dict-building picks up on an
+insertion-ordered scan. Rates come from the model's own apply_* methods, so the
+floats are bit-identical.
+"""
+
+import logging
+from datetime import datetime
+
+from sqlalchemy import and_, case, func, or_, select, union
+
+from app.models.matches import Availability, Match, Schedule
+from app.models.players import PlayerTeamSeason, player_teams
+from app.models.stats import PlayerAttendanceStats
+
+logger = logging.getLogger(__name__)
+
+CAREER_FIELDS = (
+    'total_matches_invited', 'total_responses', 'yes_responses', 'no_responses',
+    'maybe_responses', 'no_response_count', 'response_rate', 'attendance_rate',
+    'adjusted_attendance_rate', 'reliability_score',
+)
+SEASON_FIELDS = ('season_matches_invited', 'season_yes_responses', 'season_attendance_rate')
+
+
+def _count(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def compute_attendance_counts(session, player_ids, season_ids, today=None):
+    """Raw counts for many players in two statements.
+
+    Args:
+        player_ids: a list of ids, or a SELECT of ids (used as an IN subquery).
+        season_ids: current season ids (PlayerAttendanceStats.current_seasons).
+
+    Returns:
+        dict: {player_id: {'career': (invited, yes, no, maybe),
+                           'season': (invited, yes)}}. Players with nothing to
+        count are absent (all zeros).
+    """
+    today = today or datetime.utcnow().date()
+
+    def targeted(column):
+        return column.in_(player_ids)
+
+    latest = (
+        select(Availability.player_id, Availability.match_id, Availability.response)
+        .where(Availability.id.in_(
+            select(func.max(Availability.id))
+            .where(targeted(Availability.player_id))
+            .group_by(Availability.player_id, Availability.match_id)))
+        .subquery('latest')
+    )
+    first_activity = (
+        select(Availability.player_id, func.min(Availability.responded_at).label('first_at'))
+        .where(targeted(Availability.player_id))
+        .group_by(Availability.player_id)
+        .subquery('first_activity')
+    )
+    with_history = select(PlayerTeamSeason.player_id).where(targeted(PlayerTeamSeason.player_id))
+    # Branch 2 eligibility: a current team and at least one RSVP timestamp.
+    with_team_and_activity = (
+        select(player_teams.c.player_id)
+        .join(first_activity, first_activity.c.player_id == player_teams.c.player_id)
+        .where(first_activity.c.first_at.isnot(None), targeted(player_teams.c.player_id))
+    )
+
+    played_regular = and_(Match.week_type == 'REGULAR',
+                          Match.date <= today,
+                          Match.home_team_id != Match.away_team_id)
+
+    def plays_for(team_column):
+        return or_(Match.home_team_id == team_column, Match.away_team_id == team_column)
+
+    def current_team_matches():
+        return (select(player_teams.c.player_id, Match.id.label('match_id'))
+                .select_from(player_teams)
+                .join(Match, plays_for(player_teams.c.team_id))
+                .join(first_activity, first_activity.c.player_id == player_teams.c.player_id)
+                .where(played_regular,
+                       Match.date >= func.date(first_activity.c.first_at),
+                       targeted(player_teams.c.player_id)))
+
+    def tally(universe, columns):
+        joined = universe.outerjoin(latest, and_(latest.c.player_id == universe.c.player_id,
+                                                 latest.c.match_id == universe.c.match_id))
+        answer = func.lower(latest.c.response)
+        return session.execute(
+            select(universe.c.player_id, func.count(), *[_count(answer == value) for value in columns])
+            .select_from(joined)
+            .group_by(universe.c.player_id)
+        ).all()
+
+    counts = {}
+
+    career_universe = union(
+        select(PlayerTeamSeason.player_id, Match.id.label('match_id'))
+        .join(Match, plays_for(PlayerTeamSeason.team_id))
+        .where(played_regular, targeted(PlayerTeamSeason.player_id)),
+        current_team_matches()
+        .where(player_teams.c.player_id.notin_(with_history)),
+        select(latest.c.player_id, latest.c.match_id)
+        .where(latest.c.player_id.notin_(with_history),
+               latest.c.player_id.notin_(with_team_and_activity)),
+    ).subquery('career_universe')
+    for player_id, invited, yes, no, maybe in tally(career_universe, ('yes', 'no', 'maybe')):
+        counts[player_id] = {'career': (invited, yes, no, maybe), 'season': (0, 0)}
+
+    if season_ids:
+        in_season = Schedule.season_id.in_(season_ids)
+        season_universe = union(
+            current_team_matches()
+            .join(Schedule, Schedule.id == Match.schedule_id)
+            .where(in_season),
+            select(latest.c.player_id, latest.c.match_id)
+            .select_from(latest)
+            .join(Match, Match.id == latest.c.match_id)
+            .join(Schedule, Schedule.id == Match.schedule_id)
+            .where(in_season, latest.c.player_id.notin_(with_team_and_activity)),
+        ).subquery('season_universe')
+        for player_id, invited, yes in tally(season_universe, ('yes',)):
+            entry = counts.setdefault(player_id, {'career': (0, 0, 0, 0), 'season': (0, 0)})
+            entry['season'] = (invited, yes)
+
+    return counts
+
+
+def _stat_values(player_id, entry, stamp_season_id):
+    """Column values update_stats would leave on the row (minus last_updated)."""
+    stat = PlayerAttendanceStats(player_id=player_id)
+    stat.apply_career_counts(*entry['career'])
+    values = {field: getattr(stat, field) for field in CAREER_FIELDS}
+    if stamp_season_id is not None:
+        stat.apply_season_counts(*entry['season'])
+        values['current_season_id'] = stamp_season_id
+    else:
+        stat.apply_season_counts(0, 0)
+    values.update({field: getattr(stat, field) for field in SEASON_FIELDS})
+    return values
+
+
+def compute_attendance_stats(session, player_ids, today=None):
+    """{player_id: column values} for the given players, as update_stats computes them."""
+    stamp_season_id, season_ids = PlayerAttendanceStats.current_seasons(session)
+    counts = compute_attendance_counts(session, player_ids, season_ids, today=today)
+    empty = {'career': (0, 0, 0, 0), 'season': (0, 0)}
+    return {pid: _stat_values(pid, counts.get(pid, empty), stamp_season_id) for pid in player_ids}
+
+
+def recalculate_attendance_stats(session, player_ids=None, batch_size=500):
+    """Recompute and upsert PlayerAttendanceStats for many players.
+
+    Args:
+        player_ids: players to recompute; defaults to every existing stats row.
+            Players without a row get one.
+        batch_size: rows written (and committed) per batch.
+
+    Returns:
+        dict: {'updated', 'created', 'total'}
+    """
+    existing_query = session.query(PlayerAttendanceStats.player_id, PlayerAttendanceStats.id)
+    if player_ids is not None:
+        player_ids = list(dict.fromkeys(player_ids))
+        existing_query = existing_query.filter(PlayerAttendanceStats.player_id.in_(player_ids))
+    existing = dict(existing_query.all())
+    if player_ids is None:
+        player_ids = list(existing)
+    if not player_ids:
+        return {'updated': 0, 'created': 0, 'total': 0}
+
+    values = compute_attendance_stats(session, player_ids)
+    now = datetime.utcnow()
+    updated = created = 0
+    for start in range(0, len(player_ids), batch_size):
+        updates, inserts = [], []
+        for pid in player_ids[start:start + batch_size]:
+            row = dict(values[pid], last_updated=now)
+            if pid in existing:
+                updates.append(dict(row, id=existing[pid]))
+            else:
+                inserts.append(dict(row, player_id=pid))
+        if updates:
+            session.bulk_update_mappings(PlayerAttendanceStats, updates)
+        if inserts:
+            session.bulk_insert_mappings(PlayerAttendanceStats, inserts)
+        # Commit per batch so a failure later can't discard earlier work.
+        session.commit()
+        updated += len(updates)
+        created += len(inserts)
+
+    logger.info(f"Attendance stats recomputed: {updated} updated, {created} created")
+    return {'updated': updated, 'created': created, 'total': len(player_ids)}
+
+
+def compare_with_update_stats(session, player_ids=None):
+    """Comparison harness: set-based values vs update_stats, player by player.
+
+    update_stats runs on throwaway instances that are never added to the
+    session, so nothing is written. Returns a list of
+    {'player_id', 'field', 'bulk', 'update_stats'} for every difference --
+    empty means the two engines agree.
+    """
+    if player_ids is None:
+        player_ids = [pid for (pid,) in session.query(PlayerAttendanceStats.player_id).all()]
+    bulk = compute_attendance_stats(session, player_ids)
+    mismatches = []
+    for pid in player_ids:
+        reference = PlayerAttendanceStats(player_id=pid)
+        reference.update_stats(session=session)
+        for field, value in bulk[pid].items():
+            expected = getattr(reference, field)
+            if value != expected:
+                mismatches.append({'player_id': pid, 'field': field,
+                                   'bulk': value, 'update_stats': expected})
+    return mismatches
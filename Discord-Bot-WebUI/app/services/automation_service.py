@@ -30,18 +30,36 @@ Design notes worth knowing before changing anything here:
   the scope is consumed (no surprise send) but visible in the run history. An
   admin can still force-run from the UI.
 
+* **Detector results are cached between passes.** Per-subject detectors
+  declare the tables they read (DETECTOR_INPUTS). While none of those has been
+  written (table_watermarks) the previous result is reused, filtered by the
+  clock; see detect_events. Dedup against existing runs is one set-based query
+  per rule, not one per event.
+
+* **Conditions are compiled, not re-interpreted per person.** A rule's
+  condition tree is compiled once per version (compile_conditions) and, when
+  every field has an SQL form, applied as one WHERE over the audience. The
+  Python predicate stays the reference; the two must agree, including on what
+  fails closed.
+
 * **Delivery is not reimplemented.** A run creates an EmailCampaign through
   email_broadcast_service and hands it to the existing send task, which owns
   audience resolution, opt-out gating, throttling, and the per-recipient
   EmailCampaignRecipient rows that answer "who got this".
 """
 
+import json
 import logging
+import math
 import re
 from datetime import datetime, timedelta, time
+from functools import lru_cache
+from time import perf_counter
 from types import SimpleNamespace
 
-from sqlalchemy import func, or_
+from sqlalchemy import (
+    Boolean, DateTime, Integer, Numeric, String, and_, false, func, not_, or_, select,
+)
 from sqlalchemy.exc import IntegrityError
 
 from app.models.automation import (
@@ -62,7 +80,9 @@ from app.models.core import Season, League, User, Role, user_roles
 from app.models.players import Player, Team, player_teams
 from app.models.league_features import DraftOrderHistory, DraftSession
 from app.models.email_templates import EmailTemplate
+from app.services import table_watermarks
 from app.services.automation_defaults import SUPPORT_EMAIL, DEFAULT_DISCORD_INVITE
+from app.utils.redis_manager import get_app_redis
 
 logger = logging.getLogger(__name__)
 
@@ -482,13 +502,19 @@ def detect_recurring_weekly(session, rule):
 # These can legitimately return hundreds of events the first time a rule is
 # enabled, so evaluate_rule caps how many runs a single pass will create and
 # logs what it left behind (never a silent truncation).
+#
+# Each takes `until`: report every event that will have fired by then, not just
+# by now. The detector cache (DETECTOR_INPUTS) asks for a few hours ahead and
+# filters to event_at <= now on every read, so a result it reuses still picks up
+# thresholds crossed by the clock alone. Floors stay anchored to the real now.
 # ─────────────────────────────────────────────────────────────────────────────
 
-def detect_user_approved(session, rule):
+def detect_user_approved(session, rule, until=None):
     """One event per user whose account was approved.
 
     `approved_at` is a real timestamp (app/models/core.py:140), so the delay is
-    measured from the approval itself rather than from when we noticed.
+    measured from the approval itself rather than from when we noticed. `until`
+    is accepted for the detector cache; approvals never lie in the future.
     """
     cfg = rule.trigger_config or {}
     horizon = datetime.utcnow() - timedelta(days=int(cfg.get('max_event_age_days', 14)))
@@ -509,13 +535,13 @@ def detect_user_approved(session, rule):
     } for uid, username, approved_at in rows]
 
 
-def detect_waitlist_stuck(session, rule):
+def detect_waitlist_stuck(session, rule, until=None):
     """One event per user still waiting after `stuck_days`."""
     cfg = rule.trigger_config or {}
     stuck_days = int(cfg.get('stuck_days', 14))
     max_age_days = int(cfg.get('max_event_age_days', 14))
     now = datetime.utcnow()
-    cutoff = now - timedelta(days=stuck_days)
+    cutoff = (until or now) - timedelta(days=stuck_days)
     # Lower bound so the first evaluation does not sweep up years of history.
     # Anything older than this crosses the threshold outside the freshness
     # window, so evaluate_rule would only file it as 'skipped' -- 200 junk rows
@@ -546,7 +572,7 @@ def detect_waitlist_stuck(session, rule):
     } for uid, username, joined in rows]
 
 
-def detect_sub_no_reply(session, rule):
+def detect_sub_no_reply(session, rule, until=None):
     """One event per (player, sub request) asked and never answered."""
     from app.models.substitutes import SubstituteResponse
 
@@ -554,7 +580,7 @@ def detect_sub_no_reply(session, rule):
     silence_hours = int(cfg.get('silence_hours', 24))
     max_age_days = int(cfg.get('max_event_age_days', 14))
     now = datetime.utcnow()
-    cutoff = now - timedelta(hours=silence_hours)
+    cutoff = (until or now) - timedelta(hours=silence_hours)
     # Bounded for the same reason as the waitlist detector: unanswered sub
     # requests accumulate forever, and every historical one would otherwise
     # become a 'skipped' run.
@@ -609,7 +635,7 @@ def _horizon(cfg, extra_days=0, extra_hours=0):
             - timedelta(hours=extra_hours))
 
 
-def detect_player_inactive(session, rule):
+def detect_player_inactive(session, rule, until=None):
     """Players who have not turned out for a while this season.
 
     Anchored to PlayerSeasonParticipation.last_played_date, refreshed nightly at
@@ -625,7 +651,7 @@ def detect_player_inactive(session, rule):
     cfg = rule.trigger_config or {}
     inactive_days = int(cfg.get('inactive_days', 28))
     now = datetime.utcnow()
-    cutoff = (now - timedelta(days=inactive_days)).date()
+    cutoff = ((until or now) - timedelta(days=inactive_days)).date()
     floor = _horizon(cfg, extra_days=inactive_days).date()
 
     season = _current_season(session, cfg.get('league_type', 'Pub League'))
@@ -653,7 +679,7 @@ def detect_player_inactive(session, rule):
     } for pid, last_played in rows]
 
 
-def detect_profile_stale(session, rule):
+def detect_profile_stale(session, rule, until=None):
     """Rostered players whose profile has not been touched in a long time.
 
     Scoped to players on a team THIS season -- otherwise it would sweep up every
@@ -664,7 +690,7 @@ def detect_profile_stale(session, rule):
     cfg = rule.trigger_config or {}
     stale_days = int(cfg.get('stale_days', 180))
     now = datetime.utcnow()
-    cutoff = now - timedelta(days=stale_days)
+    cutoff = (until or now) - timedelta(days=stale_days)
     floor = _horizon(cfg, extra_days=stale_days)
 
     season = _current_season(session, cfg.get('league_type', 'Pub League'))
@@ -693,7 +719,7 @@ def detect_profile_stale(session, rule):
     } for pid, updated in rows]
 
 
-def detect_pass_never_downloaded(session, rule):
+def detect_pass_never_downloaded(session, rule, until=None):
     """Membership passes issued but never added to a phone.
 
     download_count is written by record_download() on both the Apple and Google
@@ -705,7 +731,7 @@ def detect_pass_never_downloaded(session, rule):
     cfg = rule.trigger_config or {}
     wait_days = int(cfg.get('wait_days', 3))
     now = datetime.utcnow()
-    cutoff = now - timedelta(days=wait_days)
+    cutoff = (until or now) - timedelta(days=wait_days)
     floor = _horizon(cfg, extra_days=wait_days)
 
     rows = (session.query(WalletPass.id, WalletPass.created_at)
@@ -726,7 +752,7 @@ def detect_pass_never_downloaded(session, rule):
     } for pid, created in rows]
 
 
-def detect_pass_expiring(session, rule):
+def detect_pass_expiring(session, rule, until=None):
     """Membership passes about to lapse.
 
     Keyed on valid_until, NOT on status == 'expired' -- nothing in the codebase
@@ -737,7 +763,7 @@ def detect_pass_expiring(session, rule):
     cfg = rule.trigger_config or {}
     lead_days = int(cfg.get('lead_days', 14))
     now = datetime.utcnow()
-    window_end = now + timedelta(days=lead_days)
+    window_end = (until or now) + timedelta(days=lead_days)
 
     rows = (session.query(WalletPass.id, WalletPass.valid_until)
             .filter(WalletPass.status == 'active',
@@ -757,7 +783,7 @@ def detect_pass_expiring(session, rule):
     } for pid, valid_until in rows]
 
 
-def detect_feedback_open(session, rule):
+def detect_feedback_open(session, rule, until=None):
     """Feedback tickets left open too long.
 
     Status vocabulary is Title Case with a space: 'Open' | 'In Progress' |
@@ -769,7 +795,7 @@ def detect_feedback_open(session, rule):
     cfg = rule.trigger_config or {}
     open_days = int(cfg.get('open_days', 7))
     now = datetime.utcnow()
-    cutoff = now - timedelta(days=open_days)
+    cutoff = (until or now) - timedelta(days=open_days)
     floor = _horizon(cfg, extra_days=open_days)
 
     rows = (session.query(Feedback.id, Feedback.created_at)
@@ -791,7 +817,7 @@ def detect_feedback_open(session, rule):
     } for fid, created in rows]
 
 
-def detect_sub_request_unfilled(session, rule):
+def detect_sub_request_unfilled(session, rule, until=None):
     """Substitute requests still open and short of players.
 
     Status vocabulary is uppercase and only OPEN / FILLED / CANCELLED / EXPIRED
@@ -804,7 +830,7 @@ def detect_sub_request_unfilled(session, rule):
     cfg = rule.trigger_config or {}
     unfilled_hours = int(cfg.get('unfilled_hours', 24))
     now = datetime.utcnow()
-    cutoff = now - timedelta(hours=unfilled_hours)
+    cutoff = (until or now) - timedelta(hours=unfilled_hours)
     floor = _horizon(cfg, extra_hours=unfilled_hours)
 
     filled = (session.query(SubstituteAssignment.request_id,
@@ -833,7 +859,7 @@ def detect_sub_request_unfilled(session, rule):
     } for rid, created, needed, got in rows if (needed or 1) > (got or 0)]
 
 
-def detect_sub_pool_pending(session, rule):
+def detect_sub_pool_pending(session, rule, until=None):
     """Substitute-pool applications waiting on approval.
 
     Pending is approved_at IS NULL -- NOT is_active == False. New rows are
@@ -845,7 +871,7 @@ def detect_sub_pool_pending(session, rule):
     cfg = rule.trigger_config or {}
     waiting_days = int(cfg.get('waiting_days', 3))
     now = datetime.utcnow()
-    cutoff = now - timedelta(days=waiting_days)
+    cutoff = (until or now) - timedelta(days=waiting_days)
     floor = _horizon(cfg, extra_days=waiting_days)
 
     rows = (session.query(SubstitutePool.id, SubstitutePool.created_at)
@@ -867,12 +893,13 @@ def detect_sub_pool_pending(session, rule):
     } for pid, created in rows]
 
 
-def detect_match_rescheduled(session, rule):
+def detect_match_rescheduled(session, rule, until=None):
     """Matches whose date or time was changed.
 
     rescheduled_at has a single writer (the admin-panel single-match time edit),
     so this covers that path only -- a bulk schedule regeneration does not stamp
-    it and will not fire this.
+    it and will not fire this. `until` is accepted for the detector cache; the
+    event is the edit itself.
     """
     from app.models.matches import Match
 
@@ -917,30 +944,144 @@ DETECTORS = {
     TRIGGER_MATCH_RESCHEDULED: detect_match_rescheduled,
 }
 
+# Tables each cacheable detector reads (table_watermarks.WATCHED_TABLES must
+# cover them). evaluate_rule reuses a rule's previous result while none of these
+# has been written and the lookahead hasn't run out. Detectors not listed here
+# (draft, season, recurring) are cheap or clock-driven and always run.
+DETECTOR_INPUTS = {
+    detect_user_approved: ('users',),
+    detect_waitlist_stuck: ('users',),
+    detect_sub_no_reply: ('substitute_responses', 'substitute_requests', 'player', 'users'),
+    detect_player_inactive: ('player_season_participation', 'player', 'users', 'season'),
+    detect_profile_stale: ('player', 'users', 'player_teams', 'team', 'league', 'season'),
+    detect_pass_never_downloaded: ('wallet_pass',),
+    detect_pass_expiring: ('wallet_pass',),
+    detect_feedback_open: ('feedback', 'users'),
+    detect_sub_request_unfilled: ('substitute_requests', 'substitute_assignments'),
+    detect_sub_pool_pending: ('substitute_pools', 'player', 'users'),
+    detect_match_rescheduled: ('matches',),
+}
+
+# How far ahead a cached detector result reaches, and so the longest it is
+# reused. Also bounds staleness from writes the watermark hooks can't see.
+DETECTOR_LOOKAHEAD = timedelta(hours=6)
+
+DETECTOR_CACHE_KEY = 'automation:detector:{rule_id}'
+
+# Scope keys per IN (...) when checking which events already have a run.
+SCOPE_KEY_BATCH = 500
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Evaluation
 # ─────────────────────────────────────────────────────────────────────────────
 
-def evaluate_rule(session, rule):
+def _detector_fingerprint(rule):
+    return json.dumps([rule.trigger_type, rule.trigger_config or {}], sort_keys=True, default=str)
+
+
+def _load_detector_cache(r, rule):
+    try:
+        raw = r.get(DETECTOR_CACHE_KEY.format(rule_id=rule.id))
+        if not isinstance(raw, (str, bytes)):
+            return None
+        cached = json.loads(raw)
+        cached['until'] = datetime.fromisoformat(cached['until'])
+        for event in cached['events']:
+            event['event_at'] = datetime.fromisoformat(event['event_at'])
+        return cached
+    except Exception:
+        logger.debug("Detector cache unreadable for rule %s", rule.key, exc_info=True)
+        return None
+
+
+def _store_detector_cache(r, rule, fingerprint, watermarks, until, events):
+    payload = {
+        'fingerprint': fingerprint,
+        'watermarks': watermarks,
+        'until': until.isoformat(),
+        'events': [{**event, 'event_at': event['event_at'].isoformat()} for event in events],
+    }
+    try:
+        r.setex(DETECTOR_CACHE_KEY.format(rule_id=rule.id),
+                int(DETECTOR_LOOKAHEAD.total_seconds()), json.dumps(payload, default=str))
+    except Exception:
+        logger.debug("Could not cache detector result for rule %s", rule.key, exc_info=True)
+
+
+def detect_events(session, rule, detector, report=None):
+    """Run a rule's detector, or reuse its last result if nothing it reads changed.
+
+    Watermarks are read BEFORE detecting, so a write that commits mid-query
+    leaves the cache looking older than it is (one extra recompute), never newer.
+    Without Redis every call runs the detector.
+    """
+    report = report if report is not None else {}
+    tables = DETECTOR_INPUTS.get(detector)
+    if tables is None:
+        report['cached'] = False
+        return detector(session, rule)
+
+    now = datetime.utcnow()
+    r = get_app_redis()
+    watermarks = table_watermarks.get_watermarks(tables, redis_client=r) if r is not None else None
+    fingerprint = _detector_fingerprint(rule)
+    if watermarks is not None:
+        cached = _load_detector_cache(r, rule)
+        if (cached and cached['fingerprint'] == fingerprint
+                and cached['watermarks'] == watermarks and now <= cached['until']):
+            report['cached'] = True
+            return [event for event in cached['events'] if event['event_at'] <= now]
+
+    report['cached'] = False
+    until = now + DETECTOR_LOOKAHEAD
+    events = detector(session, rule, until=until)
+    if watermarks is not None:
+        _store_detector_cache(r, rule, fingerprint, watermarks, until, events)
+    return [event for event in events if event['event_at'] <= now]
+
+
+def _existing_scope_keys(session, rule_id, scope_keys):
+    """The subset of scope_keys that already have a run for this rule."""
+    scope_keys = list(dict.fromkeys(scope_keys))
+    existing = set()
+    for start in range(0, len(scope_keys), SCOPE_KEY_BATCH):
+        batch = scope_keys[start:start + SCOPE_KEY_BATCH]
+        existing.update(key for (key,) in (
+            session.query(AutomationRun.scope_key)
+            .filter(AutomationRun.rule_id == rule_id,
+                    AutomationRun.scope_key.in_(batch))
+            .all()))
+    return existing
+
+
+def evaluate_rule(session, rule, report=None):
     """Detect triggers for one rule and record any new AutomationRuns.
 
+    `report`, if given, is filled with detection details for the pass summary
+    (events, cached, detect_ms).
+
     Returns:
         list[AutomationRun]: newly created runs (pending or skipped).
     """
+    report = report if report is not None else {}
     detector = DETECTORS.get(rule.trigger_type)
     if not detector:
         logger.warning("Rule %s has unknown trigger_type %r", rule.key, rule.trigger_type)
         return []
 
+    started = perf_counter()
     try:
-        events = detector(session, rule)
+        events = detect_events(session, rule, detector, report)
     except Exception:
         # Still stamp the evaluation time, otherwise a permanently-broken rule
         # reads as "never evaluated" in the UI instead of "failing every hour".
         logger.exception("Trigger detection failed for rule %s", rule.key)
         rule.last_evaluated_at = datetime.utcnow()
+        report['error'] = True
         return []
+    report['detect_ms'] = round((perf_counter() - started) * 1000, 1)
+    report['events'] = len(events)
 
     cfg = rule.trigger_config or {}
     max_age_days = cfg.get('max_event_age_days', 14)
@@ -951,16 +1092,12 @@ def evaluate_rule(session, rule):
     # was a starvation bug: detectors sort ascending, so every pass truncated to
     # the same oldest N -- which already had runs -- and everything past N was
     # never created, then aged out of the freshness window permanently.
-    fresh_events = []
-    for event in events:
-        key = build_scope_key(event['season_id'], event['league_id'],
+    keyed = [(build_scope_key(event['season_id'], event['league_id'],
                               event.get('subject_type'), event.get('subject_id'),
-                              event.get('occurrence'))
-        if not (session.query(AutomationRun.id)
-                .filter(AutomationRun.rule_id == rule.id,
-                        AutomationRun.scope_key == key)
-                .first()):
-            fresh_events.append((key, event))
+                              event.get('occurrence')), event)
+             for event in events]
+    existing = _existing_scope_keys(session, rule.id, [key for key, _ in keyed])
+    fresh_events = [(key, event) for key, event in keyed if key not in existing]
 
     if len(fresh_events) > MAX_RUNS_PER_PASS:
         logger.warning(
@@ -1017,12 +1154,26 @@ def evaluate_rule(session, rule):
 
 
 def evaluate_all(session):
-    """Evaluate every enabled rule. Returns a summary dict."""
+    """Evaluate every enabled rule.
+
+    Returns a summary dict; 'rule_timings' has one entry per rule, slowest
+    first, with its wall time, detection time, event count, runs created and
+    whether the detector result came from cache.
+    """
     rules = session.query(AutomationRule).filter(AutomationRule.enabled.is_(True)).all()
     total = 0
+    timings = []
     for rule in rules:
-        total += len(evaluate_rule(session, rule))
-    return {'rules_evaluated': len(rules), 'runs_created': total}
+        report = {}
+        started = perf_counter()
+        created = len(evaluate_rule(session, rule, report))
+        total += created
+        timings.append({'rule': rule.key, 'ms': round((perf_counter() - started) * 1000, 1),
+                        'runs_created': created, **report})
+    timings.sort(key=lambda t: t['ms'], reverse=True)
+    return {'rules_evaluated': len(rules), 'runs_created': total,
+            'detectors_cached': sum(1 for t in timings if t.get('cached')),
+            'rule_timings': timings}
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -1266,89 +1417,300 @@ def _condition_test(actual, op, expected, now):
             return op == 'older_than_days'
         try:
             days = float(expected)
+            age = (now - actual).total_seconds() / 86400.0
         except (TypeError, ValueError):
+            # Includes a day-count test on a field that is not a date.
             return False
-        age = (now - actual).total_seconds() / 86400.0
         return age > days if op == 'older_than_days' else age <= days
-    if op == 'has':
-        return str(expected) in (actual or set())
-    if op == 'not_has':
-        return str(expected) not in (actual or set())
+    if op in ('has', 'not_has'):
+        try:
+            found = str(expected) in (actual or set())
+        except TypeError:
+            # Not a collection (a boolean or number field): fail closed.
+            return False
+        return found if op == 'has' else not found
     logger.warning("Unknown condition operator %r; failing closed", op)
     return False
 
 
-def apply_conditions(session, rule, recipients):
-    """Narrow a resolved recipient list by the rule's conditions.
+# ── Compiled conditions ─────────────────────────────────────────────────────
+#
+# A rule's condition tree is validated and turned into code ONCE per version of
+# the conditions (the JSON is the cache key, so an edit is a new version and an
+# unchanged rule never recompiles). Each compiled tree carries two equivalent
+# forms:
+#
+#   * a Python predicate over per-user facts -- always available, and the
+#     reference semantics (_condition_test decides every leaf);
+#   * a SQL WHERE clause over users, when every leaf has an exact SQL
+#     translation. Then a whole audience is narrowed in one query with no facts
+#     loaded at all.
+#
+# Anything without an exact translation (an operator used on a field type it
+# was not meant for, a non-finite number) falls back to the predicate for the
+# whole tree rather than approximating one leaf.
+
+# Condition field -> the column it reads. 'player.*' columns are tested per
+# Player row; membership fields are sets and have no column.
+_CONDITION_COLUMNS = {
+    'user.approval_status': User.approval_status,
+    'user.is_active': User.is_active,
+    'user.last_login': User.last_login,
+    'user.created_at': User.created_at,
+    'user.has_completed_onboarding': User.has_completed_onboarding,
+    'user.email_notifications': User.email_notifications,
+    'user.discord_notifications': User.discord_notifications,
+    'user.push_notifications': User.push_notifications,
+    'player.discord_in_server': Player.discord_in_server,
+    'player.discord_id': Player.discord_id,
+    'player.discord_last_checked': Player.discord_last_checked,
+    'player.is_current_player': Player.is_current_player,
+    'player.is_coach': Player.is_coach,
+    'player.is_sub': Player.is_sub,
+    'player.is_ref': Player.is_ref,
+    'player.primary_team_id': Player.primary_team_id,
+    'player.profile_last_updated': Player.profile_last_updated,
+    'player.is_phone_verified': Player.is_phone_verified,
+}
 
-    Every condition must pass. Evaluated in Python rather than SQL because the
-    fields span User, Player, roles and league membership, and the lists here are
-    hundreds of rows -- one extra query beats a pile of conditional joins.
+_USER_CONDITION_FIELDS = tuple(f for f in _CONDITION_COLUMNS if f.startswith('user.'))
+_PLAYER_CONDITION_FIELDS = tuple(f for f in _CONDITION_COLUMNS if f.startswith('player.'))
 
-    Failure modes are deliberately CLOSED: an unknown field, an unknown operator
-    or a malformed entry excludes everyone rather than being ignored. Silently
-    dropping a condition an admin wrote could mail people they explicitly
-    excluded, which is the worse mistake.
+COMPILED_CONDITIONS_CACHE_SIZE = 256
+
+
+def _column_test(column, op, expected):
+    """SQL for `_condition_test(column, op, expected, now)`, as a now -> clause builder.
+
+    Every clause is two-valued (never NULL), so callers may negate it. Returns
+    None when there is no exact translation; the caller then evaluates in Python.
     """
+    kind = column.type
+    is_text = isinstance(kind, String)
+
+    if isinstance(kind, Boolean) and op in ('is_true', 'is_false'):
+        return (lambda now: column.is_(True)) if op == 'is_true' else \
+               (lambda now: column.isnot(True))
+    if op in ('exists', 'missing'):
+        present = and_(column.isnot(None), column != '') if is_text else column.isnot(None)
+        return (lambda now: present) if op == 'exists' else (lambda now: not_(present))
+    if op == 'never':
+        return lambda now: column.is_(None)
+    if is_text and op in ('eq', 'neq'):
+        # str(None) == 'None', so a NULL equals the literal text 'None'.
+        text = str(expected)
+        equal = or_(and_(column.isnot(None), column == text),
+                    column.is_(None) if text == 'None' else false())
+        return (lambda now: equal) if op == 'eq' else (lambda now: not_(equal))
+    if isinstance(kind, (Integer, Numeric)) and op in ('gt', 'lt'):
+        try:
+            bound = float(expected)
+        except (TypeError, ValueError):
+            return lambda now: false()
+        if not math.isfinite(bound):
+            return None
+        compare = column > bound if op == 'gt' else column < bound
+        return lambda now: and_(column.isnot(None), compare)
+    if isinstance(kind, DateTime) and op in ('older_than_days', 'newer_than_days'):
+        try:
+            days = float(expected)
+        except (TypeError, ValueError):
+            # Unparseable window: only "never happened" still counts as older.
+            return (lambda now: column.is_(None)) if op == 'older_than_days' else \
+                   (lambda now: false())
+        if not math.isfinite(days):
+            return None
+
+        def window(now):
+            cutoff = now - timedelta(days=days)
+            if op == 'older_than_days':
+                return or_(column.is_(None), column < cutoff)
+            return and_(column.isnot(None), column >= cutoff)
+        return window
+    return None
+
+
+def _membership_test(field, op, expected):
+    """SQL for has / not_has on a membership set; None for anything else."""
+    if op not in ('has', 'not_has'):
+        return None
+    name = str(expected)
+    if field == 'membership.role':
+        member = (select(user_roles.c.user_id)
+                  .join(Role, Role.id == user_roles.c.role_id)
+                  .where(user_roles.c.user_id == User.id, Role.name == name)
+                  .exists())
+    else:
+        member = (select(Player.id)
+                  .join(player_teams, player_teams.c.player_id == Player.id)
+                  .join(Team, Team.id == player_teams.c.team_id)
+                  .join(League, League.id == Team.league_id)
+                  .join(Season, Season.id == League.season_id)
+                  .where(Player.user_id == User.id, Season.is_current.is_(True),
+                         League.name == name)
+                  .exists())
+    return (lambda now: member) if op == 'has' else (lambda now: not_(member))
+
+
+def _player_test(op, expected, test):
+    """Lift a per-Player-row clause to the user, matching the any()/all() rule.
+
+    A user with no Player rows is tested against one all-NULL row, exactly as
+    the predicate does with `row['players'] or [{}]`.
+    """
+    from app.models.automation import CONDITION_NEGATIVE_OPS
+
+    def owned(*criteria):
+        return select(Player.id).where(Player.user_id == User.id, *criteria).exists()
+
+    def clause(now):
+        when_absent = _condition_test(None, op, expected, now)
+        if op in CONDITION_NEGATIVE_OPS:
+            every = not_(owned(not_(test(now))))
+            return every if when_absent else and_(every, owned())
+        some = owned(test(now))
+        return or_(some, not_(owned())) if when_absent else some
+    return clause
+
+
+class CompiledConditions:
+    """One rule's condition tree, validated and compiled (see compile_conditions).
+
+    `fields` is every field the tree reads, nested groups included; `problems`
+    are the parts that fail closed, for the caller to log against its rule.
+    """
+
+    def __init__(self, predicate, where, fields, problems):
+        self._predicate = predicate
+        self._where = where
+        self.fields = frozenset(fields)
+        self.problems = tuple(problems)
+
+    @property
+    def pushdown(self):
+        return self._where is not None
+
+    def matches(self, facts, now):
+        """Whether one user's facts (see load_condition_facts) pass."""
+        return facts is not None and self._predicate(facts, now)
+
+    def where(self, now):
+        """The WHERE clause over users, or None if this tree has no SQL form."""
+        if self._where is None:
+            return None
+        try:
+            return self._where(now)
+        except (OverflowError, ValueError):
+            # A window reaching past year 1; the predicate copes.
+            return None
+
+
+def _never(row, now):
+    return False
+
+
+def _never_where(now):
+    return false()
+
+
+def _compile_node(cond, fields, problems):
+    """(predicate, where-builder or None) for one condition or nested group."""
     from app.models.automation import CONDITION_FIELDS, CONDITION_NEGATIVE_OPS
 
-    conditions = [c for c in (rule.conditions or [])]
-    if not conditions or not recipients:
-        return recipients
+    if not isinstance(cond, dict):
+        problems.append(f'has a malformed condition {cond!r}')
+        return _never, _never_where
+
+    # Groups. 'any' is how an admin expresses OR; 'all' nests an AND.
+    # An EMPTY group fails closed -- an admin who added a group and left it
+    # blank has expressed nothing, and guessing "match everyone" would be
+    # the dangerous reading.
+    if 'any' in cond or 'all' in cond:
+        either = 'any' in cond
+        inner = cond.get('any') if either else cond.get('all')
+        if not isinstance(inner, list) or not inner:
+            problems.append('has an empty condition group')
+            return _never, _never_where
+        parts = [_compile_node(c, fields, problems) for c in inner]
+        predicates = [p for p, _ in parts]
+        wheres = [w for _, w in parts]
+        combine = any if either else all
+
+        def group(row, now):
+            return combine(p(row, now) for p in predicates)
+
+        if any(w is None for w in wheres):
+            return group, None
+        join = or_ if either else and_
+        return group, lambda now: join(*(w(now) for w in wheres))
+
+    field, op = cond.get('field'), cond.get('op')
+    if field not in CONDITION_FIELDS:
+        problems.append(f'has an unknown condition field {field!r}')
+        return _never, _never_where
+    expected = cond.get('value')
+    fields.add(field)
+
+    if field.startswith('player.'):
+        # POSITIVE tests use any(): a duplicate/orphan Player row alongside
+        # the real one should not disqualify someone. NEGATIVE tests MUST use
+        # all(), or an all-NULL orphan row would satisfy "is not in the
+        # Discord server" for someone who is.
+        combine = all if op in CONDITION_NEGATIVE_OPS else any
+
+        def player_leaf(row, now):
+            return combine(_condition_test(pl.get(field), op, expected, now)
+                           for pl in row['players'] or [{}])
+
+        column = _CONDITION_COLUMNS.get(field)
+        test = _column_test(column, op, expected) if column is not None else None
+        return player_leaf, (_player_test(op, expected, test) if test else None)
+
+    def leaf(row, now):
+        return _condition_test(row.get(field), op, expected, now)
 
-    now = datetime.utcnow()
-    user_ids = [r['user_id'] for r in recipients]
+    if field.startswith('membership.'):
+        return leaf, _membership_test(field, op, expected)
+    column = _CONDITION_COLUMNS.get(field)
+    return leaf, (_column_test(column, op, expected) if column is not None else None)
+
+
+@lru_cache(maxsize=COMPILED_CONDITIONS_CACHE_SIZE)
+def _compile_conditions_json(text):
+    fields, problems = set(), []
+    predicate, where = _compile_node({'all': json.loads(text)}, fields, problems)
+    return CompiledConditions(predicate, where, fields, problems)
 
-    # ── User-level facts ────────────────────────────────────────────────
-    user_rows = (session.query(
-        User.id, User.approval_status, User.is_active, User.last_login,
-        User.created_at, User.has_completed_onboarding,
-        User.email_notifications, User.discord_notifications, User.push_notifications,
-    ).filter(User.id.in_(user_ids)).all())
+
+def compile_conditions(conditions):
+    """Compiled form of a condition list (every entry must pass), cached by content."""
+    return _compile_conditions_json(json.dumps(list(conditions or []), sort_keys=True, default=str))
+
+
+def load_condition_facts(session, user_ids, fields):
+    """{user_id: facts} for the predicate form, loading only what `fields` reads.
+
+    A user may have MORE THAN ONE Player row, so players are a list.
+    """
+    fields = set(fields)
+    user_fields = [f for f in _USER_CONDITION_FIELDS if f in fields]
+    user_rows = (session.query(User.id, *(_CONDITION_COLUMNS[f] for f in user_fields))
+                 .filter(User.id.in_(user_ids)).all())
     facts = {
-        r[0]: {
-            'user.approval_status': r[1],
-            'user.is_active': r[2],
-            'user.last_login': r[3],
-            'user.created_at': r[4],
-            'user.has_completed_onboarding': r[5],
-            'user.email_notifications': r[6],
-            'user.discord_notifications': r[7],
-            'user.push_notifications': r[8],
-            'players': [],
-            'membership.role': set(),
-            'membership.league': set(),
-        } for r in user_rows
+        r[0]: {**dict(zip(user_fields, r[1:])),
+               'players': [], 'membership.role': set(), 'membership.league': set()}
+        for r in user_rows
     }
 
-    # ── Player-level facts (a user may have MORE THAN ONE Player row) ───
-    player_rows = (session.query(
-        Player.user_id, Player.discord_in_server, Player.discord_id,
-        Player.discord_roles_synced, Player.discord_last_checked,
-        Player.is_current_player, Player.is_coach, Player.is_sub, Player.is_ref,
-        Player.primary_team_id, Player.profile_last_updated, Player.is_phone_verified,
-    ).filter(Player.user_id.in_(user_ids)).all())
-    for r in player_rows:
-        entry = facts.get(r[0])
-        if entry is None:
-            continue
-        entry['players'].append({
-            'player.discord_in_server': r[1],
-            'player.discord_id': r[2],
-            'player.discord_roles_synced': r[3],
-            'player.discord_last_checked': r[4],
-            'player.is_current_player': r[5],
-            'player.is_coach': r[6],
-            'player.is_sub': r[7],
-            'player.is_ref': r[8],
-            'player.primary_team_id': r[9],
-            'player.profile_last_updated': r[10],
-            'player.is_phone_verified': r[11],
-        })
+    player_fields = [f for f in _PLAYER_CONDITION_FIELDS if f in fields]
+    if player_fields:
+        for r in (session.query(Player.user_id, *(_CONDITION_COLUMNS[f] for f in player_fields))
+                  .filter(Player.user_id.in_(user_ids)).all()):
+            if r[0] in facts:
+                facts[r[0]]['players'].append(dict(zip(player_fields, r[1:])))
 
     # ── Roles, only if a rule actually asks about them ──────────────────
-    wanted = {c.get('field') for c in conditions if isinstance(c, dict)}
-    if 'membership.role' in wanted:
+    if 'membership.role' in fields:
         for uid, name in (session.query(user_roles.c.user_id, Role.name)
                           .join(Role, Role.id == user_roles.c.role_id)
                           .filter(user_roles.c.user_id.in_(user_ids)).all()):
@@ -1356,7 +1718,7 @@ def apply_conditions(session, rule, recipients):
                 facts[uid]['membership.role'].add(name)
 
     # ── League membership this season, via the live roster ──────────────
-    if 'membership.league' in wanted:
+    if 'membership.league' in fields:
         rows = (session.query(Player.user_id, League.name)
                 .join(player_teams, player_teams.c.player_id == Player.id)
                 .join(Team, Team.id == player_teams.c.team_id)
@@ -1367,55 +1729,50 @@ def apply_conditions(session, rule, recipients):
         for uid, name in rows:
             if uid in facts:
                 facts[uid]['membership.league'].add(name)
+    return facts
 
-    def passes(user_id):
-        row = facts.get(user_id)
-        if row is None:
-            return False
-        for cond in conditions:
-            if not _eval_condition(cond, row, now, rule):
-                return False
-        return True
 
-    def _eval_condition(cond, row, now, rule):
-        """One condition, or a nested any/all group."""
-        if not isinstance(cond, dict):
-            logger.warning("Rule %s has a malformed condition %r; failing closed",
-                           rule.key, cond)
-            return False
+def matching_user_ids(session, compiled, user_ids, now=None, pushdown=True):
+    """The subset of user_ids passing a compiled condition tree.
 
-        # Groups. 'any' is how an admin expresses OR; 'all' nests an AND.
-        # An EMPTY group fails closed -- an admin who added a group and left it
-        # blank has expressed nothing, and guessing "match everyone" would be
-        # the dangerous reading.
-        if 'any' in cond or 'all' in cond:
-            inner = cond.get('any') if 'any' in cond else cond.get('all')
-            if not isinstance(inner, list) or not inner:
-                logger.warning("Rule %s has an empty condition group; failing closed",
-                               rule.key)
-                return False
-            results = (_eval_condition(c, row, now, rule) for c in inner)
-            return any(results) if 'any' in cond else all(results)
-
-        field, op = cond.get('field'), cond.get('op')
-        if field not in CONDITION_FIELDS:
-            logger.warning("Rule %s has an unknown condition field %r; failing closed",
-                           rule.key, field)
-            return False
-        expected = cond.get('value')
+    One query when the tree has a SQL form; otherwise the facts are loaded and
+    the predicate runs per user. Both forms give the same answer.
+    """
+    now = now or datetime.utcnow()
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return set()
+    where = compiled.where(now) if pushdown else None
+    if where is not None:
+        return {uid for (uid,) in session.query(User.id)
+                .filter(User.id.in_(user_ids), where).all()}
+    facts = load_condition_facts(session, user_ids, compiled.fields)
+    return {uid for uid in user_ids if compiled.matches(facts.get(uid), now)}
 
-        if field.startswith('player.'):
-            # POSITIVE tests use any(): a duplicate/orphan Player row alongside
-            # the real one should not disqualify someone. NEGATIVE tests MUST use
-            # all(), or an all-NULL orphan row would satisfy "is not in the
-            # Discord server" for someone who is.
-            players = row['players'] or [{}]
-            results = [_condition_test(pl.get(field), op, expected, now) for pl in players]
-            return all(results) if op in CONDITION_NEGATIVE_OPS else any(results)
 
-        return _condition_test(row.get(field), op, expected, now)
+def apply_conditions(session, rule, recipients):
+    """Narrow a resolved recipient list by the rule's conditions.
+
+    Every condition must pass. The conditions are compiled once per version
+    (compile_conditions) and, when every field has a SQL form, applied as one
+    WHERE over the whole audience; otherwise per-user facts are loaded in a few
+    queries and tested in Python.
+
+    Failure modes are deliberately CLOSED: an unknown field, an unknown operator
+    or a malformed entry excludes everyone rather than being ignored. Silently
+    dropping a condition an admin wrote could mail people they explicitly
+    excluded, which is the worse mistake.
+    """
+    conditions = [c for c in (rule.conditions or [])]
+    if not conditions or not recipients:
+        return recipients
+
+    compiled = compile_conditions(conditions)
+    for problem in compiled.problems:
+        logger.warning("Rule %s %s; failing closed", rule.key, problem)
 
-    kept = [r for r in recipients if passes(r['user_id'])]
+    matched = matching_user_ids(session, compiled, [r['user_id'] for r in recipients])
+    kept = [r for r in recipients if r['user_id'] in matched]
     if len(kept) != len(recipients):
         logger.info("Rule %s conditions narrowed audience %d -> %d",
                     rule.key, len(recipients), len(kept))
@@ -2417,20 +2774,18 @@ def explain_for_user(session, rule, user_id):
     if not conditions:
         add('Passes conditions', True, 'This automation has no extra conditions.')
     else:
-        recipients = [{'user_id': user_id, 'name': who}]
-        kept = apply_conditions(session, rule, recipients)
-        if kept:
+        # One load of this person's facts, then each compiled condition on it:
+        # the whole list, and one at a time to name the culprit rather than
+        # just "failed".
+        now = datetime.utcnow()
+        compiled = compile_conditions(conditions)
+        facts = load_condition_facts(session, [user_id], compiled.fields).get(user_id)
+        if compiled.matches(facts, now):
             add('Passes conditions', True,
                 f'{who} passes all {len(conditions)} condition(s).')
         else:
-            # Re-test one at a time to name the culprit rather than just "failed".
-            failed = []
-            for cond in conditions:
-                probe = SimpleNamespace(
-                    key=rule.key, conditions=[cond],
-                    audience_type=rule.audience_type, force_send=rule.force_send)
-                if not apply_conditions(session, probe, list(recipients)):
-                    failed.append(describe_condition(cond))
+            failed = [describe_condition(cond) for cond in conditions
+                      if not compile_conditions([cond]).matches(facts, now)]
             detail = ('Excluded by: ' + '; '.join(failed)) if failed else \
                      'Excluded by the conditions.'
             add('Passes conditions', False, detail)
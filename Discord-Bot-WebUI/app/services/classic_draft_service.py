@@ -15,7 +15,10 @@ Nothing here writes rosters — assignment goes through the existing
 draft_player_enhanced socket path (app/sockets/draft.py), untouched.
 """
 
+import bisect
 import logging
+import threading
+import time
 from decimal import Decimal
 
 from app.constants.positions import parse_positions
@@ -222,6 +225,109 @@ def project_assignment(team_totals, player_entry, team_id, config):
     }
 
 
+class TeamMetricMatrix:
+    """Team metric totals held as one column per metric, for batch projections.
+
+    Adding a candidate to one team only moves that team's total, so for each
+    metric the projected max/min is the target's new total against the best
+    and worst of the OTHER teams — found once per projection batch instead of
+    copying every team's totals per candidate. Values and tie-breaks match
+    compute_gaps exactly (same Decimals, same keys).
+    """
+
+    def __init__(self, team_totals, config):
+        self.team_ids = list(team_totals)
+        self.max_gap = config['max_metric_gap']
+        self.unrated_default = config['unrated_default']
+        self.columns = {m: [team_totals[tid]['metrics'][m]['total'] for tid in self.team_ids]
+                        for m in METRICS}
+        self._index = {tid: i for i, tid in enumerate(self.team_ids)}
+
+    def row(self, player_entry):
+        """The player's per-metric values (unrated imputed), in METRICS order."""
+        return [_metric_value(player_entry, m, self.unrated_default) for m in METRICS]
+
+    def add(self, team_id, row):
+        """Apply an assignment in place."""
+        i = self._index[team_id]
+        for metric, value in zip(METRICS, row):
+            self.columns[metric][i] += value
+
+    def _gap_entry(self, max_team, max_total, min_team, min_total):
+        gap = max_total - min_total
+        return {
+            'max': max_total, 'min': min_total, 'gap': gap,
+            'max_team_id': max_team, 'min_team_id': min_team,
+            'within_limit': gap <= self.max_gap,
+        }
+
+    def gaps(self):
+        """Same result as compute_gaps on the equivalent team_totals."""
+        if not self.team_ids:
+            return {m: {'max': None, 'min': None, 'gap': Decimal(0), 'max_team_id': None,
+                        'min_team_id': None, 'within_limit': True} for m in METRICS}
+        gaps = {}
+        for metric in METRICS:
+            entries = list(zip(self.team_ids, self.columns[metric]))
+            max_team, max_total = max(entries, key=lambda e: (e[1], -e[0]))
+            min_team, min_total = min(entries, key=lambda e: (e[1], e[0]))
+            gaps[metric] = self._gap_entry(max_team, max_total, min_team, min_total)
+        return gaps
+
+    def _others(self, team_id):
+        """Per metric: (max entry, min entry) over every team except team_id."""
+        if team_id not in self._index:
+            raise ValueError(f'Unknown team {team_id}')
+        i = self._index[team_id]
+        bounds = {}
+        for metric in METRICS:
+            entries = [(tid, total) for k, (tid, total)
+                       in enumerate(zip(self.team_ids, self.columns[metric])) if k != i]
+            if entries:
+                bounds[metric] = (max(entries, key=lambda e: (e[1], -e[0])),
+                                  min(entries, key=lambda e: (e[1], e[0])))
+            else:
+                bounds[metric] = (None, None)
+        return i, bounds
+
+    def project_gaps(self, team_id, rows):
+        """Projected per-metric gaps for adding each row to team_id.
+
+        Returns one list of Decimal gaps (METRICS order) per row. Only values
+        matter here, so ties need no team-id tie-break.
+        """
+        i, bounds = self._others(team_id)
+        columns = []
+        for metric in METRICS:
+            other_max, other_min = bounds[metric]
+            columns.append((self.columns[metric][i],
+                            other_max[1] if other_max else None,
+                            other_min[1] if other_min else None))
+        out = []
+        for row in rows:
+            gaps = []
+            for (base, hi, lo), value in zip(columns, row):
+                total = base + value
+                if hi is None:
+                    gaps.append(total - total)
+                else:
+                    gaps.append((total if total > hi else hi) - (total if total < lo else lo))
+            out.append(gaps)
+        return out
+
+    def project_detail(self, team_id, row):
+        """Full compute_gaps-shaped result for adding one row to team_id."""
+        i, bounds = self._others(team_id)
+        gaps = {}
+        for metric, value in zip(METRICS, row):
+            entry = (team_id, self.columns[metric][i] + value)
+            other_max, other_min = bounds[metric]
+            max_entry = max(entry, other_max, key=lambda e: (e[1], -e[0])) if other_max else entry
+            min_entry = min(entry, other_min, key=lambda e: (e[1], e[0])) if other_min else entry
+            gaps[metric] = self._gap_entry(max_entry[0], max_entry[1], min_entry[0], min_entry[1])
+        return gaps
+
+
 def _team_position_needs(roster):
     """Groups where the team is furthest below the scaled 1-4-4-3 template."""
     players = [p for p in roster if not p.get('is_coach')]
@@ -259,13 +365,14 @@ def suggest_players(pool, rosters, team_id, config):
     weights = {m: config['weights'][m] / Decimal(100) for m in METRICS}
     coeffs = config['suggestion_coefficients']
     team_totals = compute_team_totals(rosters, config)
-    current_gaps = compute_gaps(team_totals, config)
     target_roster = rosters.get(team_id, [])
     needs = _team_position_needs(target_roster)
     lacks_gk = _team_lacks_gk(target_roster)
     target = team_totals.get(team_id)
     if target is None:
         raise ValueError(f'Unknown team {team_id}')
+    matrix = TeamMetricMatrix(team_totals, config)
+    current_gaps = matrix.gaps()
 
     # Pool-wide gender ratio drives the under/over-representation test.
     pool_and_rostered = [p for p in pool if not p.get('is_coach')] + \
@@ -274,23 +381,31 @@ def suggest_players(pool, rosters, team_id, config):
     total_n = sum(1 for p in pool_and_rostered if derive_gender(p) == 'N')
     league_n_share = (Decimal(total_n) / Decimal(total_m + total_n)) if (total_m + total_n) else Decimal(0)
 
-    scored = []
-    for candidate in pool:
-        if candidate.get('is_coach'):
-            continue
-        projection = project_assignment(team_totals, candidate, team_id, config)
+    # Everything below that doesn't depend on the candidate is computed once.
+    deficits = {}
+    for m in METRICS:
+        deficits[m] = (current_gaps[m]['max'] - target['metrics'][m]['total']
+                       if current_gaps[m]['max'] is not None else Decimal(0))
+    team_players = target['genders']['M'] + target['genders']['N']
+    team_n_share = Decimal(target['genders']['N']) / Decimal(team_players) if team_players else None
+
+    candidates = [c for c in pool if not c.get('is_coach')]
+    rows = [matrix.row(c) for c in candidates]
+    projected = matrix.project_gaps(team_id, rows)
+    max_gap = config['max_metric_gap']
 
+    scored = []
+    for candidate, row, projected_gaps in zip(candidates, rows, projected):
         # B: weighted total gap reduction (dominant term).
         balance = sum(
-            weights[m] * (current_gaps[m]['gap'] - projection['gaps'][m]['gap'])
-            for m in METRICS)
+            weights[m] * (current_gaps[m]['gap'] - gap)
+            for m, gap in zip(METRICS, projected_gaps))
 
         # N: strength exactly where this team trails the leader, deficit-capped.
         need = Decimal(0)
-        for m in METRICS:
-            deficit = current_gaps[m]['max'] - target['metrics'][m]['total'] if current_gaps[m]['max'] is not None else Decimal(0)
+        for m, value in zip(METRICS, row):
+            deficit = deficits[m]
             if deficit > 0:
-                value = _metric_value(candidate, m, config['unrated_default'])
                 need += weights[m] * min(value, deficit) / Decimal(5)
 
         # G: +1 when the candidate's gender is underrepresented on this team
@@ -298,11 +413,7 @@ def suggest_players(pool, rosters, team_id, config):
         gender = Decimal(0)
         candidate_gender = derive_gender(candidate)
         if config['gender_balance_enabled'] and candidate_gender in ('M', 'N'):
-            team_players = target['genders']['M'] + target['genders']['N']
-            if team_players == 0:
-                gender = Decimal(0)
-            else:
-                team_n_share = Decimal(target['genders']['N']) / Decimal(team_players)
+            if team_n_share is not None:
                 share = team_n_share if candidate_gender == 'N' else Decimal(1) - team_n_share
                 league_share = league_n_share if candidate_gender == 'N' else Decimal(1) - league_n_share
                 if share < league_share:
@@ -325,11 +436,10 @@ def suggest_players(pool, rosters, team_id, config):
 
         scored.append({
             'player': candidate,
+            'row': row,
             'score': score,
             'composite': composite,
-            'violates_gap': projection['violates_gap'],
-            'deltas': projection['deltas'],
-            'projected_gaps': projection['gaps'],
+            'violates_gap': any(gap > max_gap for gap in projected_gaps),
             'components': {'balance': balance, 'need': need,
                            'gender': gender, 'position': position},
         })
@@ -342,9 +452,11 @@ def suggest_players(pool, rosters, team_id, config):
     ))
 
     out = []
+    target_metrics = target['metrics']
     for rank, s in enumerate(scored[:config['suggestion_count']], start=1):
         p = s['player']
-        target_metrics = team_totals[team_id]['metrics']
+        deltas = dict(zip(METRICS, s['row']))
+        projected_gaps = matrix.project_detail(team_id, s['row'])
         out.append({
             'rank': rank,
             'player_id': p['id'],
@@ -364,51 +476,100 @@ def suggest_players(pool, rosters, team_id, config):
                            for k, v in s['components'].items()},
             'projection': {
                 m: {
-                    'delta': float(rating_service.quantize2(s['deltas'][m])),
+                    'delta': float(rating_service.quantize2(deltas[m])),
                     'team_total_before': float(rating_service.quantize2(target_metrics[m]['total'])),
                     'team_total_after': float(rating_service.quantize2(
-                        target_metrics[m]['total'] + s['deltas'][m])),
-                    'gap_before': float(rating_service.quantize2(compute_gaps(team_totals, config)[m]['gap'])),
-                    'gap_after': float(rating_service.quantize2(s['projected_gaps'][m]['gap'])),
-                    'within_limit_after': s['projected_gaps'][m]['within_limit'],
+                        target_metrics[m]['total'] + deltas[m])),
+                    'gap_before': float(rating_service.quantize2(current_gaps[m]['gap'])),
+                    'gap_after': float(rating_service.quantize2(projected_gaps[m]['gap'])),
+                    'within_limit_after': projected_gaps[m]['within_limit'],
                 } for m in METRICS
             },
         })
     return out
 
 
-def get_board_state(session):
-    """Full balanced-draft board state: teams (with rosters + metric totals +
-    gaps), unassigned pool, and config echo. JSON-safe."""
-    board = compute_classic_board(session, include_scores=True)
-    config = rating_service.get_rating_config()
-    league_id = board['league_id']
+class BoardModel:
+    """Balanced-draft board held as pool + rosters with per-team Decimal totals.
 
-    teams_meta = []
-    rosters = {}
-    if league_id is not None:
-        league = rating_service.current_classic_league(session)
-        for team in sorted((t for t in league.teams if t.name != 'Practice'),
-                           key=lambda t: t.name):
-            teams_meta.append({'id': team.id, 'name': team.name})
-            rosters[team.id] = []
-
-    pool = []
-    for p in board['players']:
-        p = dict(p)
-        p['gender'] = derive_gender(p)
-        # The raw admin override is admin-panel-only; draft surfaces get the
-        # derived gender.
-        p.pop('balance_gender', None)
-        if p['team_id'] and p['team_id'] in rosters:
-            rosters[p['team_id']].append(p)
-        else:
-            pool.append(p)
+    A pick or removal moves one player and re-totals only the teams it touches,
+    so a live board can follow the draft without rebuilding from the DB.
+    state() renders the same JSON-safe payload get_board_state always has;
+    version is the shared board-log version this model reflects (None when
+    there's no log to follow).
+    """
 
-    team_totals = compute_team_totals(rosters, config)
-    gaps = compute_gaps(team_totals, config)
+    def __init__(self, board, teams_meta, config, version=None, built_at=None):
+        self.board = {k: board[k] for k in ('season_id', 'season_name', 'league_id', 'metrics')}
+        self.teams_meta = teams_meta
+        self.config = config
+        self.version = version
+        self.built_at = built_at if built_at is not None else time.time()
+        self._team_names = {t['id']: t['name'] for t in teams_meta}
+        self._order = {}
+        self.players = {}
+        self.rosters = {t['id']: [] for t in teams_meta}
+        self.pool = []
+        for index, p in enumerate(board['players']):
+            if 'gender' not in p:
+                p = dict(p)
+                p['gender'] = derive_gender(p)
+                # The raw admin override is admin-panel-only; draft surfaces get
+                # the derived gender.
+                p.pop('balance_gender', None)
+            self._order[p['id']] = index
+            self.players[p['id']] = p
+            if p['team_id'] and p['team_id'] in self.rosters:
+                self.rosters[p['team_id']].append(p['id'])
+            else:
+                self.pool.append(p['id'])
+        self.team_totals = compute_team_totals(
+            {tid: self._entries(ids) for tid, ids in self.rosters.items()}, config)
+
+    def _entries(self, ids):
+        return [self.players[pid] for pid in ids]
+
+    def move(self, player_id, team_id):
+        """Put player_id on team_id, or back in the pool for None. Idempotent.
+
+        Returns False when the model can't apply it (player or team it has
+        never seen) and must be rebuilt.
+        """
+        entry = self.players.get(player_id)
+        if entry is None or (team_id is not None and team_id not in self.rosters):
+            return False
+        current = entry['team_id'] if entry['team_id'] in self.rosters else None
+        if current == team_id:
+            return True
+        (self.rosters[current] if current is not None else self.pool).remove(player_id)
+        bisect.insort((self.rosters[team_id] if team_id is not None else self.pool),
+                      player_id, key=self._order.__getitem__)
+        # Replace rather than mutate: earlier state() payloads share entries.
+        self.players[player_id] = {**entry, 'team_id': team_id,
+                                   'team_name': self._team_names.get(team_id)}
+        for tid in {current, team_id} - {None}:
+            self.team_totals.update(compute_team_totals({tid: self._entries(self.rosters[tid])},
+                                                        self.config))
+        return True
+
+    def location(self, player_id):
+        """Team id the player is on, or None for the pool."""
+        team_id = self.players[player_id]['team_id']
+        return team_id if team_id in self.rosters else None
+
+    def gaps_payload(self):
+        gaps = compute_gaps(self.team_totals, self.config)
+        return {
+            m: {
+                'gap': float(rating_service.quantize2(g['gap'])),
+                'max_team_id': g['max_team_id'],
+                'min_team_id': g['min_team_id'],
+                'within_limit': g['within_limit'],
+            } for m, g in gaps.items()
+        }
 
-    def _jsonify_totals(data):
+    def team_payload(self, team_id):
+        data = self.team_totals[team_id]
         return {
             'metrics': {
                 m: {
@@ -423,39 +584,202 @@ def get_board_state(session):
             'genders': data['genders'],
         }
 
+    def state(self):
+        config = self.config
+        return {
+            'season_id': self.board['season_id'],
+            'season_name': self.board['season_name'],
+            'league_id': self.board['league_id'],
+            'version': self.version,
+            'metrics': self.board['metrics'],
+            'teams': [
+                {**meta, 'roster': self._entries(self.rosters[meta['id']]),
+                 'totals': self.team_payload(meta['id'])}
+                for meta in self.teams_meta
+            ],
+            'pool': self._entries(self.pool),
+            'gaps': self.gaps_payload(),
+            'config': {
+                'max_metric_gap': float(config['max_metric_gap']),
+                'unrated_default': float(config['unrated_default']),
+                'suggestion_count': config['suggestion_count'],
+                'gender_balance_enabled': config['gender_balance_enabled'],
+                # Admin rollback toggle — see mobile_api/classic_ratings.py.
+                'balanced_draft_enabled': config['balanced_draft_enabled'],
+                'weights': {m: float(rating_service.quantize2(config['weights'][m])) for m in METRICS},
+            },
+        }
+
+    def to_snapshot(self):
+        """JSON-safe form for the shared Redis snapshot (config is not carried;
+        from_snapshot takes the live one)."""
+        return {
+            'board': {**self.board, 'players': [self.players[pid] for pid in
+                                                sorted(self.players, key=self._order.__getitem__)]},
+            'teams': self.teams_meta,
+            'version': self.version,
+            'built_at': self.built_at,
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot, config):
+        return cls(snapshot['board'], snapshot['teams'], config,
+                   version=snapshot['version'], built_at=snapshot['built_at'])
+
+
+# Board log / snapshot key in DraftCacheService, and how long a worker trusts
+# its in-memory model before re-reading (edits that bypass the log — rating
+# changes, profile edits — show up within this window).
+BOARD_LEAGUE_KEY = 'classic'
+BOARD_MAX_AGE = 120
+
+_board_lock = threading.Lock()
+_board_model = None
+
+
+def _load_board_model(session, version=None):
+    board = compute_classic_board(session, include_scores=True)
+    config = rating_service.get_rating_config()
+    teams_meta = []
+    if board['league_id'] is not None:
+        league = rating_service.current_classic_league(session)
+        for team in sorted((t for t in league.teams if t.name != 'Practice'),
+                           key=lambda t: t.name):
+            teams_meta.append({'id': team.id, 'name': team.name})
+    return BoardModel(board, teams_meta, config, version=version)
+
+
+def _catch_up(model, version):
+    """Apply log entries up to version in place. False if the model can't
+    follow (log gap, a reset entry, or a move it doesn't recognise)."""
+    from app.draft_cache_service import DraftCacheService
+
+    entries = DraftCacheService.get_board_deltas(BOARD_LEAGUE_KEY, model.version, version)
+    if entries is None:
+        return False
+    for entry in entries:
+        if entry.get('reset') or not model.move(entry['player_id'], entry['team_id']):
+            return False
+        model.version = entry['v']
+    return True
+
+
+def current_board(session):
+    """The board model at the latest shared version.
+
+    Served from this worker's model when it can catch up from the board log,
+    else seeded from the shared snapshot, else rebuilt from the DB (which
+    republishes the snapshot). Without Redis there is no log to follow, so
+    every call rebuilds, exactly as before.
+    """
+    global _board_model
+    from app.draft_cache_service import DraftCacheService
+
+    # Read the version BEFORE any DB load: a pick committing in between is
+    # then already in the rows and re-applying its log entry is a no-op.
+    version = DraftCacheService.get_board_version(BOARD_LEAGUE_KEY)
+    if version is None:
+        return _load_board_model(session)
+
+    with _board_lock:
+        model = _board_model
+        fresh = (model is not None and model.version <= version
+                 and time.time() - model.built_at < BOARD_MAX_AGE)
+        if not (fresh and _catch_up(model, version)):
+            model = None
+            snapshot = DraftCacheService.get_board_snapshot(BOARD_LEAGUE_KEY)
+            if snapshot and snapshot['version'] <= version:
+                model = BoardModel.from_snapshot(snapshot, rating_service.get_rating_config())
+                if not _catch_up(model, version):
+                    model = None
+        if model is None:
+            model = _load_board_model(session, version)
+            DraftCacheService.set_board_snapshot(BOARD_LEAGUE_KEY, model.to_snapshot())
+        _board_model = model
+    return model
+
+
+def invalidate_board():
+    """Drop this process's board model. PROCESS-LOCAL — other workers notice
+    changes through the board log (DraftCacheService.reset_board)."""
+    global _board_model
+    with _board_lock:
+        _board_model = None
+
+
+def is_board_league(league_name):
+    """True for the league whose roster changes feed the balanced-board log."""
+    return (league_name or '').strip().lower() == rating_service.LEAGUE_TYPE.lower()
+
+
+def record_board_move(player_id, team_id):
+    """Append a committed pick (team_id) or removal (team_id=None) to the
+    shared board log. Returns the new board version, or None if it couldn't be
+    logged (callers then fall back to resetting the board)."""
+    from app.draft_cache_service import DraftCacheService
+
+    version = DraftCacheService.append_board_delta(
+        BOARD_LEAGUE_KEY, {'player_id': player_id, 'team_id': team_id})
+    if version is not None:
+        with _board_lock:
+            model = _board_model
+            if model is not None and model.version == version - 1 \
+                    and model.move(player_id, team_id):
+                model.version = version
+    return version
+
+
+def get_board_state(session):
+    """Full balanced-draft board state: teams (with rosters + metric totals +
+    gaps), unassigned pool, config echo, and the board version. JSON-safe.
+
+    Always rebuilt from the DB — this is the authoritative bootstrap/resync —
+    and reseeds the shared snapshot that board_changes_since serves from."""
+    global _board_model
+    from app.draft_cache_service import DraftCacheService
+
+    version = DraftCacheService.get_board_version(BOARD_LEAGUE_KEY)
+    model = _load_board_model(session, version)
+    if version is not None:
+        DraftCacheService.set_board_snapshot(BOARD_LEAGUE_KEY, model.to_snapshot())
+        with _board_lock:
+            _board_model = model
+    return model.state()
+
+
+def board_changes_since(session, since):
+    """Compact diff from board version `since` to now.
+
+    {'version', 'full': False, 'moves': [{player_id, team_id}], 'teams':
+    {team_id: totals}, 'gaps'} where each moved player appears once with where
+    they are now (team_id None = pool) and only touched teams carry totals.
+    Falls back to {'full': True, **state} when the log can't cover the range.
+    """
+    from app.draft_cache_service import DraftCacheService
+
+    model = current_board(session)
+    entries = None
+    if model.version is not None and since is not None and 0 <= since <= model.version:
+        entries = DraftCacheService.get_board_deltas(BOARD_LEAGUE_KEY, since, model.version)
+    if entries is None or any(e.get('reset') for e in entries):
+        return {'full': True, **model.state()}
+
+    moved = list(dict.fromkeys(e['player_id'] for e in entries))
+    moves = [{'player_id': pid, 'team_id': model.location(pid)} for pid in moved]
+    touched = {e['team_id'] for e in entries if e['team_id'] is not None}
+    touched.update(m['team_id'] for m in moves if m['team_id'] is not None)
     return {
-        'season_id': board['season_id'],
-        'season_name': board['season_name'],
-        'league_id': league_id,
-        'metrics': board['metrics'],
-        'teams': [
-            {**meta, 'roster': rosters[meta['id']], 'totals': _jsonify_totals(team_totals[meta['id']])}
-            for meta in teams_meta
-        ],
-        'pool': pool,
-        'gaps': {
-            m: {
-                'gap': float(rating_service.quantize2(g['gap'])),
-                'max_team_id': g['max_team_id'],
-                'min_team_id': g['min_team_id'],
-                'within_limit': g['within_limit'],
-            } for m, g in gaps.items()
-        },
-        'config': {
-            'max_metric_gap': float(config['max_metric_gap']),
-            'unrated_default': float(config['unrated_default']),
-            'suggestion_count': config['suggestion_count'],
-            'gender_balance_enabled': config['gender_balance_enabled'],
-            # Admin rollback toggle — see mobile_api/classic_ratings.py.
-            'balanced_draft_enabled': config['balanced_draft_enabled'],
-            'weights': {m: float(rating_service.quantize2(config['weights'][m])) for m in METRICS},
-        },
+        'version': model.version,
+        'full': False,
+        'moves': moves,
+        'teams': {tid: model.team_payload(tid) for tid in sorted(touched)},
+        'gaps': model.gaps_payload(),
     }
 
 
 def suggest_for_team(session, team_id, limit=None):
     """Suggestions for a team using live board state."""
-    state = get_board_state(session)
+    state = current_board(session).state()
     config = rating_service.get_rating_config()
     if limit:
         config = {**config, 'suggestion_count': min(int(limit), 50)}
@@ -468,10 +792,13 @@ def suggest_for_team(session, team_id, limit=None):
 def multi_check(session, assignments):
     """Sequentially project a list of {player_id, team_id} assignments.
     Returns combined post-state gaps + per-step deltas (preview only)."""
-    state = get_board_state(session)
+    state = current_board(session).state()
     config = rating_service.get_rating_config()
-    rosters = {t['id']: list(t['roster']) for t in state['teams']}
+    rosters = {t['id']: t['roster'] for t in state['teams']}
     pool_by_id = {p['id']: p for p in state['pool']}
+    # Each step adds one player's values to one team in place rather than
+    # re-totalling every roster.
+    matrix = TeamMetricMatrix(compute_team_totals(rosters, config), config)
 
     steps = []
     for assignment in assignments:
@@ -481,9 +808,9 @@ def multi_check(session, assignments):
             steps.append({'player_id': assignment.get('player_id'),
                           'team_id': team_id, 'error': 'invalid player or team'})
             continue
-        rosters[team_id].append(player)
-        totals = compute_team_totals(rosters, config)
-        gaps = compute_gaps(totals, config)
+        if not player.get('is_coach'):  # coaches never count toward totals
+            matrix.add(team_id, matrix.row(player))
+        gaps = matrix.gaps()
         steps.append({
             'player_id': player['id'], 'team_id': team_id,
             'gaps': {m: float(rating_service.quantize2(g['gap'])) for m, g in gaps.items()},
@@ -0,0 +1,130 @@
+# app/services/commit_marks.py
+
+"""
+Collect at flush, publish after commit.
+
+Several features keep Redis-side state derived from database writes: the
+participation rollup's dirty marks, mobile ETag version counters, table
+watermarks, the player search change feed and the live reporting session
+stream. Each needs the same plumbing -- notice the write while the session
+still knows what changed, hold on to it until the transaction commits, publish
+it then, and forget it on rollback -- so it lives here once, behind one set of
+Session listeners, and each feature registers a tracker:
+
+    commit_marks.track('etag_scopes', publish=bump,
+                       on_instance=_instance_scopes, on_statement=_statement_scopes)
+
+- on_instance(session, instance) runs at after_flush for every new, dirty and
+  deleted instance (their pre-flush state and ids are still readable) and
+  returns the marks that write produces.
+- on_statement(table, orm_execute_state) runs for Core/bulk INSERT/UPDATE/
+  DELETE through the session, which after_flush never sees, with the name of
+  the statement's target table.
+- publish(marks) runs from after_commit with everything the transaction
+  collected. It may only talk to Redis: the session is committed and can't
+  emit SQL.
+
+Marks go into a set by default; pass factory=dict and return (key, value) pairs
+to keep the last value per key. Classifiers must read loaded state only --
+lazy-loading an expired column from after_flush emits SQL mid-flush.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# session.info key holding {tracker name: marks} for a not-yet-committed transaction.
+_SESSION_INFO_KEY = 'pending_commit_marks'
+
+
+@dataclass(frozen=True)
+class Tracker:
+    name: str
+    publish: Callable
+    on_instance: Optional[Callable] = None
+    on_statement: Optional[Callable] = None
+    factory: Callable = set
+
+
+_trackers = {}
+
+
+def track(name, publish, on_instance=None, on_statement=None, factory=set):
+    """Register (or, on module reload, replace) a tracker."""
+    tracker = Tracker(name, publish, on_instance, on_statement, factory)
+    _trackers[name] = tracker
+    return tracker
+
+
+def _add(session, tracker, marks):
+    if not marks:
+        return
+    pending = session.info.setdefault(_SESSION_INFO_KEY, {})
+    if tracker.name not in pending:
+        pending[tracker.name] = tracker.factory()
+    pending[tracker.name].update(marks)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_instance_marks(session, flush_context):
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if not changed:
+        return
+    for tracker in list(_trackers.values()):
+        if tracker.on_instance is None:
+            continue
+        marks = tracker.factory()
+        for instance in changed:
+            marks.update(tracker.on_instance(session, instance) or ())
+        _add(session, tracker, marks)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_statement_marks(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update
+            or orm_execute_state.is_delete):
+        return
+    table = getattr(getattr(orm_execute_state.statement, 'table', None), 'name', None)
+    if table is None:
+        return
+    for tracker in list(_trackers.values()):
+        if tracker.on_statement is not None:
+            _add(orm_execute_state.session, tracker,
+                 tracker.on_statement(table, orm_execute_state))
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_marks(session):
+    pending = session.info.pop(_SESSION_INFO_KEY, None)
+    if not pending:
+        return
+    for name, marks in pending.items():
+        tracker = _trackers.get(name)
+        if tracker is None or not marks:
+            continue
+        try:
+            tracker.publish(marks)
+        except Exception:
+            # One feature's Redis trouble must not cost the others their marks.
+            logger.warning(f"commit marks: publishing {name} failed", exc_info=True)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_marks(session):
+    session.info.pop(_SESSION_INFO_KEY, None)
+
+
+def statement_columns(orm_execute_state):
+    """Column names an UPDATE statement sets (empty when they can't be told)."""
+    values = getattr(orm_execute_state.statement, '_values', None) or {}
+    return {getattr(key, 'key', key) for key in values}
+
+
+def install_listeners():
+    """Idempotent install marker -- importing this module registers the hooks."""
+    logger.info(f"Commit mark listeners installed ({', '.join(sorted(_trackers)) or 'no trackers'})")
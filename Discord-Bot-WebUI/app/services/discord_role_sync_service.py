@@ -6,25 +6,133 @@ Discord Role Sync Service
 Bidirectional synchronization service for Flask roles and Discord roles.
 This service handles:
 - Syncing Flask roles to Discord when users gain/lose roles
-- Bulk syncing all users with a specific Flask role to Discord
+- Bulk syncing all users with a specific Flask role to Discord, as a planned
+  add/remove diff executed within per-route rate limits (or a dry run)
 - Fetching available Discord roles for mapping
 """
 
 import logging
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
 import requests
 
 from app.core import db
-from app.models.core import Role, User
+from app.models.core import Role, User, user_roles
+from app.models.players import Player
 from app.utils.discord_request_handler import make_discord_request
 
 logger = logging.getLogger(__name__)
 
 
+# Bulk sync executor: add/remove calls in flight at once, and attempts per call
+# when the route answers 429.
+ROLE_SYNC_CONCURRENCY = 4
+ROLE_SYNC_MAX_ATTEMPTS = 3
+
+
+class RouteRateLimit:
+    """
+    Rate limit for one route, driven by the headers on its responses.
+
+    Discord reports a route's remaining budget on every response
+    (X-RateLimit-Remaining, X-RateLimit-Reset-After) and how long to back off
+    on a 429 (Retry-After). Callers reserve a request with acquire() before
+    sending and hand the response to update(). While the budget is unknown --
+    no headers seen yet, or the window has reset -- requests go straight
+    through and the executor's concurrency cap is the only limit.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self._clock = clock
+        self._sleep = sleep
+        self._remaining: Optional[int] = None
+        self._reset_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until the route has budget for one request. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                if self._reset_at is not None and now >= self._reset_at:
+                    self._remaining = None
+                    self._reset_at = None
+                if self._remaining is None or self._remaining > 0:
+                    if self._remaining is not None:
+                        self._remaining -= 1
+                    return waited
+                delay = self._reset_at - now
+            self._sleep(delay)
+            waited += delay
+
+    def update(self, status: int, headers: Optional[Dict[str, str]]) -> None:
+        """Record the budget a response reported."""
+        headers = headers or {}
+        try:
+            if status == 429:
+                remaining, reset_after = 0, float(headers.get('Retry-After', 1))
+            elif 'X-RateLimit-Remaining' in headers:
+                remaining = int(headers['X-RateLimit-Remaining'])
+                reset_after = float(headers.get('X-RateLimit-Reset-After', 1))
+            else:
+                return
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            reset_at = self._clock() + reset_after
+            # Responses land out of order; within a window the lowest count wins.
+            if self._remaining is None or status == 429:
+                self._remaining = remaining
+            else:
+                self._remaining = min(self._remaining, remaining)
+            self._reset_at = max(self._reset_at or 0.0, reset_at)
+
+
+@dataclass
+class RoleSyncOperation:
+    """One planned Discord role change."""
+    action: str              # 'add' | 'remove'
+    discord_user_id: str
+    username: Optional[str] = None
+
+
+@dataclass
+class RoleSyncPlan:
+    """The minimal set of changes that brings one Discord role in line with its Flask role."""
+    role_id: int
+    role_name: str
+    discord_role_id: str
+    total_users: int = 0        # users with the Flask role
+    skipped: int = 0            # ...without a linked Discord account
+    already_synced: int = 0     # ...who already hold the Discord role
+    unmanaged: int = 0          # role holders not linked to any account (left alone)
+    members_known: bool = True  # False if the holder list could not be read
+    to_add: List[RoleSyncOperation] = field(default_factory=list)
+    to_remove: List[RoleSyncOperation] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'role_id': self.role_id,
+            'role_name': self.role_name,
+            'discord_role_id': self.discord_role_id,
+            'total_users': self.total_users,
+            'skipped': self.skipped,
+            'already_synced': self.already_synced,
+            'unmanaged': self.unmanaged,
+            'members_known': self.members_known,
+            'to_add': [asdict(op) for op in self.to_add],
+            'to_remove': [asdict(op) for op in self.to_remove],
+        }
+
+
 class DiscordRoleSyncService:
     """
     Service for bidirectional synchronization between Flask roles and Discord roles.
@@ -89,22 +197,30 @@ class DiscordRoleSyncService:
         Returns:
             List of member dictionaries with id, username, etc.
         """
+        return self._fetch_role_members(discord_role_id) or []
+
+    def _fetch_role_members(self, discord_role_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Members holding a Discord role, or None if the bot could not say."""
         if not discord_role_id:
-            return []
+            return None
 
         try:
             url = f"{self.bot_api_url}/api/discord/roles/{discord_role_id}/members"
             response = requests.get(url, timeout=self.REQUEST_TIMEOUT)
 
             if response.status_code == 200:
-                return response.json().get('members', [])
+                body = response.json()
+                # The bot answers 200 with success: false when it is not ready
+                # or the role is gone; that is "unknown", not "nobody".
+                if body.get('success') is not False:
+                    return body.get('members', [])
 
             logger.error(f"Failed to get members for role {discord_role_id}")
-            return []
+            return None
 
         except Exception as e:
             logger.error(f"Error getting role members: {e}", exc_info=True)
-            return []
+            return None
 
     # -------------------------------------------------------------------------
     # Individual User Sync
@@ -258,16 +374,137 @@ class DiscordRoleSyncService:
     # -------------------------------------------------------------------------
     # Bulk Sync Operations
     # -------------------------------------------------------------------------
+    #
+    # A bulk sync is planned, then executed. The plan compares who SHOULD hold
+    # the Discord role (linked users with the Flask role) against who DOES (one
+    # get_role_members call), so members who already have it cost nothing. The
+    # executor sends only the difference, a few requests at a time, paced by
+    # the rate-limit headers on each response rather than a fixed sleep.
+
+    def plan_role_sync(self, role: Role) -> 'RoleSyncPlan':
+        """
+        Work out the Discord changes that would bring a role in line with Flask.
+
+        Additions are linked users with the Flask role who lack the Discord
+        role. Removals are Discord members holding the role whose account is
+        linked to a user WITHOUT the Flask role; members not linked to any
+        account are counted as unmanaged and never touched.
 
-    def sync_flask_role_to_discord(self, role: Role) -> Dict[str, Any]:
+        Args:
+            role: The Flask Role object to plan for
+
+        Returns:
+            RoleSyncPlan
+        """
+        rows = (db.session.query(User.id, User.username, Player.discord_id)
+                .join(user_roles, user_roles.c.user_id == User.id)
+                .outerjoin(Player, Player.user_id == User.id)
+                .filter(user_roles.c.role_id == role.id)
+                .all())
+        wanted: Dict[str, str] = {}
+        linked_users = set()
+        all_users = set()
+        for user_id, username, discord_id in rows:
+            all_users.add(user_id)
+            if discord_id:
+                linked_users.add(user_id)
+                wanted.setdefault(str(discord_id), username)
+
+        plan = RoleSyncPlan(
+            role_id=role.id,
+            role_name=role.name,
+            discord_role_id=role.discord_role_id,
+            total_users=len(all_users),
+            skipped=len(all_users - linked_users),
+        )
+
+        members = self._fetch_role_members(role.discord_role_id)
+        if members is None:
+            # Current holders unknown: fall back to adding everyone (adds are
+            # idempotent) and plan no removals.
+            logger.warning(f"Could not read members of Discord role {role.discord_role_id}; "
+                           f"planning '{role.name}' as add-only")
+            plan.members_known = False
+            plan.to_add = [RoleSyncOperation('add', did, name) for did, name in wanted.items()]
+            return plan
+
+        held = {str(m.get('id')): m.get('username') for m in members if m.get('id')}
+        plan.already_synced = len(held.keys() & wanted.keys())
+        plan.to_add = [RoleSyncOperation('add', did, name)
+                       for did, name in wanted.items() if did not in held]
+
+        extra = [did for did in held if did not in wanted]
+        owners = {}
+        if extra:
+            owners = dict(db.session.query(Player.discord_id, User.username)
+                          .join(User, User.id == Player.user_id)
+                          .filter(Player.discord_id.in_(extra))
+                          .all())
+        plan.to_remove = [RoleSyncOperation('remove', did, owners[did])
+                          for did in extra if did in owners]
+        plan.unmanaged = len(extra) - len(plan.to_remove)
+        return plan
+
+    def execute_role_sync_plan(
+        self,
+        plan: 'RoleSyncPlan',
+        prune: bool = False,
+        limits: Optional[Dict[str, 'RouteRateLimit']] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a plan's operations concurrently within per-route rate limits.
+
+        Args:
+            plan: The plan from plan_role_sync
+            prune: Also perform the planned removals (additions only otherwise)
+            limits: Route -> RouteRateLimit, to share pacing across several plans
+
+        Returns:
+            Dictionary with added, removed, failed and errors
+        """
+        operations = list(plan.to_add) + (list(plan.to_remove) if prune else [])
+        results = {'added': 0, 'removed': 0, 'failed': 0, 'errors': []}
+        if not operations:
+            return results
+
+        limits = limits if limits is not None else {}
+        for action in ('add', 'remove'):
+            limits.setdefault(action, RouteRateLimit())
+
+        workers = max(1, min(ROLE_SYNC_CONCURRENCY, len(operations)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='role-sync') as executor:
+            outcomes = list(executor.map(
+                lambda op: self._send_role_change(op, plan.discord_role_id, limits[op.action]),
+                operations))
+
+        for op, (success, message) in zip(operations, outcomes):
+            if success:
+                results['added' if op.action == 'add' else 'removed'] += 1
+            else:
+                results['failed'] += 1
+                results['errors'].append({'user': op.username or op.discord_user_id,
+                                          'action': op.action, 'error': message})
+        return results
+
+    def sync_flask_role_to_discord(
+        self,
+        role: Role,
+        dry_run: bool = False,
+        prune: bool = False,
+        limits: Optional[Dict[str, 'RouteRateLimit']] = None
+    ) -> Dict[str, Any]:
         """
         Sync all users with a Flask role to have the corresponding Discord role.
 
         Args:
             role: The Flask Role object to sync
+            dry_run: Only report the planned operations; send nothing
+            prune: Also remove the Discord role from linked users without the
+                Flask role (see plan_role_sync)
+            limits: Route -> RouteRateLimit, shared across roles by sync_all_mapped_roles
 
         Returns:
-            Dictionary with sync results
+            Dictionary with sync results ('plan' holds the planned operations)
         """
         if not role.discord_role_id:
             return {
@@ -283,48 +520,43 @@ class DiscordRoleSyncService:
 
         results = {
             'success': True,
+            'dry_run': dry_run,
             'total_users': 0,
             'synced': 0,
+            'already_synced': 0,
+            'added': 0,
+            'removed': 0,
             'skipped': 0,
             'failed': 0,
             'errors': []
         }
 
         try:
-            # Get all users with this Flask role
-            users_with_role = role.users
-            results['total_users'] = len(users_with_role)
-
-            for user in users_with_role:
-                discord_id = self._get_user_discord_id(user)
-
-                if not discord_id:
-                    results['skipped'] += 1
-                    continue
-
-                success, message = self.assign_discord_role_to_user(
-                    discord_id,
-                    role.discord_role_id
+            plan = self.plan_role_sync(role)
+            results['total_users'] = plan.total_users
+            results['skipped'] = plan.skipped
+            results['already_synced'] = plan.already_synced
+            results['plan'] = plan.to_dict()
+
+            if dry_run:
+                results['synced'] = plan.already_synced
+                logger.info(
+                    f"Dry run for role '{role.name}': {len(plan.to_add)} to add, "
+                    f"{len(plan.to_remove)} to remove, {plan.already_synced} already synced"
                 )
+                return results
 
-                if success:
-                    results['synced'] += 1
-                else:
-                    results['failed'] += 1
-                    results['errors'].append({
-                        'user': user.username,
-                        'error': message
-                    })
-
-                # Rate limiting - small delay between API calls
-                time.sleep(0.5)
+            executed = self.execute_role_sync_plan(plan, prune=prune, limits=limits)
+            results.update(executed)
+            results['synced'] = plan.already_synced + executed['added']
 
             # Update last synced timestamp
             role.last_synced_at = datetime.utcnow()
             db.session.commit()
 
             logger.info(
-                f"Synced role '{role.name}': {results['synced']}/{results['total_users']} users, "
+                f"Synced role '{role.name}': {results['synced']}/{results['total_users']} users "
+                f"({results['added']} added, {results['removed']} removed), "
                 f"{results['skipped']} skipped, {results['failed']} failed"
             )
 
@@ -335,15 +567,20 @@ class DiscordRoleSyncService:
 
         return results
 
-    def sync_all_mapped_roles(self) -> Dict[str, Any]:
+    def sync_all_mapped_roles(self, dry_run: bool = False, prune: bool = False) -> Dict[str, Any]:
         """
         Sync all Flask roles that have Discord mappings.
 
+        Args:
+            dry_run: Only report each role's planned operations
+            prune: Also perform planned removals (see plan_role_sync)
+
         Returns:
             Dictionary with overall sync results
         """
         results = {
             'success': True,
+            'dry_run': dry_run,
             'roles_processed': 0,
             'roles_synced': 0,
             'roles_failed': 0,
@@ -359,8 +596,11 @@ class DiscordRoleSyncService:
 
             results['roles_processed'] = len(mapped_roles)
 
+            # Every role goes through the same bot routes, so they share limits.
+            limits: Dict[str, RouteRateLimit] = {}
             for role in mapped_roles:
-                role_result = self.sync_flask_role_to_discord(role)
+                role_result = self.sync_flask_role_to_discord(
+                    role, dry_run=dry_run, prune=prune, limits=limits)
 
                 results['details'].append({
                     'role_name': role.name,
@@ -372,9 +612,6 @@ class DiscordRoleSyncService:
                 else:
                     results['roles_failed'] += 1
 
-                # Rate limiting between roles
-                time.sleep(1)
-
             logger.info(
                 f"Bulk role sync complete: {results['roles_synced']}/{results['roles_processed']} roles synced"
             )
@@ -386,6 +623,37 @@ class DiscordRoleSyncService:
 
         return results
 
+    def _send_role_change(
+        self,
+        op: 'RoleSyncOperation',
+        discord_role_id: str,
+        limit: 'RouteRateLimit'
+    ) -> Tuple[bool, str]:
+        """One add/remove call for the executor, retried after a 429."""
+        url = f"{self.bot_api_url}/api/discord/roles/{'assign' if op.action == 'add' else 'remove'}"
+        payload = {'user_id': op.discord_user_id, 'role_id': discord_role_id}
+        for _ in range(ROLE_SYNC_MAX_ATTEMPTS):
+            limit.acquire()
+            try:
+                response = requests.post(url, json=payload, timeout=self.REQUEST_TIMEOUT)
+            except Exception as e:
+                return False, str(e)
+            limit.update(response.status_code, response.headers)
+            if response.status_code == 429:
+                continue
+            if response.status_code != 200:
+                return False, f"HTTP {response.status_code}: {response.text}"
+            # The bot reports its own failures (member left, bot not ready)
+            # with a 200 and success: false.
+            try:
+                body = response.json()
+            except ValueError:
+                body = {}
+            if isinstance(body, dict) and body.get('success') is False:
+                return False, body.get('error') or 'Rejected by the bot'
+            return True, 'OK'
+        return False, 'Rate limited'
+
     # -------------------------------------------------------------------------
     # Role Mapping Management
     # -------------------------------------------------------------------------
@@ -8,6 +8,7 @@ personalizing content, and tracking progress.
 """
 
 import logging
+import re
 from datetime import datetime
 
 from sqlalchemy import select, or_
@@ -47,6 +48,42 @@ def _display_name(player, user):
     return (getattr(user, 'username', None) or '').strip()
 
 
+PERSONALIZATION_TOKENS = ('{name}', '{first_name}', '{team}', '{league}', '{season}')
+_TOKEN_RE = re.compile('(' + '|'.join(re.escape(t) for t in PERSONALIZATION_TOKENS) + ')')
+
+
+def _token_values(name, team_name='', league_name='', season_name=''):
+    """Personalization token -> value for one recipient."""
+    return {
+        '{name}': name,
+        '{first_name}': name.split()[0] if name else '',
+        '{team}': team_name,
+        '{league}': league_name,
+        '{season}': season_name,
+    }
+
+
+class CompiledEmail:
+    """
+    A campaign's subject and final HTML, split once around personalization
+    tokens so each recipient's copy is a single join rather than a template
+    render, linkify pass and five string replaces.
+    """
+
+    def __init__(self, subject, html):
+        self._subject = _TOKEN_RE.split(subject or '')
+        self._html = _TOKEN_RE.split(html or '')
+
+    @staticmethod
+    def _fill(parts, values):
+        # re.split with a capture group puts the tokens at the odd indexes.
+        return ''.join(values[part] if i % 2 else part for i, part in enumerate(parts))
+
+    def render(self, values):
+        """(subject, html) for one recipient's token values."""
+        return self._fill(self._subject, values), self._fill(self._html, values)
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -465,12 +502,6 @@ class EmailBroadcastService:
         player = (session.query(Player).filter(Player.user_id == user_id)
                   .order_by(Player.id).first())
 
-        # Real name first. User.username is a LOGIN handle ("george_courville"),
-        # not a name -- greeting someone with it reads as a mail-merge failure.
-        # Player.name is the human name we collect at registration; fall back to
-        # the username only when there is no player row at all.
-        name = _display_name(player, user)
-        first_name = name.split()[0] if name else ''
         team_name = ''
         league_name = ''
         season_name = ''
@@ -487,13 +518,11 @@ class EmailBroadcastService:
                     if league.season:
                         season_name = league.season.name
 
-        replacements = {
-            '{name}': name,
-            '{first_name}': first_name,
-            '{team}': team_name,
-            '{league}': league_name,
-            '{season}': season_name,
-        }
+        # Real name first. User.username is a LOGIN handle ("george_courville"),
+        # not a name -- greeting someone with it reads as a mail-merge failure.
+        # Player.name is the human name we collect at registration; fall back to
+        # the username only when there is no player row at all.
+        replacements = _token_values(_display_name(player, user), team_name, league_name, season_name)
 
         p_subject = subject
         p_body = body
@@ -503,6 +532,58 @@ class EmailBroadcastService:
 
         return p_subject, p_body
 
+    def load_personalization_context(self, session, user_ids, chunk_size=500):
+        """
+        Bulk version of personalize_content's lookups for a whole campaign.
+
+        One pass over users, players, teams and leagues (chunked IN queries)
+        instead of up to five queries per recipient. Player choice and name
+        fallback match personalize_content exactly.
+
+        Args:
+            session: Database session.
+            user_ids (iterable[int]): Recipients' user IDs.
+
+        Returns:
+            dict: {user_id: {'email': str|None, 'values': {token: value}}}.
+                Users that no longer exist are absent.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        users, players = {}, {}
+        for i in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[i:i + chunk_size]
+            for user in session.query(User).filter(User.id.in_(chunk)):
+                users[user.id] = user
+            rows = (session.query(Player.user_id, Player.name, Player.primary_team_id,
+                                  Player.primary_league_id)
+                    .filter(Player.user_id.in_(chunk))
+                    .order_by(Player.id))
+            for row in rows:
+                players.setdefault(row.user_id, row)
+
+        team_ids = {p.primary_team_id for p in players.values() if p.primary_team_id}
+        league_ids = {p.primary_league_id for p in players.values() if p.primary_league_id}
+        team_names = dict(session.query(Team.id, Team.name).filter(Team.id.in_(team_ids))) if team_ids else {}
+        leagues = {}
+        if league_ids:
+            rows = (session.query(League.id, League.name, Season.name)
+                    .outerjoin(Season, League.season_id == Season.id)
+                    .filter(League.id.in_(league_ids)))
+            leagues = {league_id: (name, season_name or '') for league_id, name, season_name in rows}
+
+        context = {}
+        for user_id, user in users.items():
+            player = players.get(user_id)
+            team_name = league_name = season_name = ''
+            if player:
+                team_name = team_names.get(player.primary_team_id, '')
+                league_name, season_name = leagues.get(player.primary_league_id, ('', ''))
+            context[user_id] = {
+                'email': user.email,
+                'values': _token_values(_display_name(player, user), team_name, league_name, season_name),
+            }
+        return context
+
     def get_campaign_progress(self, session, campaign_id):
         """
         Get campaign progress counts.
@@ -0,0 +1,332 @@
+# app/services/email_delivery.py
+
+"""
+Email Delivery Engine
+=====================
+
+Concurrent, rate-limited delivery for personalized email broadcasts.
+
+A small pool of workers each holds ONE persistent transport for the whole
+campaign -- a Gmail API service (the default) or an SMTP session -- instead
+of rebuilding credentials and connections for every message. A shared
+TokenBucket (see notification_delivery) caps messages per second across the
+pool, with a burst allowance, in place of fixed sleeps between sends.
+
+Workers never touch the database. Outcomes stream back to the calling
+thread, which owns the session: it hands them to an on_results callback in
+batches (so recipient statuses are written a batch per transaction) and polls
+a should_cancel callback between batches. Cancelling stops workers from
+taking new messages; anything already sent is still reported, anything not
+yet taken is left untouched (still 'pending').
+
+Transports are chosen by EMAIL_BROADCAST_TRANSPORT ('gmail' or 'smtp'); the
+SMTP transport is also what tests drive against a local sink.
+"""
+
+import logging
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Iterable, List, Optional
+
+from app.services.notification_delivery import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutgoingEmail:
+    """One rendered message. key identifies it to on_results (a recipient row id)."""
+    key: Any
+    to: str
+    subject: str
+    html: str
+
+
+@dataclass
+class DeliveryOutcome:
+    """Result of one send, reported back to the caller's thread."""
+    key: Any
+    ok: bool
+    error: Optional[str] = None
+    sent_at: Optional[datetime] = None
+
+
+@dataclass
+class EmailDeliverySummary:
+    """Totals for one deliver() call."""
+    sent: int = 0
+    failed: int = 0
+    cancelled: bool = False
+    throttled_seconds: float = 0.0
+    elapsed: float = 0.0
+
+
+class EmailTransport:
+    """A persistent connection to a mail provider, owned by one worker."""
+
+    def open(self):
+        pass
+
+    def send_email(self, to, subject, html):
+        """Send one message. Returns a truthy value on success; may raise."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class GmailTransport(EmailTransport):
+    """Gmail API with the delegated service account; the service is built once."""
+
+    def __init__(self):
+        self._service = None
+
+    def open(self):
+        from app.email import build_gmail_service
+        self._service = build_gmail_service()
+        if self._service is None:
+            raise RuntimeError('Gmail service unavailable')
+
+    def send_email(self, to, subject, html):
+        from app.email import build_message, send_with_service
+        return send_with_service(self._service, build_message(to, subject, html))
+
+    def close(self):
+        self._service = None
+
+
+class SmtpTransport(EmailTransport):
+    """One SMTP session kept open across messages; reconnects once if dropped."""
+
+    def __init__(self, host, port=587, username=None, password=None,
+                 use_tls=True, sender=None, timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.sender = sender
+        self.timeout = timeout
+        self._smtp = None
+
+    def open(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or '')
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp = smtp
+
+    def send_email(self, to, subject, html):
+        from app.email import build_message
+        message = build_message(to, subject, html)
+        if self.sender:
+            message.replace_header('from', self.sender)
+        try:
+            self._smtp.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            self.close()
+            self.open()
+            self._smtp.send_message(message)
+        return True
+
+    def close(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            self._smtp.close()
+        self._smtp = None
+
+
+def transport_factory_from_config(config) -> Callable[[], EmailTransport]:
+    """Transport factory for EMAIL_BROADCAST_TRANSPORT ('gmail' unless set to 'smtp')."""
+    if (config.get('EMAIL_BROADCAST_TRANSPORT') or 'gmail').lower() == 'smtp':
+        settings = dict(
+            host=config.get('SMTP_SERVER'),
+            port=int(config.get('SMTP_PORT') or 587),
+            username=config.get('SMTP_USERNAME'),
+            password=config.get('SMTP_PASSWORD'),
+            use_tls=bool(config.get('SMTP_USE_TLS', True)),
+            sender=config.get('SMTP_SENDER'),
+        )
+        return lambda: SmtpTransport(**settings)
+    return GmailTransport
+
+
+class _MessageSource:
+    """Hands messages from one iterable to many workers."""
+
+    def __init__(self, messages: Iterable[OutgoingEmail]):
+        self._iterator = iter(messages)
+        self._lock = threading.Lock()
+
+    def next(self) -> Optional[OutgoingEmail]:
+        with self._lock:
+            return next(self._iterator, None)
+
+
+class EmailDeliveryEngine:
+    """
+    Send rendered messages over a pool of persistent transports.
+
+    Usage:
+        engine = EmailDeliveryEngine.from_config(current_app.config)
+        summary = engine.deliver(messages, on_results=write_statuses,
+                                 should_cancel=campaign_was_cancelled)
+
+    deliver() blocks until every message is sent or the send is cancelled.
+    on_results and should_cancel always run on the calling thread.
+    """
+
+    def __init__(self, transport_factory: Callable[[], EmailTransport],
+                 connections: int = 3, rate_per_second: float = 2.0, burst: int = 5,
+                 status_batch_size: int = 25, flush_interval: float = 2.0):
+        self.transport_factory = transport_factory
+        self.connections = max(1, connections)
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.status_batch_size = max(1, status_batch_size)
+        self.flush_interval = flush_interval
+
+    @classmethod
+    def from_config(cls, config) -> 'EmailDeliveryEngine':
+        return cls(
+            transport_factory_from_config(config),
+            connections=int(config.get('EMAIL_BROADCAST_CONNECTIONS', 3)),
+            rate_per_second=float(config.get('EMAIL_BROADCAST_RATE_PER_SECOND', 2.0)),
+            burst=int(config.get('EMAIL_BROADCAST_BURST', 5)),
+            status_batch_size=int(config.get('EMAIL_BROADCAST_STATUS_BATCH', 25)),
+        )
+
+    def deliver(self, messages: Iterable[OutgoingEmail],
+                on_results: Callable[[List[DeliveryOutcome]], None],
+                should_cancel: Optional[Callable[[], bool]] = None) -> EmailDeliverySummary:
+        """
+        Send every message, reporting outcomes in batches.
+
+        Args:
+            messages: OutgoingEmail items; consumed lazily by the workers, so a
+                generator is fine as long as it does not touch the database.
+            on_results: called with each batch of DeliveryOutcome
+            should_cancel: polled after every batch (and every flush_interval)
+
+        Returns:
+            EmailDeliverySummary
+        """
+        app = None
+        try:
+            from flask import current_app, has_app_context
+            if has_app_context():
+                app = current_app._get_current_object()
+        except ImportError:
+            pass
+
+        summary = EmailDeliverySummary()
+        source = _MessageSource(messages)
+        results: 'queue.Queue[DeliveryOutcome]' = queue.Queue()
+        stop = threading.Event()
+        bucket = TokenBucket(self.rate_per_second, self.burst)
+        waited = [0.0] * self.connections
+        started = time.perf_counter()
+
+        executor = ThreadPoolExecutor(max_workers=self.connections,
+                                      thread_name_prefix='email-broadcast')
+        try:
+            futures = [executor.submit(self._run_worker, app, index, source, bucket,
+                                       results, stop, waited)
+                       for index in range(self.connections)]
+            pending: List[DeliveryOutcome] = []
+            last_flush = time.monotonic()
+            while True:
+                workers_done = all(f.done() for f in futures)
+                try:
+                    pending.append(results.get(timeout=0.1))
+                except queue.Empty:
+                    if workers_done:
+                        break
+                now = time.monotonic()
+                if len(pending) < self.status_batch_size and now - last_flush < self.flush_interval:
+                    continue
+                self._flush(pending, on_results, summary)
+                pending = []
+                last_flush = now
+                if should_cancel and not stop.is_set() and should_cancel():
+                    logger.info("Email delivery cancelled; waiting for in-flight sends")
+                    summary.cancelled = True
+                    stop.set()
+            self._flush(pending, on_results, summary)
+            for future in futures:
+                future.result()
+        finally:
+            stop.set()
+            executor.shutdown(wait=True)
+
+        summary.throttled_seconds = sum(waited)
+        summary.elapsed = time.perf_counter() - started
+        return summary
+
+    @staticmethod
+    def _flush(outcomes: List[DeliveryOutcome], on_results, summary: EmailDeliverySummary):
+        if not outcomes:
+            return
+        on_results(outcomes)
+        for outcome in outcomes:
+            if outcome.ok:
+                summary.sent += 1
+            else:
+                summary.failed += 1
+
+    def _run_worker(self, app, index, source, bucket, results, stop, waited):
+        if app is not None:
+            with app.app_context():
+                self._worker_loop(index, source, bucket, results, stop, waited)
+        else:
+            self._worker_loop(index, source, bucket, results, stop, waited)
+
+    def _worker_loop(self, index, source, bucket, results, stop, waited):
+        transport = None
+        try:
+            while not stop.is_set():
+                message = source.next()
+                if message is None:
+                    return
+                waited[index] += bucket.acquire()
+                if stop.is_set():
+                    return  # cancelled while throttled: leave it unsent
+                try:
+                    if transport is None:
+                        transport = self.transport_factory()
+                        transport.open()
+                    sent = transport.send_email(message.to, message.subject, message.html)
+                except Exception as e:
+                    logger.error(f"Email to recipient {message.key} failed: {e}")
+                    if transport is not None:
+                        self._close(transport)
+                        transport = None  # reopen for the next message
+                    results.put(DeliveryOutcome(message.key, False, str(e) or 'Send failed'))
+                    continue
+                if sent:
+                    results.put(DeliveryOutcome(message.key, True, sent_at=datetime.utcnow()))
+                else:
+                    results.put(DeliveryOutcome(message.key, False, 'Send failed'))
+        finally:
+            if transport is not None:
+                self._close(transport)
+
+    @staticmethod
+    def _close(transport: EmailTransport):
+        try:
+            transport.close()
+        except Exception as e:
+            logger.debug(f"Error closing email transport: {e}")
@@ -0,0 +1,124 @@
+# app/services/etag_versions.py
+
+"""
+Dependency version counters for mobile API ETags.
+
+make_etag_response hashes the fully built payload, so a 304 still costs every
+query and every row serialization the endpoint does. Instead, each data domain
+a mobile endpoint reads from has a small Redis counter that is bumped after any
+commit writing to it:
+
+    matches   matches, schedule, player_event, ecs_fc_matches, ecs_fc_player_events
+    rsvps     availability, ecs_fc_availability
+    teams     team, league, season, standings, player_teams, player_team_season,
+              player_season_stats, player_career_stats, admin_config, and
+              player rows whose team-facing columns change
+    profile:<user_id>
+              users / player rows owned by that user
+    profiles  Core DML on users/player/user_roles, where the owner is unknown
+
+An endpoint reads its counters BEFORE touching the database and hashes them with
+the user id and query string (etag_utils.version_etag). A matching If-None-Match
+returns 304 with no session at all. Reading the counters first is what keeps
+this safe: a write committing mid-request can only make the body newer than its
+ETag, which costs one extra download on the next request, never a stale 304.
+
+Writes the commit_marks tracker can't see (raw text() SQL) should call bump()
+themselves; the Pacific date in every ETag bounds the staleness of anything
+missed to one day. The same goes for deploys that change a payload's shape:
+bump its scopes, or clients keep validating the old body until the date rolls
+over.
+
+The counters are a version_counters.CounterSet keyed by scope.
+"""
+
+from sqlalchemy.orm.attributes import get_history
+
+from app.services import commit_marks
+from app.services.version_counters import CounterSet
+
+MATCHES = 'matches'
+RSVPS = 'rsvps'
+TEAMS = 'teams'
+PROFILES = 'profiles'
+
+VERSION_PREFIX = 'etag:v:'
+
+TABLE_SCOPES = {
+    'matches': (MATCHES,),
+    'schedule': (MATCHES,),
+    'player_event': (MATCHES,),
+    'ecs_fc_matches': (MATCHES,),
+    'ecs_fc_player_events': (MATCHES,),
+    'availability': (RSVPS,),
+    'ecs_fc_availability': (RSVPS,),
+    'team': (TEAMS,),
+    'league': (TEAMS,),
+    'season': (TEAMS,),
+    'standings': (TEAMS,),
+    'player_teams': (TEAMS,),
+    'player_team_season': (TEAMS,),
+    'player_season_stats': (TEAMS,),
+    'player_career_stats': (TEAMS,),
+    'admin_config': (TEAMS,),  # make_teams_public and friends gate team visibility
+    'user_roles': (PROFILES,),
+}
+
+# Tables whose rows belong to one user: ORM writes bump that user's profile
+# scope, bulk writes (owner unknown) bump PROFILES.
+_OWNED_TABLES = ('users', 'player')
+
+# Player attributes that show up in team payloads (rosters, stats, coach gating).
+# Other Player writes (preferences, Discord sync bookkeeping) only touch the
+# owner's profile, so they don't churn every team ETag.
+PLAYER_TEAM_ATTRIBUTES = ('name', 'primary_team_id', 'teams', 'is_coach', 'jersey_number',
+                          'profile_picture_url', 'league_id', 'is_current_player')
+
+
+_counters = CounterSet(VERSION_PREFIX, 'etag versions')
+
+
+def profile_scope(user_id):
+    return f'profile:{user_id}'
+
+
+def bump(scopes, redis_client=None):
+    """Invalidate every ETag depending on any of these scopes."""
+    return _counters.bump(scopes, redis_client=redis_client)
+
+
+def get_versions(scopes, redis_client=None):
+    """Current counter per scope, seeding missing ones. None if Redis is unavailable."""
+    return _counters.read(scopes, redis_client=redis_client)
+
+
+# -----------------------------------------------------------------------------
+# Commit marks: scopes collected at flush, bumped after commit.
+# -----------------------------------------------------------------------------
+
+def _instance_scopes(session, instance):
+    table = getattr(getattr(instance, '__table__', None), 'name', None)
+    scopes = set(TABLE_SCOPES.get(table, ()))
+    if table == 'users' and instance.id is not None:
+        scopes.add(profile_scope(instance.id))
+    elif table == 'player':
+        if instance.user_id is not None:
+            scopes.add(profile_scope(instance.user_id))
+        if instance not in session.dirty or any(
+                get_history(instance, attr).has_changes() for attr in PLAYER_TEAM_ATTRIBUTES):
+            scopes.add(TEAMS)
+    return scopes
+
+
+def _statement_scopes(table, orm_execute_state):
+    """session.execute(update(...)), player_teams.insert() and friends."""
+    scopes = set(TABLE_SCOPES.get(table, ()))
+    if table in _OWNED_TABLES:
+        scopes.add(PROFILES)
+        if table == 'player':
+            scopes.add(TEAMS)
+    return scopes
+
+
+commit_marks.track('etag_scopes', publish=bump,
+                   on_instance=_instance_scopes, on_statement=_statement_scopes)
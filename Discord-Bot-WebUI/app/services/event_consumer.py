@@ -625,6 +625,40 @@ class DiscordEmbedUpdater(EventConsumer):
             return False
 
 
+class ParticipationRollupUpdater(EventConsumer):
+    """
+    Event consumer that keeps the participation rollup current as RSVPs change.
+
+    Only marks the (player, match) dirty -- no database work here. The
+    participation rollup flush coalesces marks per row and recomputes them
+    (see app/services/participation_rollup.py).
+    """
+
+    def __init__(self, redis_service=None):
+        config = ConsumerConfig(
+            consumer_name="participation_rollup_updater",
+            consumer_group="participation_rollups",
+            stream_name="rsvp:analytics",
+            batch_size=50,  # Marking is a single ZADD, so take big batches
+            poll_timeout=5000,
+            processing_timeout=5
+        )
+        super().__init__(config, redis_service)
+
+    async def process_event(self, event: RSVPEvent, raw_data: Dict[str, Any]) -> bool:
+        """Mark the rollup row(s) behind this RSVP dirty."""
+        if event.is_no_op():
+            return True
+        try:
+            from app.services.participation_rollup import mark_dirty, rsvp_member
+
+            mark_dirty([rsvp_member(event.player_id, event.match_id)])
+            return True
+        except Exception as e:
+            logger.error(f"❌ Participation rollup mark error for event {event.event_id}: {e}")
+            return False
+
+
 # Consumer registry for management
 _consumers: Dict[str, EventConsumer] = {}
 
@@ -699,10 +733,12 @@ async def initialize_default_consumers():
     # Create default consumers
     websocket_broadcaster = WebSocketBroadcaster()
     discord_updater = DiscordEmbedUpdater()
+    participation_updater = ParticipationRollupUpdater()
     
     # Register consumers
     await register_consumer(websocket_broadcaster)
     await register_consumer(discord_updater)
+    await register_consumer(participation_updater)
     
     logger.info("✅ Default consumers initialized")
     
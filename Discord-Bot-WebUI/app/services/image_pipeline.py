@@ -0,0 +1,473 @@
+# app/services/image_pipeline.py
+
+"""
+Image Optimization Pipeline
+===========================
+
+Bulk engine behind ImageCacheService.bulk_optimize_images.
+
+Optimizing one image is three very different kinds of work: a network wait
+(download), CPU (decode + resize + encode) and a few small file/DB writes. The
+old loop did all three in series per player, so re-optimizing a roster after a
+season import took minutes and held a worker the whole time. The pipeline runs
+them as stages. Download and render are fed by bounded queues, so a slow stage
+applies back-pressure instead of buffering the whole roster in memory; the
+status queue is unbounded (it holds at most one small outcome per player) so
+render callbacks, which run on the pool's own threads, never block on it:
+
+    jobs --[fetch queue]--> download threads (one pooled HTTP session)
+         --[render queue]--> dispatcher --> transform pool (processes)
+         --[status queue]--> caller thread, which batches cache-status writes
+
+Variants are content-addressed: they are stored under a hash of the source
+bytes plus the render spec, so the same photo shared by several players (or
+re-imported next season) is rendered once and reused -- within a run via the
+in-flight map, across runs because the files already exist on disk. Jobs are
+keyed by source URL, so a URL shared by several players is also downloaded
+once.
+
+The transform pool is a persistent per-process ProcessPoolExecutor, created on
+first use and reused by every later run, and rebuilt if a child dies and
+breaks it. Where a child process can't be started (e.g. inside a daemonic
+worker), it falls back to threads; Pillow releases the GIL for most of the
+resize/encode work, so that still overlaps.
+"""
+
+import atexit
+import hashlib
+import io
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_SOURCE_BYTES = 15 * 1024 * 1024
+
+_SENTINEL = object()
+
+
+@dataclass(frozen=True)
+class RenderSpec:
+    """Sizes and qualities of the variants; part of the content hash."""
+    thumbnail_size: Tuple[int, int] = (80, 80)
+    medium_size: Tuple[int, int] = (200, 200)
+    jpeg_quality: int = 90
+    webp_quality: int = 85
+
+    def tag(self) -> str:
+        return (f'{self.thumbnail_size[0]}x{self.thumbnail_size[1]}:'
+                f'{self.medium_size[0]}x{self.medium_size[1]}:'
+                f'{self.jpeg_quality}:{self.webp_quality}')
+
+
+@dataclass
+class ImageJob:
+    """One source image and every player that uses it."""
+    url: str
+    player_ids: List[int]
+
+
+@dataclass
+class ImageOutcome:
+    """Result for one player; the status stage turns these into cache-row updates."""
+    player_id: int
+    ok: bool
+    content_hash: Optional[str] = None
+    width: int = 0
+    height: int = 0
+    file_size: int = 0
+    reused: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class ImagePipelineSummary:
+    success: int = 0
+    failed: int = 0
+    downloaded: int = 0
+    rendered: int = 0
+    reused: int = 0
+    status_batches: int = 0
+    elapsed: float = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {k: getattr(self, k) for k in self.__dataclass_fields__}
+
+
+# -----------------------------------------------------------------------------
+# Transform (runs in the worker pool -- must stay a picklable top-level function)
+# -----------------------------------------------------------------------------
+
+def render_variants(data: bytes, spec: RenderSpec) -> Dict[str, object]:
+    """Decode a source image and encode the thumbnail / medium JPEG and WebP."""
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    if image.mode in ('RGBA', 'LA', 'P'):
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+        rgb_image = Image.new('RGB', image.size, (255, 255, 255))
+        rgb_image.paste(image, mask=image.split()[-1])
+        image = rgb_image
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    def encode(img, fmt, quality):
+        out = io.BytesIO()
+        img.save(out, fmt, quality=quality, optimize=True)
+        return out.getvalue()
+
+    thumbnail = image.copy()
+    thumbnail.thumbnail(spec.thumbnail_size, Image.Resampling.LANCZOS)
+    medium = image.copy()
+    medium.thumbnail(spec.medium_size, Image.Resampling.LANCZOS)
+    return {
+        'thumbnail': encode(thumbnail, 'JPEG', spec.jpeg_quality),
+        'medium': encode(medium, 'JPEG', spec.jpeg_quality),
+        'webp': encode(medium, 'WEBP', spec.webp_quality),
+        'width': medium.width,
+        'height': medium.height,
+    }
+
+
+def content_hash(data: bytes, spec: RenderSpec) -> str:
+    digest = hashlib.sha256(data)
+    digest.update(spec.tag().encode())
+    return digest.hexdigest()[:40]
+
+
+class VariantStore:
+    """Content-addressed variant files under the player image cache directory."""
+
+    LAYOUT = {'thumbnail': ('thumbnails', 'jpg'), 'medium': ('medium', 'jpg'), 'webp': ('webp', 'webp')}
+
+    def __init__(self, cache_dir: Path, url_prefix: str = '/static/img/cache/players'):
+        self.cache_dir = Path(cache_dir)
+        self.url_prefix = url_prefix.rstrip('/')
+
+    def path(self, variant: str, digest: str) -> Path:
+        folder, ext = self.LAYOUT[variant]
+        return self.cache_dir / folder / f'{digest}.{ext}'
+
+    def url(self, variant: str, digest: str) -> str:
+        folder, ext = self.LAYOUT[variant]
+        return f'{self.url_prefix}/{folder}/{digest}.{ext}'
+
+    def urls(self, digest: str) -> Dict[str, str]:
+        return {variant: self.url(variant, digest) for variant in self.LAYOUT}
+
+    def lookup(self, digest: str) -> Optional[Tuple[int, int, int]]:
+        """(width, height, medium file size) if every variant is already stored."""
+        if not all(self.path(variant, digest).exists() for variant in self.LAYOUT):
+            return None
+        from PIL import Image
+        medium = self.path('medium', digest)
+        try:
+            with Image.open(medium) as img:
+                width, height = img.size
+            return width, height, medium.stat().st_size
+        except OSError:
+            return None
+
+    def save(self, digest: str, rendered: Dict[str, object]) -> int:
+        """Write the variants (atomically, so readers never see half a file)."""
+        for variant in self.LAYOUT:
+            target = self.path(variant, digest)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(f'.{target.name}.{os.getpid()}.{threading.get_ident()}')
+            tmp.write_bytes(rendered[variant])
+            os.replace(tmp, target)
+        return len(rendered['medium'])
+
+
+# -----------------------------------------------------------------------------
+# Persistent transform pool
+# -----------------------------------------------------------------------------
+
+_pool_lock = threading.Lock()
+_pool = None
+_pool_key = None
+
+
+def _thread_pool(workers: int) -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=max(1, workers or os.cpu_count() or 1),
+                              thread_name_prefix='image-transform')
+
+
+def _is_broken(pool) -> bool:
+    """A ProcessPoolExecutor whose child died refuses every later submit."""
+    return bool(getattr(pool, '_broken', False))
+
+
+def get_transform_pool(workers: int):
+    """
+    Per-process pool reused across runs; threads if processes are unavailable
+    or workers <= 0. A broken process pool is replaced.
+    """
+    global _pool, _pool_key
+    key = (os.getpid(), workers)
+    with _pool_lock:
+        if _pool is not None and _pool_key == key and not _is_broken(_pool):
+            return _pool
+        if _pool is not None:
+            if _is_broken(_pool):
+                logger.warning("Image transform pool is broken; starting a new one")
+            _pool.shutdown(wait=False, cancel_futures=True)
+        if workers <= 0:
+            pool = _thread_pool(workers)
+        else:
+            try:
+                pool = ProcessPoolExecutor(max_workers=workers)
+                pool.submit(int, 0).result(timeout=30)  # surface start-up failures here
+            except Exception as e:
+                logger.warning(f"Image transform pool falling back to threads: {e}")
+                pool = _thread_pool(workers)
+        _pool, _pool_key = pool, key
+        return pool
+
+
+def shutdown_transform_pool():
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool, _pool_key = None, None
+
+
+atexit.register(shutdown_transform_pool)
+
+
+# -----------------------------------------------------------------------------
+# Fetch
+# -----------------------------------------------------------------------------
+
+class ImageFetcher:
+    """Loads source bytes: /static/ paths from disk, http(s) over one pooled session."""
+
+    def __init__(self, pool_size: int = 8, timeout: float = 10.0, static_root: str = 'app/static'):
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.timeout = timeout
+        self.static_root = static_root
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def fetch(self, url: str) -> bytes:
+        if url.startswith('/static/'):
+            from app.utils.path_validator import validate_path_within_directory
+            path = Path(validate_path_within_directory(str(Path('app') / url.lstrip('/')),
+                                                       self.static_root))
+            if path.stat().st_size > MAX_SOURCE_BYTES:
+                raise ValueError(f'source larger than {MAX_SOURCE_BYTES} bytes')
+            return path.read_bytes()
+        if not url.startswith('http'):
+            raise ValueError(f'unsupported image URL: {url}')
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            chunks, size = [], 0
+            for chunk in response.iter_content(64 * 1024):
+                size += len(chunk)
+                if size > MAX_SOURCE_BYTES:
+                    raise ValueError(f'source larger than {MAX_SOURCE_BYTES} bytes')
+                chunks.append(chunk)
+            return b''.join(chunks)
+
+    def close(self):
+        self.session.close()
+
+
+# -----------------------------------------------------------------------------
+# Pipeline
+# -----------------------------------------------------------------------------
+
+class ImagePipeline:
+    """
+    Concurrent download -> transform -> status pipeline over bounded queues.
+
+    run() blocks the calling thread, which owns the status stage: on_results is
+    always invoked from it, with at most status_batch_size outcomes per call, so
+    the caller can use its own database session there.
+    """
+
+    def __init__(self, store: VariantStore, spec: RenderSpec = RenderSpec(),
+                 download_workers: int = 8, transform_workers: int = 2,
+                 queue_size: int = 32, status_batch_size: int = 50,
+                 fetcher: Optional[ImageFetcher] = None, transform_pool=None):
+        self.store = store
+        self.spec = spec
+        self.download_workers = max(1, download_workers)
+        self.transform_workers = transform_workers
+        self.queue_size = max(1, queue_size)
+        self.status_batch_size = max(1, status_batch_size)
+        self.fetcher = fetcher
+        self.transform_pool = transform_pool
+
+    def run(self, jobs: List[ImageJob],
+            on_results: Callable[[List[ImageOutcome]], None]) -> ImagePipelineSummary:
+        summary = ImagePipelineSummary()
+        started = time.perf_counter()
+        expected = sum(len(job.player_ids) for job in jobs)
+        if not expected:
+            return summary
+
+        own_fetcher = self.fetcher is None
+        fetcher = self.fetcher or ImageFetcher(pool_size=self.download_workers)
+        pools = [self.transform_pool or get_transform_pool(self.transform_workers)]
+
+        fetch_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        render_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        # Unbounded: outcomes are put from future callbacks, which must not block.
+        status_q: queue.Queue = queue.Queue()
+        counters_lock = threading.Lock()
+        in_flight = threading.BoundedSemaphore(max(1, self.transform_workers) * 2)
+
+        def emit_failure(job, error):
+            for player_id in job.player_ids:
+                status_q.put(ImageOutcome(player_id, ok=False, error=error))
+
+        def feed():
+            for job in jobs:
+                fetch_q.put(job)
+            for _ in range(self.download_workers):
+                fetch_q.put(_SENTINEL)
+
+        def download():
+            while True:
+                job = fetch_q.get()
+                if job is _SENTINEL:
+                    render_q.put(_SENTINEL)
+                    return
+                try:
+                    data = fetcher.fetch(job.url)
+                    if not data:
+                        raise ValueError('empty image')
+                except Exception as e:
+                    logger.warning(f"Failed to load image {job.url}: {e}")
+                    emit_failure(job, f'download: {e}')
+                    continue
+                with counters_lock:
+                    summary.downloaded += 1
+                render_q.put((job, data))
+
+        waiting: Dict[str, List[ImageJob]] = {}
+        waiting_lock = threading.Lock()
+
+        def finish(digest, meta=None, error=None, reused=False):
+            with waiting_lock:
+                waiters = waiting.pop(digest, [])
+            for job in waiters:
+                if error:
+                    emit_failure(job, error)
+                    continue
+                width, height, size = meta
+                for player_id in job.player_ids:
+                    status_q.put(ImageOutcome(player_id, ok=True, content_hash=digest, width=width,
+                                              height=height, file_size=size, reused=reused))
+
+        def rendered(digest, future):
+            try:
+                result = future.result()
+                size = self.store.save(digest, result)
+                with counters_lock:
+                    summary.rendered += 1
+                finish(digest, (result['width'], result['height'], size))
+            except Exception as e:
+                logger.warning(f"Failed to render image {digest}: {e}")
+                finish(digest, error=f'render: {e}')
+            finally:
+                in_flight.release()
+
+        def dispatch():
+            remaining = self.download_workers
+            while remaining:
+                item = render_q.get()
+                if item is _SENTINEL:
+                    remaining -= 1
+                    continue
+                job, data = item
+                try:
+                    submit(job, data)
+                except Exception as e:
+                    logger.warning(f"Failed to dispatch image {job.url}: {e}")
+                    emit_failure(job, f'dispatch: {e}')
+
+        def submit(job, data):
+            digest = content_hash(data, self.spec)
+            with waiting_lock:
+                if digest in waiting:
+                    # Same bytes already being rendered for another URL.
+                    waiting[digest].append(job)
+                    with counters_lock:
+                        summary.reused += len(job.player_ids)
+                    return
+                waiting[digest] = [job]
+            stored = self.store.lookup(digest)
+            if stored is not None:
+                with counters_lock:
+                    summary.reused += len(job.player_ids)
+                finish(digest, stored, reused=True)
+                return
+            in_flight.acquire()
+            try:
+                try:
+                    future = pools[0].submit(render_variants, data, self.spec)
+                except BrokenProcessPool:
+                    if self.transform_pool is not None:
+                        raise
+                    # A child died mid-run; carry on with a fresh shared pool.
+                    pools[0] = get_transform_pool(self.transform_workers)
+                    future = pools[0].submit(render_variants, data, self.spec)
+            except Exception as e:
+                in_flight.release()
+                finish(digest, error=f'render: {e}')
+                return
+            future.add_done_callback(lambda f, d=digest: rendered(d, f))
+
+        threads = [threading.Thread(target=feed, name='image-feed', daemon=True),
+                   threading.Thread(target=dispatch, name='image-dispatch', daemon=True)]
+        threads += [threading.Thread(target=download, name=f'image-download-{i}', daemon=True)
+                    for i in range(self.download_workers)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            pending: List[ImageOutcome] = []
+            received = 0
+            while received < expected:
+                outcome = status_q.get()
+                received += 1
+                pending.append(outcome)
+                if outcome.ok:
+                    summary.success += 1
+                else:
+                    summary.failed += 1
+                if len(pending) >= self.status_batch_size:
+                    self._flush(pending, on_results, summary)
+                    pending = []
+            self._flush(pending, on_results, summary)
+        finally:
+            for thread in threads:
+                thread.join(timeout=5)
+            if own_fetcher:
+                fetcher.close()
+
+        summary.elapsed = time.perf_counter() - started
+        return summary
+
+    @staticmethod
+    def _flush(outcomes: List[ImageOutcome], on_results, summary: ImagePipelineSummary):
+        if not outcomes:
+            return
+        on_results(outcomes)
+        summary.status_batches += 1
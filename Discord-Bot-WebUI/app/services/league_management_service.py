@@ -1123,13 +1123,11 @@ class LeagueManagementService:
             return []
 
     def search_players_by_name(self, name_query: str, limit: int = 20) -> List[Dict[str, Any]]:
-        """Search for players by name (case-insensitive partial match)."""
-        from app.models import Player
+        """Search for players by name, username, Discord username or team (ranked, see player_search_index)."""
+        from app.services.player_search_index import search_players
 
         try:
-            players = self.session.query(Player).filter(
-                Player.name.ilike(f'%{name_query}%')
-            ).limit(limit).all()
+            players = search_players(self.session, name_query, limit=limit)
 
             return [
                 {
@@ -0,0 +1,158 @@
+# app/services/live_session_registry.py
+
+"""
+Change feed for live reporting sessions.
+
+RealtimeReportingService used to reload every active LiveReportingSession, and
+one or two MLSMatch rows per session, from Postgres on every polling tick. It
+now keeps its session set from a Redis stream instead:
+
+- A commit_marks tracker collects LiveReportingSession rows that were created,
+  deleted, (de)activated, or had their match/thread/competition changed at
+  flush, and appends one stream entry per session after commit. That
+  covers every start/stop site -- the match scheduler, admin routes,
+  live_reporting_helpers and the service's own deactivation -- without each of
+  them publishing by hand.
+- The service reads new entries each tick (one Redis round trip), loads a
+  started session and its match once, and drops a stopped one.
+- A full reconciliation against the database every few minutes catches
+  anything the stream missed (Redis down at commit time, raw SQL).
+
+Entries carry action ('start' | 'stop' | 'reconcile'), session_id and match_id.
+Core/bulk DML on live_reporting_sessions publishes 'reconcile', since the rows
+it touched are unknown.
+"""
+
+import logging
+
+from sqlalchemy.orm.attributes import get_history
+
+from app.services import commit_marks
+from app.utils.redis_manager import get_app_redis
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = 'live_reporting:session_events'
+# Approximate cap; readers are at most a reconciliation interval behind.
+STREAM_MAXLEN = 1000
+
+START = 'start'
+STOP = 'stop'
+RECONCILE = 'reconcile'
+
+# Columns the realtime service reads from a session row. Bookkeeping writes
+# (last_update, update_count, last_event_keys, ...) happen every poll and
+# must not echo back as registry events.
+SESSION_ATTRIBUTES = ('is_active', 'match_id', 'thread_id', 'competition')
+_SESSION_COLUMNS = set(SESSION_ATTRIBUTES)
+
+
+def _text(value):
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def publish(events, redis_client=None):
+    """Append (action, session_id, match_id) entries to the stream."""
+    events = list(events)
+    if not events:
+        return 0
+    r = redis_client or get_app_redis()
+    if r is None:
+        return 0
+    try:
+        pipe = r.pipeline()
+        for action, session_id, match_id in events:
+            pipe.xadd(STREAM_KEY, {'action': action, 'session_id': session_id or '',
+                                   'match_id': match_id or ''},
+                      maxlen=STREAM_MAXLEN, approximate=True)
+        pipe.execute()
+    except Exception:
+        # The realtime service's periodic reconciliation picks these up.
+        logger.warning(f"live session registry: could not publish {len(events)} event(s)", exc_info=True)
+        return 0
+    return len(events)
+
+
+def stream_tail(redis_client=None):
+    """Id of the newest entry, to read from after a full reload ('0-0' if none)."""
+    r = redis_client or get_app_redis()
+    if r is None:
+        return '0-0'
+    try:
+        entries = r.xrevrange(STREAM_KEY, count=1)
+    except Exception:
+        logger.debug("live session registry: stream unavailable", exc_info=True)
+        return '0-0'
+    if not isinstance(entries, (list, tuple)) or not entries:
+        return '0-0'
+    return _text(entries[0][0])
+
+
+def read_events(last_id, redis_client=None, count=100):
+    """
+    Entries after last_id, without blocking. Returns (events, new_last_id);
+    events are dicts with action, session_id (int or None) and match_id.
+    """
+    r = redis_client or get_app_redis()
+    if r is None:
+        return [], last_id
+    try:
+        response = r.xread({STREAM_KEY: last_id}, count=count)
+    except Exception:
+        logger.debug("live session registry: stream unavailable", exc_info=True)
+        return [], last_id
+    if isinstance(response, dict):  # RESP3
+        response = list(response.items())
+    if not isinstance(response, (list, tuple)):
+        return [], last_id
+
+    events = []
+    for _, entries in response:
+        for entry_id, fields in entries:
+            last_id = _text(entry_id)
+            fields = {_text(k): _text(v) for k, v in (fields or {}).items()}
+            session_id = fields.get('session_id')
+            events.append({
+                'action': fields.get('action'),
+                'session_id': int(session_id) if session_id and session_id.isdigit() else None,
+                'match_id': fields.get('match_id') or None,
+            })
+    return events, last_id
+
+
+# -----------------------------------------------------------------------------
+# Commit marks: {session_id: (action, match_id)} collected at flush, published
+# after commit.
+# -----------------------------------------------------------------------------
+
+def _instance_events(session, instance):
+    if getattr(getattr(instance, '__table__', None), 'name', None) != 'live_reporting_sessions' \
+            or instance.id is None:
+        return ()
+    if instance in session.dirty and not any(
+            get_history(instance, attr).has_changes() for attr in SESSION_ATTRIBUTES):
+        return ()
+    # Loaded state only: after_flush must not lazy-load expired columns.
+    state = instance.__dict__
+    active = instance not in session.deleted and state.get('is_active', True) is not False
+    return ((instance.id, (START if active else STOP, state.get('match_id'))),)
+
+
+def _statement_events(table, orm_execute_state):
+    """Bulk DML can't name the sessions it touched; ask for a reconciliation."""
+    if table != 'live_reporting_sessions':
+        return ()
+    if orm_execute_state.is_update:
+        columns = commit_marks.statement_columns(orm_execute_state)
+        if columns and not columns & _SESSION_COLUMNS:
+            return ()
+    return ((RECONCILE, (RECONCILE, None)),)
+
+
+def _publish_events(pending):
+    publish((action, None if key == RECONCILE else key, match_id)
+            for key, (action, match_id) in pending.items())
+
+
+commit_marks.track('live_sessions', publish=_publish_events, factory=dict,
+                   on_instance=_instance_events, on_statement=_statement_events)
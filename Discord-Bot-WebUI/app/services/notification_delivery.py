@@ -0,0 +1,266 @@
+# app/services/notification_delivery.py
+
+"""
+Notification Delivery Engine
+============================
+
+Parallel, rate-aware fan-out used by NotificationOrchestrator.
+
+Recipients are grouped by channel (push, email, sms, discord) and each channel
+runs on its own worker pool at the same time as the others, so one slow
+provider (SMTP, Twilio) no longer holds up the rest. Per channel:
+
+- recipients are split into provider-sized batches (users per FCM multicast;
+  email/SMS/Discord DMs are one recipient per call);
+- a token bucket caps batches per second, with a burst allowance;
+- a concurrency limit caps in-flight provider calls.
+
+Each channel returns a ChannelDeliveryResult summary (success/failure counts,
+batches, time spent waiting on the rate limit, wall time).
+
+FakeChannelProvider simulates a provider's latency and failure rate so the
+engine can be load-tested offline (see tests/performance).
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A channel sender takes one batch of recipients and returns (success, failure).
+BatchSender = Callable[[List[Any]], Tuple[int, int]]
+
+
+@dataclass
+class ChannelPolicy:
+    """Throughput limits for one delivery channel."""
+    max_concurrency: int = 4        # provider calls in flight at once
+    rate_per_second: float = 10.0   # batches started per second (sustained)
+    burst: int = 10                 # batches that may start back-to-back
+    batch_size: int = 1             # recipients per provider call
+
+
+# Defaults sized to each provider's limits. Push recipients are user ids: FCM
+# multicast caps at 500 tokens per request, so 250 users leaves room for
+# several devices each (the push sender splits any overflow). Gmail API and
+# Twilio throttle per second; the bot's DM endpoint forwards to Discord, which
+# rate-limits DMs per bot.
+DEFAULT_CHANNEL_POLICIES: Dict[str, ChannelPolicy] = {
+    'push': ChannelPolicy(max_concurrency=4, rate_per_second=20.0, burst=4, batch_size=250),
+    'email': ChannelPolicy(max_concurrency=8, rate_per_second=10.0, burst=20),
+    'sms': ChannelPolicy(max_concurrency=4, rate_per_second=10.0, burst=10),
+    'discord': ChannelPolicy(max_concurrency=5, rate_per_second=10.0, burst=10),
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: rate tokens/second, holding at most burst."""
+
+    def __init__(self, rate: float, burst: int,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token; returns how long the caller must wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            # Negative balance: this caller is queued behind the deficit.
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """Block until a token is available. Returns seconds spent waiting."""
+        wait = self._reserve()
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+@dataclass
+class ChannelDeliveryResult:
+    """Per-channel summary of one fan-out."""
+    channel: str
+    recipients: int = 0
+    success: int = 0
+    failure: int = 0
+    batches: int = 0
+    throttled_seconds: float = 0.0
+    elapsed: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'recipients': self.recipients,
+            'success': self.success,
+            'failure': self.failure,
+            'batches': self.batches,
+            'throttled_seconds': round(self.throttled_seconds, 3),
+            'elapsed': round(self.elapsed, 3),
+        }
+
+
+class DeliveryEngine:
+    """
+    Fan recipients out across channels concurrently.
+
+    Usage:
+        engine = DeliveryEngine()
+        summaries = engine.deliver(
+            {'email': ['a@x.com', 'b@x.com'], 'push': [1, 2, 3]},
+            {'email': send_email_batch, 'push': send_push_batch},
+        )
+        summaries['email'].success
+
+    When called inside a Flask app context, every worker runs in its own app
+    context for the same app, so senders can use the database and config.
+    """
+
+    def __init__(self, policies: Optional[Dict[str, ChannelPolicy]] = None):
+        self.policies = dict(DEFAULT_CHANNEL_POLICIES)
+        if policies:
+            self.policies.update(policies)
+        # Buckets live as long as the engine so back-to-back sends share one
+        # rate limit per provider.
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    def policy(self, channel: str) -> ChannelPolicy:
+        return self.policies.get(channel) or ChannelPolicy()
+
+    def _bucket(self, channel: str) -> TokenBucket:
+        with self._buckets_lock:
+            bucket = self._buckets.get(channel)
+            if bucket is None:
+                policy = self.policy(channel)
+                bucket = TokenBucket(policy.rate_per_second, policy.burst)
+                self._buckets[channel] = bucket
+            return bucket
+
+    @staticmethod
+    def _batches(recipients: Sequence[Any], size: int) -> List[List[Any]]:
+        size = max(1, size)
+        return [list(recipients[i:i + size]) for i in range(0, len(recipients), size)]
+
+    def deliver(self, plan: Dict[str, Sequence[Any]],
+                senders: Dict[str, BatchSender]) -> Dict[str, ChannelDeliveryResult]:
+        """
+        Send every channel's recipients, all channels in parallel.
+
+        Args:
+            plan: channel -> recipients (whatever that channel's sender accepts)
+            senders: channel -> callable(batch) returning (success, failure)
+
+        Returns:
+            channel -> ChannelDeliveryResult, for every channel in plan
+        """
+        app = None
+        try:
+            from flask import current_app, has_app_context
+            if has_app_context():
+                app = current_app._get_current_object()
+        except ImportError:
+            pass
+
+        results: Dict[str, ChannelDeliveryResult] = {}
+        executors = []
+        futures = []
+        started = time.perf_counter()
+        try:
+            for channel, recipients in plan.items():
+                summary = ChannelDeliveryResult(channel=channel, recipients=len(recipients))
+                results[channel] = summary
+                if not recipients:
+                    continue
+                policy = self.policy(channel)
+                batches = self._batches(list(recipients), policy.batch_size)
+                executor = ThreadPoolExecutor(
+                    max_workers=max(1, min(policy.max_concurrency, len(batches))),
+                    thread_name_prefix=f'notify-{channel}',
+                )
+                executors.append(executor)
+                bucket = self._bucket(channel)
+                for batch in batches:
+                    futures.append((summary, executor.submit(
+                        self._run_batch, app, bucket, senders[channel], channel, batch, started)))
+
+            for summary, future in futures:
+                success, failure, waited, finished = future.result()
+                summary.success += success
+                summary.failure += failure
+                summary.batches += 1
+                summary.throttled_seconds += waited
+                summary.elapsed = max(summary.elapsed, finished)
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True)
+        return results
+
+    @staticmethod
+    def _run_batch(app, bucket: TokenBucket, sender: BatchSender, channel: str,
+                   batch: List[Any], started: float) -> Tuple[int, int, float, float]:
+        waited = bucket.acquire()
+        try:
+            if app is not None:
+                with app.app_context():
+                    success, failure = sender(batch)
+            else:
+                success, failure = sender(batch)
+        except Exception as e:
+            logger.error(f"{channel} batch of {len(batch)} failed: {e}", exc_info=True)
+            success, failure = 0, len(batch)
+        return success, failure, waited, time.perf_counter() - started
+
+
+@dataclass
+class FakeChannelProvider:
+    """
+    Offline stand-in for a delivery provider.
+
+    Sleeps latency (+/- jitter) per call and fails each recipient with
+    probability failure_rate. Records calls and the peak number of calls in
+    flight, so load tests can check the engine's concurrency limits.
+    """
+    latency: float = 0.05
+    jitter: float = 0.0
+    failure_rate: float = 0.0
+    seed: Optional[int] = None
+    calls: List[int] = field(default_factory=list)
+    peak_in_flight: int = 0
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.call_times: List[float] = []
+
+    def send(self, batch: List[Any]) -> Tuple[int, int]:
+        with self._lock:
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+            self.calls.append(len(batch))
+            self.call_times.append(time.monotonic())
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            failures = sum(1 for _ in batch if self._rng.random() < self.failure_rate)
+        try:
+            time.sleep(delay)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        return len(batch) - failures, failures
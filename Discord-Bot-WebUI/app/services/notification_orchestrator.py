@@ -23,13 +23,33 @@ import json
 import logging
 import os
 import re
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Optional, Any
 from enum import Enum
 from dataclasses import dataclass, field
 
+from prometheus_client import Histogram
+
+from app.services.notification_delivery import DeliveryEngine
+
 logger = logging.getLogger(__name__)
 
+# Database statements issued by one orchestrator.send(). Preferences, contacts
+# and FCM tokens are bulk-loaded, so this should stay flat as recipients grow.
+NOTIFICATION_DB_QUERIES = Histogram(
+    'notification_db_queries',
+    'Database queries issued per notification send',
+    ['notification_type'],
+    buckets=(1, 2, 3, 5, 8, 13, 21, 50, 100, 250),
+)
+
+# Simulator/debug builds register placeholder tokens FCM would reject.
+DEBUG_TOKEN_PREFIX = 'DEBUG_SIMULATOR_TOKEN_'
+
+# FCM rejects a multicast message with more tokens than this.
+FCM_MULTICAST_LIMIT = 500
+
 
 def _format_when_phrase(opponent: str, match_date, match_time: str, today) -> str:
     """Build the opener for a single-match reminder based on the real date."""
@@ -255,6 +275,7 @@ class NotificationOrchestrator:
         self._push_service = None
         self._db = None
         self.bot_api_url = os.getenv('BOT_API_URL', 'http://discord-bot:5001')
+        self.delivery_engine = DeliveryEngine()
 
     def _get_push_service(self):
         """Lazy load push notification service"""
@@ -268,6 +289,28 @@ class NotificationOrchestrator:
         from app.core import db
         return db
 
+    @contextmanager
+    def _count_queries(self):
+        """Count ORM statements (queries and lazy loads) issued on the current
+        session while the block runs. Yields {'count': n}."""
+        counter = {'count': 0}
+
+        def _on_execute(orm_execute_state):
+            counter['count'] += 1
+
+        try:
+            from sqlalchemy import event
+            session = self._get_db().session()
+            event.listen(session, 'do_orm_execute', _on_execute)
+        except Exception:
+            # No app context / session: nothing to count.
+            session = None
+        try:
+            yield counter
+        finally:
+            if session is not None:
+                event.remove(session, 'do_orm_execute', _on_execute)
+
     def send(self, payload: NotificationPayload) -> Dict[str, Any]:
         """
         Send notification through appropriate channels.
@@ -280,7 +323,8 @@ class NotificationOrchestrator:
         falls back to sending through all enabled channels.
 
         Returns:
-            Dict with results for each channel
+            Dict with results for each channel, plus 'db_queries': the number
+            of ORM statements this send issued
         """
         results = {
             'in_app': {'created': 0, 'skipped': 0},
@@ -295,56 +339,60 @@ class NotificationOrchestrator:
             logger.warning("No user IDs provided for notification")
             return results
 
-        try:
-            # Get user preferences and contact info
-            users_with_prefs = self._get_users_with_preferences(payload.user_ids)
-
-            # In-App Notification. Always created in legacy mode; when an
-            # explicit channel allow-list is set, only if 'in_app' is listed.
-            if self._channel_allowed(payload, 'in_app'):
-                for user_id, preferences in users_with_prefs.items():
-                    if self._should_send_in_app(payload, preferences):
-                        if self._create_in_app_notification(user_id, payload):
-                            results['in_app']['created'] += 1
+        with self._count_queries() as queries:
+            try:
+                # Get user preferences and contact info
+                users_with_prefs = self._get_users_with_preferences(payload.user_ids)
+
+                # In-App Notification. Always created in legacy mode; when an
+                # explicit channel allow-list is set, only if 'in_app' is listed.
+                if self._channel_allowed(payload, 'in_app'):
+                    for user_id, preferences in users_with_prefs.items():
+                        if self._should_send_in_app(payload, preferences):
+                            if self._create_in_app_notification(user_id, payload):
+                                results['in_app']['created'] += 1
+                            else:
+                                results['in_app']['skipped'] += 1
                         else:
                             results['in_app']['skipped'] += 1
-                    else:
-                        results['in_app']['skipped'] += 1
-            else:
-                results['in_app']['skipped'] = len(users_with_prefs)
-
-            # Determine delivery mode. An explicit channel allow-list always
-            # uses all-channels dispatch restricted to the listed channels.
-            use_tiered = (
-                payload.channels is None
-                and payload.tiered
-                and not payload.skip_preferences
-                and not self._has_force_overrides(payload)
-            )
+                else:
+                    results['in_app']['skipped'] = len(users_with_prefs)
+
+                # Determine delivery mode. An explicit channel allow-list always
+                # uses all-channels dispatch restricted to the listed channels.
+                use_tiered = (
+                    payload.channels is None
+                    and payload.tiered
+                    and not payload.skip_preferences
+                    and not self._has_force_overrides(payload)
+                )
 
-            if use_tiered:
-                self._send_tiered(payload, users_with_prefs, results)
-            else:
-                self._send_all_channels(payload, users_with_prefs, results)
-
-            # Track analytics
-            self._track_notification_sent(payload, results)
-
-            tier_label = "tiered" if use_tiered else "all-channels"
-            logger.info(
-                f"Notification sent ({tier_label}): type={payload.notification_type.value}, "
-                f"in_app={results['in_app']['created']}, "
-                f"push={results['push']['success']}, "
-                f"email={results['email']['success']}, "
-                f"sms={results['sms']['success']}, "
-                f"discord={results['discord']['success']}"
-            )
+                if use_tiered:
+                    self._send_tiered(payload, users_with_prefs, results)
+                else:
+                    self._send_all_channels(payload, users_with_prefs, results)
+
+                # Track analytics
+                self._track_notification_sent(payload, results)
+
+                tier_label = "tiered" if use_tiered else "all-channels"
+                logger.info(
+                    f"Notification sent ({tier_label}): type={payload.notification_type.value}, "
+                    f"in_app={results['in_app']['created']}, "
+                    f"push={results['push']['success']}, "
+                    f"email={results['email']['success']}, "
+                    f"sms={results['sms']['success']}, "
+                    f"discord={results['discord']['success']}"
+                )
 
-            return results
+            except Exception as e:
+                logger.error(f"Error in notification orchestrator: {e}", exc_info=True)
 
-        except Exception as e:
-            logger.error(f"Error in notification orchestrator: {e}", exc_info=True)
-            return results
+        results['db_queries'] = queries['count']
+        NOTIFICATION_DB_QUERIES.labels(
+            notification_type=payload.notification_type.value
+        ).observe(queries['count'])
+        return results
 
     def send_async(self, payload: NotificationPayload) -> Dict[str, Any]:
         """Enqueue delivery on Celery so the caller returns immediately.
@@ -396,12 +444,7 @@ class NotificationOrchestrator:
         """
         # 1. Push (highest priority) - need preferences + active FCM tokens
         if self._should_send_push(payload, preferences):
-            from app.models.notifications import UserFCMToken
-            db = self._get_db()
-            has_tokens = db.session.query(UserFCMToken.id).filter_by(
-                user_id=user_id, is_active=True
-            ).first() is not None
-            if has_tokens:
+            if self._has_active_tokens(user_id, preferences):
                 return 'push'
 
         # 2. Discord DM
@@ -418,6 +461,21 @@ class NotificationOrchestrator:
 
         return None
 
+    def _has_active_tokens(self, user_id: int, preferences: Dict) -> bool:
+        """Does the user have any active FCM token?
+
+        Uses the tokens preloaded by _get_users_with_preferences; preference
+        dicts built elsewhere (no 'fcm_tokens' key) fall back to a query.
+        """
+        tokens = preferences.get('fcm_tokens')
+        if tokens is not None:
+            return bool(tokens)
+        from app.models.notifications import UserFCMToken
+        db = self._get_db()
+        return db.session.query(UserFCMToken.id).filter_by(
+            user_id=user_id, is_active=True
+        ).first() is not None
+
     def _send_tiered(self, payload: NotificationPayload, users_with_prefs: Dict, results: Dict):
         """
         Send notifications using tiered delivery.
@@ -453,51 +511,32 @@ class NotificationOrchestrator:
                 if self._should_send_discord(payload, prefs) and prefs.get('discord_id'):
                     also_discord.append((user_id, prefs))
             for user_id, prefs in tier_discord:
-                if self._should_send_push(payload, prefs):
-                    from app.models.notifications import UserFCMToken
-                    db = self._get_db()
-                    has_tokens = db.session.query(UserFCMToken.id).filter_by(
-                        user_id=user_id, is_active=True
-                    ).first() is not None
-                    if has_tokens:
-                        also_push.append(user_id)
+                if self._should_send_push(payload, prefs) and self._has_active_tokens(user_id, prefs):
+                    also_push.append(user_id)
 
         # Push (batch all push recipients)
         push_uids = [uid for uid, _ in tier_push]
         if also_push:
             push_uids.extend(also_push)
-        if push_uids:
-            push_results = self._send_push_notifications(push_uids, payload)
-            results['push']['success'] = push_results.get('success', 0)
-            results['push']['failure'] = push_results.get('failure', 0)
-        results['push']['skipped'] = len(users_with_prefs) - len(push_uids)
 
-        # Discord (tier + cross-sends from push tier)
+        # Discord (tier + cross-sends from push tier). A tier member missing the
+        # contact detail counts as a failure, not a skip.
         all_discord = list(tier_discord) + also_discord
-        for user_id, prefs in all_discord:
-            discord_id = prefs.get('discord_id')
-            if discord_id and self._send_discord_notification(discord_id, payload):
-                results['discord']['success'] += 1
-            else:
-                results['discord']['failure'] += 1
-        results['discord']['skipped'] = len(users_with_prefs) - len(all_discord)
+        plan = {
+            'push': push_uids,
+            'discord': [prefs['discord_id'] for _, prefs in all_discord if prefs.get('discord_id')],
+            'email': [prefs['email'] for _, prefs in tier_email if prefs.get('email')],
+            'sms': [(prefs['phone'], user_id) for user_id, prefs in tier_sms if prefs.get('phone')],
+        }
+        results['discord']['failure'] += len(all_discord) - len(plan['discord'])
+        results['email']['failure'] += len(tier_email) - len(plan['email'])
+        results['sms']['failure'] += len(tier_sms) - len(plan['sms'])
 
-        # Email
-        for user_id, prefs in tier_email:
-            email = prefs.get('email')
-            if email and self._send_email_notification(email, payload):
-                results['email']['success'] += 1
-            else:
-                results['email']['failure'] += 1
-        results['email']['skipped'] = len(users_with_prefs) - len(tier_email)
+        self._deliver(payload, plan, users_with_prefs, results)
 
-        # SMS (last resort)
-        for user_id, prefs in tier_sms:
-            phone = prefs.get('phone')
-            if phone and self._send_sms_notification(phone, user_id, payload):
-                results['sms']['success'] += 1
-            else:
-                results['sms']['failure'] += 1
+        results['push']['skipped'] = len(users_with_prefs) - len(push_uids)
+        results['discord']['skipped'] = len(users_with_prefs) - len(all_discord)
+        results['email']['skipped'] = len(users_with_prefs) - len(tier_email)
         results['sms']['skipped'] = len(users_with_prefs) - len(tier_sms)
 
     def _send_all_channels(self, payload: NotificationPayload, users_with_prefs: Dict, results: Dict):
@@ -508,100 +547,127 @@ class NotificationOrchestrator:
         or an explicit channel allow-list is present (payload.channels), which
         restricts dispatch to the listed channels.
         """
+        plan = {}
+        contact_checks = {
+            'email': (self._should_send_email, lambda uid, prefs: prefs.get('email')),
+            'sms': (self._should_send_sms,
+                    lambda uid, prefs: (prefs['phone'], uid) if prefs.get('phone') else None),
+            'discord': (self._should_send_discord, lambda uid, prefs: prefs.get('discord_id')),
+        }
+
         # Push Notifications (batch for efficiency)
         if self._channel_allowed(payload, 'push'):
-            push_user_ids = [
+            plan['push'] = [
                 uid for uid, prefs in users_with_prefs.items()
                 if self._should_send_push(payload, prefs)
             ]
-
-            if push_user_ids:
-                push_results = self._send_push_notifications(push_user_ids, payload)
-                results['push']['success'] = push_results.get('success', 0)
-                results['push']['failure'] = push_results.get('failure', 0)
-
-            results['push']['skipped'] = len(payload.user_ids) - len(push_user_ids)
+            results['push']['skipped'] = len(payload.user_ids) - len(plan['push'])
         else:
             results['push']['skipped'] = len(payload.user_ids)
 
-        # Email Notifications
-        if self._channel_allowed(payload, 'email'):
+        # Email, SMS and Discord DM: users who opted out or lack the contact
+        # detail are skipped.
+        for channel, (should_send, contact) in contact_checks.items():
+            if not self._channel_allowed(payload, channel):
+                results[channel]['skipped'] = len(payload.user_ids)
+                continue
+            recipients = []
             for user_id, prefs in users_with_prefs.items():
-                if self._should_send_email(payload, prefs):
-                    email = prefs.get('email')
-                    if email:
-                        if self._send_email_notification(email, payload):
-                            results['email']['success'] += 1
-                        else:
-                            results['email']['failure'] += 1
-                    else:
-                        results['email']['skipped'] += 1
+                item = contact(user_id, prefs) if should_send(payload, prefs) else None
+                if item:
+                    recipients.append(item)
                 else:
-                    results['email']['skipped'] += 1
-        else:
-            results['email']['skipped'] = len(payload.user_ids)
+                    results[channel]['skipped'] += 1
+            plan[channel] = recipients
 
-        # SMS Notifications
-        if self._channel_allowed(payload, 'sms'):
-            for user_id, prefs in users_with_prefs.items():
-                if self._should_send_sms(payload, prefs):
-                    phone = prefs.get('phone')
-                    if phone:
-                        if self._send_sms_notification(phone, user_id, payload):
-                            results['sms']['success'] += 1
-                        else:
-                            results['sms']['failure'] += 1
-                    else:
-                        results['sms']['skipped'] += 1
-                else:
-                    results['sms']['skipped'] += 1
-        else:
-            results['sms']['skipped'] = len(payload.user_ids)
+        self._deliver(payload, plan, users_with_prefs, results)
 
-        # Discord DM Notifications
-        if self._channel_allowed(payload, 'discord'):
-            for user_id, prefs in users_with_prefs.items():
-                if self._should_send_discord(payload, prefs):
-                    discord_id = prefs.get('discord_id')
-                    if discord_id:
-                        if self._send_discord_notification(discord_id, payload):
-                            results['discord']['success'] += 1
-                        else:
-                            results['discord']['failure'] += 1
-                    else:
-                        results['discord']['skipped'] += 1
-                else:
-                    results['discord']['skipped'] += 1
-        else:
-            results['discord']['skipped'] = len(payload.user_ids)
+    def _deliver(self, payload: NotificationPayload, plan: Dict[str, List], users_with_prefs: Dict,
+                 results: Dict):
+        """
+        Fan the per-channel recipient lists out through the delivery engine.
+
+        plan maps channel -> recipients: user ids for push, emails, (phone,
+        user_id) pairs for SMS, discord ids for Discord. All channels send in
+        parallel; counts are added to results and the per-channel summaries
+        stored under results['delivery'].
+        """
+        def push(user_ids):
+            push_results = self._send_push_notifications(user_ids, payload, users_with_prefs)
+            return push_results.get('success', 0), push_results.get('failure', 0)
+
+        def one_by_one(send_one):
+            def send(batch):
+                sent = sum(1 for item in batch if send_one(item))
+                return sent, len(batch) - sent
+            return send
+
+        senders = {
+            'push': push,
+            'email': one_by_one(lambda email: self._send_email_notification(email, payload)),
+            'sms': one_by_one(lambda item: self._send_sms_notification(item[0], item[1], payload)),
+            'discord': one_by_one(lambda discord_id: self._send_discord_notification(discord_id, payload)),
+        }
+        summaries = self.delivery_engine.deliver(plan, senders)
+        for channel, summary in summaries.items():
+            results[channel]['success'] += summary.success
+            results[channel]['failure'] += summary.failure
+        results['delivery'] = {channel: summary.to_dict() for channel, summary in summaries.items()}
 
     def _get_users_with_preferences(self, user_ids: List[int]) -> Dict[int, Dict]:
-        """Get users and their notification preferences along with contact info"""
+        """Get users and their notification preferences along with contact info.
+
+        Bulk-loads in a fixed number of queries regardless of recipient count:
+        users, their player profiles, and active FCM tokens (kept under
+        'fcm_tokens' so tiering and push delivery don't query again). Emails
+        and phones are decrypted in one batch.
+        """
+        from sqlalchemy.orm import lazyload
         from app.models import User, Player
+        from app.models.notifications import UserFCMToken
+        from app.utils.pii_encryption import decrypt_values
 
         db = self._get_db()
-        users = db.session.query(User).filter(User.id.in_(user_ids)).all()
+        user_ids = list(dict.fromkeys(user_ids))
+        users = db.session.query(User).options(lazyload('*')).filter(User.id.in_(user_ids)).all()
+        if not users:
+            return {}
+        loaded_ids = [user.id for user in users]
+
+        # First player profile per user (phone number and discord_id)
+        players = {}
+        player_rows = db.session.query(
+            Player.user_id, Player.encrypted_phone, Player.discord_id,
+            Player.is_phone_verified, Player.sms_consent_given,
+        ).filter(Player.user_id.in_(loaded_ids)).order_by(Player.id).all()
+        for row in player_rows:
+            players.setdefault(row.user_id, row)
+
+        tokens = {uid: [] for uid in loaded_ids}
+        token_rows = db.session.query(UserFCMToken.user_id, UserFCMToken.fcm_token).filter(
+            UserFCMToken.user_id.in_(loaded_ids),
+            UserFCMToken.is_active == True,
+        ).all()
+        for uid, token in token_rows:
+            tokens[uid].append(token)
+
+        plaintext = decrypt_values(
+            [user.encrypted_email for user in users]
+            + [player.encrypted_phone for player in players.values()]
+        )
 
         result = {}
         for user in users:
-            # Get player profile for phone number and discord_id
-            player = db.session.query(Player).filter_by(user_id=user.id).first()
+            player = players.get(user.id)
 
-            # Get phone number from player profile
+            # Get phone number and verification status from player profile
             phone = None
             is_phone_verified = False
             sms_consent_given = False
             if player:
-                phone = player.phone
-                is_phone_verified = getattr(player, 'is_phone_verified', False)
-                sms_consent_given = getattr(player, 'sms_consent_given', False)
-                # Handle encrypted phone if needed
-                if not phone and hasattr(player, 'encrypted_phone') and player.encrypted_phone:
-                    try:
-                        from app.utils.encryption import decrypt_phone
-                        phone = decrypt_phone(player.encrypted_phone)
-                    except Exception:
-                        pass
+                phone = plaintext.get(player.encrypted_phone)
+                is_phone_verified = player.is_phone_verified
+                sms_consent_given = player.sms_consent_given
 
             # Get Discord ID from player profile
             discord_id = player.discord_id if player else None
@@ -614,9 +680,10 @@ class NotificationOrchestrator:
                 'discord_enabled': user.discord_notifications,
 
                 # Contact information
-                'email': user.email,
+                'email': plaintext.get(user.encrypted_email),
                 'phone': phone,
                 'discord_id': discord_id,
+                'fcm_tokens': tokens[user.id],
 
                 # SMS verification status (CRITICAL for legal compliance)
                 'is_phone_verified': is_phone_verified,
@@ -995,21 +1062,35 @@ class NotificationOrchestrator:
                 pass
             return False
 
-    def _send_push_notifications(self, user_ids: List[int], payload: NotificationPayload) -> Dict[str, int]:
-        """Send push notifications to users with FCM tokens"""
+    def _send_push_notifications(self, user_ids: List[int], payload: NotificationPayload,
+                                 users_with_prefs: Optional[Dict] = None) -> Dict[str, int]:
+        """Send push notifications to users with FCM tokens.
+
+        When users_with_prefs carries preloaded 'fcm_tokens' for every user,
+        no query is issued.
+        """
         try:
-            from app.models import UserFCMToken
+            if users_with_prefs is not None and all(
+                    'fcm_tokens' in users_with_prefs.get(uid, {}) for uid in user_ids):
+                token_list = [
+                    token
+                    for uid in dict.fromkeys(user_ids)
+                    for token in users_with_prefs[uid]['fcm_tokens']
+                    if token and not token.startswith(DEBUG_TOKEN_PREFIX)
+                ]
+            else:
+                from app.models import UserFCMToken
 
-            db = self._get_db()
+                db = self._get_db()
 
-            # Get active FCM tokens for users, excluding debug/simulator tokens
-            tokens = db.session.query(UserFCMToken.fcm_token).filter(
-                UserFCMToken.user_id.in_(user_ids),
-                UserFCMToken.is_active == True,
-                ~UserFCMToken.fcm_token.like('DEBUG_SIMULATOR_TOKEN_%')
-            ).all()
+                # Get active FCM tokens for users, excluding debug/simulator tokens
+                tokens = db.session.query(UserFCMToken.fcm_token).filter(
+                    UserFCMToken.user_id.in_(user_ids),
+                    UserFCMToken.is_active == True,
+                    ~UserFCMToken.fcm_token.like(f'{DEBUG_TOKEN_PREFIX}%')
+                ).all()
 
-            token_list = [t[0] for t in tokens if t[0]]
+                token_list = [t[0] for t in tokens if t[0]]
 
             if not token_list:
                 logger.info(f"No active FCM tokens for users {user_ids}, skipping push")
@@ -1068,15 +1149,19 @@ class NotificationOrchestrator:
 
             channel_id = NOTIFICATION_CHANNEL_IDS.get(payload.notification_type, 'general')
 
-            # Send via push service
+            # Send via push service, one multicast per FCM_MULTICAST_LIMIT tokens
             push_service = self._get_push_service()
-            result = push_service.send_push_notification(
-                tokens=token_list,
-                title=payload.title,
-                body=payload.message,
-                data=data,
-                android_channel_id=channel_id,
-            )
+            result = {'success': 0, 'failure': 0}
+            for start in range(0, len(token_list), FCM_MULTICAST_LIMIT):
+                chunk_result = push_service.send_push_notification(
+                    tokens=token_list[start:start + FCM_MULTICAST_LIMIT],
+                    title=payload.title,
+                    body=payload.message,
+                    data=data,
+                    android_channel_id=channel_id,
+                )
+                result['success'] += chunk_result.get('success', 0)
+                result['failure'] += chunk_result.get('failure', 0)
 
             return result
 
@@ -1253,6 +1338,17 @@ class NotificationOrchestrator:
             f"sms={results['sms']['success']}, "
             f"discord={results['discord']['success']}"
         )
+        # Per-channel batching/throttling figures are what ops read to size the
+        # push and email batch settings, so they go out at info.
+        for channel, summary in results.get('delivery', {}).items():
+            if summary['recipients']:
+                logger.info(
+                    f"Notification delivery: type={payload.notification_type.value}, "
+                    f"channel={channel}, recipients={summary['recipients']}, "
+                    f"success={summary['success']}, failure={summary['failure']}, "
+                    f"batches={summary['batches']}, throttled={summary['throttled_seconds']}s, "
+                    f"elapsed={summary['elapsed']}s"
+                )
 
     # =========================================================================
     # CONVENIENCE METHODS
@@ -0,0 +1,248 @@
+# app/services/participation_rollup.py
+
+"""
+Incremental maintenance of the player_season_participation rollup.
+
+The rollup used to be rebuilt season-wide once a night, so attendance reports
+were up to a day stale. Now every change that can move a row marks it dirty,
+and a short-cadence flush recomputes only those rows:
+
+- RSVPs: ParticipationRollupUpdater (event_consumer) reads the rsvp:analytics
+  stream, and the ORM hooks below catch Availability / EcsFcAvailability
+  writes from paths that never publish an RSVPEvent.
+- Check-ins: MatchAttendance inserts/deletes.
+- Roster changes: PlayerTeamSeason inserts/deletes/team moves.
+- Date rollover: fixtures that became "played" since the last flush (the
+  rollup's played-gated columns change without any write at all).
+
+Dirty marks live in one Redis sorted set. A member is the cheapest thing the
+writer knows -- ``m:<player>:<match>``, ``e:<player>:<ecs_fc_match>`` or
+``t:<player>:<team>`` -- scored with the time it was FIRST marked (ZADD NX), so
+a burst of RSVPs for the same player and match is coalesced into one recompute
+once the member is COALESCE_WINDOW_SECONDS old. The flush resolves members to
+(player, season, league) rows and hands them to
+participation_service.refresh_participation_rows, season by season.
+
+Why recompute the row rather than add +1/-1 to counters: the stream is
+at-least-once (pending messages are re-claimed and retried), and a replayed
+delta would double-count forever. Recomputing a row from source is idempotent,
+costs one narrowed statement, and shares its SQL with the nightly job, which is
+now a reconciliation check (reconcile_season_participation) that repairs and
+reports drift from writes the hooks can't see (bulk/Core SQL).
+"""
+
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm.attributes import get_history
+
+from app.services import commit_marks
+from app.utils.redis_manager import get_app_redis
+
+logger = logging.getLogger(__name__)
+
+DIRTY_KEY = 'participation:dirty'
+AS_OF_KEY = 'participation:as_of'
+COALESCE_WINDOW_SECONDS = 10
+FLUSH_LIMIT = 2000
+
+
+def rsvp_member(player_id, match_id):
+    return f'm:{player_id}:{match_id}'
+
+
+def ecs_fc_member(player_id, ecs_fc_match_id):
+    return f'e:{player_id}:{ecs_fc_match_id}'
+
+
+def roster_member(player_id, team_id):
+    return f't:{player_id}:{team_id}'
+
+
+def mark_dirty(members):
+    """Mark rollup sources dirty. Re-marking keeps the first timestamp, so the
+    coalescing window is measured from the first change, not the last."""
+    members = [m for m in set(members) if m]
+    if not members:
+        return 0
+    r = get_app_redis()
+    if r is None:
+        return 0
+    try:
+        now = time.time()
+        r.zadd(DIRTY_KEY, {m: now for m in members}, nx=True)
+    except Exception:
+        # The nightly reconcile repairs whatever a lost mark leaves stale.
+        logger.warning(f"participation rollup: could not mark {len(members)} member(s) dirty",
+                       exc_info=True)
+        return 0
+    return len(members)
+
+
+def resolve_rows(session, members):
+    """Dirty members -> {(player_id, season_id, league_id)} rollup keys."""
+    from app.models import League, Match, Team
+    from app.models.ecs_fc import EcsFcMatch
+
+    by_kind = defaultdict(set)
+    for member in members:
+        kind, player_id, ref_id = member.split(':')
+        by_kind[kind].add((int(player_id), int(ref_id)))
+
+    player_teams = set(by_kind['t'])
+    if by_kind['m']:
+        match_ids = {ref for _, ref in by_kind['m']}
+        teams = {mid: (home, away) for mid, home, away in session.query(
+            Match.id, Match.home_team_id, Match.away_team_id).filter(Match.id.in_(match_ids))}
+        for player_id, match_id in by_kind['m']:
+            for team_id in teams.get(match_id, ()):
+                player_teams.add((player_id, team_id))
+    if by_kind['e']:
+        match_ids = {ref for _, ref in by_kind['e']}
+        teams = dict(session.query(EcsFcMatch.id, EcsFcMatch.team_id)
+                     .filter(EcsFcMatch.id.in_(match_ids)))
+        for player_id, match_id in by_kind['e']:
+            if match_id in teams:
+                player_teams.add((player_id, teams[match_id]))
+
+    if not player_teams:
+        return set()
+    leagues = {team_id: (season_id, league_id) for team_id, league_id, season_id in session.query(
+        Team.id, League.id, League.season_id)
+        .join(League, League.id == Team.league_id)
+        .filter(Team.id.in_({team_id for _, team_id in player_teams}))}
+    return {(player_id,) + leagues[team_id]
+            for player_id, team_id in player_teams if team_id in leagues}
+
+
+def refresh_rows(session, rows, as_of=None):
+    """Recompute rollup rows, one narrowed statement per season, committing each."""
+    from app.models import Season
+    from app.services.participation_service import refresh_participation_rows
+
+    by_season = defaultdict(lambda: (set(), set()))
+    for player_id, season_id, league_id in rows:
+        by_season[season_id][0].add(player_id)
+        by_season[season_id][1].add(league_id)
+    if not by_season:
+        return 0
+
+    league_types = dict(session.query(Season.id, Season.league_type)
+                        .filter(Season.id.in_(list(by_season))))
+    for season_id, (player_ids, league_ids) in sorted(by_season.items()):
+        refresh_participation_rows(session, season_id, sorted(player_ids), sorted(league_ids),
+                                   as_of=as_of,
+                                   league_type=league_types.get(season_id) or 'Pub League')
+        session.commit()
+    return len(by_season)
+
+
+def flush_dirty_rows(session, window_seconds=COALESCE_WINDOW_SECONDS, limit=FLUSH_LIMIT, now=None):
+    """Recompute every row whose first dirty mark is at least window_seconds old.
+
+    Members are claimed (ZREM) BEFORE recomputing, so a change landing while the
+    refresh runs re-marks the member and is picked up next flush rather than
+    being swallowed. On failure the claimed members are put back.
+
+    Returns:
+        dict: {'members', 'rows', 'seasons'}
+    """
+    result = {'members': 0, 'rows': 0, 'seasons': 0}
+    r = get_app_redis()
+    if r is None:
+        return result
+
+    cutoff = (now if now is not None else time.time()) - window_seconds
+    members = r.zrangebyscore(DIRTY_KEY, '-inf', cutoff, start=0, num=limit) or []
+    members = [m.decode() if isinstance(m, bytes) else m for m in members]
+    if not members:
+        return result
+    r.zrem(DIRTY_KEY, *members)
+
+    try:
+        rows = resolve_rows(session, members)
+        seasons = refresh_rows(session, rows)
+    except Exception:
+        session.rollback()
+        mark_dirty(members)
+        raise
+
+    result.update(members=len(members), rows=len(rows), seasons=seasons)
+    logger.debug(f"participation rollup flush: {result}")
+    return result
+
+
+def mark_played_fixtures(session, today=None):
+    """Mark rows whose fixtures became "played" since the last call.
+
+    matches_played and the RSVP/check-in buckets are gated on date <= as_of, so
+    a match rolling into the past changes rows without any write. Runs at most
+    once per (UTC) day; the first run only covers today.
+    """
+    from app.models import Match
+    from app.models.ecs_fc import EcsFcMatch
+    from app.models.players import PlayerTeamSeason
+
+    today = today or datetime.utcnow().date()
+    r = get_app_redis()
+    if r is None:
+        return 0
+    last = r.get(AS_OF_KEY)
+    last = last.decode() if isinstance(last, bytes) else last
+    if last == today.isoformat():
+        return 0
+    start = (datetime.strptime(last, '%Y-%m-%d').date() + timedelta(days=1)
+             if last else today)
+
+    team_ids = set()
+    for home, away in session.query(Match.home_team_id, Match.away_team_id).filter(
+            Match.date.between(start, today), Match.week_type == 'REGULAR',
+            Match.home_team_id != Match.away_team_id):
+        team_ids.update((home, away))
+    team_ids.update(team_id for (team_id,) in session.query(EcsFcMatch.team_id).filter(
+        EcsFcMatch.match_date.between(start, today)))
+
+    members = []
+    if team_ids:
+        members = [roster_member(player_id, team_id) for player_id, team_id in session.query(
+            PlayerTeamSeason.player_id, PlayerTeamSeason.team_id)
+            .filter(PlayerTeamSeason.team_id.in_(team_ids))]
+    mark_dirty(members)
+    r.set(AS_OF_KEY, today.isoformat())
+    return len(members)
+
+
+# -----------------------------------------------------------------------------
+# Commit marks: members collected at flush, marked dirty after commit.
+# -----------------------------------------------------------------------------
+
+def _values(instance, attr):
+    """Current and previous value of an attribute (a moved row dirties both)."""
+    history = get_history(instance, attr)
+    return set(history.added or ()) | set(history.unchanged or ()) | set(history.deleted or ())
+
+
+def _instance_members(session, instance):
+    from app.models import Availability, MatchAttendance
+    from app.models.ecs_fc import EcsFcAvailability
+    from app.models.players import PlayerTeamSeason
+
+    if isinstance(instance, Availability):
+        make, ref = rsvp_member, 'match_id'
+    elif isinstance(instance, EcsFcAvailability):
+        make, ref = ecs_fc_member, 'ecs_fc_match_id'
+    elif isinstance(instance, MatchAttendance):
+        make = ecs_fc_member if instance.league_type == 'ecs_fc' else rsvp_member
+        ref = 'match_id'
+    elif isinstance(instance, PlayerTeamSeason):
+        make, ref = roster_member, 'team_id'
+    else:
+        return ()
+    return [make(player_id, ref_id)
+            for player_id in _values(instance, 'player_id') if player_id is not None
+            for ref_id in _values(instance, ref) if ref_id is not None]
+
+
+commit_marks.track('participation', publish=mark_dirty, on_instance=_instance_members)
@@ -45,7 +45,13 @@ logger = logging.getLogger(__name__)
 # One statement builds every row for a season. Written as raw SQL rather than ORM
 # because it is a bulk upsert over three source tables and the ORM equivalent
 # would either N+1 or be unreadable.
-_REFRESH_SQL = text("""
+#
+# The statements are templates: the season-wide refresh fills the filter slots
+# with nothing, while refresh_participation_rows narrows the roster (and the
+# availability scan) to a handful of players so the incremental path runs the
+# SAME aggregation as the nightly one instead of a second implementation that
+# could disagree with it.
+_REFRESH_TEMPLATE = """
 WITH roster AS (
     -- Every (player, season, league) that was rostered, with their team(s).
     SELECT pts.player_id,
@@ -59,6 +65,7 @@ WITH roster AS (
       JOIN team   t ON t.id = pts.team_id
       JOIN league l ON l.id = t.league_id
      WHERE l.season_id = :season_id
+           {roster_filter}
      GROUP BY pts.player_id, l.season_id, l.id
 ),
 fixtures AS (
@@ -110,6 +117,7 @@ agg AS (
           SELECT DISTINCT ON (match_id, player_id)
                  match_id, player_id, response
             FROM availability
+           {availability_filter}
            ORDER BY match_id, player_id, responded_at DESC NULLS LAST, id DESC
       ) a ON a.match_id = f.match_id AND a.player_id = f.player_id
       LEFT JOIN match_attendance att
@@ -157,14 +165,15 @@ ON CONFLICT (player_id, season_id, league_id) DO UPDATE SET
     last_match_date   = EXCLUDED.last_match_date,
     last_played_date  = EXCLUDED.last_played_date,
     last_computed_at  = EXCLUDED.last_computed_at
-""")
+"""
 
 
 # Rows whose roster assignment disappeared (undrafted, moved, roster row deleted)
 # must not linger — otherwise a player shows up in a league they were removed from.
-_PRUNE_SQL = text("""
+_PRUNE_TEMPLATE = """
 DELETE FROM player_season_participation psp
  WHERE psp.season_id = :season_id
+   {row_filter}
    AND NOT EXISTS (
         SELECT 1
           FROM player_team_season pts
@@ -174,7 +183,7 @@ DELETE FROM player_season_participation psp
            AND l.season_id   = psp.season_id
            AND l.id          = psp.league_id
    )
-""")
+"""
 
 
 # ---------------------------------------------------------------------
@@ -184,7 +193,7 @@ DELETE FROM player_season_participation psp
 # 'ecs_fc'. ECS FC cares about its OWN turnout — who shows up for the team —
 # not who they play, so the same rollup shape applies with these sources.
 # ---------------------------------------------------------------------
-_REFRESH_ECS_FC_SQL = text("""
+_REFRESH_ECS_FC_TEMPLATE = """
 WITH roster AS (
     SELECT pts.player_id,
            l.season_id,
@@ -197,6 +206,7 @@ WITH roster AS (
       JOIN team   t ON t.id = pts.team_id
       JOIN league l ON l.id = t.league_id
      WHERE l.season_id = :season_id
+           {roster_filter}
      GROUP BY pts.player_id, l.season_id, l.id
 ),
 fixtures AS (
@@ -274,7 +284,20 @@ ON CONFLICT (player_id, season_id, league_id) DO UPDATE SET
     last_match_date   = EXCLUDED.last_match_date,
     last_played_date  = EXCLUDED.last_played_date,
     last_computed_at  = EXCLUDED.last_computed_at
-""")
+"""
+
+_ROWS_ROSTER_FILTER = "AND pts.player_id = ANY(:player_ids) AND l.id = ANY(:league_ids)"
+
+_REFRESH_SQL = text(_REFRESH_TEMPLATE.format(roster_filter='', availability_filter=''))
+_REFRESH_ECS_FC_SQL = text(_REFRESH_ECS_FC_TEMPLATE.format(roster_filter=''))
+_PRUNE_SQL = text(_PRUNE_TEMPLATE.format(row_filter=''))
+
+_REFRESH_ROWS_SQL = text(_REFRESH_TEMPLATE.format(
+    roster_filter=_ROWS_ROSTER_FILTER,
+    availability_filter="WHERE player_id = ANY(:player_ids)"))
+_REFRESH_ECS_FC_ROWS_SQL = text(_REFRESH_ECS_FC_TEMPLATE.format(roster_filter=_ROWS_ROSTER_FILTER))
+_PRUNE_ROWS_SQL = text(_PRUNE_TEMPLATE.format(
+    row_filter="AND psp.player_id = ANY(:player_ids) AND psp.league_id = ANY(:league_ids)"))
 
 
 def refresh_season_participation(session, season_id, as_of=None, league_type='Pub League'):
@@ -315,6 +338,60 @@ def refresh_season_participation(session, season_id, as_of=None, league_type='Pu
     return result
 
 
+def refresh_participation_rows(session, season_id, player_ids, league_ids, as_of=None,
+                               league_type='Pub League'):
+    """Recompute just the given players' rows in one season (the incremental path).
+
+    Same aggregation as refresh_season_participation with the roster narrowed to
+    ``player_ids`` x ``league_ids``, so a row refreshed here is byte-for-byte what
+    the nightly rebuild would write. Rows whose roster assignment vanished are
+    pruned, again only within that scope. Returns the number of rows pruned.
+    """
+    as_of = as_of or datetime.utcnow().date()
+    params = {'season_id': season_id, 'as_of': as_of,
+              'player_ids': list(player_ids), 'league_ids': list(league_ids)}
+    sql = _REFRESH_ECS_FC_ROWS_SQL if league_type == 'ECS FC' else _REFRESH_ROWS_SQL
+    session.execute(sql, params)
+    return session.execute(_PRUNE_ROWS_SQL, params).rowcount
+
+
+_SNAPSHOT_SQL = text("""
+    SELECT player_id, league_id, team_id, team_count,
+           matches_scheduled, matches_played,
+           rsvp_yes, rsvp_no, rsvp_maybe, rsvp_none, checked_in,
+           was_coach, first_match_date, last_match_date, last_played_date
+      FROM player_season_participation
+     WHERE season_id = :season_id
+""")
+
+
+def _season_snapshot(session, season_id):
+    rows = session.execute(_SNAPSHOT_SQL, {'season_id': season_id}).all()
+    return {(row[0], row[1]): tuple(row[2:]) for row in rows}
+
+
+def reconcile_season_participation(session, season_id, league_type='Pub League'):
+    """Nightly check that the incrementally maintained rows are still right.
+
+    Rebuilds the season from source and diffs it against what was there before,
+    so drift (a write path that bypassed the change hooks, a lost dirty mark) is
+    both repaired and reported. With the incremental path healthy ``drifted`` is
+    0; anything else is logged as a warning with a sample of the affected keys.
+    """
+    before = _season_snapshot(session, season_id)
+    result = refresh_season_participation(session, season_id, league_type=league_type)
+    after = _season_snapshot(session, season_id)
+
+    drifted = sorted(key for key in before.keys() | after.keys()
+                     if before.get(key) != after.get(key))
+    result['drifted'] = len(drifted)
+    if drifted:
+        logger.warning(
+            f"Participation reconcile: {len(drifted)} drifted row(s) in season {season_id} "
+            f"repaired, e.g. (player, league) {drifted[:10]}")
+    return result
+
+
 def refresh_all_seasons(session, league_type=None):
     """Backfill every season, oldest first. ``league_type`` None = both Pub League
     and ECS FC (the post-migration backfill); pass one to restrict.
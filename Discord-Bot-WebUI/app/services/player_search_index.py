@@ -0,0 +1,662 @@
+# app/services/player_search_index.py
+
+"""
+In-process trigram index for player search.
+
+Autocomplete and the admin person filters used to run ``Player.name ILIKE
+'%term%'`` (plus team / username ILIKEs) on every keystroke. A leading-wildcard
+ILIKE can't use a btree index, and emails can't be matched in SQL at all --
+they're stored encrypted, with only an exact-match hash. This module keeps one
+search document per player in memory instead:
+
+    name, account username, Discord username, team names, and (admin callers
+    only, include_email=True) the decrypted email -- decrypted on the first
+    include_email lookup, not at build time, so non-admin workers never pay
+    for it
+
+indexed by trigram (and by bigram, so two-letter words don't scan every
+document). A lookup intersects the postings of the term's grams, verifies the
+substring, and ranks:
+
+    1. exact matches before fuzzy ones (fuzzy only tops up the list),
+    2. current players first,
+    3. name prefix, then a name word prefix, then a prefix of another field,
+       then a substring anywhere,
+    4. trigram similarity (fuzzy), then name.
+
+Freshness. A commit_marks tracker collects what a transaction wrote (player,
+users and team rows, roster changes through Player.teams) and, after commit,
+records it twice: in this process's pending set, and in a Redis sorted set
+(``player_search:changes``) scored by commit time, so the other web workers
+see it too. Before each lookup the index reloads just the changed rows. Core
+DML that can't be narrowed to rows (bulk updates of searchable columns,
+player_teams inserts/deletes) records ``*``, which rebuilds the index on the
+next lookup. Raw text() SQL isn't seen at all; a full rebuild every
+FULL_REBUILD_SECONDS bounds how long anything missed can linger.
+
+Only the very first build runs on the request thread. Later full rebuilds run
+on a background thread with their own session while lookups keep reading the
+previous index, which is swapped out when the new one is ready; incremental
+changes wait for the swap, so none are applied to an index about to be
+discarded.
+"""
+
+import heapq
+import logging
+import math
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+from app.services import commit_marks
+from app.utils.redis_manager import get_app_redis
+
+logger = logging.getLogger(__name__)
+
+CHANGES_KEY = 'player_search:changes'
+CHANGE_RETENTION_SECONDS = 6 * 3600
+# Re-read changes this far behind the last sync: covers clock skew between
+# workers and commits whose ZADD lands after the reader's sync.
+SYNC_OVERLAP_SECONDS = 5
+FULL_REBUILD_SECONDS = 3600
+
+MIN_TERM_LENGTH = 2
+FUZZY_THRESHOLD = 0.3
+
+REBUILD = '*'
+
+# Columns whose changes move a search document.
+PLAYER_SEARCH_ATTRIBUTES = ('name', 'discord_username', 'is_current_player', 'user_id', 'teams')
+USER_SEARCH_ATTRIBUTES = ('username', 'encrypted_email')
+TEAM_SEARCH_ATTRIBUTES = ('name', 'players')
+_SEARCH_COLUMNS = {
+    'player': {'id', 'name', 'discord_username', 'is_current_player', 'user_id'},
+    'users': {'id', 'username', 'encrypted_email'},
+    'team': {'id', 'name'},
+}
+
+# Match classes, best first.
+NAME_PREFIX, NAME_WORD_PREFIX, FIELD_PREFIX, SUBSTRING, FUZZY = range(5)
+
+
+def player_member(player_id):
+    return f'p:{player_id}'
+
+
+def user_member(user_id):
+    return f'u:{user_id}'
+
+
+def team_member(team_id):
+    return f't:{team_id}'
+
+
+def normalize(text) -> str:
+    """Casefolded, accent-stripped, whitespace-collapsed."""
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.casefold().split())
+
+
+def trigrams(text: str) -> set:
+    """pg_trgm-style trigrams: each word padded with two leading spaces and one trailing."""
+    grams = set()
+    for word in text.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _inner_grams(text: str) -> set:
+    """Unpadded bigrams and trigrams of each word (the substring postings)."""
+    grams = set()
+    for word in text.split():
+        grams.update(word[i:i + 2] for i in range(len(word) - 1))
+        grams.update(word[i:i + 3] for i in range(len(word) - 2))
+    return grams
+
+
+def _term_grams(text: str) -> set:
+    """Grams every doc containing the text has: trigrams, or the word itself if two letters."""
+    grams = set()
+    for word in text.split():
+        if len(word) == 2:
+            grams.add(word)
+        else:
+            grams.update(word[i:i + 3] for i in range(len(word) - 2))
+    return grams
+
+
+def _similarity(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+@dataclass
+class PlayerDoc:
+    player_id: int
+    name: str
+    is_current: bool = False
+    user_id: Optional[int] = None
+    username: str = ''
+    discord_username: str = ''
+    email: str = ''
+    team_ids: Tuple[int, ...] = ()
+    encrypted_email: Optional[str] = field(default=None, repr=False)
+    grams: set = field(default_factory=set, repr=False)
+    gram_sets: tuple = field(default=(), repr=False)
+
+    def __post_init__(self):
+        self.name = normalize(self.name)
+        self.username = normalize(self.username)
+        self.discord_username = normalize(self.discord_username)
+        self.email = normalize(self.email)
+        values = [v for v in (self.name, self.username, self.discord_username) if v]
+        self.grams = set()
+        for value in values:
+            self.grams |= trigrams(value) | _inner_grams(value)
+        # Whole values and single words, for similarity(); built once, not per lookup.
+        parts = dict.fromkeys([*values, *(w for v in values for w in v.split())])
+        self.gram_sets = tuple(trigrams(part) for part in parts)
+
+    def match_class(self, term: str, include_email: bool = False) -> Optional[int]:
+        if self.name.startswith(term):
+            return NAME_PREFIX
+        if f' {term}' in self.name:
+            return NAME_WORD_PREFIX
+        email = self.email if include_email else ''
+        if (self.username.startswith(term) or self.discord_username.startswith(term)
+                or email.startswith(term)):
+            return FIELD_PREFIX
+        if term in self.name or term in self.username or term in self.discord_username or term in email:
+            return SUBSTRING
+        return None
+
+    def similarity(self, term_grams: set) -> float:
+        return max((_similarity(term_grams, grams) for grams in self.gram_sets), default=0.0)
+
+
+class PlayerSearchIndex:
+    """Player documents plus trigram postings for players, teams and emails."""
+
+    def __init__(self):
+        self._docs: Dict[int, PlayerDoc] = {}
+        self._current = set()
+        self._grams = defaultdict(set)
+        self._email_grams = defaultdict(set)
+        self._teams: Dict[int, str] = {}
+        self._team_grams = defaultdict(set)
+        self._team_members = defaultdict(set)
+        self._lock = threading.RLock()
+        self.built_at = None     # time.monotonic() of the last full build
+        self.synced_at = 0.0     # wall clock; changes scored after this are unseen
+        self._applied = {}       # member -> change score already applied
+        self.emails_loaded = False
+
+    def __len__(self):
+        return len(self._docs)
+
+    @property
+    def ready(self):
+        return self.built_at is not None
+
+    # -- maintenance ---------------------------------------------------------
+
+    def load(self, docs: Iterable[PlayerDoc], teams: Dict[int, str]):
+        with self._lock:
+            for team_id, name in teams.items():
+                self._set_team(team_id, name)
+            for doc in docs:
+                self._remove(doc.player_id)
+                self._docs[doc.player_id] = doc
+                if doc.is_current:
+                    self._current.add(doc.player_id)
+                for gram in doc.grams:
+                    self._grams[gram].add(doc.player_id)
+                for gram in _inner_grams(doc.email):
+                    self._email_grams[gram].add(doc.player_id)
+                for team_id in doc.team_ids:
+                    self._team_members[team_id].add(doc.player_id)
+            if self.emails_loaded:
+                self._decrypt_emails(docs)
+
+    def load_emails(self):
+        """Decrypt and index every document's email (once; later loads keep up)."""
+        with self._lock:
+            if not self.emails_loaded:
+                self._decrypt_emails(self._docs.values())
+                self.emails_loaded = True
+
+    def _decrypt_emails(self, docs):
+        from app.utils.pii_encryption import decrypt_values
+
+        docs = [doc for doc in docs if doc.encrypted_email and not doc.email]
+        emails = decrypt_values(doc.encrypted_email for doc in docs)
+        for doc in docs:
+            doc.email = normalize(emails.get(doc.encrypted_email, ''))
+            for gram in _inner_grams(doc.email):
+                self._email_grams[gram].add(doc.player_id)
+
+    def remove(self, player_ids: Iterable[int] = (), team_ids: Iterable[int] = ()):
+        with self._lock:
+            for player_id in player_ids:
+                self._remove(player_id)
+            for team_id in team_ids:
+                for gram in _inner_grams(self._teams.pop(team_id, '')):
+                    self._discard(self._team_grams, gram, team_id)
+
+    def _remove(self, player_id):
+        doc = self._docs.pop(player_id, None)
+        if doc is None:
+            return
+        self._current.discard(player_id)
+        for gram in doc.grams:
+            self._discard(self._grams, gram, player_id)
+        for gram in _inner_grams(doc.email):
+            self._discard(self._email_grams, gram, player_id)
+        for team_id in doc.team_ids:
+            self._discard(self._team_members, team_id, player_id)
+
+    def _set_team(self, team_id, name):
+        old = self._teams.get(team_id)
+        name = normalize(name)
+        if old == name:
+            return
+        if old is not None:
+            for gram in _inner_grams(old):
+                self._discard(self._team_grams, gram, team_id)
+        self._teams[team_id] = name
+        for gram in _inner_grams(name):
+            self._team_grams[gram].add(team_id)
+
+    @staticmethod
+    def _discard(postings, key, value):
+        members = postings.get(key)
+        if members is not None:
+            members.discard(value)
+            if not members:
+                del postings[key]
+
+    def affected_players(self, user_ids=(), team_ids=()) -> set:
+        """Indexed players owned by these users or rostered on these teams."""
+        with self._lock:
+            user_ids = set(user_ids)
+            affected = {pid for pid, doc in self._docs.items() if doc.user_id in user_ids} if user_ids else set()
+            for team_id in team_ids:
+                affected |= self._team_members.get(team_id, set())
+            return affected
+
+    # -- lookup --------------------------------------------------------------
+
+    def search(self, term: str, limit: Optional[int] = 10, include_email: bool = False,
+               fuzzy: bool = True, current_only: bool = False) -> List[int]:
+        """Ranked player ids matching the term (see the module docstring for the order)."""
+        term = normalize(term)
+        if len(term) < MIN_TERM_LENGTH:
+            return []
+        if include_email and not self.emails_loaded:
+            self.load_emails()
+        with self._lock:
+            players, team_classes = self._exact_candidates(term, include_email)
+            # Current players rank first, so former ones are only classified
+            # when the current ones don't fill the page.
+            classes = self._classify(players & self._current, term, include_email, team_classes)
+            if not current_only and (limit is None or len(classes) < limit):
+                classes.update(self._classify(players - self._current, term, include_email,
+                                              team_classes))
+            scores = {}
+            if fuzzy and len(term) >= 3 and (limit is None or len(classes) < limit):
+                scores = self._fuzzy_matches(term, exclude=classes)
+
+            ranked = []
+            for pid, match in (*classes.items(), *((pid, FUZZY) for pid in scores)):
+                doc = self._docs[pid]
+                if current_only and not doc.is_current:
+                    continue
+                ranked.append((match == FUZZY, not doc.is_current, match, -scores.get(pid, 1.0),
+                               doc.name, pid))
+        ranked = sorted(ranked) if limit is None else heapq.nsmallest(limit, ranked)
+        return [key[-1] for key in ranked]
+
+    def _candidates(self, postings, term, universe):
+        grams = _term_grams(term)
+        if not grams:
+            return universe  # only single letters: scan
+        sets = sorted((postings.get(g, set()) for g in grams), key=len)
+        result = set(sets[0])
+        for s in sets[1:]:
+            if not result:
+                break
+            result &= s
+        return result
+
+    def _exact_candidates(self, term, include_email):
+        """(player ids that may contain the term, {player id: class} from team names)."""
+        players = set(self._candidates(self._grams, term, self._docs.keys()))
+        if include_email:
+            players |= self._candidates(self._email_grams, term, self._docs.keys())
+
+        team_classes = {}
+        for team_id in self._candidates(self._team_grams, term, self._teams.keys()):
+            team_name = self._teams[team_id]
+            if term not in team_name:
+                continue
+            match = FIELD_PREFIX if team_name.startswith(term) or f' {term}' in team_name else SUBSTRING
+            for pid in self._team_members.get(team_id, ()):
+                if pid in self._docs and team_classes.get(pid, FUZZY) > match:
+                    team_classes[pid] = match
+        return players | team_classes.keys(), team_classes
+
+    def _classify(self, players, term, include_email, team_classes):
+        classes = {}
+        for pid in players:
+            match = self._docs[pid].match_class(term, include_email)
+            team_match = team_classes.get(pid)
+            if team_match is not None and (match is None or team_match < match):
+                match = team_match
+            if match is not None:
+                classes[pid] = match
+        return classes
+
+    def _fuzzy_matches(self, term, exclude):
+        term_grams = trigrams(term)
+        hits = Counter()
+        for gram in term_grams:
+            hits.update(self._grams.get(gram, ()))
+        # Jaccard >= threshold needs at least threshold * |term grams| shared grams.
+        floor = max(1, math.ceil(FUZZY_THRESHOLD * len(term_grams)))
+        scores = {}
+        for pid, shared in hits.items():
+            if shared < floor or pid in exclude:
+                continue
+            score = self._docs[pid].similarity(term_grams)
+            if score >= FUZZY_THRESHOLD:
+                scores[pid] = score
+        return scores
+
+
+# -----------------------------------------------------------------------------
+# Loading from the database
+# -----------------------------------------------------------------------------
+
+def load_documents(session, player_ids=(), user_ids=(), team_ids=(), everything=False):
+    """
+    (docs, {team_id: name}) for the given players / owners / rosters, or all of
+    them. Emails stay encrypted on the docs until the index needs them.
+    """
+    from app.models import Player, Team, User, player_teams
+
+    query = (select(Player.id, Player.name, Player.is_current_player, Player.discord_username,
+                    Player.user_id, User.username, User.encrypted_email)
+             .select_from(Player).outerjoin(User, User.id == Player.user_id))
+    if not everything:
+        clauses = []
+        if player_ids:
+            clauses.append(Player.id.in_(list(player_ids)))
+        if user_ids:
+            clauses.append(Player.user_id.in_(list(user_ids)))
+        if team_ids:
+            clauses.append(Player.id.in_(select(player_teams.c.player_id)
+                                         .where(player_teams.c.team_id.in_(list(team_ids)))))
+        if not clauses:
+            return [], {}
+        query = query.where(or_(*clauses))
+    rows = session.execute(query).all()
+
+    roster_query = select(player_teams.c.player_id, player_teams.c.team_id)
+    team_query = select(Team.id, Team.name)
+    if not everything:
+        ids = [row.id for row in rows]
+        roster_query = roster_query.where(player_teams.c.player_id.in_(ids))
+    roster = defaultdict(list)
+    for player_id, team_id in session.execute(roster_query):
+        roster[player_id].append(team_id)
+    if not everything:
+        wanted = {tid for tids in roster.values() for tid in tids} | set(team_ids)
+        team_query = team_query.where(Team.id.in_(list(wanted)))
+    teams = dict(session.execute(team_query).all())
+
+    docs = [PlayerDoc(player_id=row.id, name=row.name, is_current=bool(row.is_current_player),
+                      user_id=row.user_id, username=row.username or '',
+                      discord_username=row.discord_username or '',
+                      encrypted_email=row.encrypted_email,
+                      team_ids=tuple(roster.get(row.id, ()))) for row in rows]
+    return docs, teams
+
+
+# -----------------------------------------------------------------------------
+# Process-wide index and change feed
+# -----------------------------------------------------------------------------
+
+_index = PlayerSearchIndex()
+_sync_lock = threading.Lock()
+_rebuild_thread: Optional[threading.Thread] = None
+_local_changes = {}  # member -> score, committed in this process and not yet applied
+_local_lock = threading.Lock()
+
+
+def record_changes(members, redis_client=None):
+    """Publish committed changes to this process and, through Redis, the others."""
+    members = {m for m in members if m}
+    if not members:
+        return 0
+    now = time.time()
+    with _local_lock:
+        for member in members:
+            _local_changes[member] = now
+    r = redis_client or get_app_redis()
+    if r is None:
+        return len(members)
+    try:
+        pipe = r.pipeline()
+        pipe.zadd(CHANGES_KEY, {m: now for m in members})
+        pipe.zremrangebyscore(CHANGES_KEY, '-inf', now - CHANGE_RETENTION_SECONDS)
+        pipe.execute()
+    except Exception:
+        # Other workers pick it up at their next full rebuild.
+        logger.warning(f"player search: could not publish {len(members)} change(s)", exc_info=True)
+    return len(members)
+
+
+def _remote_changes(since):
+    r = get_app_redis()
+    if r is None:
+        return {}
+    try:
+        entries = r.zrangebyscore(CHANGES_KEY, since, '+inf', withscores=True)
+    except Exception:
+        logger.debug("player search: change feed unavailable", exc_info=True)
+        return {}
+    if not isinstance(entries, (list, tuple)):
+        return {}
+    return {(m.decode() if isinstance(m, bytes) else str(m)): float(score) for m, score in entries}
+
+
+def _rebuild(session, started, with_emails=False, applied=None):
+    global _index
+    docs, teams = load_documents(session, everything=True)
+    index = PlayerSearchIndex()
+    index.load(docs, teams)
+    if with_emails:
+        index.load_emails()
+    index.built_at = time.monotonic()
+    index.synced_at = started
+    # The changes that asked for this rebuild are in it; don't re-read them
+    # from the feed's overlap window and rebuild again.
+    index._applied = dict(applied or {})
+    _index = index
+    logger.info(f"player search: indexed {len(index)} players")
+    return index
+
+
+def _rebuild_in_background(bind, started, with_emails, applied):
+    global _rebuild_thread
+    try:
+        with Session(bind=bind) as session:
+            _rebuild(session, started, with_emails, applied)
+    except Exception:
+        # The previous index keeps serving; the next lookup tries again.
+        logger.exception("player search: background rebuild failed")
+        with _local_lock:
+            _local_changes[REBUILD] = time.time()
+    finally:
+        _rebuild_thread = None
+
+
+def _start_rebuild(session, index, started, applied=None):
+    global _rebuild_thread
+    with _local_lock:
+        _local_changes.clear()
+    _rebuild_thread = threading.Thread(
+        target=_rebuild_in_background, name='player-search-rebuild', daemon=True,
+        args=(session.get_bind(), started, index.emails_loaded, applied))
+    _rebuild_thread.start()
+    return index
+
+
+def wait_for_rebuild(timeout=None):
+    """Block until a background rebuild, if any, has swapped in its index."""
+    thread = _rebuild_thread
+    if thread is not None:
+        thread.join(timeout)
+
+
+def sync_index(session):
+    """Bring this process's index up to date and return it."""
+    index = _index
+    if index.ready and (_rebuild_thread is not None or not _sync_lock.acquire(blocking=False)):
+        # Another thread is syncing or a rebuild is under way; the current
+        # index is fine to read.
+        return index
+    if not index.ready:
+        _sync_lock.acquire()
+    try:
+        index = _index
+        started = time.time()
+        if not index.ready:
+            with _local_lock:
+                _local_changes.clear()
+            return _rebuild(session, started)
+        if time.monotonic() - index.built_at > FULL_REBUILD_SECONDS:
+            return _start_rebuild(session, index, started)
+
+        with _local_lock:
+            changes = dict(_local_changes)
+            _local_changes.clear()
+        for member, score in _remote_changes(index.synced_at - SYNC_OVERLAP_SECONDS).items():
+            changes[member] = max(score, changes.get(member, 0))
+        changes = {m: s for m, s in changes.items() if s > index._applied.get(m, 0)}
+        if REBUILD in changes:
+            return _start_rebuild(session, index, started, applied=changes)
+
+        if changes:
+            _apply_changes(session, index, changes)
+        index.synced_at = started
+        horizon = started - SYNC_OVERLAP_SECONDS - 1
+        index._applied = {m: s for m, s in {**index._applied, **changes}.items() if s >= horizon}
+        return index
+    finally:
+        _sync_lock.release()
+
+
+def invalidate_index():
+    """Drop this process's index; the next lookup rebuilds it."""
+    global _index
+    wait_for_rebuild()
+    with _sync_lock:
+        _index = PlayerSearchIndex()
+        with _local_lock:
+            _local_changes.clear()
+
+
+def _apply_changes(session, index, changes):
+    by_kind = defaultdict(set)
+    for member in changes:
+        kind, _, ref = member.partition(':')
+        if ref.isdigit():
+            by_kind[kind].add(int(ref))
+    player_ids = by_kind['p'] | index.affected_players(by_kind['u'], by_kind['t'])
+    docs, teams = load_documents(session, player_ids=player_ids, user_ids=by_kind['u'],
+                                 team_ids=by_kind['t'])
+    index.remove(player_ids - {doc.player_id for doc in docs}, by_kind['t'] - teams.keys())
+    index.load(docs, teams)
+
+
+def indexable(term) -> bool:
+    """Whether the index can answer this term; shorter ones match nothing.
+
+    Filters (as opposed to autocomplete) should fall back to SQL for these
+    rather than treat the empty result as "nobody matches".
+    """
+    return len(normalize(term)) >= MIN_TERM_LENGTH
+
+
+def search_player_ids(session, term, limit: Optional[int] = 10, include_email=False,
+                      fuzzy=True, current_only=False) -> List[int]:
+    """Ranked player ids for the term. include_email is for admin callers only."""
+    if not indexable(term):
+        return []
+    return sync_index(session).search(term, limit=limit, include_email=include_email,
+                                      fuzzy=fuzzy, current_only=current_only)
+
+
+def search_players(session, term, limit=10, **kwargs):
+    """Player rows in ranked order (see search_player_ids)."""
+    from app.models import Player
+    ids = search_player_ids(session, term, limit=limit, **kwargs)
+    if not ids:
+        return []
+    players = {p.id: p for p in session.query(Player).filter(Player.id.in_(ids))}
+    return [players[pid] for pid in ids if pid in players]
+
+
+# -----------------------------------------------------------------------------
+# Commit marks: changes collected at flush, recorded after commit.
+# -----------------------------------------------------------------------------
+
+def _instance_members(session, instance):
+    table = getattr(getattr(instance, '__table__', None), 'name', None)
+    if table == 'player':
+        attrs, member = PLAYER_SEARCH_ATTRIBUTES, player_member
+    elif table == 'users':
+        attrs, member = USER_SEARCH_ATTRIBUTES, user_member
+    elif table == 'team':
+        attrs, member = TEAM_SEARCH_ATTRIBUTES, team_member
+    else:
+        return ()
+    if instance.id is None:
+        return ()
+    if instance in session.dirty and not any(
+            get_history(instance, attr).has_changes() for attr in attrs):
+        return ()
+    return (member(instance.id),)
+
+
+def _statement_changes(table, orm_execute_state):
+    """Bulk writes that can touch a document force a rebuild."""
+    if table == 'player_teams':
+        if orm_execute_state.is_update:
+            return ()  # position / ordering only; membership is insert/delete
+    elif table in _SEARCH_COLUMNS:
+        if orm_execute_state.is_update:
+            columns = commit_marks.statement_columns(orm_execute_state)
+            if columns and not columns & _SEARCH_COLUMNS[table]:
+                return ()  # e.g. update(Player).values(discord_needs_update=True)
+    else:
+        return ()
+    return (REBUILD,)
+
+
+commit_marks.track('player_search', publish=record_changes,
+                   on_instance=_instance_members, on_statement=_statement_changes)
@@ -20,12 +20,17 @@ from typing import Dict, Any, List, Optional, Set
 from datetime import datetime, timedelta
 import json
 import os
+import time
+
+from flask import current_app
 
 from app.models import LiveReportingSession, MLSMatch
+from app.services import live_session_registry
 from app.services.live_reporting_event_log import record_event as log_event
 from app.services.redis_connection_service import get_redis_service
 from app.utils.competition_mappings import resolve_league_code
 from app.utils.espn_api_client import ESPNAPIClient
+from app.utils.espn_live_poller import ESPNLivePoller, event_dedup_key
 from app.utils.discord_request_handler import send_to_discord_bot
 from app.utils.task_session_manager import task_session
 from app.utils.sync_ai_client import get_sync_ai_client
@@ -50,10 +55,15 @@ class RealtimeReportingService:
     SESSION_MAX_DURATION_SECONDS = 4 * 3600
     # Number of consecutive UNKNOWN status polls before forcing deactivation
     UNKNOWN_STATUS_THRESHOLD = 20  # ~200 seconds at 10s polling
+    # Full reload of active sessions from the database; between reloads the
+    # session set follows the live_session_registry change feed.
+    RECONCILE_SECONDS = 300
 
     def __init__(self):
         self.redis_service = get_redis_service()
         self.espn_client = ESPNAPIClient()
+        # Async conditional polling, scheduled per match (see espn_live_poller)
+        self.espn_poller = ESPNLivePoller(self.espn_client)
         self.ai_client = get_sync_ai_client()  # Enhanced AI for commentary
         self.template_engine = get_template_engine()  # Deterministic mad-lib commentary
         # Template-first ("mad-lib") commentary is the default — deterministic,
@@ -67,7 +77,7 @@ class RealtimeReportingService:
         # no goal keyEvent advances the score silently (the goal keyEvent announces
         # it, and the score is in every event footer). Set =1 to re-enable.
         self._post_score_updates = os.getenv('LIVE_REPORTING_POST_SCORE_UPDATES', '0').lower() in ('1', 'true', 'yes')
-        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='espn-poll')
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='bot-post')
         self.is_running = False
         self.active_sessions: Dict[int, Dict[str, Any]] = {}
         self.last_events: Dict[int, Set[str]] = {}  # Track processed events by session
@@ -79,6 +89,10 @@ class RealtimeReportingService:
         self._pending_correction: Dict[int, str] = {}  # Per-session lower score awaiting debounce confirmation
         self._overrides_refreshed_at = None  # Last time admin mad-lib overrides were loaded
         self._session_goals: Dict[int, List[Dict[str, Any]]] = {}  # Goals accumulated per session for the FT recap
+        self._settled_sessions: Set[int] = set()  # Last cycle left nothing to retry/confirm
+        self._registry_cursor: Optional[str] = None  # Last change-feed entry applied (None: reload first)
+        self._reconciled_at = 0.0  # time.monotonic() of the last full reload
+        self._match_metadata: Dict[str, Dict[str, Any]] = {}  # LiveReportingSession.match_id -> MLSMatch fields
 
     async def start_service(self):
         """Start the real-time reporting service."""
@@ -102,6 +116,7 @@ class RealtimeReportingService:
             logger.error(f"Fatal error in real-time service: {e}")
         finally:
             self.is_running = False
+            await self.espn_poller.close()
             # Clear status in Redis using execute_command
             self.redis_service.execute_command('del', 'realtime_service:status')
 
@@ -123,7 +138,7 @@ class RealtimeReportingService:
                     self.redis_service.execute_command('setex', 'realtime_service:heartbeat', 120, now.isoformat())
                     last_heartbeat = now
 
-                # Load active sessions from database
+                # Apply session start/stop events (periodic full reload from the DB)
                 await self._refresh_active_sessions()
 
                 if not self.active_sessions:
@@ -142,18 +157,26 @@ class RealtimeReportingService:
                 logger.error(f"Error in main loop: {e}")
                 await asyncio.sleep(10)  # Brief pause on error
 
-    def _refresh_template_overrides(self):
+    def _template_overrides_due(self) -> bool:
         """
-        Load admin-edited mad-lib lines (AIPromptConfig.template_lines) into the
-        template engine, throttled to once every 5 min so edits propagate without
-        a restart but we don't query every cycle. Best-effort — on failure the
-        engine keeps its current (or code-default) lines.
+        Whether to reload admin-edited mad-lib lines this reconciliation,
+        throttled to once every 5 min so edits propagate without a restart but
+        we don't query every cycle. Claims the slot when it returns True.
         """
         now = datetime.utcnow()
         if (self._overrides_refreshed_at is not None
                 and (now - self._overrides_refreshed_at).total_seconds() < 300):
-            return
+            return False
         self._overrides_refreshed_at = now
+        return True
+
+    @staticmethod
+    def _load_template_overrides() -> Optional[Dict[str, List[str]]]:
+        """
+        Admin-edited mad-lib lines (AIPromptConfig.template_lines) by prompt
+        type. Runs in a worker thread and only reads. Best-effort -- None on
+        failure, and the engine keeps its current (or code-default) lines.
+        """
         try:
             from app.models.ai_prompt_config import AIPromptConfig
             overrides: Dict[str, List[str]] = {}
@@ -168,133 +191,237 @@ class RealtimeReportingService:
                 lines = [ln.strip() for ln in (lines_text or '').splitlines() if ln.strip()]
                 if lines:
                     overrides[prompt_type] = lines
-            self.template_engine.set_overrides(overrides)
-            if overrides:
-                logger.info(f"Loaded mad-lib overrides for {len(overrides)} prompt type(s): {sorted(overrides)}")
+            return overrides
         except Exception as e:
             logger.warning(f"Could not refresh template overrides: {e}")
+            return None
+
+    def _apply_template_overrides(self, overrides: Dict[str, List[str]]):
+        """Hand loaded overrides to the template engine (event loop only)."""
+        self.template_engine.set_overrides(overrides)
+        if overrides:
+            logger.info(f"Loaded mad-lib overrides for {len(overrides)} prompt type(s): {sorted(overrides)}")
 
     async def _refresh_active_sessions(self):
-        """Load active live reporting sessions from database."""
+        """
+        Bring active_sessions up to date from the session change feed
+        (live_session_registry). Ticks with no start/stop events touch Redis
+        only; a full reload from the database runs on the first call and then
+        every RECONCILE_SECONDS as a safety net.
+        """
         try:
-            # Refresh admin mad-lib line overrides (throttled internally)
-            self._refresh_template_overrides()
+            now = time.monotonic()
+            if (self._registry_cursor is None
+                    or now - self._reconciled_at >= self.RECONCILE_SECONDS):
+                await self._reconcile_sessions()
+                return
 
-            with task_session() as session:
-                active_sessions = session.query(LiveReportingSession).filter_by(
-                    is_active=True
-                ).all()
+            events, self._registry_cursor = live_session_registry.read_events(self._registry_cursor)
+            if not events:
+                return
+            # Last word per session wins; anything unattributable forces a reload.
+            actions = {}
+            for entry in events:
+                if entry['action'] == live_session_registry.RECONCILE or entry['session_id'] is None:
+                    await self._reconcile_sessions()
+                    return
+                actions[entry['session_id']] = entry['action']
+
+            for session_id, action in actions.items():
+                if action == live_session_registry.STOP:
+                    self._unregister_session(session_id)
+            started = [sid for sid, action in actions.items() if action == live_session_registry.START]
+            if started:
+                # A start may follow an edit of the match, so reload its metadata too.
+                snapshots = await self._run_db(self._load_session_snapshots, started, {})
+                for session_id in started:
+                    if session_id in snapshots:
+                        self._register_session(session_id, snapshots[session_id])
+                    else:
+                        self._unregister_session(session_id)  # stopped again since
+        except Exception as e:
+            logger.error(f"Error refreshing active sessions: {e}")
 
-                # Update our local cache
-                current_sessions = {}
-                for live_session in active_sessions:
-                    session_data = {
-                        'id': live_session.id,
-                        'match_id': live_session.match_id,
-                        'thread_id': live_session.thread_id,
-                        'competition': live_session.competition,
-                        'started_at': live_session.started_at,
-                        'last_update': live_session.last_update,
-                        'update_count': getattr(live_session, 'update_count', 0),
-                        'error_count': getattr(live_session, 'error_count', 0)
-                    }
+    async def _reconcile_sessions(self):
+        """Reload every active session from the database (match metadata from cache)."""
+        self._reconciled_at = time.monotonic()
+        if self._registry_cursor is None:
+            # Anything published while the reload runs is replayed next tick.
+            self._registry_cursor = live_session_registry.stream_tail()
+        snapshots, overrides = await self._run_db(
+            self._reconcile_snapshots, dict(self._match_metadata), self._template_overrides_due())
+        if overrides is not None:
+            self._apply_template_overrides(overrides)
+
+        for old_id in set(self.active_sessions) - set(snapshots):
+            self._unregister_session(old_id)
+        for session_id, snapshot in snapshots.items():
+            self._register_session(session_id, snapshot)
+
+        if self.active_sessions:
+            logger.info(f"Found {len(self.active_sessions)} active live session(s): {list(self.active_sessions)}")
+        else:
+            logger.info("No active live reporting sessions found")
 
-                    # Get match details - handle both match_id (ESPN ID) and id (database primary key)
-                    match = session.query(MLSMatch).filter_by(match_id=live_session.match_id).first()
-                    if not match:
-                        # Try looking up by database ID if match_id didn't work
-                        try:
-                            match = session.query(MLSMatch).filter_by(id=int(live_session.match_id)).first()
-                        except (ValueError, TypeError):
-                            pass
+    def _reconcile_snapshots(self, known_matches, with_overrides):
+        """Worker-thread half of a reconciliation: (snapshots, overrides or None)."""
+        # Admin mad-lib line overrides ride along on the same executor hop.
+        overrides = self._load_template_overrides() if with_overrides else None
+        return self._load_session_snapshots(None, known_matches), overrides
 
-                    if match:
-                        # For MLSMatch, we have opponent and is_home_game
-                        home_team = "Seattle Sounders FC" if match.is_home_game else match.opponent
-                        away_team = match.opponent if match.is_home_game else "Seattle Sounders FC"
-
-                        # espn_match_id may not be populated separately - match_id IS the ESPN ID
-                        espn_id = match.espn_match_id or match.match_id
-
-                        session_data.update({
-                            'home_team': home_team,
-                            'away_team': away_team,
-                            'match_date': match.date_time,
-                            'opponent': match.opponent,
-                            'is_home_game': match.is_home_game,
-                            'venue': match.venue or 'TBD',
-                            'competition': match.competition or 'MLS',
-                            'espn_match_id': espn_id
-                        })
+    async def _run_db(self, fn, *args):
+        """Run a blocking database read off the event loop, inside the app context."""
+        app = current_app._get_current_object()
 
-                    current_sessions[live_session.id] = session_data
+        def run():
+            with app.app_context():
+                return fn(*args)
 
-                    # Log new sessions to the admin UI ring buffer
-                    if live_session.id not in self.active_sessions:
-                        log_event(
-                            stage="session", outcome="info",
-                            session_id=live_session.id,
-                            match_id=str(live_session.match_id),
-                            message=f"Session active: {session_data.get('home_team', '?')} vs {session_data.get('away_team', '?')}",
-                            context={
-                                "competition": session_data.get('competition'),
-                                "thread_id": session_data.get('thread_id'),
-                            },
-                        )
+        return await asyncio.get_running_loop().run_in_executor(None, run)
 
-                    # Initialize event tracking - load persisted keys from DB to survive restarts
-                    if live_session.id not in self.last_events:
-                        persisted_keys = live_session.parsed_event_keys
-                        self.last_events[live_session.id] = set(persisted_keys) if persisted_keys else set()
-                        if persisted_keys:
-                            logger.info(f"Loaded {len(persisted_keys)} persisted event keys for session {live_session.id}")
-                        else:
-                            # No persisted keys but session has been active — need silent catch-up
-                            # to avoid replaying all past events after a restart/first-run
-                            age = (datetime.utcnow() - live_session.started_at).total_seconds() if live_session.started_at else 0
-                            if age > 120:  # Session older than 2 minutes
-                                self._catchup_sessions.add(live_session.id)
-                                logger.info(f"Session {live_session.id} needs catch-up (age={age:.0f}s, no persisted events)")
-
-                        # Restore last known status from DB for transition detection
-                        if live_session.last_status:
-                            self._last_statuses[live_session.id] = live_session.last_status
-                            logger.info(f"Restored last status '{live_session.last_status}' for session {live_session.id}")
-
-                        # Seed Redis score key from DB to prevent false score-change on restart
-                        if live_session.last_score:
-                            score_key = f"last_score_{live_session.id}"
-                            try:
-                                self.redis_service.setex(score_key, 3600, str(live_session.last_score))
-                                logger.info(f"Restored last score '{live_session.last_score}' for session {live_session.id}")
-                            except Exception:
-                                pass
-
-                # Clean up old sessions from our cache
-                old_session_ids = set(self.active_sessions.keys()) - set(current_sessions.keys())
-                for old_id in old_session_ids:
-                    self.last_events.pop(old_id, None)
-                    self._session_goals.pop(old_id, None)
-                    self._pending_score.pop(old_id, None)
-                    self._pending_correction.pop(old_id, None)
-
-                self.active_sessions = current_sessions
-
-                if self.active_sessions:
-                    session_ids = list(self.active_sessions.keys())
-                    logger.info(f"Found {len(self.active_sessions)} active live session(s): {session_ids}")
-                else:
-                    logger.info("No active live reporting sessions found")
+    def _load_session_snapshots(self, session_ids, known_matches) -> Dict[int, Dict[str, Any]]:
+        """
+        Active sessions (all of them, or just session_ids) as plain dicts, with
+        match metadata taken from known_matches or loaded. Runs in a worker
+        thread, so nothing here touches service state.
+        """
+        snapshots = {}
+        with task_session() as session:
+            query = session.query(LiveReportingSession).filter_by(is_active=True)
+            if session_ids is not None:
+                query = query.filter(LiveReportingSession.id.in_(list(session_ids)))
+            for live_session in query.all():
+                match_key = str(live_session.match_id)
+                metadata = known_matches.get(match_key)
+                if metadata is None:
+                    metadata = self._load_match_metadata(session, live_session.match_id)
+                session_data = {
+                    'id': live_session.id,
+                    'match_id': live_session.match_id,
+                    'thread_id': live_session.thread_id,
+                    'competition': live_session.competition,
+                    'started_at': live_session.started_at,
+                    'last_update': live_session.last_update,
+                    'update_count': getattr(live_session, 'update_count', 0),
+                    'error_count': getattr(live_session, 'error_count', 0),
+                    **metadata,
+                }
+                snapshots[live_session.id] = {
+                    'session_data': session_data,
+                    'match_key': match_key,
+                    'match_metadata': metadata,
+                    'event_keys': live_session.parsed_event_keys,
+                    'last_status': live_session.last_status,
+                    'last_score': live_session.last_score,
+                }
+        return snapshots
 
-        except Exception as e:
-            logger.error(f"Error refreshing active sessions: {e}")
+    @staticmethod
+    def _load_match_metadata(session, match_id) -> Dict[str, Any]:
+        """Team/venue fields for a session's match; {} if the match isn't found."""
+        # Handle both match_id (ESPN ID) and id (database primary key)
+        match = session.query(MLSMatch).filter_by(match_id=match_id).first()
+        if not match:
+            try:
+                match = session.query(MLSMatch).filter_by(id=int(match_id)).first()
+            except (ValueError, TypeError):
+                pass
+        if not match:
+            return {}
+
+        # For MLSMatch, we have opponent and is_home_game
+        home_team = "Seattle Sounders FC" if match.is_home_game else match.opponent
+        away_team = match.opponent if match.is_home_game else "Seattle Sounders FC"
+        return {
+            'home_team': home_team,
+            'away_team': away_team,
+            'match_date': match.date_time,
+            'opponent': match.opponent,
+            'is_home_game': match.is_home_game,
+            'venue': match.venue or 'TBD',
+            'competition': match.competition or 'MLS',
+            # espn_match_id may not be populated separately - match_id IS the ESPN ID
+            'espn_match_id': match.espn_match_id or match.match_id,
+        }
+
+    def _register_session(self, session_id: int, snapshot: Dict[str, Any]):
+        """Start (or refresh) tracking a session from a _load_session_snapshots entry."""
+        session_data = snapshot['session_data']
+        if snapshot['match_metadata']:
+            self._match_metadata[snapshot['match_key']] = snapshot['match_metadata']
+
+        existing = self.active_sessions.get(session_id)
+        if existing is not None:
+            # Keep what polling stored on the dict (running score etc.).
+            existing.update(session_data)
+            return
+        self.active_sessions[session_id] = session_data
+
+        # Log new sessions to the admin UI ring buffer
+        log_event(
+            stage="session", outcome="info",
+            session_id=session_id,
+            match_id=str(session_data['match_id']),
+            message=f"Session active: {session_data.get('home_team', '?')} vs {session_data.get('away_team', '?')}",
+            context={
+                "competition": session_data.get('competition'),
+                "thread_id": session_data.get('thread_id'),
+            },
+        )
+
+        # Initialize event tracking - load persisted keys from DB to survive restarts
+        if session_id not in self.last_events:
+            persisted_keys = snapshot['event_keys']
+            self.last_events[session_id] = set(persisted_keys) if persisted_keys else set()
+            if persisted_keys:
+                logger.info(f"Loaded {len(persisted_keys)} persisted event keys for session {session_id}")
+            else:
+                # No persisted keys but session has been active — need silent catch-up
+                # to avoid replaying all past events after a restart/first-run
+                started_at = session_data.get('started_at')
+                age = (datetime.utcnow() - started_at).total_seconds() if started_at else 0
+                if age > 120:  # Session older than 2 minutes
+                    self._catchup_sessions.add(session_id)
+                    logger.info(f"Session {session_id} needs catch-up (age={age:.0f}s, no persisted events)")
+
+            # Restore last known status from DB for transition detection
+            if snapshot['last_status']:
+                self._last_statuses[session_id] = snapshot['last_status']
+                logger.info(f"Restored last status '{snapshot['last_status']}' for session {session_id}")
+
+            # Seed Redis score key from DB to prevent false score-change on restart
+            if snapshot['last_score']:
+                score_key = f"last_score_{session_id}"
+                try:
+                    self.redis_service.setex(score_key, 3600, str(snapshot['last_score']))
+                    logger.info(f"Restored last score '{snapshot['last_score']}' for session {session_id}")
+                except Exception:
+                    pass
+
+    def _unregister_session(self, session_id: int):
+        """Stop tracking a session and drop its in-memory state."""
+        session_data = self.active_sessions.pop(session_id, None)
+        if session_data is not None:
+            self._match_metadata.pop(str(session_data.get('match_id')), None)
+            if session_data.get('espn_match_id'):
+                self.espn_poller.forget(session_data['espn_match_id'])
+        self.last_events.pop(session_id, None)
+        self._settled_sessions.discard(session_id)
+        self._catchup_sessions.discard(session_id)
+        self._last_statuses.pop(session_id, None)
+        self.match_history.pop(session_id, None)
+        self._unknown_status_counts.pop(session_id, None)
+        self._session_goals.pop(session_id, None)
+        self._pending_score.pop(session_id, None)
+        self._pending_correction.pop(session_id, None)
 
     async def _process_active_sessions(self):
-        """Process all active sessions for real-time updates."""
+        """Process the active sessions whose match is due for an ESPN poll."""
         tasks = []
 
-        for session_id, session_data in self.active_sessions.items():
-            if session_data.get('espn_match_id'):
+        for session_id, session_data in list(self.active_sessions.items()):
+            espn_match_id = session_data.get('espn_match_id')
+            if espn_match_id and self.espn_poller.is_due(espn_match_id):
                 task = asyncio.create_task(
                     self._process_session_realtime(session_id, session_data)
                 )
@@ -322,13 +449,8 @@ class RealtimeReportingService:
                 f"Polling ESPN for session {session_id} "
                 f"(match={espn_match_id}, league={league_code})"
             )
-            # Run sync ESPN client in executor to avoid blocking the async event loop
-            loop = asyncio.get_running_loop()
-            match_data = await loop.run_in_executor(
-                self._executor,
-                self.espn_client.get_match_data,
-                espn_match_id, league_code,
-            )
+            poll = await self.espn_poller.poll(espn_match_id, league_code)
+            match_data = poll.data if poll else None
             if not match_data:
                 # If ESPN returned nothing after the match was previously live,
                 # it has likely dropped off the live scoreboard because it
@@ -428,8 +550,14 @@ class RealtimeReportingService:
                                                  self._get_transition_type(previous_status, status),
                                                  match_data)
 
-            # Process any new discrete events (goals, cards, subs)
-            new_events = await self._extract_new_events(session_id, match_data)
+            # Process any new discrete events (goals, cards, subs). When neither
+            # keyEvents, score nor status moved since a cycle that left nothing
+            # to retry or confirm, there is nothing new to find.
+            if poll.quiet and session_id in self._settled_sessions:
+                new_events = []
+            else:
+                new_events = await self._extract_new_events(session_id, match_data)
+            settled = True
 
             # On first poll after restart with no persisted keys, silently catch up
             if is_catchup:
@@ -448,6 +576,7 @@ class RealtimeReportingService:
                 session_data['home_score'] = match_data.get('home_score', 0)
                 session_data['away_score'] = match_data.get('away_score', 0)
                 posted_keys = await self._send_events_to_discord(session_id, session_data, new_events)
+                settled = all(e.get('_dedup_key') in (posted_keys or ()) for e in new_events)
                 # Commit dedup keys ONLY for events that actually posted, so a failed
                 # post is retried next cycle instead of being silently dropped. (Score
                 # keys are tracked via Redis, not last_events.)
@@ -461,6 +590,12 @@ class RealtimeReportingService:
                 # No events to post, but a first-cycle score seed may be pending.
                 self._commit_pending_score(session_id)
 
+            # A pending score correction is confirmed (or dropped) on the next poll.
+            if settled and session_id not in self._pending_correction:
+                self._settled_sessions.add(session_id)
+            else:
+                self._settled_sessions.discard(session_id)
+
             # Update status tracking and persist state
             self._last_statuses[session_id] = status
             await self._update_session_stats(session_id, status, score)
@@ -852,21 +987,14 @@ class RealtimeReportingService:
             batch_seen = set()  # avoid returning the same event twice within one poll
 
             for event in events:
-                # Build a robust dedup key from all available fields. ESPN
-                # keyEvents carry a unique 'id' but we include type/minute/
-                # player/team so dedup survives even if id is missing.
-                parts = [
-                    event.get('id', ''),
-                    event.get('type', 'unknown'),
-                    str(event.get('minute', '0')),
-                    event.get('player', event.get('athlete_name', '')),
-                    event.get('team', event.get('team_id', '')),
-                ]
-                event_id = '_'.join(p for p in parts if p)
+                # The poller stamps each event's key once, when it builds
+                # the event list; it reuses the list while keyEvents is unchanged.
+                event_id = event.get('_dedup_key')
+                if event_id is None:
+                    event_id = event['_dedup_key'] = event_dedup_key(event)
 
                 if event_id not in processed_events and event_id not in batch_seen:
                     batch_seen.add(event_id)
-                    event['_dedup_key'] = event_id
                     new_events.append(event)
 
             # Score-change detection (skip during halftime — score can't change).
@@ -1566,14 +1694,10 @@ class RealtimeReportingService:
                     # in the LiveReportingSession DB record for diagnostics.
                     await self._archive_thread(live_session.thread_id)
 
-                    # Clean up in-memory tracking
-                    self.last_events.pop(session_id, None)
-                    self._last_statuses.pop(session_id, None)
-                    self.match_history.pop(session_id, None)
-                    self._unknown_status_counts.pop(session_id, None)
-                    self._session_goals.pop(session_id, None)
-                    self._pending_score.pop(session_id, None)
-                    self._pending_correction.pop(session_id, None)
+                    # Clean up in-memory tracking (the commit above also
+                    # publishes a stop event; unregistering twice is harmless)
+                    self.espn_poller.forget(session_data.get('espn_match_id') or live_session.match_id)
+                    self._unregister_session(session_id)
 
         except Exception as e:
             logger.error(f"Error deactivating session {session_id}: {e}")
@@ -1604,12 +1728,14 @@ class RealtimeReportingService:
             logger.error(f"Error sending session end message: {e}")
 
     def _get_next_interval(self) -> float:
-        """Determine the next check interval based on active sessions."""
+        """Sleep until the next match is due, refreshing sessions at least every 10s."""
         if not self.active_sessions:
             return 30.0  # No active sessions
 
-        # If we have active sessions, check frequently
-        return 10.0  # Real-time updates every 10 seconds
+        match_ids = [s['espn_match_id'] for s in self.active_sessions.values() if s.get('espn_match_id')]
+        if not match_ids:
+            return 10.0
+        return min(10.0, max(1.0, self.espn_poller.seconds_until_due(match_ids)))
 
     async def get_service_status(self) -> Dict[str, Any]:
         """Get current service status for monitoring."""
@@ -1758,6 +1758,7 @@ def get_api_tab(session, hours=24):
         'stats': None,          # headline metrics (all api-only)
         'top_endpoints': [],    # busiest endpoints
         'error_breakdown': [],  # errors grouped by status code
+        'latency': [],          # per-endpoint percentiles (pre-aggregated histograms)
         'has_data': False,
         'management_url': None,  # LINK to the full API Management page
     }
@@ -1832,6 +1833,13 @@ def get_api_tab(session, hours=24):
     except Exception:
         logger.exception("api tab: error breakdown failed")
 
+    # ---- latency percentiles (pre-aggregated; no raw-row scan) ----
+    try:
+        from app.services.api_log_buffer import get_latency_summary
+        out['latency'] = get_latency_summary(hours=hours, limit=10)
+    except Exception:
+        logger.exception("api tab: latency percentiles failed")
+
     out['management_url'] = _safe_url('admin_panel.api_management')
     return out
 
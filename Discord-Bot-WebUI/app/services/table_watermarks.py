@@ -0,0 +1,69 @@
+# app/services/table_watermarks.py
+
+"""
+Per-table change watermarks.
+
+One version counter (app/services/version_counters.py) per watched table,
+bumped after any commit that writes to it. The automation engine uses these to
+reuse detector results across hourly passes (see DETECTOR_INPUTS in
+automation_service.py). Writes the commit_marks tracker can't see (raw text()
+SQL) should call bump() themselves.
+"""
+
+from sqlalchemy import inspect
+
+from app.services import commit_marks
+from app.services.version_counters import CounterSet
+
+WATERMARK_PREFIX = 'watermark:'
+
+# Tables someone reads watermarks for. Writes to other tables cost nothing.
+WATCHED_TABLES = frozenset({
+    'users', 'player', 'player_teams', 'team', 'league', 'season',
+    'player_season_participation', 'substitute_requests', 'substitute_responses',
+    'substitute_assignments', 'substitute_pools', 'wallet_pass', 'feedback', 'matches',
+})
+
+# Bookkeeping columns written on every request; a write touching only these
+# doesn't move the watermark.
+IGNORED_COLUMNS = {
+    'users': frozenset({'last_login'}),
+}
+
+_counters = CounterSet(WATERMARK_PREFIX, 'table watermarks')
+
+
+def bump(tables, redis_client=None):
+    """Move the watermark of every given table."""
+    return _counters.bump(tables, redis_client=redis_client)
+
+
+def get_watermarks(tables, redis_client=None):
+    """{table: counter} for these tables, seeding missing ones. None if Redis is unavailable."""
+    tables = sorted(set(tables))
+    values = _counters.read(tables, redis_client=redis_client)
+    return None if values is None else dict(zip(tables, values))
+
+
+# -----------------------------------------------------------------------------
+# Commit marks: tables collected at flush, bumped after commit.
+# -----------------------------------------------------------------------------
+
+def _instance_tables(session, instance):
+    table = getattr(getattr(instance, '__table__', None), 'name', None)
+    if table not in WATCHED_TABLES:
+        return ()
+    if instance in session.dirty:
+        state = inspect(instance)
+        changed = {attr.key for attr in state.attrs if attr.history.has_changes()}
+        if not changed or changed <= IGNORED_COLUMNS.get(table, frozenset()):
+            return ()
+    return (table,)
+
+
+def _statement_tables(table, orm_execute_state):
+    return (table,) if table in WATCHED_TABLES else ()
+
+
+commit_marks.track('table_watermarks', publish=bump,
+                   on_instance=_instance_tables, on_statement=_statement_tables)
@@ -0,0 +1,80 @@
+# app/services/version_counters.py
+
+"""
+Named Redis change counters.
+
+A counter is bumped after any commit that writes what it stands for (a table,
+or a group of tables like an ETag scope), so a reader that remembers the values
+it saw can tell whether anything it depends on changed since, without querying
+the data. etag_versions and table_watermarks are both a CounterSet plus a
+commit_marks tracker that maps writes onto counter names.
+
+Counters are seeded with the current time in milliseconds rather than starting
+at 0, so a Redis flush can't replay old values and make a stale cache (or ETag)
+look current. Reads seed missing counters the same way. Without Redis, bump()
+does nothing and read() returns None; readers must then recompute, and must
+bound anything they cache in time to cover writes nobody bumped for.
+"""
+
+import logging
+import time
+
+from app.utils.redis_manager import get_app_redis
+
+logger = logging.getLogger(__name__)
+
+
+class CounterSet:
+    """Counters stored at ``<prefix><name>``; label names them in log lines."""
+
+    def __init__(self, prefix, label):
+        self.prefix = prefix
+        self.label = label
+
+    def key(self, name):
+        return f'{self.prefix}{name}'
+
+    def bump(self, names, redis_client=None):
+        """Move every given counter. Returns how many were bumped."""
+        names = sorted({n for n in names if n})
+        if not names:
+            return 0
+        r = redis_client or get_app_redis()
+        if r is None:
+            return 0
+        try:
+            seed = int(time.time() * 1000)
+            pipe = r.pipeline()
+            for name in names:
+                pipe.set(self.key(name), seed, nx=True)
+                pipe.incr(self.key(name))
+            pipe.execute()
+        except Exception:
+            # Readers bound their caches in time, so a lost bump only delays them.
+            logger.warning(f"{self.label}: could not bump {names}", exc_info=True)
+            return 0
+        return len(names)
+
+    def read(self, names, redis_client=None):
+        """Current value per name, in order, seeding missing ones. None if Redis is unavailable."""
+        r = redis_client or get_app_redis()
+        if r is None:
+            return None
+        keys = [self.key(name) for name in names]
+        try:
+            values = r.mget(keys)
+            missing = [key for key, value in zip(keys, values) if value is None]
+            if missing:
+                seed = int(time.time() * 1000)
+                pipe = r.pipeline()
+                for key in missing:
+                    pipe.set(key, seed, nx=True)
+                pipe.execute()
+                values = r.mget(keys)
+        except Exception:
+            logger.debug(f"{self.label}: counters unavailable", exc_info=True)
+            return None
+        if not isinstance(values, (list, tuple)) or len(values) != len(keys) \
+                or any(value is None for value in values):
+            return None
+        return [value.decode() if isinstance(value, bytes) else str(value) for value in values]
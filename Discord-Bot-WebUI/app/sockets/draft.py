@@ -15,7 +15,7 @@ from app.core import socketio
 from app.core.session_manager import managed_session
 from app.models.ecs_fc import is_ecs_fc_league
 from app.sockets.utils import get_draft_lock, cleanup_draft_lock
-from app.services import program_registry
+from app.services import classic_draft_service, program_registry
 
 logger = logging.getLogger(__name__)
 
@@ -651,6 +651,17 @@ def handle_draft_player_enhanced(data):
             # a client that loaded /draft/Classic joins draft_Classic while the
             # balanced/mobile boards join draft_classic — a single-casing emit
             # would silently skip one of them.
+            # Classic: log the move so balanced boards catch up by delta. A
+            # client already at board_version - 1 applies this event and is
+            # current without refetching state.
+            board_version = None
+            if classic_draft_service.is_board_league(db_league_name):
+                try:
+                    board_version = classic_draft_service.record_board_move(player_id, team_id)
+                except Exception as _board_err:
+                    logger.warning(f"Board log append skipped: {_board_err}")
+                response_data['board_version'] = board_version
+
             from app.draft_clock import draft_rooms as _draft_rooms
             for _room in _draft_rooms(league_name):
                 emit('player_drafted_enhanced', response_data, room=_room)
@@ -677,7 +688,8 @@ def handle_draft_player_enhanced(data):
                 # Normalize league name for cache key
                 db_league_name = (program_registry.league_name_for_draft_slug(league_name.lower())
                                       or league_name)
-                deleted = DraftCacheService.invalidate_player_cache_ultra_safe(player_id, db_league_name)
+                deleted = DraftCacheService.invalidate_player_cache_ultra_safe(
+                    player_id, db_league_name, reset_board=board_version is None)
                 print(f"🗑️ Invalidated {deleted} cache keys for player {player_id} in {db_league_name}")
                 logger.info(f"🗑️ Invalidated {deleted} cache keys after draft")
             except Exception as cache_error:
@@ -1048,6 +1060,14 @@ def handle_remove_player_enhanced(data):
             # Broadcast to all clients in the draft room so everyone sees the update
             # (web '/' + mobile '/draft' namespaces).
             # Same exact + lowercased room fan-out as the drafted broadcast.
+            board_version = None
+            if classic_draft_service.is_board_league(db_league_name):
+                try:
+                    board_version = classic_draft_service.record_board_move(player_id, None)
+                except Exception as _board_err:
+                    logger.warning(f"Board log append skipped: {_board_err}")
+                response_data['board_version'] = board_version
+
             from app.draft_clock import draft_rooms as _draft_rooms
             for _room in _draft_rooms(league_name):
                 emit('player_removed_enhanced', response_data, room=_room)
@@ -1059,7 +1079,8 @@ def handle_remove_player_enhanced(data):
             # CRITICAL: Invalidate draft cache so page refresh shows correct data
             try:
                 from app.draft_cache_service import DraftCacheService
-                deleted = DraftCacheService.invalidate_player_cache_ultra_safe(player_id, db_league_name)
+                deleted = DraftCacheService.invalidate_player_cache_ultra_safe(
+                    player_id, db_league_name, reset_board=board_version is None)
                 print(f"🗑️ Invalidated {deleted} cache keys for player {player_id} in {db_league_name}")
                 logger.info(f"🗑️ Invalidated {deleted} cache keys after player removal")
             except Exception as cache_error:
@@ -5,10 +5,13 @@
  * legacy draft: emits the existing draft_player_enhanced /
  * remove_player_enhanced events with league_name 'classic' and consumes
  * player_drafted_enhanced / player_removed_enhanced. Client state updates
- * optimistically from events; a debounced state.json refetch reconciles.
+ * optimistically from events. Events carry the board_version they produced;
+ * when that is the next version no fetch is needed, otherwise a debounced
+ * state.json?since=<version> diff (full payload if the log can't cover it)
+ * reconciles.
  */
 
-import { state, loadInitial, applyDrafted, applyRemoved } from './state.js';
+import { state, loadInitial, applyDrafted, applyRemoved, applyChanges, advanceVersion } from './state.js';
 import { renderAll } from './render.js';
 
 const LEAGUE = 'classic';
@@ -32,10 +35,16 @@ export function scheduleResync() {
         try {
             const url = document.getElementById('draft-balanced-root')?.dataset.stateUrl;
             if (!url) return;
-            const resp = await fetch(url);
-            const data = await resp.json();
+            const since = state.version;
+            let resp = await fetch(since === null ? url : `${url}?since=${since}`);
+            let data = await resp.json();
+            if (resp.ok && data.success && since !== null && !data.full && !applyChanges(data)) {
+                resp = await fetch(url);
+                data = await resp.json();
+                data.full = true;
+            }
             if (resp.ok && data.success) {
-                loadInitial(data);
+                if (since === null || data.full) loadInitial(data);
                 renderAll();
                 onChangeCallback?.();
             }
@@ -48,19 +57,21 @@ export function scheduleResync() {
 function handleDrafted(data) {
     const playerId = data?.player?.id ?? data?.player_id;
     if (playerId === undefined) return;
-    applyDrafted(playerId, data.team_id);
+    const applied = applyDrafted(playerId, data.team_id);
     renderAll();
     onChangeCallback?.();
-    scheduleResync();   // authoritative reconciliation (joins mid-draft, drift)
+    // Authoritative reconciliation (joins mid-draft, drift) unless this event
+    // was exactly the next board version.
+    if (!(applied && advanceVersion(data.board_version))) scheduleResync();
 }
 
 function handleRemoved(data) {
     const playerId = data?.player?.id ?? data?.player_id;
     if (playerId === undefined) return;
-    applyRemoved(playerId);
+    const applied = applyRemoved(playerId);
     renderAll();
     onChangeCallback?.();
-    scheduleResync();
+    if (!(applied && advanceVersion(data.board_version))) scheduleResync();
 }
 
 function handleError(data) {
@@ -6,8 +6,8 @@
  * Mirrors app/services/classic_draft_service.py: per-metric team TOTALS over
  * non-coach players with the configured unrated_default imputed for unrated
  * players; gap = max total - min total per metric. Events mutate this state
- * deterministically; a debounced /classic-draft/state.json resync remains the
- * authority (see socket.js).
+ * deterministically; a debounced /classic-draft/state.json?since=<version>
+ * diff (or full resync) remains the authority (see socket.js).
  */
 
 export const METRICS = ['intensity', 'on_ball_skill', 'spirit', 'knowledge_movement'];
@@ -24,6 +24,7 @@ export const state = {
     metrics: [],        // metric guide rows (key,label,weight,...)
     config: { max_metric_gap: 3, unrated_default: 3, suggestion_count: 10, gender_balance_enabled: true },
     seasonName: null,
+    version: null,      // board-log version this state reflects (null = no log)
     activeTeamId: null, // click-to-target team
     railTab: 'pool',
     suggestTeamId: null,
@@ -37,6 +38,7 @@ export function loadInitial(payload) {
     state.metrics = payload.metrics || [];
     state.config = payload.config || state.config;
     state.seasonName = payload.season_name || null;
+    state.version = payload.version ?? null;
     if (state.suggestTeamId === null && state.teams.length) {
         state.suggestTeamId = state.teams[0].id;
     }
@@ -155,6 +157,34 @@ export function applyRemoved(playerId) {
     return false;
 }
 
+/**
+ * Apply a ?since= diff from state.json: each move says where the player is
+ * NOW (team_id null = pool). Returns false when the diff can't be applied
+ * (a player this client never saw) so the caller falls back to a full load.
+ */
+export function applyChanges(payload) {
+    for (const move of payload.moves || []) {
+        const known = move.team_id === null
+            ? (applyRemoved(move.player_id) || state.pool.some(p => p.id === move.player_id))
+            : (applyDrafted(move.player_id, move.team_id)
+               || Boolean(findTeam(move.team_id)?.roster.some(p => p.id === move.player_id)));
+        if (!known) return false;
+    }
+    state.version = payload.version ?? null;
+    return true;
+}
+
+/**
+ * Socket events carry the board_version they produced. When that is exactly
+ * the next version, the optimistic apply already made this client current.
+ */
+export function advanceVersion(boardVersion) {
+    if (boardVersion === null || boardVersion === undefined || state.version === null) return false;
+    if (boardVersion !== state.version + 1) return false;
+    state.version = boardVersion;
+    return true;
+}
+
 export function draftedCount() {
     return state.teams.reduce((total, t) => total + t.roster.filter(p => !p.is_coach).length, 0);
 }
@@ -1,10 +1,13 @@
 # app/tasks/tasks_api_logging.py
 
 """
-Async API Request Logging Task
+Async API Request Logging Tasks
 
-Celery task for asynchronous API request logging to prevent
-database connection pool exhaustion from blocking commits on every request.
+The middleware now buffers rows in-process (app/services/api_log_buffer.py)
+instead of queueing a task per request. drain_api_log_stream bulk-inserts the
+batches the 'redis' sink leaves on the api:request_log stream;
+log_api_request_async stays registered so messages queued before a deploy
+still drain.
 """
 
 import logging
@@ -37,7 +40,7 @@ def log_api_request_async(
     timestamp_iso: str
 ) -> Dict[str, Any]:
     """
-    Async API request logging via Celery.
+    Async API request logging via Celery (legacy single-row path).
 
     This task is called asynchronously to log API requests without blocking
     the main request/response cycle. This prevents connection pool exhaustion
@@ -93,3 +96,53 @@ def log_api_request_async(
             pass
         # Don't raise - logging failures shouldn't cause task retries
         return {'status': 'failed', 'error': str(e)}
+
+
+@celery_task(
+    name='app.tasks.tasks_api_logging.drain_api_log_stream',
+    bind=True,
+    ignore_result=True,
+    max_retries=0,
+    soft_time_limit=30,
+    time_limit=60
+)
+def drain_api_log_stream(self, session, max_entries: int = 50) -> Dict[str, Any]:
+    """
+    Bulk-insert API log batches queued on the Redis stream by the 'redis' sink.
+
+    Each stream entry is one buffered batch; up to max_entries of them go into
+    a single multi-row INSERT, and are deleted from the stream only after the
+    commit. A no-op (one XRANGE) when the 'db' sink is in use.
+    """
+    from app.models.api_logs import APIRequestLog
+    from app.services.api_log_buffer import STREAM_KEY, decode_stream_rows
+    from app.utils.safe_redis import get_safe_redis
+
+    safe_redis = get_safe_redis()
+    if not safe_redis.is_available:
+        return {'status': 'skipped', 'reason': 'redis unavailable'}
+
+    entries = safe_redis.client.xrange(STREAM_KEY, count=max_entries) or []
+    if not entries:
+        return {'status': 'empty', 'rows': 0}
+
+    rows, ids = [], []
+    for entry_id, fields in entries:
+        ids.append(entry_id)
+        payload = fields.get('rows', fields.get(b'rows'))
+        try:
+            rows.extend(decode_stream_rows(payload))
+        except Exception as e:
+            logger.debug(f"Skipping malformed API log batch {entry_id}: {e}")
+
+    try:
+        if rows:
+            session.execute(APIRequestLog.__table__.insert(), rows)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.warning(f"API log stream drain failed, {len(ids)} batch(es) left queued: {e}")
+        return {'status': 'failed', 'error': str(e)}
+
+    safe_redis.client.xdel(STREAM_KEY, *ids)
+    return {'status': 'drained', 'batches': len(ids), 'rows': len(rows)}
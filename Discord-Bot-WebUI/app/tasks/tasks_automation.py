@@ -34,11 +34,15 @@ def evaluate_automations(self, session):
     dispatched = automation_service.dispatch_due_runs(session)
 
     logger.info(
-        "Automation pass: %d rules evaluated, %d runs created, "
-        "%d due, %d dispatched",
-        evaluated['rules_evaluated'], evaluated['runs_created'],
-        dispatched['due'], dispatched['dispatched'],
+        "Automation pass: %d rules evaluated (%d detectors from cache), "
+        "%d runs created, %d due, %d dispatched",
+        evaluated['rules_evaluated'], evaluated['detectors_cached'],
+        evaluated['runs_created'], dispatched['due'], dispatched['dispatched'],
     )
+    for timing in evaluated['rule_timings'][:5]:
+        logger.info("Automation rule %s: %.1fms (detect %sms, %s events, cached=%s)",
+                    timing['rule'], timing['ms'], timing.get('detect_ms', '-'),
+                    timing.get('events', '-'), timing.get('cached', False))
     return {**evaluated, **dispatched}
 
 
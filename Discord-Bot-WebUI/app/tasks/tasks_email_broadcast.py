@@ -11,11 +11,14 @@ import time
 import logging
 from datetime import datetime
 
+from flask import current_app
+
 from app.decorators import celery_task
 from app.models.email_campaigns import EmailCampaign, EmailCampaignRecipient
 from app.models.core import User
 from app.email import send_email, send_email_bcc
-from app.services.email_broadcast_service import email_broadcast_service
+from app.services.email_broadcast_service import CompiledEmail, email_broadcast_service
+from app.services.email_delivery import EmailDeliveryEngine, OutgoingEmail
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +65,8 @@ def send_email_broadcast(self, session, campaign_id):
     Send an email broadcast campaign.
 
     For BCC mode: batches recipients and sends via BCC with delays.
-    For individual mode: sends personalized emails one at a time.
+    For individual mode: sends personalized emails through the concurrent,
+    rate-limited EmailDeliveryEngine.
 
     Args:
         self: Celery task instance.
@@ -222,63 +226,76 @@ def _send_bcc_batch(session, campaign, wrapper_html):
 
 
 def _send_individual(session, campaign, wrapper_html):
-    """Send campaign with per-recipient personalization."""
-    recipients = session.query(EmailCampaignRecipient).filter_by(
-        campaign_id=campaign.id, status='pending'
-    ).all()
+    """Send campaign with per-recipient personalization.
 
-    send_count = 0
-    for recipient in recipients:
-        # Check for cancellation every 10 sends
-        if send_count > 0 and send_count % 10 == 0:
-            session.refresh(campaign)
-            if campaign.status == 'cancelled':
-                logger.info(f"Campaign {campaign.id} cancelled during send")
-                return
+    wrapper_html is already template-rendered and linkified with the tokens
+    still in it, so it is compiled once and each recipient's copy is a join.
+    Personalization context is preloaded in bulk, messages go out through
+    EmailDeliveryEngine (persistent connections, token-bucket rate limit), and
+    recipient statuses are written a batch per commit.
+    """
+    recipients = session.query(
+        EmailCampaignRecipient.id, EmailCampaignRecipient.user_id
+    ).filter_by(campaign_id=campaign.id, status='pending').all()
+    if not recipients:
+        return
 
-        user = session.query(User).get(recipient.user_id)
-        if not user or not user.email:
-            recipient.status = 'skipped'
-            recipient.error_message = 'No email address'
-            campaign.failed_count += 1
-            session.commit()
-            send_count += 1
-            continue
+    contexts = email_broadcast_service.load_personalization_context(
+        session, [r.user_id for r in recipients])
 
-        # Personalize content
-        p_subject, p_body = email_broadcast_service.personalize_content(
-            session, campaign.subject, campaign.body_html, recipient.user_id
-        )
-
-        # Re-wrap personalized body with template if assigned
-        if campaign.template_id and campaign.template:
-            try:
-                personalized_html = campaign.template.render(p_body, p_subject)
-            except Exception:
-                personalized_html = p_body
+    deliverable = []
+    skipped = []
+    for recipient in recipients:
+        context = contexts.get(recipient.user_id)
+        if context and context['email']:
+            deliverable.append((recipient.id, context))
         else:
-            personalized_html = p_body
+            skipped.append({'id': recipient.id, 'status': 'skipped',
+                            'error_message': 'No email address'})
+    if skipped:
+        session.bulk_update_mappings(EmailCampaignRecipient, skipped)
+        campaign.failed_count += len(skipped)
+        session.commit()
 
-        # Auto-link bare URLs
-        personalized_html = linkify_urls(personalized_html)
+    compiled = CompiledEmail(campaign.subject, wrapper_html)
 
-        result = send_email(user.email, p_subject, personalized_html)
-        now = datetime.utcnow()
+    def messages():
+        for recipient_id, context in deliverable:
+            subject, html = compiled.render(context['values'])
+            yield OutgoingEmail(recipient_id, context['email'], subject, html)
 
-        if result:
-            recipient.status = 'sent'
-            recipient.sent_at = now
-            campaign.sent_count += 1
-        else:
-            recipient.status = 'failed'
-            recipient.error_message = 'Send failed'
-            campaign.failed_count += 1
+    def record(outcomes):
+        _record_outcomes(session, campaign, outcomes)
 
-        send_count += 1
-        session.commit()
+    def cancelled():
+        session.refresh(campaign)
+        return campaign.status == 'cancelled'
+
+    engine = EmailDeliveryEngine.from_config(current_app.config)
+    summary = engine.deliver(messages(), record, should_cancel=cancelled)
+    if summary.cancelled:
+        logger.info(f"Campaign {campaign.id} cancelled during send")
+    logger.info(
+        f"Campaign {campaign.id} individual send: sent={summary.sent}, failed={summary.failed}, "
+        f"throttled={summary.throttled_seconds:.1f}s, elapsed={summary.elapsed:.1f}s"
+    )
 
-        # Rate limit delay
-        time.sleep(1.5)
+
+def _record_outcomes(session, campaign, outcomes):
+    """Write one batch of delivery outcomes and the campaign counters in one commit."""
+    updates = []
+    sent = 0
+    for outcome in outcomes:
+        if outcome.ok:
+            sent += 1
+            updates.append({'id': outcome.key, 'status': 'sent', 'sent_at': outcome.sent_at})
+        else:
+            updates.append({'id': outcome.key, 'status': 'failed',
+                            'error_message': outcome.error or 'Send failed'})
+    session.bulk_update_mappings(EmailCampaignRecipient, updates)
+    campaign.sent_count += sent
+    campaign.failed_count += len(outcomes) - sent
+    session.commit()
 
 
 @celery_task(
@@ -623,27 +623,21 @@ def recalculate_all_attendance_stats(self, session):
     request — looping hundreds of players, each now doing several queries — which
     exceeded the request timeout and rolled the whole transaction back, so stored
     attendance stayed frozen (career showed the old buggy calc, season read 0%).
-    Running it as a task with a per-player commit removes the timeout and lets
-    partial progress persist; one bad player can't lose the rest.
+
+    It is now set-based (app/services/attendance_stats_service.py): two aggregate
+    statements compute every player's numbers, identical to update_stats, and rows
+    are written back in committed batches instead of a commit per player.
     """
-    from app.models.stats import PlayerAttendanceStats
+    from app.services.attendance_stats_service import recalculate_attendance_stats
 
-    player_ids = [pid for (pid,) in session.query(PlayerAttendanceStats.player_id).all()]
-    updated = 0
-    errors = 0
-    for pid in player_ids:
-        try:
-            stat = session.query(PlayerAttendanceStats).filter_by(player_id=pid).first()
-            if stat is not None:
-                stat.update_stats(session)
-                session.commit()
-                updated += 1
-        except Exception as e:
-            session.rollback()
-            errors += 1
-            logger.warning(f"recalculate_all_attendance_stats: player {pid} failed: {e}")
-    logger.info(f"recalculate_all_attendance_stats: {updated} updated, {errors} errors, {len(player_ids)} total")
-    return {'updated': updated, 'errors': errors, 'total': len(player_ids)}
+    try:
+        result = recalculate_attendance_stats(session)
+    except Exception as e:
+        session.rollback()
+        logger.error(f"recalculate_all_attendance_stats failed: {e}", exc_info=True)
+        return {'updated': 0, 'errors': 1, 'error': str(e)}
+    logger.info(f"recalculate_all_attendance_stats: {result['updated']} updated, {result['total']} total")
+    return {'updated': result['updated'], 'errors': 0, 'total': result['total']}
 
 
 @celery_task(
@@ -654,26 +648,26 @@ def recalculate_all_attendance_stats(self, session):
     default_retry_delay=300,
 )
 def refresh_participation_rollup(self, session, season_id=None, all_seasons=False):
-    """Rebuild `player_season_participation` — the analytics spine.
+    """Reconcile `player_season_participation` — the analytics spine.
 
-    Unlike `recalculate_all_attendance_stats`, this is set-based: one statement per
-    season rather than ~11 queries per player. A whole season is a handful of
-    statements, so it is cheap enough to run nightly and safe under the PgBouncer
-    transaction budget.
+    The rollup is maintained incrementally during the day (see
+    `flush_participation_rollup`), so this nightly run is a reconciliation
+    check: it rebuilds the current season(s) from source, diffs against the
+    incrementally maintained rows, repairs and reports any drift. Like
+    `recalculate_all_attendance_stats`, it is set-based — one statement per
+    season — so it stays safe under the PgBouncer transaction budget.
 
-    It also fixes a structural gap in the older job, which seeds its worklist FROM
-    the attendance cache and therefore can never create a row for a player who has
-    never RSVP'd — 86 current players are invisible to the attendance report for
-    exactly that reason. This one is driven by the ROSTER, so everyone rostered gets
-    a row whether or not they have ever responded.
+    The rollup is driven by the ROSTER, so everyone rostered gets a row whether
+    or not they have ever responded (the older attendance job seeds from the
+    attendance cache and misses players who never RSVP'd).
 
     Args:
-        season_id: refresh one season (its league_type is looked up). Defaults to the
+        season_id: reconcile one season (its league_type is looked up). Defaults to the
             current Pub League AND ECS FC season(s).
-        all_seasons: refresh every Pub League and ECS FC season (post-migration backfill).
+        all_seasons: rebuild every Pub League and ECS FC season (post-migration backfill).
     """
     from app.services.participation_service import (
-        refresh_season_participation, refresh_all_seasons, current_season_ids,
+        reconcile_season_participation, refresh_all_seasons, current_season_ids,
     )
     from app.models import Season
 
@@ -698,10 +692,11 @@ def refresh_participation_rollup(self, session, season_id=None, all_seasons=Fals
         for sid in targets:
             s = session.query(Season).get(sid)
             lt = s.league_type if s else 'Pub League'
-            results.append(refresh_season_participation(session, sid, league_type=lt))
+            results.append(reconcile_season_participation(session, sid, league_type=lt))
             # Commit per season so a later failure can't discard earlier work.
             session.commit()
-        return {'success': True, 'seasons': results}
+        return {'success': True, 'seasons': results,
+                'drifted': sum(r['drifted'] for r in results)}
 
     except Exception as e:
         session.rollback()
@@ -709,6 +704,34 @@ def refresh_participation_rollup(self, session, season_id=None, all_seasons=Fals
         raise self.retry(exc=e)
 
 
+@celery_task(
+    name='app.tasks.tasks_maintenance.flush_participation_rollup',
+    bind=True,
+    queue='celery',
+    max_retries=0,
+)
+def flush_participation_rollup(self, session):
+    """Recompute the participation rollup rows marked dirty since the last flush.
+
+    RSVP, check-in and roster writes (and fixtures rolling into the past) mark
+    rows dirty; each mark waits out a short coalescing window so a burst of
+    changes to one row costs one recompute. No retry: a failed flush puts its
+    marks back and the next beat picks them up.
+    """
+    from app.services.participation_rollup import flush_dirty_rows, mark_played_fixtures
+
+    try:
+        marked = mark_played_fixtures(session)
+        result = flush_dirty_rows(session)
+        if marked or result['members']:
+            logger.info(f"flush_participation_rollup: {marked} rollover mark(s), {result}")
+        return {'success': True, 'rollover_marks': marked, **result}
+    except Exception as e:
+        session.rollback()
+        logger.error(f"flush_participation_rollup failed: {e}", exc_info=True)
+        return {'success': False, 'error': str(e)}
+
+
 @celery_task(
     name='app.tasks.tasks_maintenance.expire_past_match_sub_requests',
     bind=True,
@@ -236,7 +236,13 @@ class ESPNAPIClient:
             pass
         return (None, None)
 
-    def _process_summary_data(self, raw_data: Dict[str, Any], match_id: str) -> Optional[Dict[str, Any]]:
+    def _process_summary_data(
+        self,
+        raw_data: Dict[str, Any],
+        match_id: str,
+        athlete_lookup: Optional[Dict[str, Dict[str, str]]] = None,
+        match_events: Optional[List[Dict[str, Any]]] = None,
+    ) -> Optional[Dict[str, Any]]:
         """
         Process ESPN /summary?event={id} response into our normalized schema.
 
@@ -254,6 +260,10 @@ class ESPNAPIClient:
         stats{home, away}, events[{type, minute, player, player_headshot,
         player_jersey, team, team_logo, detail_text, description, id}],
         venue, attendance, cached_at.
+
+        athlete_lookup / match_events let a caller that knows rosters or
+        keyEvents haven't changed since its last poll (ESPNLivePoller) skip
+        rebuilding them.
         """
         try:
             header = raw_data.get('header') or {}
@@ -289,14 +299,15 @@ class ESPNAPIClient:
                         'logo': self._team_logo_url(team_obj),
                     }
 
-            # Build athlete_id → {jersey, headshot} from rosters
-            athlete_lookup = self._build_athlete_lookup(raw_data.get('rosters') or [])
-
-            match_events = self._extract_events_from_summary(
-                raw_data.get('keyEvents') or [],
-                team_lookup,
-                athlete_lookup,
-            )
+            if match_events is None:
+                # Build athlete_id → {jersey, headshot} from rosters
+                if athlete_lookup is None:
+                    athlete_lookup = self._build_athlete_lookup(raw_data.get('rosters') or [])
+                match_events = self._extract_events_from_summary(
+                    raw_data.get('keyEvents') or [],
+                    team_lookup,
+                    athlete_lookup,
+                )
 
             # Boxscore stats
             home_stats = {}
@@ -0,0 +1,293 @@
+# app/utils/espn_live_poller.py
+
+"""
+Async, change-detecting ESPN poller for live reporting.
+
+RealtimeReportingService used to run the synchronous ESPNAPIClient.get_match_data
+in a thread pool. That call could block its worker in time.sleep() to keep 3s
+between requests for a match, and every poll re-normalized the whole /summary
+payload (athlete lookup, keyEvents -> events) even when nothing had moved.
+
+ESPNLivePoller instead:
+
+- shares one pooled aiohttp session across every live match;
+- sends If-None-Match / If-Modified-Since once ESPN has handed out validators.
+  A 304, or a body byte-identical to the previous one, reuses the previous
+  result without decoding any JSON;
+- compares the payload sections live reporting reacts to (status, score,
+  keyEvents, rosters, team objects, boxscore) with the previous poll's, and
+  rebuilds the event list only
+  when keyEvents, rosters or teams changed (stamping each event's dedup key
+  then, once). PollResult.quiet tells the caller that nothing event-relevant
+  moved, so it can skip diffing events;
+- schedules each match's next poll from its status (is_due / seconds_until_due)
+  rather than sleeping until a request is allowed.
+
+Normalization, the circuit breaker and the shared Redis cache still come from
+ESPNAPIClient, so PollResult.data has exactly get_match_data()'s schema.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional
+
+import aiohttp
+
+from app.utils.espn_api_client import ESPNAPIClient
+
+logger = logging.getLogger(__name__)
+
+# Sections whose change can produce a Discord post (new events, a score
+# change, a status transition).
+EVENT_SECTIONS = frozenset({'status', 'score', 'events'})
+ALL_SECTIONS = frozenset({'status', 'score', 'events', 'rosters', 'teams', 'stats'})
+
+
+@dataclass
+class PollResult:
+    match_id: str
+    data: Dict[str, Any]
+    changed: FrozenSet[str]     # sections that differ from the previous poll
+    not_modified: bool = False  # 304 / identical body: nothing was decoded
+
+    @property
+    def quiet(self) -> bool:
+        """Nothing that feeds events, score or status changed since the last poll."""
+        return not (self.changed & EVENT_SECTIONS)
+
+
+@dataclass
+class _MatchState:
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body: Optional[bytes] = None
+    sections: Dict[str, Any] = field(default_factory=dict)
+    athlete_lookup: Optional[Dict[str, Dict[str, str]]] = None
+    data: Optional[Dict[str, Any]] = None
+    last_request: float = float('-inf')
+    next_due: float = 0.0
+    failures: int = 0
+
+
+def event_dedup_key(event: Dict[str, Any]) -> str:
+    """
+    Live reporting's dedup key for a normalized event. ESPN keyEvents carry a
+    unique 'id' but we include type/minute/player/team so dedup survives even
+    if id is missing.
+    """
+    parts = [
+        event.get('id', ''),
+        event.get('type', 'unknown'),
+        str(event.get('minute', '0')),
+        event.get('player', event.get('athlete_name', '')),
+        event.get('team', event.get('team_id', '')),
+    ]
+    return '_'.join(p for p in parts if p)
+
+
+def summary_sections(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a /summary payload compared between polls."""
+    competitions = (raw.get('header') or {}).get('competitions') or [{}]
+    comp = competitions[0] or {}
+    status = comp.get('status') or {}
+    status_type = status.get('type') or {}
+    competitors = comp.get('competitors') or []
+    return {
+        # Not displayClock: it ticks every poll and only feeds embed text.
+        'status': [status_type.get('name'), status_type.get('state'),
+                   status_type.get('completed'), status.get('period')],
+        'score': [[c.get('homeAway'), c.get('score')] for c in competitors],
+        'events': raw.get('keyEvents') or [],
+        'rosters': raw.get('rosters') or [],
+        'teams': [c.get('team') or {} for c in competitors],
+        'stats': (raw.get('boxscore') or {}).get('teams') or [],
+    }
+
+
+class ESPNLivePoller:
+    """Per-match conditional polling of ESPN /summary over a shared session."""
+
+    LIVE_INTERVAL = 10.0
+    HALFTIME_INTERVAL = 15.0
+    PRE_MATCH_INTERVAL = 20.0
+    DEFAULT_INTERVAL = 10.0
+    # Never hit ESPN for the same match more often than this.
+    MIN_REQUEST_SPACING = 3.0
+    FAILURE_BACKOFF = (10.0, 20.0, 40.0, 60.0)
+
+    POOL_SIZE = 10
+    TIMEOUT = ESPNAPIClient.TIMEOUT
+
+    def __init__(self, client: Optional[ESPNAPIClient] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.client = client or ESPNAPIClient()
+        self._clock = clock
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._states: Dict[str, _MatchState] = {}
+
+    # -- scheduling ----------------------------------------------------------
+
+    def interval_for(self, status: Optional[str]) -> float:
+        if status == 'IN_PLAY':
+            return self.LIVE_INTERVAL
+        if status == 'HALFTIME':
+            return self.HALFTIME_INTERVAL
+        if status in ('SCHEDULED', 'PRE_MATCH'):
+            return self.PRE_MATCH_INTERVAL
+        return self.DEFAULT_INTERVAL
+
+    def is_due(self, match_id, now: Optional[float] = None) -> bool:
+        state = self._states.get(str(match_id))
+        return state is None or (self._clock() if now is None else now) >= state.next_due
+
+    def seconds_until_due(self, match_ids: Iterable) -> float:
+        """Seconds until the earliest of these matches is due (0 if one already is)."""
+        now = self._clock()
+        waits = [0.0 if self.is_due(m, now) else self._states[str(m)].next_due - now
+                 for m in match_ids]
+        return min(waits, default=self.DEFAULT_INTERVAL)
+
+    def forget(self, match_id):
+        """Drop a match's validators, fingerprints and schedule (session ended)."""
+        self._states.pop(str(match_id), None)
+
+    # -- polling -------------------------------------------------------------
+
+    async def poll(self, match_id, competition: str = 'usa.1') -> Optional[PollResult]:
+        """
+        Fetch and normalize one match if anything changed. None on failure,
+        like get_match_data; the match is then rescheduled with backoff.
+        """
+        match_id = str(match_id)
+        state = self._states.setdefault(match_id, _MatchState())
+        now = self._clock()
+
+        if self.client._is_circuit_open(match_id):
+            logger.warning(f"Circuit breaker open for {match_id}; skipping fetch")
+            state.next_due = now + self.FAILURE_BACKOFF[-1]
+            return None
+        if state.data is not None and now - state.last_request < self.MIN_REQUEST_SPACING:
+            state.next_due = state.last_request + self.MIN_REQUEST_SPACING
+            return PollResult(match_id, state.data, frozenset(), not_modified=True)
+
+        state.last_request = now
+        url = f"{self.client.BASE_URL}/{competition}/summary?event={match_id}"
+        headers = {}
+        if state.data is not None:
+            if state.etag:
+                headers['If-None-Match'] = state.etag
+            if state.last_modified:
+                headers['If-Modified-Since'] = state.last_modified
+        try:
+            session = await self._get_session()
+            async with session.get(url, headers=headers) as response:
+                body = await response.read() if response.status == 200 else b''
+                result = self.ingest(match_id, response.status, body, response.headers,
+                                     competition=competition)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Request error fetching {url}: {e}")
+            result = None
+        return self._schedule(match_id, state, result, now)
+
+    def ingest(self, match_id: str, status_code: int, body: bytes, headers=None,
+               competition: Optional[str] = None) -> Optional[PollResult]:
+        """
+        Turn one /summary response into a PollResult, reusing whatever the
+        previous poll already built. Split from poll() so recorded payloads
+        can be replayed without a network (tests/performance).
+        """
+        state = self._states.setdefault(str(match_id), _MatchState())
+        headers = headers or {}
+
+        if status_code == 304 and state.data is not None:
+            return PollResult(match_id, state.data, frozenset(), not_modified=True)
+        if status_code != 200:
+            logger.warning(f"ESPN returned {status_code} for summary of {match_id}")
+            return None
+
+        state.etag = headers.get('ETag') or state.etag
+        state.last_modified = headers.get('Last-Modified') or state.last_modified
+        if body == state.body and state.data is not None:
+            return PollResult(match_id, state.data, frozenset(), not_modified=True)
+
+        try:
+            raw = json.loads(body)
+        except ValueError as e:
+            logger.error(f"Invalid JSON in summary for {match_id}: {e}")
+            return None
+
+        # Decoded-structure equality runs in C and stops at the first
+        # difference; cheaper than hashing a serialization of each section.
+        sections = summary_sections(raw)
+        changed = frozenset(name for name, value in sections.items()
+                            if state.sections.get(name) != value)
+        if state.data is None:
+            changed = ALL_SECTIONS
+
+        if 'rosters' in changed or state.athlete_lookup is None:
+            state.athlete_lookup = self.client._build_athlete_lookup(raw.get('rosters') or [])
+        events = None
+        if state.data is not None and not changed & {'events', 'rosters', 'teams'}:
+            events = state.data['events']
+        data = self.client._process_summary_data(raw, match_id, athlete_lookup=state.athlete_lookup,
+                                                 match_events=events)
+        if data is None:
+            return None
+        if events is None:
+            for event in data['events']:
+                event['_dedup_key'] = event_dedup_key(event)
+
+        state.body = body
+        state.sections = sections
+        state.data = data
+        # The shared cache entry (ESPNAPIClient.get_match_data readers) is
+        # rewritten when something a reader would act on moved; between those
+        # it expires on its own TTL and readers fetch for themselves.
+        if competition and changed & EVENT_SECTIONS:
+            self.client._cache_data(f"espn:match:{competition}:{match_id}", data)
+        return PollResult(match_id, data, changed)
+
+    def _schedule(self, match_id, state, result, now) -> Optional[PollResult]:
+        if result is None:
+            state.failures += 1
+            backoff = self.FAILURE_BACKOFF[min(state.failures, len(self.FAILURE_BACKOFF)) - 1]
+            state.next_due = now + backoff
+            self.client._record_failure(match_id)
+            return None
+        state.failures = 0
+        state.next_due = now + self.interval_for(result.data.get('status'))
+        self.client._record_success(match_id)
+        return result
+
+    # -- session -------------------------------------------------------------
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """One pooled session per event loop; recreated if the loop changed."""
+        loop = asyncio.get_running_loop()
+        session = self._session
+        if session is not None and not session.closed:
+            connector_loop = getattr(session.connector, '_loop', loop)
+            if connector_loop is loop:
+                return session
+            try:
+                await session.close()
+            except Exception:
+                pass
+        self._session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self.TIMEOUT),
+            connector=aiohttp.TCPConnector(limit=self.POOL_SIZE, limit_per_host=self.POOL_SIZE),
+            headers={
+                'User-Agent': 'ECS-Discord-Bot/2.0',
+                'Accept': 'application/json',
+                'Accept-Encoding': 'gzip, deflate',
+            },
+        )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -44,6 +44,27 @@ def decrypt_value(encrypted_value):
         return encrypted_value
 
 
+def decrypt_values(encrypted_values):
+    """Decrypt many values at once; returns {encrypted: decrypted}.
+
+    Same per-value semantics as decrypt_value, but resolves the Fernet key
+    once and decrypts each distinct ciphertext only once.
+    """
+    fernet = None
+    result = {}
+    for encrypted_value in encrypted_values:
+        if not encrypted_value or encrypted_value in result:
+            continue
+        if fernet is None:
+            fernet = get_fernet()
+        try:
+            result[encrypted_value] = fernet.decrypt(encrypted_value.encode()).decode()
+        except Exception:
+            # If decryption fails, assume it's not encrypted
+            result[encrypted_value] = encrypted_value
+    return result
+
+
 def create_hash(value):
     """Create searchable hash."""
     if not value:
@@ -417,6 +417,22 @@ def get_redis_manager() -> UnifiedRedisManager:
     return _get_global_redis_manager()
 
 
+def get_app_redis(app=None) -> Optional[Redis]:
+    """
+    The app's Redis client (``app.redis``, default current_app), or the unified
+    manager's outside a configured app. None when neither is reachable, for
+    callers that treat Redis as best-effort and skip the work rather than fail.
+    """
+    try:
+        from flask import current_app
+        client = getattr(app or current_app, 'redis', None)
+        if client is not None:
+            return client
+        return UnifiedRedisManager().client
+    except Exception:
+        return None
+
+
 # LEGACY COMPATIBILITY - DEPRECATED
 class RedisManager:
     """
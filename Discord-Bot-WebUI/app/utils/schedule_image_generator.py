@@ -11,12 +11,26 @@ Features:
 - Colored event type badges
 - Professional typography
 - Auto-downloads fonts if none available on system
+
+Assets (font, logo, Twemoji PNGs) are read from an on-disk bundle first --
+ASSET_BUNDLE_DIR, populated by `flask build-schedule-assets` -- and only
+fetched from the network when the bundle is missing a file. preload_assets()
+warms the in-process caches from the bundle at startup without touching the
+network.
+
+Everything that doesn't depend on the rows (background gradient, watermark,
+header/footer bands, footer logo) is composed once per canvas size and theme
+and kept in a small LRU, so rendering a poster only draws its text and badges.
+generate_team_schedule_images() renders a whole week of team posters in one
+pass, ordered so posters sharing a canvas size reuse the same base layer.
 """
 
 import io
 import logging
 import os
 import tempfile
+import threading
+from collections import OrderedDict
 import requests
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
@@ -27,8 +41,60 @@ logger = logging.getLogger(__name__)
 # Twemoji CDN for emoji images (Twitter's open source emoji)
 TWEMOJI_CDN = "https://cdn.jsdelivr.net/gh/twitter/twemoji@latest/assets/72x72/"
 
-# Cache for downloaded emoji images
-_emoji_cache = {}
+# On-disk asset bundle: fonts/schedule_font.ttf, logo.png, twemoji/<codepoints>.png
+ASSET_BUNDLE_DIR = os.environ.get('SCHEDULE_ASSET_DIR') or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'static', 'schedule_assets')
+
+LOGO_URL = "https://weareecs.com/wp-content/uploads/2024/10/ECS-PubLeague_Logo_4color-1120x730.png"
+FONT_FILENAME = 'schedule_font.ttf'
+
+EMOJI_CACHE_SIZE = 256
+LAYER_CACHE_SIZE = 32
+CANVAS_CACHE_SIZE = 8  # full-size base canvases are ~3-5 MB each
+
+
+class _LRUCache:
+    """Small thread-safe LRU; gunicorn threads share the module caches."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# Resized Twemoji images keyed by (emoji, size). None marks an emoji the CDN
+# doesn't have, so it isn't re-requested on every poster.
+_emoji_cache = _LRUCache(EMOJI_CACHE_SIZE)
+
+# Precomposed static layers (see base_canvas).
+_layer_cache = _LRUCache(LAYER_CACHE_SIZE)
+_canvas_cache = _LRUCache(CANVAS_CACHE_SIZE)
 
 # Color scheme - Dark theme for better Discord visibility
 COLORS = {
@@ -67,9 +133,27 @@ _font_cache = {}
 _downloaded_font_path = None
 
 
+def _bundle_path(*parts: str) -> str:
+    return os.path.join(ASSET_BUNDLE_DIR, *parts)
+
+
+def _write_bundle_file(data: bytes, *parts: str) -> None:
+    """Best-effort write-back so the next process finds the asset on disk."""
+    path = _bundle_path(*parts)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Could not write {path} to the asset bundle: {e}")
+
+
 def _get_font_cache_dir() -> str:
     """Get or create a directory for caching downloaded fonts."""
     cache_dirs = [
+        _bundle_path('fonts'),
         os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static', 'fonts'),
         os.path.join(tempfile.gettempdir(), 'ecs_fonts'),
     ]
@@ -88,15 +172,26 @@ def _get_font_cache_dir() -> str:
     return tempfile.gettempdir()
 
 
-def _download_font() -> Optional[str]:
+def _download_font(allow_network: bool = True) -> Optional[str]:
     """Download a font from Google Fonts and cache it locally."""
     global _downloaded_font_path
 
     if _downloaded_font_path and os.path.exists(_downloaded_font_path):
         return _downloaded_font_path
 
+    # The bundle may be baked into a read-only image, so check it directly
+    # rather than only through the writable cache dir.
+    bundled = _bundle_path('fonts', FONT_FILENAME)
+    if os.path.exists(bundled):
+        try:
+            ImageFont.truetype(bundled, 20)
+            _downloaded_font_path = bundled
+            return bundled
+        except Exception as e:
+            logger.warning(f"Bundled font unusable: {e}")
+
     cache_dir = _get_font_cache_dir()
-    font_path = os.path.join(cache_dir, 'schedule_font.ttf')
+    font_path = os.path.join(cache_dir, FONT_FILENAME)
 
     if os.path.exists(font_path):
         try:
@@ -106,6 +201,9 @@ def _download_font() -> Optional[str]:
         except Exception:
             os.remove(font_path)
 
+    if not allow_network:
+        return None
+
     ttf_urls = [
         'https://github.com/googlefonts/opensans/raw/main/fonts/ttf/OpenSans-Bold.ttf',
         'https://github.com/googlefonts/roboto/raw/main/src/hinted/Roboto-Bold.ttf',
@@ -134,7 +232,7 @@ def _download_font() -> Optional[str]:
     return None
 
 
-def get_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
+def get_font(size: int, bold: bool = False, allow_network: bool = True) -> ImageFont.FreeTypeFont:
     """Get a font with automatic download fallback."""
     cache_key = f"{size}_{bold}"
     if cache_key in _font_cache:
@@ -169,7 +267,7 @@ def get_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
         except (OSError, IOError):
             continue
 
-    downloaded_font = _download_font()
+    downloaded_font = _download_font(allow_network=allow_network)
     if downloaded_font:
         try:
             font = ImageFont.truetype(downloaded_font, size)
@@ -182,21 +280,36 @@ def get_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
         font = ImageFont.load_default(size=size)
     except TypeError:
         font = ImageFont.load_default()
-    _font_cache[cache_key] = font
+    if allow_network:
+        # Offline lookups (preload) mustn't pin the fallback font for good.
+        _font_cache[cache_key] = font
     return font
 
 
-def download_logo(url: str = "https://weareecs.com/wp-content/uploads/2024/10/ECS-PubLeague_Logo_4color-1120x730.png") -> Optional[Image.Image]:
-    """Download and cache the Pub League logo."""
+def download_logo(url: str = LOGO_URL, allow_network: bool = True) -> Optional[Image.Image]:
+    """Load the Pub League logo from the asset bundle, downloading it if missing."""
     global _logo_cache
 
     if _logo_cache is not None:
         return _logo_cache.copy()
 
+    bundled = _bundle_path('logo.png')
+    if os.path.exists(bundled):
+        try:
+            with Image.open(bundled) as logo:
+                _logo_cache = logo.convert('RGBA')
+            return _logo_cache.copy()
+        except Exception as e:
+            logger.warning(f"Bundled logo unusable: {e}")
+
+    if not allow_network:
+        return None
+
     try:
         response = requests.get(url, timeout=10)
         if response.status_code == 200:
             _logo_cache = Image.open(io.BytesIO(response.content)).convert('RGBA')
+            _write_bundle_file(response.content, 'logo.png')
             return _logo_cache.copy()
     except Exception as e:
         logger.warning(f"Failed to download logo: {e}")
@@ -236,6 +349,81 @@ def create_watermark_logo(logo: Image.Image, size: Tuple[int, int], opacity: flo
     return logo_resized
 
 
+def _theme_key(colors: Dict[str, tuple]) -> tuple:
+    return tuple(colors[k] for k in ('background_dark', 'background_light', 'header_bg',
+                                     'header_bg_light', 'footer_bg'))
+
+
+def gradient_layer(width: int, height: int, color1: tuple, color2: tuple) -> Image.Image:
+    """Cached vertical gradient. Shared -- paste it, don't draw on it."""
+    key = ('gradient', width, height, color1, color2)
+    layer = _layer_cache.get(key)
+    if layer is None:
+        layer = create_gradient(width, height, color1, color2)
+        _layer_cache.put(key, layer)
+    return layer
+
+
+def _logo_layer(kind: str, size: Tuple[int, int], opacity: Optional[float] = None) -> Optional[Image.Image]:
+    """Cached watermark / footer thumbnail of the logo, or None without a logo."""
+    key = (kind, size, opacity)
+    layer = _layer_cache.get(key)
+    if layer is None:
+        logo = download_logo()
+        if logo is None:
+            return None
+        if opacity is not None:
+            layer = create_watermark_logo(logo, size, opacity=opacity)
+        else:
+            layer = logo
+            layer.thumbnail(size, Image.Resampling.LANCZOS)
+        _layer_cache.put(key, layer)
+    return layer
+
+
+def base_canvas(width: int, total_height: int, header_height: int, content_height: int,
+                footer_height: int, padding: int = 50, colors: Dict[str, tuple] = None) -> Image.Image:
+    """
+    A fresh copy of every static layer of a poster: background gradient,
+    watermark, header and footer bands, and the footer logo.
+
+    The composition is cached per canvas size and theme, so a poster only pays
+    for a copy. Rows never reach the footer band, so painting it before the
+    rows gives the same pixels as painting it last.
+    """
+    colors = colors or COLORS
+    key = (width, total_height, header_height, content_height, footer_height, padding,
+           _theme_key(colors), _logo_cache is not None)
+    canvas = _canvas_cache.get(key)
+    if canvas is None:
+        canvas = gradient_layer(width, total_height, colors['background_dark'],
+                                colors['background_light']).copy()
+
+        watermark = _logo_layer('watermark', (550, 450), opacity=0.05)
+        if watermark:
+            wm_x = (width - watermark.width) // 2
+            wm_y = header_height + (content_height - watermark.height) // 2
+            canvas.paste(watermark, (wm_x, wm_y), watermark)
+
+        canvas.paste(gradient_layer(width, header_height, colors['header_bg'],
+                                    colors['header_bg_light']), (0, 0))
+
+        footer_y = total_height - footer_height
+        canvas.paste(gradient_layer(width, footer_height, colors['footer_bg'],
+                                    colors['header_bg_light']), (0, footer_y))
+
+        small_logo = _logo_layer('footer_logo', (90, 60))
+        if small_logo:
+            logo_x = width - small_logo.width - padding
+            logo_y = footer_y + (footer_height - small_logo.height) // 2
+            canvas.paste(small_logo, (logo_x, logo_y), small_logo)
+
+        # The logo may have just loaded; key the entry by the state it was built in.
+        key = key[:-1] + (watermark is not None,)
+        _canvas_cache.put(key, canvas)
+    return canvas.copy()
+
+
 def draw_rounded_rect(draw: ImageDraw.Draw, xy: Tuple[int, int, int, int],
                       fill: tuple, radius: int = 8, shadow: bool = False):
     """Draw a rounded rectangle with optional shadow effect."""
@@ -297,32 +485,52 @@ def emoji_to_twemoji_filename(emoji: str) -> str:
     return "-".join(codepoints)
 
 
-def download_twemoji(emoji: str, size: int = 72) -> Optional[Image.Image]:
-    """Download a Twemoji PNG for the given emoji character."""
-    global _emoji_cache
-
-    cache_key = f"{emoji}_{size}"
-    if cache_key in _emoji_cache:
-        return _emoji_cache[cache_key].copy()
+def download_twemoji(emoji: str, size: int = 72, allow_network: bool = True) -> Optional[Image.Image]:
+    """Load a Twemoji PNG for the given emoji from the asset bundle, downloading it if missing."""
+    cache_key = (emoji, size)
+    cached = _emoji_cache.get(cache_key, default=False)
+    if cached is None:
+        return None
+    if cached is not False:
+        return cached.copy()
 
-    try:
-        filename = emoji_to_twemoji_filename(emoji)
+    filename = emoji_to_twemoji_filename(emoji)
+    data = None
+    bundled = _bundle_path('twemoji', f"{filename}.png")
+    if os.path.exists(bundled):
+        try:
+            with open(bundled, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            logger.debug(f"Bundled Twemoji unreadable for {emoji}: {e}")
+
+    if data is None:
+        if not allow_network:
+            return None
         url = f"{TWEMOJI_CDN}{filename}.png"
-
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            img = Image.open(io.BytesIO(response.content)).convert('RGBA')
-            # Resize to desired size
-            if img.size[0] != size:
-                img = img.resize((size, size), Image.Resampling.LANCZOS)
-            _emoji_cache[cache_key] = img
-            return img.copy()
-        else:
+        try:
+            response = requests.get(url, timeout=5)
+        except Exception as e:
+            logger.debug(f"Failed to download Twemoji for {emoji}: {e}")
+            return None
+        if response.status_code != 200:
             logger.debug(f"Twemoji not found for {emoji}: {url}")
-    except Exception as e:
-        logger.debug(f"Failed to download Twemoji for {emoji}: {e}")
+            if response.status_code == 404:
+                _emoji_cache.put(cache_key, None)
+            return None
+        data = response.content
+        _write_bundle_file(data, 'twemoji', f"{filename}.png")
 
-    return None
+    try:
+        img = Image.open(io.BytesIO(data)).convert('RGBA')
+    except Exception as e:
+        logger.debug(f"Invalid Twemoji image for {emoji}: {e}")
+        return None
+    # Resize to desired size
+    if img.size[0] != size:
+        img = img.resize((size, size), Image.Resampling.LANCZOS)
+    _emoji_cache.put(cache_key, img)
+    return img.copy()
 
 
 def draw_emoji(image: Image.Image, pos: tuple, emoji: str, size: int = 24) -> int:
@@ -481,19 +689,10 @@ def generate_schedule_image(
     content_height = (num_events * row_height) + (num_months * month_header_height)
     total_height = header_height + content_height + footer_height + 50
 
-    # Create gradient background
-    img = create_gradient(width, total_height, COLORS['background_dark'], COLORS['background_light'])
+    # Background, watermark, header/footer bands and footer logo (cached)
+    img = base_canvas(width, total_height, header_height, content_height, footer_height, padding)
     draw = ImageDraw.Draw(img)
 
-    # Add watermark logo
-    logo = download_logo()
-    if logo:
-        watermark = create_watermark_logo(logo, (550, 450), opacity=0.05)
-        wm_x = (width - watermark.width) // 2
-        wm_y = header_height + (content_height - watermark.height) // 2
-        img.paste(watermark, (wm_x, wm_y), watermark)
-        draw = ImageDraw.Draw(img)
-
     # Load fonts
     font_title = get_font(52, bold=True)
     font_subtitle = get_font(18, bold=False)
@@ -506,11 +705,6 @@ def generate_schedule_image(
     font_footer = get_font(18, bold=True)
     font_emoji = get_font(22, bold=False)
 
-    # Draw header gradient
-    header_gradient = create_gradient(width, header_height, COLORS['header_bg'], COLORS['header_bg_light'])
-    img.paste(header_gradient, (0, 0))
-    draw = ImageDraw.Draw(img)
-
     # Draw title with shadow
     title_text = title.upper()
     title_bbox = draw.textbbox((0, 0), title_text, font=font_title)
@@ -602,23 +796,12 @@ def generate_schedule_image(
 
     # Draw footer
     footer_y = total_height - footer_height
-    footer_gradient = create_gradient(width, footer_height, COLORS['footer_bg'], COLORS['header_bg_light'])
-    img.paste(footer_gradient, (0, footer_y))
-    draw = ImageDraw.Draw(img)
 
     if footer_url:
         url_text = f"🔗 {footer_url}"
         draw_text_with_emoji(img, (padding, footer_y + 24), url_text, font_footer, COLORS['white'])
         draw = ImageDraw.Draw(img)
 
-    # Add logo to footer
-    if logo:
-        small_logo = logo.copy()
-        small_logo.thumbnail((90, 60), Image.Resampling.LANCZOS)
-        logo_x = width - small_logo.width - padding
-        logo_y = footer_y + (footer_height - small_logo.height) // 2
-        img.paste(small_logo, (logo_x, logo_y), small_logo)
-
     # Save to bytes
     buffer = io.BytesIO()
     img.save(buffer, format='PNG', optimize=True, quality=95)
@@ -715,35 +898,8 @@ def _draw_match_week_badge(draw: ImageDraw.Draw, x: int, y: int, week_type: str,
     return badge_width
 
 
-def generate_match_schedule_image(
-    matches: List[Dict[str, Any]],
-    player_name: str = "",
-    team_names: List[str] = None,
-    team_leagues: Optional[Dict[str, str]] = None,
-    footer_url: Optional[str] = None
-) -> bytes:
-    """
-    Generate a professional match schedule poster image.
-
-    Args:
-        matches: List of match dicts with keys: date, time, home_team, away_team,
-                 home_team_id, away_team_id, is_home, location, week_type, league
-        player_name: Player's display name
-        team_names: List of the player's team names
-        team_leagues: Optional dict mapping team name -> league label
-        footer_url: Optional URL for footer
-
-    Returns:
-        PNG image as bytes
-    """
-    width = 1100
-    padding = 50
-    header_height = 140
-    row_height = 70
-    footer_height = 75
-    month_header_height = 55
-
-    # Parse and sort matches
+def _parse_match_rows(matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Normalize and sort match dicts into poster rows."""
     parsed = []
     for m in matches:
         try:
@@ -795,6 +951,39 @@ def generate_match_schedule_image(
                     'location': '', 'is_home': True, 'week_type': 'REGULAR', 'is_bye': False,
                     'league': ''}]
 
+    return parsed
+
+
+def generate_match_schedule_image(
+    matches: List[Dict[str, Any]],
+    player_name: str = "",
+    team_names: List[str] = None,
+    team_leagues: Optional[Dict[str, str]] = None,
+    footer_url: Optional[str] = None
+) -> bytes:
+    """
+    Generate a professional match schedule poster image.
+
+    Args:
+        matches: List of match dicts with keys: date, time, home_team, away_team,
+                 home_team_id, away_team_id, is_home, location, week_type, league
+        player_name: Player's display name
+        team_names: List of the player's team names
+        team_leagues: Optional dict mapping team name -> league label
+        footer_url: Optional URL for footer
+
+    Returns:
+        PNG image as bytes
+    """
+    width = 1100
+    padding = 50
+    header_height = 140
+    row_height = 70
+    footer_height = 75
+    month_header_height = 55
+
+    parsed = _parse_match_rows(matches)
+
     # Detect if matches span multiple leagues
     leagues_present = set(m['league'] for m in parsed if m.get('league'))
     show_league = len(leagues_present) > 1
@@ -813,19 +1002,10 @@ def generate_match_schedule_image(
     content_height = (num_matches * row_height) + (num_months * month_header_height)
     total_height = header_height + content_height + footer_height + 50
 
-    # Create gradient background
-    img = create_gradient(width, total_height, COLORS['background_dark'], COLORS['background_light'])
+    # Background, watermark, header/footer bands and footer logo (cached)
+    img = base_canvas(width, total_height, header_height, content_height, footer_height, padding)
     draw = ImageDraw.Draw(img)
 
-    # Add watermark logo
-    logo = download_logo()
-    if logo:
-        watermark = create_watermark_logo(logo, (550, 450), opacity=0.05)
-        wm_x = (width - watermark.width) // 2
-        wm_y = header_height + (content_height - watermark.height) // 2
-        img.paste(watermark, (wm_x, wm_y), watermark)
-        draw = ImageDraw.Draw(img)
-
     # Load fonts
     font_title = get_font(44, bold=True)
     font_subtitle = get_font(20, bold=False)
@@ -836,11 +1016,6 @@ def generate_match_schedule_image(
     font_footer = get_font(18, bold=True)
     font_emoji = get_font(22, bold=False)
 
-    # Draw header gradient
-    header_gradient = create_gradient(width, header_height, COLORS['header_bg'], COLORS['header_bg_light'])
-    img.paste(header_gradient, (0, 0))
-    draw = ImageDraw.Draw(img)
-
     # Draw title
     title_text = "MATCH SCHEDULE"
     title_bbox = draw.textbbox((0, 0), title_text, font=font_title)
@@ -956,25 +1131,117 @@ def generate_match_schedule_image(
 
     # Footer
     footer_y = total_height - footer_height
-    footer_gradient = create_gradient(width, footer_height, COLORS['footer_bg'], COLORS['header_bg_light'])
-    img.paste(footer_gradient, (0, footer_y))
-    draw = ImageDraw.Draw(img)
 
     footer_text = footer_url or "portal.ecsfc.com"
     url_text = f"🔗 {footer_text}"
     draw_text_with_emoji(img, (padding, footer_y + 24), url_text, font_footer, COLORS['white'])
     draw = ImageDraw.Draw(img)
 
-    if logo:
-        small_logo = logo.copy()
-        small_logo.thumbnail((90, 60), Image.Resampling.LANCZOS)
-        logo_x = width - small_logo.width - padding
-        logo_y = footer_y + (footer_height - small_logo.height) // 2
-        img.paste(small_logo, (logo_x, logo_y), small_logo)
-
     # Save to bytes
     buffer = io.BytesIO()
     img.save(buffer, format='PNG', optimize=True, quality=95)
     buffer.seek(0)
 
     return buffer.getvalue()
+
+
+# Emoji the posters draw themselves (row/month/footer icons), at the sizes they draw them.
+PRELOAD_EMOJI = sorted({info['emoji'] for info in EVENT_TYPES.values()}
+                       | {info['emoji'] for info in MATCH_WEEK_TYPES.values()}
+                       | {'📅', '🔗', '🕐', '📍'})
+PRELOAD_EMOJI_SIZES = (18, 20, 24, 26)
+PRELOAD_FONT_SIZES = ((12, True), (13, True), (15, False), (18, False), (18, True), (20, False),
+                      (22, False), (22, True), (24, True), (26, True), (44, True), (52, True))
+
+
+def team_week_schedules(matches) -> Dict[int, Dict[str, Any]]:
+    """
+    Group a week's Match rows (home_team/away_team loaded) into per-team
+    arguments for generate_team_schedule_images, keyed by team id.
+    """
+    schedules = {}
+    for m in matches:
+        for team, opponent, is_home in ((m.home_team, m.away_team, True),
+                                        (m.away_team, m.home_team, False)):
+            if team is None:
+                continue
+            schedule = schedules.setdefault(team.id, {'team_names': [team.name], 'matches': []})
+            schedule['matches'].append({
+                'date': m.date.isoformat() if m.date else None,
+                'time': m.time.isoformat() if m.time else None,
+                'location': m.location,
+                'home_team': team.name if is_home else (opponent.name if opponent else 'TBD'),
+                'away_team': (opponent.name if opponent else 'TBD') if is_home else team.name,
+                'home_team_id': m.home_team_id,
+                'away_team_id': m.away_team_id,
+                'is_home': is_home,
+                'week_type': m.week_type or 'REGULAR',
+            })
+    return schedules
+
+
+def generate_team_schedule_images(
+    team_schedules: Dict[Any, Dict[str, Any]],
+    footer_url: Optional[str] = None
+) -> Dict[Any, bytes]:
+    """
+    Render match schedule posters for many teams in one pass.
+
+    Args:
+        team_schedules: Mapping of key (e.g. team id) -> generate_match_schedule_image
+                        arguments (matches, player_name, team_names, team_leagues)
+        footer_url: Optional URL for every footer
+
+    Returns:
+        Mapping of key -> PNG bytes. A team whose poster fails is logged and left out.
+    """
+    preload_assets()
+
+    def canvas_shape(item):
+        parsed = _parse_match_rows(item[1].get('matches') or [])
+        months = {row['date'].strftime('%B %Y') for row in parsed}
+        return len(parsed), len(months)
+
+    # Posters with the same row/month counts share a canvas size; rendering them
+    # back to back means each base layer is composed once, however small the LRU.
+    images = {}
+    for key, schedule in sorted(team_schedules.items(), key=canvas_shape):
+        try:
+            images[key] = generate_match_schedule_image(
+                matches=schedule.get('matches') or [],
+                player_name=schedule.get('player_name', ''),
+                team_names=schedule.get('team_names'),
+                team_leagues=schedule.get('team_leagues'),
+                footer_url=footer_url,
+            )
+        except Exception as e:
+            logger.error(f"Failed to render schedule image for {key}: {e}", exc_info=True)
+    return images
+
+
+def preload_assets() -> Dict[str, int]:
+    """
+    Warm the font, logo and emoji caches from the asset bundle. Never touches
+    the network; anything missing from the bundle is fetched on first use.
+    """
+    logo = download_logo(allow_network=False)
+    emoji = 0
+    for char in PRELOAD_EMOJI:
+        for size in PRELOAD_EMOJI_SIZES:
+            if download_twemoji(char, size, allow_network=False) is not None:
+                emoji += 1
+    for size, bold in PRELOAD_FONT_SIZES:
+        get_font(size, bold=bold, allow_network=False)
+    if logo is not None:
+        _logo_layer('watermark', (550, 450), opacity=0.05)
+        _logo_layer('footer_logo', (90, 60))
+    return {'logo': int(logo is not None), 'emoji': emoji, 'fonts': len(_font_cache)}
+
+
+def build_asset_bundle() -> Dict[str, int]:
+    """Download anything the bundle is missing (run at image build time)."""
+    font = _download_font()
+    logo = download_logo()
+    emoji = sum(1 for char in PRELOAD_EMOJI if download_twemoji(char) is not None)
+    return {'font': int(font is not None), 'logo': int(logo is not None), 'emoji': emoji,
+            'emoji_expected': len(PRELOAD_EMOJI)}
@@ -276,7 +276,8 @@ def db(_database, app):
             # nothing and its rows carry no player identity.
             'wallet_pass_checkin', 'wallet_pass_device', 'wallet_pass',
             'match_events', 'sub_requests', 'availability', 'match_predictions',
-            'mls_matches', 'match_dates',
+            'live_reporting_sessions', 'mls_matches', 'match_dates',
+            'automation_run', 'automation_rule',
             'points_event_award', 'points_event_type',
             'player_season_ratings', 'player_rating_overrides', 'classic_rating_metric',
             # Sub pools + the membership spine + quick profiles. Left out of this
@@ -285,12 +286,17 @@ def db(_database, app):
             # bug in whatever endpoint the next test called.
             'substitute_pool_history', 'substitute_pools', 'ecs_fc_sub_pool',
             'league_membership', 'quick_profile',
+            'player_attendance_stats', 'match_attendance', 'ecs_fc_availability', 'ecs_fc_matches',
             'player_teams', 'player_league', 'player_team_season',
             'matches', 'schedule', 'week_configurations',
+            # FCM tokens hang off a user_id too; a token left behind attaches
+            # itself to the next test's user with the reused id.
+            'user_fcm_tokens',
             'device_tokens', 'progress', 'sms_logs', 'discord_bot_status',
             'help_topics', 'feedback_replies', 'feedbacks', 'notes',
             'player', 'team', 'league', 'season',
             'notifications', 'announcements',
+            'email_campaign_recipients', 'email_campaigns',
             'user_roles', 'role_permissions',
             'users', 'roles', 'permissions'
         ]
@@ -311,6 +317,14 @@ def db(_database, app):
         # CRITICAL: Ensure session is removed after cleanup
         _database.session.remove()
 
+    # The balanced-draft board model is a process cache over the rows just
+    # deleted; the mocked Redis never advances its version, so drop it too.
+    from app.services import classic_draft_service
+    classic_draft_service.invalidate_board()
+    # Same for the player search index: the DELETEs above bypass its hooks.
+    from app.services import player_search_index
+    player_search_index.invalidate_index()
+
 
 @pytest.fixture(autouse=True)
 def mock_celery_tasks(monkeypatch):
@@ -617,6 +631,177 @@ def mock_redis():
     return _mock_redis_client
 
 
+class FakeRedis:
+    """
+    In-memory Redis for tests that check what was actually stored: strings and
+    counters, sorted sets, hashes and streams, with queued pipelines.
+
+    State is kept as str (self.strings, self.zsets, self.hashes, self.streams)
+    so tests can inspect it directly; replies are bytes like a raw client's
+    unless decode_responses=True.
+    """
+
+    def __init__(self, decode_responses=False):
+        self.decode_responses = decode_responses
+        self.strings = {}
+        self.zsets = {}
+        self.hashes = {}
+        self.streams = {}
+
+    def _out(self, value):
+        if value is None or self.decode_responses:
+            return value
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    @staticmethod
+    def _key(value):
+        return value.decode() if isinstance(value, bytes) else str(value)
+
+    def pipeline(self, transaction=True):
+        return FakeRedisPipeline(self)
+
+    # strings
+
+    def get(self, key):
+        return self._out(self.strings.get(key))
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = self._key(value)
+        return True
+
+    def setex(self, key, seconds, value):
+        return self.set(key, value)
+
+    def incr(self, key, amount=1):
+        self.strings[key] = str(int(self.strings.get(key, 0)) + amount)
+        return int(self.strings[key])
+
+    def delete(self, *keys):
+        return sum(store.pop(key, None) is not None
+                   for key in keys for store in (self.strings, self.zsets, self.hashes, self.streams))
+
+    def expire(self, key, seconds):
+        return True
+
+    # sorted sets
+
+    def zadd(self, key, mapping, nx=False):
+        zset = self.zsets.setdefault(key, {})
+        added = 0
+        for member, score in mapping.items():
+            member = self._key(member)
+            if nx and member in zset:
+                continue
+            added += member not in zset
+            zset[member] = float(score)
+        return added
+
+    def zrangebyscore(self, key, min, max, start=None, num=None, withscores=False):
+        low, high = float(min), float(max)
+        members = sorted((score, member) for member, score in self.zsets.get(key, {}).items()
+                         if low <= score <= high)
+        if start is not None:
+            members = members[start:start + num if num is not None else None]
+        if withscores:
+            return [(self._out(member), score) for score, member in members]
+        return [self._out(member) for _, member in members]
+
+    def zrem(self, key, *members):
+        zset = self.zsets.get(key, {})
+        return sum(zset.pop(self._key(member), None) is not None for member in members)
+
+    def zremrangebyscore(self, key, min, max):
+        zset = self.zsets.get(key, {})
+        gone = [m for m, score in zset.items() if float(min) <= score <= float(max)]
+        for member in gone:
+            del zset[member]
+        return len(gone)
+
+    # hashes
+
+    def hincrby(self, key, field, amount=1):
+        bucket = self.hashes.setdefault(key, {})
+        bucket[field] = bucket.get(field, 0) + amount
+        return bucket[field]
+
+    hincrbyfloat = hincrby
+
+    def hgetall(self, key):
+        return {self._out(field): self._out(value) for field, value in self.hashes.get(key, {}).items()}
+
+    # streams
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        stream = self.streams.setdefault(key, [])
+        entry_id = f'1-{len(stream) + 1}'
+        stream.append((entry_id, {self._key(k): self._key(v) for k, v in fields.items()}))
+        return self._out(entry_id)
+
+    def _entry(self, entry):
+        entry_id, fields = entry
+        return self._out(entry_id), {self._out(k): self._out(v) for k, v in fields.items()}
+
+    def xrevrange(self, key, max='+', min='-', count=None):
+        return [self._entry(e) for e in reversed(self.streams.get(key, []))][:count]
+
+    def xread(self, streams, count=None, block=None):
+        response = []
+        for key, last_id in streams.items():
+            after = int(self._key(last_id).split('-')[1])
+            new = [self._entry(e) for e in self.streams.get(key, [])
+                   if int(e[0].split('-')[1]) > after][:count]
+            if new:
+                response.append([self._out(key), new])
+        return response
+
+
+class FakeRedisPipeline:
+    """Queues FakeRedis commands; execute() runs them in order."""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._queued = []
+
+    def __getattr__(self, name):
+        command = getattr(self._redis, name)
+
+        def queue(*args, **kwargs):
+            self._queued.append((command, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        queued, self._queued = self._queued, []
+        return [command(*args, **kwargs) for command, args, kwargs in queued]
+
+
+@pytest.fixture
+def fake_redis(app, monkeypatch):
+    """A FakeRedis installed as app.redis, which redis_manager.get_app_redis() returns."""
+    redis = FakeRedis()
+    monkeypatch.setattr(app, 'redis', redis)
+    return redis
+
+
+@pytest.fixture
+def statements(db):
+    """SQL sent to the engine while the test runs; reset with statements.clear()."""
+    from sqlalchemy import event
+    recorded = []
+
+    def record(conn, cursor, statement, *args):
+        recorded.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield recorded
+    event.remove(db.engine, 'before_cursor_execute', record)
+
+
 @pytest.fixture
 def mock_celery(monkeypatch):
     """Mock Celery tasks."""
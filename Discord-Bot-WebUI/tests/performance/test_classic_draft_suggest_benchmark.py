@@ -0,0 +1,148 @@
+"""
+Benchmark harness for balanced-draft suggestions (app/services/classic_draft_service.py).
+
+Builds a synthetic draft night (8-12 teams, 50-200 player pool, ~15% unrated)
+and times suggest_players against the old per-candidate projection path: one
+project_assignment per pool player (deep copy + compute_gaps across all teams)
+plus a compute_gaps per metric of every output row. Every candidate's projected
+gaps from the TeamMetricMatrix are checked against project_assignment.
+
+The pytest run covers one mid-size board. For the full table:
+
+    python -m tests.performance.test_classic_draft_suggest_benchmark [--repeat 5]
+"""
+import argparse
+import random
+import time
+from decimal import Decimal
+
+import pytest
+
+from app.services import classic_draft_service as svc
+from app.services.classic_rating_service import DEFAULT_WEIGHTS, METRICS
+
+TEAM_COUNTS = (8, 10, 12)
+POOL_SIZES = (50, 100, 150, 200)
+HALF_POINTS = [1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5]
+
+
+def make_config():
+    return {
+        'weights': {m: Decimal(w) for m, w in DEFAULT_WEIGHTS.items()},
+        'max_metric_gap': Decimal('3'),
+        'unrated_default': Decimal('3.0'),
+        'suggestion_count': 10,
+        'gender_balance_enabled': True,
+        'suggestion_coefficients': {
+            'balance': Decimal('1.0'), 'need': Decimal('0.5'),
+            'gender': Decimal('0.5'), 'position': Decimal('0.35'),
+        },
+    }
+
+
+def build_board(num_teams, pool_size, per_team=6, seed=0):
+    """Rosters part-way through the draft plus the remaining pool."""
+    rng = random.Random(seed)
+    positions = ['Goalkeeper', 'Defender', 'Midfielder', 'Forward', 'Winger']
+
+    def entry(pid, coach=False):
+        rated = not coach and rng.random() >= 0.15
+        return {
+            'id': pid, 'name': f'Player {pid}', 'is_coach': coach,
+            'pronouns': rng.choice(['he/him', 'she/her', 'they/them', None]),
+            'balance_gender': None,
+            'favorite_position': rng.choice(positions), 'other_positions': [],
+            'positions_not_to_play': [], 'gk_willingness': rng.choice(['', 'Sometimes']),
+            'wants_gk': False,
+            'ratings': {
+                'is_rated': rated, 'composite': None,
+                'metrics': {m: rng.choice(HALF_POINTS) if rated else None for m in METRICS},
+            },
+        }
+
+    pid = 0
+    rosters = {}
+    for team_id in range(1, num_teams + 1):
+        pid += 1
+        rosters[team_id] = [entry(pid, coach=True)]
+        for _ in range(per_team):
+            pid += 1
+            rosters[team_id].append(entry(pid))
+    pool = []
+    for _ in range(pool_size):
+        pid += 1
+        pool.append(entry(pid))
+    return rosters, pool
+
+
+def legacy_projection_pass(pool, rosters, team_id, config):
+    """The per-candidate copy-and-rescan work the old suggest_players did."""
+    team_totals = svc.compute_team_totals(rosters, config)
+    svc.compute_gaps(team_totals, config)
+    projections = [svc.project_assignment(team_totals, c, team_id, config)
+                   for c in pool if not c.get('is_coach')]
+    for _ in projections[:config['suggestion_count']]:
+        for _ in METRICS:
+            svc.compute_gaps(team_totals, config)
+    return projections
+
+
+def check_equivalence(pool, rosters, team_id, config):
+    totals = svc.compute_team_totals(rosters, config)
+    matrix = svc.TeamMetricMatrix(totals, config)
+    rows = [matrix.row(c) for c in pool]
+    for candidate, gaps in zip(pool, matrix.project_gaps(team_id, rows)):
+        expected = svc.project_assignment(totals, candidate, team_id, config)['gaps']
+        assert gaps == [expected[m]['gap'] for m in METRICS]
+
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_case(num_teams, pool_size, repeat=3):
+    """Returns (legacy_projection_seconds, suggest_players_seconds) for one board."""
+    config = make_config()
+    rosters, pool = build_board(num_teams, pool_size)
+    team_id = num_teams  # any team; all have the same roster size
+    check_equivalence(pool, rosters, team_id, config)
+    legacy = _best_of(lambda: legacy_projection_pass(pool, rosters, team_id, config), repeat)
+    current = _best_of(lambda: svc.suggest_players(pool, rosters, team_id, config), repeat)
+    return legacy, current
+
+
+@pytest.mark.performance
+class TestClassicDraftSuggestBenchmark:
+
+    def test_150_pool_10_teams(self):
+        legacy, current = run_case(10, 150)
+        # suggest_players does strictly more than the projection pass alone.
+        assert current < legacy
+
+    def test_deterministic_across_runs(self):
+        config = make_config()
+        rosters, pool = build_board(8, 60, seed=3)
+        first = svc.suggest_players(pool, rosters, 1, config)
+        assert svc.suggest_players(list(reversed(pool)), rosters, 1, config) == first
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='best-of runs per case')
+    args = parser.parse_args()
+
+    print(f"{'teams':>5} {'pool':>5} {'legacy proj':>12} {'suggest':>9} {'speedup':>8}")
+    for num_teams in TEAM_COUNTS:
+        for pool_size in POOL_SIZES:
+            legacy, current = run_case(num_teams, pool_size, args.repeat)
+            print(f"{num_teams:>5} {pool_size:>5} {legacy * 1000:>10.1f}ms "
+                  f"{current * 1000:>7.1f}ms {legacy / current:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+"""
+Replay harness for live ESPN polling (app/utils/espn_live_poller.py).
+
+Feeds a recorded sequence of ESPN /summary payloads, one per poll, through:
+
+- legacy: decode, normalize with ESPNAPIClient._process_summary_data, serialize
+  for the Redis cache, and rebuild every event's dedup key (what each poll cost
+  before the change), and
+- poller: ESPNLivePoller.ingest, plus dedup keys only when the poll isn't quiet
+  (what RealtimeReportingService does now),
+
+and reports CPU time per poll. Without --payloads it synthesizes a 90-minute
+match at 10s polls: ticking clock and boxscore every poll, a growing
+commentary feed, scripted goals/cards/subs, and a frozen payload at halftime.
+
+    python -m tests.performance.test_espn_poll_replay_benchmark [--payloads DIR]
+
+DIR holds one JSON file per poll (e.g. 0001.json, 0002.json, ...), replayed
+in name order.
+"""
+import argparse
+import copy
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+
+from app.utils.espn_api_client import ESPNAPIClient
+from app.utils.espn_live_poller import ESPNLivePoller, event_dedup_key
+
+MATCH_ID = '700001'
+COMPETITION = 'usa.1'
+POLL_SECONDS = 10
+HALFTIME_POLLS = 90  # 15 minutes
+
+SCRIPT = {  # match minute -> (keyEvent type text, side)
+    9: ('Goal', 'home'), 23: ('Yellow Card', 'away'), 38: ('Goal', 'away'),
+    52: ('Substitution', 'home'), 61: ('Substitution', 'away'), 64: ('Goal - Header', 'home'),
+    70: ('Yellow Card', 'home'), 77: ('Substitution', 'home'), 84: ('Red Card', 'away'),
+    88: ('Penalty - Scored', 'home'),
+}
+
+
+class _NullRedis:
+    def execute_command(self, *args):
+        return None
+
+
+def _team(side):
+    if side == 'home':
+        return {'id': '9726', 'displayName': 'Seattle Sounders FC', 'abbreviation': 'SEA',
+                'logos': [{'href': 'https://a.espncdn.com/i/teamlogos/soccer/500/9726.png'}]}
+    return {'id': '184', 'displayName': 'Portland Timbers', 'abbreviation': 'POR',
+            'logos': [{'href': 'https://a.espncdn.com/i/teamlogos/soccer/500/184.png'}]}
+
+
+def _roster(side):
+    team = _team(side)
+    base = 1000 if side == 'home' else 2000
+    return {'homeAway': side, 'team': team, 'roster': [
+        {'jersey': str(n), 'starter': n <= 11, 'formationPlace': str(n) if n <= 11 else '0',
+         'position': {'abbreviation': 'M', 'name': 'Midfielder'},
+         'athlete': {'id': str(base + n), 'displayName': f"{team['abbreviation']} Player {n}",
+                     'headshot': {'href': f'https://a.espncdn.com/i/headshots/soccer/players/full/{base + n}.png'}}}
+        for n in range(1, 21)]}
+
+
+def synthetic_recording(seed=3):
+    """[(status_code, body bytes)] for one match, one entry per 10s poll."""
+    rng = random.Random(seed)
+    rosters = [_roster('home'), _roster('away')]
+    score = {'home': 0, 'away': 0}
+    stats = {side: {'possessionPct': 50.0, 'totalShots': 0, 'shotsOnTarget': 0, 'wonCorners': 0,
+                    'foulsCommitted': 0, 'totalPasses': 0, 'accuratePasses': 0} for side in score}
+    key_events, commentary = [], []
+    polls = []
+
+    def payload(status_name, state, period, clock):
+        competitors = [{'homeAway': side, 'score': str(score[side]), 'team': _team(side)}
+                       for side in ('home', 'away')]
+        return {
+            'header': {'competitions': [{'competitors': competitors, 'status': {
+                'displayClock': clock, 'period': period,
+                'type': {'name': status_name, 'state': state, 'completed': False}}}]},
+            'keyEvents': key_events,
+            'commentary': commentary,
+            'rosters': rosters,
+            'boxscore': {'teams': [{'homeAway': side, 'team': _team(side), 'statistics': [
+                {'name': name, 'displayValue': str(round(value, 1))} for name, value in stats[side].items()]}
+                for side in ('home', 'away')]},
+            'gameInfo': {'venue': {'fullName': 'Lumen Field'}, 'attendance': 37722},
+        }
+
+    for poll in range(90 * 60 // POLL_SECONDS):
+        seconds = poll * POLL_SECONDS
+        minute = seconds // 60 + 1
+        period = 1 if minute <= 45 else 2
+        for side in stats:
+            stats[side]['totalPasses'] += rng.randint(1, 4)
+            stats[side]['accuratePasses'] += rng.randint(0, 3)
+        stats['home']['possessionPct'] = min(70.0, max(30.0, stats['home']['possessionPct'] + rng.uniform(-1, 1)))
+        stats['away']['possessionPct'] = 100.0 - stats['home']['possessionPct']
+        if seconds % 60 == 0:
+            commentary.append({'sequence': len(commentary) + 1, 'time': {'displayValue': f"{minute}'"},
+                               'text': f"Minute {minute}: possession in midfield."})
+            if minute in SCRIPT:
+                text, side = SCRIPT[minute]
+                athlete = rosters[0 if side == 'home' else 1]['roster'][rng.randrange(11)]['athlete']
+                participants = [{'athlete': {'id': athlete['id'], 'displayName': athlete['displayName']}}]
+                if text == 'Substitution':
+                    bench = rosters[0 if side == 'home' else 1]['roster'][11 + len(key_events) % 9]['athlete']
+                    participants.insert(0, {'athlete': {'id': bench['id'], 'displayName': bench['displayName']}})
+                scoring = text.startswith('Goal') or text.startswith('Penalty')
+                if scoring:
+                    score[side] += 1
+                key_events.append({
+                    'id': str(40000 + len(key_events)), 'type': {'text': text}, 'scoringPlay': scoring,
+                    'clock': {'displayValue': f"{minute}'"}, 'team': {'id': _team(side)['id']},
+                    'participants': participants, 'text': f"{text}: {athlete['displayName']}.",
+                })
+        polls.append(payload('STATUS_FIRST_HALF' if period == 1 else 'STATUS_SECOND_HALF', 'in',
+                             period, f"{minute}'"))
+        if seconds == 45 * 60 - POLL_SECONDS:
+            frozen = payload('STATUS_HALFTIME', 'in', 1, 'HT')
+            polls.extend(copy.deepcopy(frozen) for _ in range(HALFTIME_POLLS))
+
+    return [(200, json.dumps(p).encode()) for p in polls]
+
+
+def load_recording(directory):
+    return [(200, path.read_bytes()) for path in sorted(Path(directory).glob('*.json'))]
+
+
+def _client():
+    # Normalization and the cache write only; skip the Redis connection.
+    client = ESPNAPIClient.__new__(ESPNAPIClient)
+    client.redis_service = _NullRedis()
+    return client
+
+
+def replay_legacy(recording):
+    client = _client()
+    samples, last = [], None
+    for _, body in recording:
+        started = time.process_time()
+        data = client._process_summary_data(json.loads(body), MATCH_ID)
+        json.dumps(data)  # the Redis cache write get_match_data did every poll
+        for event in data['events']:
+            event_dedup_key(event)
+        samples.append(time.process_time() - started)
+        last = data
+    return samples, last, {}
+
+
+def replay_poller(recording):
+    poller = ESPNLivePoller(_client())
+    samples, last = [], None
+    counts = {'not_modified': 0, 'quiet': 0}
+    for status_code, body in recording:
+        started = time.process_time()
+        result = poller.ingest(MATCH_ID, status_code, body, competition=COMPETITION)
+        if not result.quiet:
+            # RealtimeReportingService._extract_new_events reads the stamped keys.
+            [event['_dedup_key'] for event in result.data['events']]
+        samples.append(time.process_time() - started)
+        counts['not_modified'] += result.not_modified
+        counts['quiet'] += result.quiet
+        last = result.data
+    return samples, last, counts
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {'polls': len(samples), 'total': sum(samples), 'mean': statistics.fmean(samples),
+            'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]}
+
+
+def run_benchmark(recording=None, repeat=3):
+    """Per path, the per-poll minimum CPU time over `repeat` replays."""
+    recording = recording if recording is not None else synthetic_recording()
+    rows = {}
+    for name, replay in (('legacy', replay_legacy), ('poller', replay_poller)):
+        runs = [replay(recording) for _ in range(repeat)]
+        samples = [min(polls) for polls in zip(*(run[0] for run in runs))]
+        _, last, counts = runs[-1]
+        rows[name] = {**summarize(samples), **counts, 'last': last}
+    return rows
+
+
+@pytest.mark.performance
+class TestESPNPollReplay:
+
+    @pytest.fixture(scope='class')
+    def result(self):
+        return run_benchmark()
+
+    def test_same_events_and_score_as_full_reparse(self, result):
+        legacy, poller = result['legacy']['last'], result['poller']['last']
+        strip = lambda events: [{k: v for k, v in e.items() if k != '_dedup_key'} for e in events]
+        assert strip(poller['events']) == strip(legacy['events'])
+        assert (poller['home_score'], poller['away_score']) == (legacy['home_score'], legacy['away_score'])
+
+    def test_halftime_polls_skip_decoding(self, result):
+        assert result['poller']['not_modified'] >= HALFTIME_POLLS - 1
+        # Only polls with a new keyEvent (or the status flips) need an event diff.
+        assert result['poller']['polls'] - result['poller']['quiet'] <= len(SCRIPT) + 4
+
+    def test_less_cpu_per_poll(self, result):
+        assert result['poller']['total'] < result['legacy']['total']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--payloads', help='directory of recorded /summary JSON payloads')
+    parser.add_argument('--repeat', type=int, default=3, help='replays per path (min per poll)')
+    args = parser.parse_args()
+
+    recording = load_recording(args.payloads) if args.payloads else synthetic_recording()
+    rows = run_benchmark(recording, args.repeat)
+    print(f"{len(recording)} polls, {statistics.fmean(len(b) for _, b in recording) / 1024:.0f} KiB/payload")
+    print(f"{'path':<8} {'cpu_total_ms':>12} {'mean_us':>8} {'p95_us':>8} {'quiet':>6} {'304/same':>8}")
+    for name, row in rows.items():
+        print(f"{name:<8} {row['total'] * 1000:>12.1f} {row['mean'] * 1e6:>8.0f} {row['p95'] * 1e6:>8.0f} "
+              f"{row.get('quiet', '-'):>6} {row.get('not_modified', '-'):>8}")
+
+
+if __name__ == '__main__':
+    main()
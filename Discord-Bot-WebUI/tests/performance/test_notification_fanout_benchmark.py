@@ -0,0 +1,138 @@
+"""
+Load harness for notification fan-out (app/services/notification_delivery.py).
+
+Sends a 500-recipient announcement through NotificationOrchestrator with every
+channel backed by a FakeChannelProvider (fixed latency per provider call), and
+compares wall time against the old one-user-after-another dispatch, whose cost
+is the sum of all provider calls.
+
+The pytest run uses short latencies so it stays fast. For the full table with
+default channel policies:
+
+    python -m tests.performance.test_notification_fanout_benchmark [--latency 0.2]
+"""
+import argparse
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.services.notification_delivery import (
+    DEFAULT_CHANNEL_POLICIES,
+    ChannelPolicy,
+    DeliveryEngine,
+    FakeChannelProvider,
+)
+from app.services.notification_orchestrator import (
+    NotificationOrchestrator,
+    NotificationPayload,
+    NotificationType,
+)
+
+# Tier mix for a league-wide announcement: most members have the app.
+TIER_MIX = {'push': 350, 'discord': 80, 'email': 50, 'sms': 20}
+
+
+def build_recipients(mix=TIER_MIX):
+    """Preference dicts shaped like _get_users_with_preferences output."""
+    prefs = {}
+    uid = 0
+    for tier, count in mix.items():
+        for _ in range(count):
+            uid += 1
+            prefs[uid] = {
+                'push_enabled': tier == 'push',
+                'discord_enabled': tier == 'discord',
+                'email_enabled': tier == 'email',
+                'sms_enabled': tier == 'sms',
+                'email': f'user{uid}@example.com',
+                'phone': f'+1555{uid:07d}',
+                'discord_id': f'{uid}',
+                'is_phone_verified': True,
+                'sms_consent_given': True,
+                'fcm_tokens': [f'token-{uid}'] if tier == 'push' else [],
+            }
+    return prefs
+
+
+def run_fanout(latency, policies=None, mix=TIER_MIX):
+    """Deliver one announcement; returns (wall_seconds, results, providers)."""
+    providers = {channel: FakeChannelProvider(latency=latency) for channel in TIER_MIX}
+    orchestrator = NotificationOrchestrator()
+    orchestrator.delivery_engine = DeliveryEngine(policies)
+    prefs = build_recipients(mix)
+    payload = NotificationPayload(
+        notification_type=NotificationType.LEAGUE_ANNOUNCEMENT,
+        title='Fields closed',
+        message='All matches this Sunday are postponed.',
+        user_ids=list(prefs),
+    )
+
+    def push(user_ids, payload, users_with_prefs=None):
+        tokens = [t for uid in user_ids for t in users_with_prefs[uid]['fcm_tokens']]
+        success, failure = providers['push'].send(tokens)
+        return {'success': success, 'failure': failure}
+
+    def one(channel):
+        return lambda *args: providers[channel].send([args[0]])[0] == 1
+
+    with patch.object(orchestrator, '_get_users_with_preferences', return_value=prefs), \
+         patch.object(orchestrator, '_create_in_app_notification', return_value=True), \
+         patch.object(orchestrator, '_send_push_notifications', side_effect=push), \
+         patch.object(orchestrator, '_send_email_notification', side_effect=one('email')), \
+         patch.object(orchestrator, '_send_sms_notification', side_effect=one('sms')), \
+         patch.object(orchestrator, '_send_discord_notification', side_effect=one('discord')):
+        # push_discord_shared_tier cross-sends need both toggles; keep tiers disjoint.
+        started = time.perf_counter()
+        results = orchestrator.send(payload)
+        wall = time.perf_counter() - started
+    return wall, results, providers
+
+
+def sequential_estimate(latency, mix=TIER_MIX):
+    """Old dispatch: one multicast for push, then one call per other recipient."""
+    return latency * (1 + sum(count for tier, count in mix.items() if tier != 'push'))
+
+
+@pytest.mark.performance
+class TestNotificationFanoutBenchmark:
+
+    def test_500_recipients_in_seconds(self):
+        fast = {channel: ChannelPolicy(max_concurrency=policy.max_concurrency,
+                                       rate_per_second=200.0, burst=20,
+                                       batch_size=policy.batch_size)
+                for channel, policy in DEFAULT_CHANNEL_POLICIES.items()}
+        wall, results, providers = run_fanout(latency=0.05, policies=fast)
+
+        for channel, count in TIER_MIX.items():
+            assert results[channel]['success'] == count
+        assert providers['push'].calls == [250, 100]
+        assert providers['discord'].peak_in_flight <= fast['discord'].max_concurrency
+        assert wall < sequential_estimate(0.05) / 3
+        assert wall < 3.0
+
+    def test_summary_reaches_results(self):
+        _, results, _ = run_fanout(latency=0.0, mix={'push': 3, 'email': 2})
+        assert results['delivery']['email']['recipients'] == 2
+        assert results['delivery']['email']['batches'] == 2
+        assert results['delivery']['push']['batches'] == 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.2, help='seconds per provider call')
+    args = parser.parse_args()
+
+    wall, results, providers = run_fanout(args.latency)
+    print(f"{sum(TIER_MIX.values())} recipients, {args.latency:.2f}s per provider call")
+    print(f"sequential estimate: {sequential_estimate(args.latency):7.2f}s")
+    print(f"parallel fan-out:    {wall:7.2f}s")
+    print(f"{'channel':>8} {'recips':>6} {'ok':>5} {'fail':>5} {'batches':>7} {'throttled':>9} {'elapsed':>8} {'peak':>5}")
+    for channel, summary in results['delivery'].items():
+        print(f"{channel:>8} {summary['recipients']:>6} {summary['success']:>5} {summary['failure']:>5} "
+              f"{summary['batches']:>7} {summary['throttled_seconds']:>9.2f} {summary['elapsed']:>8.2f} "
+              f"{providers[channel].peak_in_flight:>5}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+Benchmark harness for player search (app/services/player_search_index.py).
+
+Builds a synthetic roster (players with user accounts, Discord handles, encrypted
+emails and team memberships) in an in-memory SQLite database and compares
+per-keystroke latency of the ILIKE queries the search endpoints used to run
+against the in-process trigram index, including the row fetch the endpoints do
+after ranking.
+
+The pytest run uses 10k players with loose thresholds. For the full table:
+
+    python -m tests.performance.test_player_search_benchmark [--players 10000]
+"""
+import argparse
+import random
+import statistics
+import time
+
+import pytest
+from sqlalchemy import create_engine, insert, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.models import Player, Team, User, player_teams
+from app.services.player_search_index import PlayerSearchIndex, load_documents
+from app.utils.pii_encryption import encrypt_value
+
+FIRST = ['James', 'Maria', 'John', 'Sofia', 'Robert', 'Ana', 'Michael', 'Lucia', 'David',
+         'Elena', 'Chris', 'Jose', 'Daniel', 'Sarah', 'Kevin', 'Mei', 'Brian', 'Aisha',
+         'Jonathan', 'Priya', 'Marcus', 'Olivia', 'Tomas', 'Hannah', 'Samuel']
+LAST = ['Smith', 'Garcia', 'Johnson', 'Martinez', 'Lee', 'Anderson', 'Nguyen', 'Brown',
+        'Lopez', 'Wilson', 'Kim', 'Taylor', 'Hernandez', 'Walker', 'Patel', 'Thompson',
+        'Rodriguez', 'Clark', 'Lewis', 'Young', 'Novak', 'Okafor', 'Schmidt', 'Rossi']
+TEAM_WORDS = ['Sounders', 'Reign', 'Kraken', 'Orcas', 'Timbers', 'Thorns', 'Rainiers',
+              'Mariners', 'Storm', 'Seawolves']
+
+# Prefixes as typed, mid-word substrings, team and handle lookups, typos, misses.
+TERMS = ['jo', 'joh', 'john', 'mar', 'smi', 'garc', 'ander', 'nguyen', 'lee', 'kim p',
+         'sounders', 'kraken 3', 'jdoe', 'player123', 'jonh', 'smtih', 'zzq']
+
+TABLES = [User.__table__, Team.__table__, Player.__table__, player_teams]
+
+
+def build_database(num_players, num_teams=60, seed=1):
+    """In-memory SQLite with num_players rostered players; returns the engine."""
+    rng = random.Random(seed)
+    engine = create_engine('sqlite://', poolclass=StaticPool,
+                           connect_args={'check_same_thread': False})
+    Player.metadata.create_all(engine, tables=TABLES)
+
+    teams = [{'id': i, 'name': f'{TEAM_WORDS[i % len(TEAM_WORDS)]} {i // len(TEAM_WORDS) + 1}',
+              'league_id': 1} for i in range(1, num_teams + 1)]
+    users, players, roster = [], [], []
+    for i in range(1, num_players + 1):
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        handle = f'{first[0]}{last}{i}'.lower()
+        users.append({'id': i, 'username': f'player{i}', 'password_hash': 'x',
+                      'encrypted_email': encrypt_value(f'{handle}@example.com')})
+        players.append({'id': i, 'user_id': i, 'name': f'{first} {last}',
+                        'discord_username': handle, 'is_current_player': rng.random() < 0.6})
+        for team_id in rng.sample(range(1, num_teams + 1), rng.choice((1, 1, 2))):
+            roster.append({'player_id': i, 'team_id': team_id})
+
+    with Session(engine) as session:
+        session.execute(insert(Team.__table__), teams)
+        session.execute(insert(User.__table__), users)
+        session.execute(insert(Player.__table__), players)
+        session.execute(insert(player_teams), roster)
+        session.commit()
+    return engine
+
+
+def ilike_name(session, term, limit=10):
+    """The autocomplete query the endpoints ran before: name only."""
+    return session.scalars(
+        select(Player).where(Player.name.ilike(f'%{term}%'))
+        .order_by(Player.is_current_player.desc(), Player.name).limit(limit)).all()
+
+
+def ilike_all(session, term, limit=10):
+    """ILIKE over every field the index covers (email excluded: it's encrypted)."""
+    pattern = f'%{term}%'
+    ids = (select(Player.id)
+           .outerjoin(User, User.id == Player.user_id)
+           .outerjoin(player_teams, player_teams.c.player_id == Player.id)
+           .outerjoin(Team, Team.id == player_teams.c.team_id)
+           .where(or_(Player.name.ilike(pattern), Player.discord_username.ilike(pattern),
+                      User.username.ilike(pattern), Team.name.ilike(pattern))))
+    return session.scalars(
+        select(Player).where(Player.id.in_(ids))
+        .order_by(Player.is_current_player.desc(), Player.name).limit(limit)).all()
+
+
+def indexed(index):
+    def run(session, term, limit=10):
+        ids = index.search(term, limit=limit)
+        if not ids:
+            return []
+        rows = {p.id: p for p in session.scalars(select(Player).where(Player.id.in_(ids)))}
+        return [rows[i] for i in ids if i in rows]
+    return run
+
+
+def _timed(session, method, terms, repeat):
+    samples = []
+    for _ in range(repeat):
+        for term in terms:
+            # Typing a term issues a query per keystroke past the minimum length.
+            for end in range(2, len(term) + 1):
+                started = time.perf_counter()
+                method(session, term[:end])
+                samples.append(time.perf_counter() - started)
+                session.expunge_all()
+    samples.sort()
+    return {'p50': statistics.median(samples),
+            'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            'queries': len(samples)}
+
+
+def run_benchmark(num_players=10000, repeat=3, seed=1):
+    engine = build_database(num_players, seed=seed)
+    with Session(engine) as session:
+        started = time.perf_counter()
+        docs, teams = load_documents(session, everything=True)
+        index = PlayerSearchIndex()
+        index.load(docs, teams)
+        build = time.perf_counter() - started
+
+        rows = {}
+        for name, method in (('ilike_name', ilike_name), ('ilike_all', ilike_all),
+                             ('index', indexed(index))):
+            rows[name] = _timed(session, method, TERMS, repeat)
+    engine.dispose()
+    return {'players': num_players, 'build': build, 'indexed': len(index), 'methods': rows}
+
+
+@pytest.mark.performance
+class TestPlayerSearchBenchmark:
+
+    @pytest.fixture(scope='class')
+    def result(self):
+        return run_benchmark(num_players=10000, repeat=1)
+
+    def test_index_covers_every_player(self, result):
+        assert result['indexed'] == result['players']
+
+    def test_index_build_is_bounded(self, result):
+        # Emails are decrypted on the first admin lookup, not here.
+        assert result['build'] < 20.0
+
+    def test_index_beats_ilike(self, result):
+        methods = result['methods']
+        assert methods['index']['p95'] < 0.05
+        assert methods['index']['p50'] < methods['ilike_all']['p50']
+
+    def test_results_come_back_ranked(self):
+        engine = build_database(500, num_teams=10, seed=5)
+        with Session(engine) as session:
+            docs, teams = load_documents(session, everything=True)
+            index = PlayerSearchIndex()
+            index.load(docs, teams)
+            found = indexed(index)(session, 'smi')
+            assert found and all('smi' in (p.name + p.discord_username).lower() for p in found)
+            current = [p.is_current_player for p in found]
+            assert current == sorted(current, reverse=True)
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--players', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3, help='passes over the term list')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    result = run_benchmark(args.players, args.repeat, args.seed)
+    print(f"{result['players']} players, index built in {result['build']:.2f}s")
+    print(f"{'method':<12} {'queries':>7} {'p50_ms':>8} {'p95_ms':>8}")
+    for name, row in result['methods'].items():
+        print(f"{name:<12} {row['queries']:>7} {row['p50'] * 1000:>8.2f} {row['p95'] * 1000:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
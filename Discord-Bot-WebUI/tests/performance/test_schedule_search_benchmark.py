@@ -0,0 +1,109 @@
+"""
+Benchmark harness for the generic schedule search (app/schedule_search.py).
+
+Measures wall time and fairness score for 4-20 teams on 1-4 fields, and checks
+that every schedule returned passes the same hard-constraint validation the
+admin UI relies on (_evaluate_generic).
+
+The pytest run uses a short budget over a reduced grid so it stays fast. For
+the full table:
+
+    python -m tests.performance.test_schedule_search_benchmark [--budget 1.5]
+"""
+import argparse
+import time
+
+import pytest
+
+from app.auto_schedule_generator import AutoScheduleGenerator
+from app.schedule_search import ScheduleSearchEngine
+
+TEAM_SIZES = range(4, 21, 2)
+FIELD_COUNTS = range(1, 5)
+
+
+def _validator():
+    # _evaluate_generic only needs the pair-key helper, not a league/session.
+    return AutoScheduleGenerator.__new__(AutoScheduleGenerator)
+
+
+def run_case(num_teams, num_fields, time_budget, seed=None):
+    """Search one configuration; returns a result row (None if the grid is infeasible)."""
+    if num_teams % num_fields != 0 or num_teams // num_fields < 2:
+        return None
+    team_ids = list(range(1, num_teams + 1))
+    engine = ScheduleSearchEngine(team_ids, num_fields, time_budget=time_budget, seed=seed)
+    started = time.perf_counter()
+    result = engine.search()
+    wall = time.perf_counter() - started
+    hard, score, summary = _validator()._evaluate_generic(
+        result.weeks, team_ids, num_fields, num_teams // num_fields)
+    return {
+        'teams': num_teams, 'fields': num_fields, 'wall': wall,
+        'score': score, 'bound': result.lower_bound, 'hard': hard,
+        'summary': summary, 'iterations': result.iterations, 'restarts': result.restarts,
+    }
+
+
+def run_benchmark(time_budget=1.5, seed=None):
+    rows = []
+    for n in TEAM_SIZES:
+        for f in FIELD_COUNTS:
+            row = run_case(n, f, time_budget, seed)
+            if row is not None:
+                rows.append(row)
+    return rows
+
+
+@pytest.mark.performance
+class TestScheduleSearchBenchmark:
+
+    @pytest.mark.parametrize('num_teams,num_fields', [
+        (4, 2), (6, 2), (6, 3), (10, 2), (12, 3), (12, 4), (16, 4), (20, 4),
+    ])
+    def test_valid_schedule_within_budget(self, num_teams, num_fields):
+        row = run_case(num_teams, num_fields, time_budget=0.3, seed=7)
+        assert row['hard'] == []
+        # Search stops at the deadline; allow slack for the final validation pass.
+        assert row['wall'] < 1.5
+        assert row['score'] >= row['bound'] - 1e-9
+
+    def test_score_matches_evaluator(self):
+        team_ids = list(range(1, 11))
+        result = ScheduleSearchEngine(team_ids, 2, time_budget=None, max_iterations=3000,
+                                      seed=3).search()
+        _, score, summary = _validator()._evaluate_generic(result.weeks, team_ids, 2, 5)
+        assert result.score == pytest.approx(score)
+        assert result.summary == summary
+
+    def test_iteration_budget_is_deterministic(self):
+        def run():
+            return ScheduleSearchEngine(list(range(1, 13)), 3, time_budget=None,
+                                        max_iterations=2000, seed=11).search().weeks
+        assert run() == run()
+
+    def test_lower_bound_stops_search_early(self):
+        result = ScheduleSearchEngine(list(range(1, 9)), 4, time_budget=5.0, seed=1).search()
+        assert result.score == pytest.approx(result.lower_bound)
+        assert result.elapsed < 5.0
+
+    def test_rejects_grid_without_two_slots(self):
+        with pytest.raises(ValueError):
+            ScheduleSearchEngine(list(range(1, 7)), 6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget', type=float, default=1.5, help='seconds per configuration')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"{'teams':>5} {'fields':>6} {'wall_s':>7} {'score':>7} {'bound':>6} {'iters':>7}  summary")
+    for row in run_benchmark(args.budget, args.seed):
+        flag = '' if not row['hard'] else f"  INVALID: {row['hard'][:3]}"
+        print(f"{row['teams']:>5} {row['fields']:>6} {row['wall']:>7.2f} {row['score']:>7.3f} "
+              f"{row['bound']:>6.1f} {row['iterations']:>7}  {row['summary']}{flag}")
+
+
+if __name__ == '__main__':
+    main()
@@ -670,6 +670,91 @@ class TestGetMatchIdFromMessage:
             assert data['match_id'] == test_match.id
 
 
+# =============================================================================
+# RSVP SYNC STATE TESTS
+# =============================================================================
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestGetRsvpSyncState:
+    """Tests for the bulk get_rsvp_sync_state endpoint."""
+
+    def test_returns_channel_team_and_rsvps_per_message(
+        self, api_client, app, db, test_match, home_team, team_player, non_team_player, api_headers
+    ):
+        """
+        GIVEN a scheduled message with home/away posts and RSVPs from both teams
+        WHEN POST /get_rsvp_sync_state is called with both ids and an unknown id
+        THEN each known message gets its channel, team and that team's RSVPs
+        """
+        from app.models import ScheduledMessage
+
+        set_factory_session(db.session)
+        AvailabilityFactory(match=test_match, player=team_player, response='yes',
+                            discord_id=team_player.discord_id)
+        AvailabilityFactory(match=test_match, player=non_team_player, response='no',
+                            discord_id=non_team_player.discord_id)
+        db.session.add(ScheduledMessage(
+            match_id=test_match.id,
+            scheduled_send_time=datetime.utcnow(),
+            home_message_id='sync_home_1', home_channel_id='chan_home',
+            away_message_id='sync_away_1', away_channel_id='chan_away',
+        ))
+        db.session.commit()
+
+        with app.app_context():
+            response = api_client.post(
+                '/api/get_rsvp_sync_state',
+                json={'message_ids': ['sync_home_1', 'sync_away_1', 'unknown_1']},
+                headers=api_headers
+            )
+
+            assert response.status_code == 200
+            data = response.get_json()
+            assert data['missing'] == ['unknown_1']
+            home = data['messages']['sync_home_1']
+            away = data['messages']['sync_away_1']
+            assert home['channel_id'] == 'chan_home'
+            assert home['team_id'] == home_team.id
+            assert home['is_recent_match'] is True
+            assert [p['discord_id'] for p in home['rsvps']['yes']] == [team_player.discord_id]
+            assert home['rsvps']['no'] == []
+            assert away['message_type'] == 'away'
+            assert [p['discord_id'] for p in away['rsvps']['no']] == [non_team_player.discord_id]
+
+    def test_old_match_has_no_rsvps(self, api_client, app, db, old_match, api_headers):
+        """
+        GIVEN a message for a match older than 7 days
+        WHEN POST /get_rsvp_sync_state is called
+        THEN the message is reported as not recent with no RSVP payload
+        """
+        from app.models import ScheduledMessage
+
+        db.session.add(ScheduledMessage(
+            match_id=old_match.id,
+            scheduled_send_time=datetime.utcnow(),
+            home_message_id='sync_old_1', home_channel_id='chan_home',
+        ))
+        db.session.commit()
+
+        with app.app_context():
+            response = api_client.post(
+                '/api/get_rsvp_sync_state',
+                json={'message_ids': ['sync_old_1']},
+                headers=api_headers
+            )
+
+            info = response.get_json()['messages']['sync_old_1']
+            assert info['is_recent_match'] is False
+            assert info['rsvps'] is None
+
+    def test_missing_message_ids_returns_400(self, api_client, app, api_headers):
+        with app.app_context():
+            response = api_client.post('/api/get_rsvp_sync_state', json={}, headers=api_headers)
+
+            assert response.status_code == 400
+
+
 # =============================================================================
 # IS USER ON TEAM TESTS
 # =============================================================================
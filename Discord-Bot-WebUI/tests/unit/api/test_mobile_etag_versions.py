@@ -0,0 +1,105 @@
+"""
+Version-counter ETags for mobile endpoints (app/services/etag_versions.py and
+etag_utils.version_etag): commit hooks bump only the scopes a write touches,
+and a current If-None-Match is answered with a 304 before any SQL runs.
+"""
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import update
+
+from app.services import etag_versions, version_counters
+
+
+def version(redis, scope):
+    return redis.strings.get(f'{etag_versions.VERSION_PREFIX}{scope}')
+
+
+@pytest.mark.unit
+class TestCommitHooks:
+
+    def test_writes_bump_only_their_scopes_after_commit(self, db, fake_redis, player, match):
+        db.session.commit()
+        before = {s: version(fake_redis, s) for s in (etag_versions.MATCHES, etag_versions.TEAMS,
+                                                   etag_versions.RSVPS)}
+
+        from app.models import Availability
+        db.session.add(Availability(match_id=match.id, player_id=player.id,
+                                    discord_id=player.discord_id, response='yes'))
+        db.session.flush()
+        assert version(fake_redis, etag_versions.RSVPS) == before[etag_versions.RSVPS]
+        db.session.commit()
+        assert version(fake_redis, etag_versions.RSVPS) != before[etag_versions.RSVPS]
+        assert version(fake_redis, etag_versions.MATCHES) == before[etag_versions.MATCHES]
+
+        # A preference edit invalidates the owner's profile, not every team list.
+        profile = version(fake_redis, etag_versions.profile_scope(player.user_id))
+        player.jersey_size = 'L'
+        db.session.commit()
+        assert version(fake_redis, etag_versions.profile_scope(player.user_id)) != profile
+        assert version(fake_redis, etag_versions.TEAMS) == before[etag_versions.TEAMS]
+
+        player.name = 'Renamed Player'
+        db.session.commit()
+        assert version(fake_redis, etag_versions.TEAMS) != before[etag_versions.TEAMS]
+
+    def test_bulk_dml_and_rollback(self, db, fake_redis, team):
+        from app.models import Team
+        db.session.commit()
+        teams = version(fake_redis, etag_versions.TEAMS)
+
+        db.session.execute(update(Team).where(Team.id == team.id).values(name='Bulk Renamed'))
+        db.session.rollback()
+        assert version(fake_redis, etag_versions.TEAMS) == teams
+
+        db.session.execute(update(Team).where(Team.id == team.id).values(name='Bulk Renamed'))
+        db.session.commit()
+        assert version(fake_redis, etag_versions.TEAMS) != teams
+
+    def test_counters_are_seeded_not_zero(self, fake_redis):
+        assert etag_versions.get_versions([etag_versions.MATCHES])[0] != '0'
+        etag_versions.bump([etag_versions.TEAMS])
+        assert int(version(fake_redis, etag_versions.TEAMS)) > 1
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestMatchesEndpoint:
+
+    def test_current_etag_returns_304_without_sql(self, client, db, fake_redis, statements, player,
+                                                   match):
+        db.session.commit()
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(player.user_id))}'}
+
+        first = client.get('/api/v1/matches', headers=headers)
+        assert first.status_code == 200
+        etag = first.headers['ETag']
+        assert etag.startswith('"v-')
+
+        statements.clear()
+        second = client.get('/api/v1/matches', headers={**headers, 'If-None-Match': etag})
+        assert second.status_code == 304
+        # Only the app-wide before_request settings lookup; nothing from the endpoint.
+        assert [s for s in statements if 'FROM admin_config' not in s] == []
+
+        # RSVPs aren't part of the plain list; a match edit is.
+        from app.models import Availability
+        db.session.add(Availability(match_id=match.id, player_id=player.id,
+                                    discord_id=player.discord_id, response='no'))
+        db.session.commit()
+        assert client.get('/api/v1/matches',
+                          headers={**headers, 'If-None-Match': etag}).status_code == 304
+        match.location = 'Other Field'
+        db.session.commit()
+        assert client.get('/api/v1/matches',
+                          headers={**headers, 'If-None-Match': etag}).status_code == 200
+
+    def test_falls_back_to_content_hash_without_counters(self, client, db, monkeypatch, player):
+        monkeypatch.setattr(version_counters, 'get_app_redis', lambda: None)
+        db.session.commit()
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(player.user_id))}'}
+
+        first = client.get('/api/v1/matches', headers=headers)
+        assert first.status_code == 200
+        assert not first.headers['ETag'].startswith('"v-')
+        assert client.get('/api/v1/matches', headers={
+            **headers, 'If-None-Match': first.headers['ETag']}).status_code == 304
@@ -0,0 +1,132 @@
+"""
+Unit tests for the buffered API request log (app/services/api_log_buffer.py):
+size-bounded ring buffer, batched writes through both sinks, and the
+per-endpoint latency histograms dashboards read percentiles from.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.api_log_buffer import (
+    APILogBuffer,
+    DatabaseSink,
+    LatencyHistogram,
+    RedisStreamSink,
+    STREAM_KEY,
+    decode_stream_rows,
+    get_latency_summary,
+)
+from tests.conftest import FakeRedis
+
+
+class RecordingSink:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def write(self, rows):
+        if self.fail:
+            raise ConnectionError('database unavailable')
+        self.batches.append(list(rows))
+
+
+def row(i, status=200, ms=12.5):
+    return {'endpoint_path': f'/api/v1/matches/{i}', 'method': 'GET', 'status_code': status,
+            'response_time_ms': ms, 'user_id': None, 'ip_address': '127.0.0.1',
+            'user_agent': 'pytest', 'timestamp': datetime(2026, 3, 1, 12, 0, i % 60)}
+
+
+@pytest.mark.unit
+class TestLatencyHistogram:
+
+    def test_percentiles_are_bucket_upper_bounds(self):
+        h = LatencyHistogram()
+        for ms in [3] * 50 + [40] * 45 + [900] * 4 + [20000]:
+            h.add(ms)
+        assert (h.percentile(0.5), h.percentile(0.95), h.percentile(0.99)) == (5, 50, 1000)
+        assert h.percentile(1.0) is None  # open-ended bucket
+        assert LatencyHistogram().percentile(0.5) == 0
+
+
+@pytest.mark.unit
+class TestAPILogBuffer:
+
+    def test_flush_writes_in_batches_and_histograms_see_every_request(self):
+        sink, redis = RecordingSink(), FakeRedis()
+        buffer = APILogBuffer(sink, histogram_redis=redis, batch_size=4, background=False)
+        for i in range(10):
+            buffer.record(row(i), 'GET /api/v1/matches/<int:match_id>', 30, 200)
+        buffer.record(None, 'GET /api/v1/matches/<int:match_id>', 700, 500)  # past the row cap
+
+        assert buffer.flush() == 10
+        assert [len(b) for b in sink.batches] == [4, 4, 2]
+        (fields,) = redis.hashes.values()
+        key = 'GET /api/v1/matches/<int:match_id>'
+        assert (fields[f'{key}|n'], fields[f'{key}|err']) == (11, 1)
+        assert buffer.stats() == {'recorded': 10, 'written': 10, 'dropped': 0, 'failed': 0,
+                                  'pending': 0}
+        assert buffer.flush() == 0
+
+    def test_ring_buffer_drops_oldest_when_full_and_failed_batches_are_counted(self):
+        sink = RecordingSink(fail=True)
+        buffer = APILogBuffer(sink, capacity=5, batch_size=2, background=False)
+        for i in range(8):
+            buffer.record(row(i), 'GET /api/x', 1, 200)
+        assert buffer.stats()['dropped'] == 3
+        buffer.flush()
+        assert buffer.stats()['failed'] == 5
+
+        sink.fail = False
+        buffer.record(row(9), 'GET /api/x', 1, 200)
+        buffer.flush()
+        assert [r['endpoint_path'] for b in sink.batches for r in b] == ['/api/v1/matches/9']
+
+    def test_database_sink_inserts_one_batch(self, app, db):
+        from app.models.api_logs import APIRequestLog
+        buffer = APILogBuffer(DatabaseSink(app), batch_size=50, background=False)
+        for i in range(3):
+            buffer.record(row(i, status=404 if i == 2 else 200), 'GET /api/x', 5, 200)
+        assert buffer.flush() == 3
+        try:
+            logged = db.session.query(APIRequestLog).order_by(APIRequestLog.id).all()
+            assert [(l.endpoint_path, l.status_code) for l in logged[-3:]] == [
+                ('/api/v1/matches/0', 200), ('/api/v1/matches/1', 200), ('/api/v1/matches/2', 404)]
+        finally:
+            db.session.query(APIRequestLog).delete()
+            db.session.commit()
+
+    def test_redis_sink_round_trips_one_entry_per_batch(self):
+        redis = FakeRedis()
+        buffer = APILogBuffer(RedisStreamSink(redis), batch_size=3, background=False)
+        for i in range(5):
+            buffer.record(row(i), 'GET /api/x', 5, 200)
+        buffer.flush()
+        entries = redis.streams[STREAM_KEY]
+        assert len(entries) == 2
+        decoded = decode_stream_rows(entries[0][1]['rows'].encode())
+        assert decoded[1] == row(1)
+
+
+@pytest.mark.unit
+class TestLatencySummary:
+
+    def test_merges_hours_and_ranks_busiest_first(self):
+        redis = FakeRedis()
+        now = datetime(2026, 3, 1, 12, 30)
+        for hours_ago, count, ms in ((0, 30, 40), (3, 70, 40), (30, 500, 40)):
+            h = LatencyHistogram()
+            for _ in range(count):
+                h.add(ms)
+            key = f"api:latency:{(now - timedelta(hours=hours_ago)).strftime('%Y%m%d%H')}"
+            for field, value in h.to_fields('GET /api/a').items():
+                redis.hincrby(key, field, value)
+        quiet = LatencyHistogram()
+        quiet.add(2000, error=True)
+        for field, value in quiet.to_fields('POST /api/b').items():
+            redis.hincrby(f"api:latency:{now.strftime('%Y%m%d%H')}", field, value)
+
+        summary = get_latency_summary(hours=24, redis_client=redis, now=now)
+        assert [(s['endpoint'], s['count']) for s in summary] == [('GET /api/a', 100),
+                                                                  ('POST /api/b', 1)]
+        assert (summary[0]['p50'], summary[0]['avg_ms']) == (50, 40.0)
+        assert (summary[1]['p99'], summary[1]['errors']) == (2500, 1)
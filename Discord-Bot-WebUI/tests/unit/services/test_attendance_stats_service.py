@@ -0,0 +1,147 @@
+"""
+Comparison harness for the set-based PlayerAttendanceStats recompute
+(app/services/attendance_stats_service.py): on randomized league histories it
+must produce exactly the numbers update_stats produces, player by player, in a
+fixed number of statements.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models import Availability, League, Match, Player, Schedule, Season, Team, User
+from app.models.players import PlayerTeamSeason
+from app.models.stats import PlayerAttendanceStats
+from app.services.attendance_stats_service import (
+    compare_with_update_stats,
+    compute_attendance_stats,
+    recalculate_attendance_stats,
+)
+
+RESPONSES = ['yes', 'no', 'maybe', 'Yes', 'NO', 'unsure']
+WEEK_TYPES = ['REGULAR'] * 6 + ['FUN', 'PLAYOFF', 'BYE']
+
+
+def build_history(session, seed, players=24, with_current=True):
+    """Two seasons of teams, fixtures and RSVPs with the messy edges update_stats handles."""
+    rng = random.Random(seed)
+    today = date.today()
+    seasons = [Season(name=f'Past {seed}', league_type='Pub League', is_current=False),
+               Season(name=f'Now {seed}', league_type='Pub League', is_current=with_current),
+               Season(name=f'ECS {seed}', league_type='ECS FC', is_current=with_current)]
+    session.add_all(seasons)
+    session.flush()
+
+    teams_by_season = {}
+    for season in seasons[:2]:
+        league = League(name=f'League {season.id}', season_id=season.id)
+        session.add(league)
+        session.flush()
+        teams = [Team(name=f'T{season.id}-{i}', league_id=league.id) for i in range(4)]
+        session.add_all(teams)
+        session.flush()
+        teams_by_season[season.id] = teams
+
+    matches = []
+    for season in seasons[:2]:
+        teams = teams_by_season[season.id]
+        base = today - timedelta(days=200 if season is seasons[0] else 40)
+        for week in range(8):
+            day = base + timedelta(days=7 * week)
+            for home, away in ((teams[0], teams[1]), (teams[2], teams[3]), (teams[0], teams[0])):
+                schedule = Schedule(week=str(week), date=day, time=time(19), opponent=away.id,
+                                    location='Field', team_id=home.id,
+                                    season_id=season.id if rng.random() > 0.2 else None)
+                session.add(schedule)
+                session.flush()
+                match = Match(date=day, time=time(19), location='Field', home_team_id=home.id,
+                              away_team_id=away.id, schedule_id=schedule.id,
+                              week_type=rng.choice(WEEK_TYPES))
+                session.add(match)
+                matches.append(match)
+    session.flush()
+
+    current_teams = teams_by_season[seasons[1].id]
+    past_teams = teams_by_season[seasons[0].id]
+    player_ids = []
+    for i in range(players):
+        user = User(username=f'att{seed}_{i}', email=f'att{seed}_{i}@example.com')
+        user.set_password('password123')
+        session.add(user)
+        session.flush()
+        player = Player(name=f'Player {i}', user_id=user.id, discord_id=f'd{seed}_{i}')
+        session.add(player)
+        session.flush()
+        kind = i % 4  # 0: roster history, 1: current team only, 2: no team, 3: team but no RSVPs
+        if kind in (0, 1, 3):
+            player.teams.append(rng.choice(current_teams))
+        if kind == 0:
+            for team in rng.sample(past_teams, 2) + [rng.choice(current_teams)]:
+                session.add(PlayerTeamSeason(player_id=player.id, team_id=team.id,
+                                             season_id=team.league.season_id))
+        if kind != 3:
+            for match in rng.sample(matches, rng.randint(0, 20)):
+                responded = datetime.combine(match.date, time(9)) - timedelta(days=rng.randint(0, 30))
+                session.add(Availability(match_id=match.id, player_id=player.id,
+                                         discord_id=player.discord_id,
+                                         response=rng.choice(RESPONSES),
+                                         responded_at=None if rng.random() < 0.1 else responded))
+                if rng.random() < 0.1:  # duplicate RSVP row; the later one wins
+                    session.add(Availability(match_id=match.id, player_id=player.id,
+                                             discord_id=player.discord_id,
+                                             response=rng.choice(RESPONSES), responded_at=responded))
+        session.add(PlayerAttendanceStats(player_id=player.id))
+        player_ids.append(player.id)
+    session.flush()
+    return player_ids
+
+
+@pytest.mark.unit
+class TestSetBasedAttendanceStats:
+
+    @pytest.mark.parametrize('seed', [1, 2, 3])
+    def test_matches_update_stats(self, db, seed):
+        player_ids = build_history(db.session, seed)
+        assert compare_with_update_stats(db.session, player_ids) == []
+        # Not vacuous: every branch produced real numbers.
+        values = compute_attendance_stats(db.session, player_ids).values()
+        assert sum(v['total_matches_invited'] > 0 for v in values) > len(player_ids) // 2
+        assert any(v['season_yes_responses'] for v in values)
+
+    def test_matches_update_stats_without_current_season(self, db):
+        player_ids = build_history(db.session, 9, players=8, with_current=False)
+        assert compare_with_update_stats(db.session, player_ids) == []
+        values = compute_attendance_stats(db.session, player_ids)
+        assert all('current_season_id' not in v and v['season_matches_invited'] == 0
+                   for v in values.values())
+
+    def test_statement_count_is_independent_of_player_count(self, db):
+        player_ids = build_history(db.session, 4, players=40)
+        statements = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        engine = db.session.get_bind()
+        event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            compute_attendance_stats(db.session, player_ids)
+        finally:
+            event.remove(engine, 'before_cursor_execute', listener)
+        assert len(statements) == 3  # current seasons, career, season
+
+    def test_recalculate_upserts_rows(self, db):
+        player_ids = build_history(db.session, 5, players=12)
+        missing = player_ids[-1]
+        db.session.query(PlayerAttendanceStats).filter_by(player_id=missing).delete()
+        db.session.flush()
+
+        result = recalculate_attendance_stats(db.session, player_ids, batch_size=5)
+        assert result == {'updated': 11, 'created': 1, 'total': 12}
+
+        expected = compute_attendance_stats(db.session, player_ids)
+        rows = {s.player_id: s for s in db.session.query(PlayerAttendanceStats)
+                .filter(PlayerAttendanceStats.player_id.in_(player_ids))}
+        assert set(rows) == set(player_ids)
+        for pid, values in expected.items():
+            db.session.refresh(rows[pid])
+            assert {k: getattr(rows[pid], k) for k in values} == values
+            assert rows[pid].last_updated is not None
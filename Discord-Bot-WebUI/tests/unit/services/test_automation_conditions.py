@@ -0,0 +1,158 @@
+"""
+Compiled automation conditions (app/services/automation_service.py): the SQL
+form of a condition tree agrees with the Python predicate on every field and
+operator, fails closed the same way, and narrows an audience in one query.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.automation import CONDITION_FIELDS, CONDITION_OPS, CONDITION_OPS_BY_TYPE
+from app.services import automation_service
+from app.services.automation_service import compile_conditions, matching_user_ids
+
+NOW = datetime.utcnow()
+
+# Values worth trying for each operator; None stands for "no value given".
+OP_VALUES = {
+    'eq': ['approved', 'None', 'd1', 1], 'neq': ['approved', 'None'],
+    'gt': [0, '5', 'abc', float('nan')], 'lt': [10, None],
+    'older_than_days': [30, '365', 'soon', float('inf')],
+    'newer_than_days': [30, 0.5, None],
+    'has': ['Pub League Coach', 'Test League', 'nobody'],
+    'not_has': ['Pub League Coach', 'Test League'],
+}
+
+
+@pytest.fixture
+def people(db, team):
+    """Users covering NULLs, empty strings, duplicate and missing Player rows."""
+    from app.models import Player, Role, User
+
+    coach = Role(name='Pub League Coach', description='Coach')
+    db.session.add(coach)
+
+    def person(name, approval='approved', last_login=None, **fields):
+        user = User(username=name, email=f'{name}@example.com', approval_status=approval,
+                    last_login=last_login, **fields)
+        user.set_password('password123')
+        db.session.add(user)
+        db.session.flush()
+        return user
+
+    def player(user, **fields):
+        row = Player(name=user.username, user_id=user.id, **fields)
+        db.session.add(row)
+        db.session.flush()
+        return row
+
+    rostered = person('rostered', last_login=NOW - timedelta(days=40),
+                      has_completed_onboarding=True, email_notifications=None)
+    rostered.roles.append(coach)
+    on_team = player(rostered, discord_id='d1', discord_in_server=True, is_current_player=True,
+                     primary_team_id=team.id, discord_last_checked=NOW - timedelta(days=2))
+    on_team.teams.append(team)
+
+    # An all-NULL orphan Player row next to the real one.
+    duplicate = person('duplicate', approval='pending', last_login=NOW - timedelta(hours=3))
+    player(duplicate)
+    player(duplicate, discord_id='d2', discord_in_server=True, is_current_player=True)
+
+    person('no_player', approval='denied', is_active=False, push_notifications=False)
+
+    blank = person('blank', last_login=NOW - timedelta(days=400))
+    player(blank, discord_id='', is_current_player=True, is_sub=True,
+           profile_last_updated=NOW - timedelta(days=400))
+
+    outside = person('outside', approval='None')
+    player(outside, discord_id='d5', discord_in_server=False, is_current_player=True,
+           is_phone_verified=True, profile_last_updated=NOW - timedelta(days=1))
+
+    db.session.commit()
+    return [u.id for u in (rostered, duplicate, blank, outside)] + \
+        [db.session.query(User.id).filter_by(username='no_player').scalar()]
+
+
+def leaf_conditions():
+    """Every field with its own operators, plus operators it was not meant for."""
+    for field, (_label, kind, _group) in CONDITION_FIELDS.items():
+        for op in CONDITION_OPS:
+            values = OP_VALUES.get(op, [None])
+            if op not in CONDITION_OPS_BY_TYPE[kind]:
+                values = values[:1]
+            for value in values:
+                yield {'field': field, 'op': op, 'value': value}
+    yield {'field': 'user.is_active', 'op': 'bogus'}
+
+
+def both_ways(db, conditions, user_ids):
+    compiled = compile_conditions(conditions)
+    return (matching_user_ids(db.session, compiled, user_ids, now=NOW),
+            matching_user_ids(db.session, compiled, user_ids, now=NOW, pushdown=False))
+
+
+@pytest.mark.unit
+class TestEquivalence:
+
+    def test_every_leaf_agrees_with_the_predicate(self, db, people):
+        pushed = 0
+        for cond in leaf_conditions():
+            in_sql, in_python = both_ways(db, [cond], people)
+            assert in_sql == in_python, cond
+            pushed += compile_conditions([cond]).pushdown
+        # Every field's own operators have an SQL form.
+        assert pushed >= sum(len(CONDITION_OPS_BY_TYPE[kind])
+                             for _l, kind, _g in CONDITION_FIELDS.values())
+
+    def test_groups_agree_with_the_predicate(self, db, people):
+        trees = [
+            [{'field': 'player.is_current_player', 'op': 'is_true'},
+             {'field': 'player.discord_in_server', 'op': 'is_false'}],
+            [{'any': [{'field': 'membership.role', 'op': 'has', 'value': 'Pub League Coach'},
+                      {'all': [{'field': 'user.approval_status', 'op': 'eq', 'value': 'pending'},
+                               {'field': 'user.last_login', 'op': 'newer_than_days', 'value': 1}]}]}],
+            [{'any': [{'field': 'membership.league', 'op': 'not_has', 'value': 'Test League'},
+                      {'field': 'player.discord_id', 'op': 'eq', 'value': 'd1'}]}],
+            [{'field': 'player.discord_id', 'op': 'exists'},
+             {'any': [{'field': 'user.is_active', 'op': 'is_false'}, 'malformed']}],
+        ]
+        for conditions in trees:
+            in_sql, in_python = both_ways(db, conditions, people)
+            assert in_sql == in_python, conditions
+        # A role asked about only inside a group is still loaded.
+        assert both_ways(db, trees[1], people)[1]
+
+    def test_fails_closed_the_same_way(self, db, people, caplog):
+        rule = SimpleNamespace(key='broken', conditions=[
+            {'field': 'user.is_active', 'op': 'is_true'},
+            {'field': 'player.nonexistent', 'op': 'is_true'}])
+        recipients = [{'user_id': uid} for uid in people]
+        assert automation_service.apply_conditions(db.session, rule, recipients) == []
+        assert 'unknown condition field' in caplog.text
+
+        for conditions in ([{'any': []}], [{'field': 'user.is_active'}], ['x']):
+            assert both_ways(db, conditions, people) == (set(), set())
+
+
+@pytest.mark.unit
+class TestCompiled:
+
+    def test_compiled_once_per_version(self):
+        conditions = [{'field': 'user.is_active', 'op': 'is_true'}]
+        assert compile_conditions(conditions) is compile_conditions([dict(conditions[0])])
+        edited = [{'field': 'user.is_active', 'op': 'is_false'}]
+        assert compile_conditions(edited) is not compile_conditions(conditions)
+
+    def test_large_audience_narrowed_in_one_query(self, db, people, statements):
+        rule = SimpleNamespace(key='not_in_discord', conditions=[
+            {'field': 'player.is_current_player', 'op': 'is_true'},
+            {'field': 'player.discord_in_server', 'op': 'is_false'}])
+        recipients = [{'user_id': uid} for uid in people]
+        statements.clear()
+        kept = automation_service.apply_conditions(db.session, rule, recipients)
+        assert len(statements) == 1
+        from app.models import User
+        names = {db.session.get(User, r['user_id']).username for r in kept}
+        # The orphan row does not make 'duplicate' look absent from Discord.
+        assert names == {'blank', 'outside'}
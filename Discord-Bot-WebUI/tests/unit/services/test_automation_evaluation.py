@@ -0,0 +1,121 @@
+"""
+Automation evaluation cost (app/services/automation_service.py): one scope-key
+lookup per rule, detector results reused while their input tables' watermarks
+(app/services/table_watermarks.py) stay put, and per-rule timings in the pass
+summary.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.automation import (
+    AutomationRule, AutomationRun, TRIGGER_USER_APPROVED, TRIGGER_WAITLIST_STUCK,
+)
+from app.services import automation_service
+
+
+def make_user(db, name, **fields):
+    from app.models import User
+    user = User(username=name, email=f'{name}@example.com', is_active=True, **fields)
+    user.set_password('password123')
+    db.session.add(user)
+    return user
+
+
+def make_rule(db, trigger_type, key='welcome', **config):
+    rule = AutomationRule(key=key, name=key, enabled=True, trigger_type=trigger_type,
+                          trigger_config=config, delay_hours=0, subject=f'{key} subject',
+                          body_html='<p>Hi</p>')
+    db.session.add(rule)
+    db.session.commit()
+    return rule
+
+
+@pytest.mark.unit
+class TestEvaluation:
+
+    def test_one_scope_key_query_per_rule(self, db, fake_redis, statements):
+        now = datetime.utcnow()
+        for i in range(5):
+            make_user(db, f'approved{i}', approval_status='approved',
+                      approved_at=now - timedelta(hours=i + 1))
+        rule = make_rule(db, TRIGGER_USER_APPROVED)
+
+        statements.clear()
+        assert len(automation_service.evaluate_rule(db.session, rule)) == 5
+        db.session.commit()
+        lookups = [s for s in statements if s.lstrip().startswith('SELECT') and 'automation_run' in s]
+        assert len(lookups) == 1
+
+        assert automation_service.evaluate_rule(db.session, rule) == []
+        assert db.session.query(AutomationRun).count() == 5
+
+    def test_detector_result_reused_until_an_input_table_changes(self, db, fake_redis, statements):
+        now = datetime.utcnow()
+        make_user(db, 'first', approval_status='approved', approved_at=now - timedelta(hours=2))
+        rule = make_rule(db, TRIGGER_USER_APPROVED)
+
+        report = {}
+        automation_service.evaluate_rule(db.session, rule, report)
+        db.session.commit()
+        assert report['cached'] is False and report['events'] == 1
+
+        statements.clear()
+        report = {}
+        automation_service.evaluate_rule(db.session, rule, report)
+        assert report['cached'] is True
+        assert not [s for s in statements if 'FROM users' in s]
+
+        # Logins don't move the users watermark; an approval does.
+        user = db.session.query(automation_service.User).filter_by(username='first').one()
+        user.last_login = datetime.utcnow()
+        db.session.commit()
+        report = {}
+        automation_service.evaluate_rule(db.session, rule, report)
+        assert report['cached'] is True
+
+        make_user(db, 'second', approval_status='approved', approved_at=now - timedelta(hours=1))
+        db.session.commit()
+        report = {}
+        created = automation_service.evaluate_rule(db.session, rule, report)
+        assert report['cached'] is False and len(created) == 1
+
+        rule.trigger_config = {'max_event_age_days': 7}
+        db.session.commit()
+        report = {}
+        automation_service.evaluate_rule(db.session, rule, report)
+        assert report['cached'] is False
+
+    def test_cached_result_still_sees_thresholds_crossed_by_the_clock(self, db, fake_redis,
+                                                                      monkeypatch):
+        now = datetime.utcnow()
+        make_user(db, 'waiting', approval_status='pending',
+                  waitlist_joined_at=now - timedelta(days=14) + timedelta(hours=2))
+        rule = make_rule(db, TRIGGER_WAITLIST_STUCK, key='stuck', stuck_days=14)
+
+        assert automation_service.evaluate_rule(db.session, rule) == []
+        db.session.commit()
+
+        class ThreeHoursLater(datetime):
+            @classmethod
+            def utcnow(cls):
+                return now + timedelta(hours=3)
+
+        monkeypatch.setattr(automation_service, 'datetime', ThreeHoursLater)
+        report = {}
+        created = automation_service.evaluate_rule(db.session, rule, report)
+        assert report['cached'] is True and [r.subject_type for r in created] == ['user']
+
+    def test_pass_summary_has_per_rule_timings(self, db, fake_redis):
+        make_user(db, 'approved', approval_status='approved',
+                  approved_at=datetime.utcnow() - timedelta(hours=1))
+        make_rule(db, TRIGGER_USER_APPROVED, key='welcome')
+        make_rule(db, TRIGGER_WAITLIST_STUCK, key='stuck')
+
+        summary = automation_service.evaluate_all(db.session)
+        assert summary['rules_evaluated'] == 2 and summary['runs_created'] == 1
+        timings = {t['rule']: t for t in summary['rule_timings']}
+        assert timings['welcome']['runs_created'] == 1 and timings['welcome']['events'] == 1
+        assert {'ms', 'detect_ms', 'cached'} <= set(timings['stuck'])
+        assert [t['ms'] for t in summary['rule_timings']] == sorted(
+            (t['ms'] for t in summary['rule_timings']), reverse=True)
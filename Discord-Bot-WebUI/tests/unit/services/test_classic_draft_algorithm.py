@@ -136,6 +136,83 @@ class TestProjection:
             svc.project_assignment({}, flat(1, 3), 99, config)
 
 
+class TestTeamMetricMatrix:
+    """The batch engine must reproduce compute_gaps/project_assignment exactly,
+    tie-breaks included (team totals collide constantly on half-point ratings)."""
+
+    def _random_board(self, seed, teams=8, per_team=6, pool_size=40):
+        rng = random.Random(seed)
+
+        def rand_player(pid):
+            if rng.random() < 0.15:
+                return player(pid, None)
+            return player(pid, {m: rng.choice([1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5]) for m in METRICS})
+
+        pid = 0
+        rosters = {}
+        for tid in rng.sample(range(1, 100), teams):
+            rosters[tid] = []
+            for _ in range(rng.randint(0, per_team)):
+                pid += 1
+                rosters[tid].append(rand_player(pid))
+            pid += 1
+            rosters[tid].append(player(pid, None, coach=True))
+        pool = []
+        for _ in range(pool_size):
+            pid += 1
+            pool.append(rand_player(pid))
+        return rosters, pool
+
+    def test_gaps_match_compute_gaps(self):
+        config = make_config()
+        for seed in range(20):
+            rosters, _ = self._random_board(seed)
+            totals = svc.compute_team_totals(rosters, config)
+            assert svc.TeamMetricMatrix(totals, config).gaps() == svc.compute_gaps(totals, config)
+        assert svc.TeamMetricMatrix({}, config).gaps() == svc.compute_gaps({}, config)
+
+    def test_projections_match_project_assignment(self):
+        config = make_config()
+        for seed in range(20):
+            rosters, pool = self._random_board(seed)
+            totals = svc.compute_team_totals(rosters, config)
+            matrix = svc.TeamMetricMatrix(totals, config)
+            rows = [matrix.row(c) for c in pool]
+            for team_id in rosters:
+                projected = matrix.project_gaps(team_id, rows)
+                for candidate, row, gaps in zip(pool, rows, projected):
+                    expected = svc.project_assignment(totals, candidate, team_id, config)['gaps']
+                    assert gaps == [expected[m]['gap'] for m in METRICS]
+                    assert matrix.project_detail(team_id, row) == expected
+
+    def test_single_team_projection(self):
+        config = make_config()
+        totals = svc.compute_team_totals({1: [flat(1, 4)]}, config)
+        matrix = svc.TeamMetricMatrix(totals, config)
+        row = matrix.row(flat(2, 5))
+        assert matrix.project_gaps(1, [row]) == [[Decimal(0)] * len(METRICS)]
+        assert matrix.project_detail(1, row) == svc.project_assignment(
+            totals, flat(2, 5), 1, config)['gaps']
+
+    def test_add_matches_retotalling(self):
+        config = make_config()
+        rosters, pool = self._random_board(7)
+        matrix = svc.TeamMetricMatrix(svc.compute_team_totals(rosters, config), config)
+        team_ids = list(rosters)
+        for i, candidate in enumerate(pool[:10]):
+            team_id = team_ids[i % len(team_ids)]
+            rosters[team_id].append(candidate)
+            matrix.add(team_id, matrix.row(candidate))
+            totals = svc.compute_team_totals(rosters, config)
+            assert matrix.gaps() == svc.compute_gaps(totals, config)
+
+    def test_unknown_team_raises(self):
+        config = make_config()
+        matrix = svc.TeamMetricMatrix(svc.compute_team_totals({1: []}, config), config)
+        with pytest.raises(ValueError):
+            matrix.project_gaps(99, [])
+
+
 class TestSuggestions:
     def test_hard_partition_non_violators_first(self):
         config = make_config(max_metric_gap=Decimal('2'), suggestion_count=10)
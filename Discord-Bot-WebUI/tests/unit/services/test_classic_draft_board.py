@@ -0,0 +1,188 @@
+"""
+Unit tests for the versioned balanced-draft board: BoardModel deltas must
+render exactly what a fresh build would, and the board-log store must catch
+models up, fall back to rebuilds, and serve compact "since" diffs. The Redis
+log is replaced by an in-memory fake — no DB, no Redis.
+"""
+import copy
+
+import pytest
+
+from app.draft_cache_service import DraftCacheService
+from app.services import classic_draft_service as svc
+from tests.unit.services.test_classic_draft_algorithm import flat, make_config, player
+
+
+def make_board(assignments, extra_pool=()):
+    """Board payload shaped like compute_classic_board: {team_id: [player]}."""
+    players = []
+    for team_id, roster in assignments.items():
+        for p in roster:
+            players.append({**p, 'team_id': team_id, 'team_name': f'Team {team_id}'})
+    for p in extra_pool:
+        players.append({**p, 'team_id': None, 'team_name': None})
+    players.sort(key=lambda p: p['name'].lower())
+    return {'season_id': 1, 'season_name': 'Spring', 'league_id': 7,
+            'metrics': [], 'players': players}
+
+
+def board_config(**overrides):
+    return make_config(balanced_draft_enabled=True, **overrides)
+
+
+TEAMS = [{'id': 1, 'name': 'Team 1'}, {'id': 2, 'name': 'Team 2'}]
+
+
+def sample_board():
+    return make_board(
+        {1: [flat(1, 4), player(2, None, coach=True)], 2: [flat(3, 2)]},
+        extra_pool=[flat(10, 5), flat(11, 1), player(12, None, pronouns='he/him', gender='N')])
+
+
+class TestBoardModel:
+    def test_moves_render_like_a_fresh_build(self):
+        config = board_config()
+        model = svc.BoardModel(sample_board(), TEAMS, config)
+        assert model.move(10, 2)
+        assert model.move(1, None)
+        assert model.move(12, 1)
+
+        expected_board = make_board(
+            {1: [player(2, None, coach=True), player(12, None, pronouns='he/him', gender='N')],
+             2: [flat(3, 2), flat(10, 5)]},
+            extra_pool=[flat(1, 4), flat(11, 1)])
+        fresh = svc.BoardModel(expected_board, TEAMS, config)
+        assert model.state() == fresh.state()
+
+    def test_move_is_idempotent_and_rejects_unknowns(self):
+        model = svc.BoardModel(sample_board(), TEAMS, board_config())
+        before = model.state()
+        assert model.move(1, 1)        # already there
+        assert model.move(11, None)    # already in the pool
+        assert model.state() == before
+        assert not model.move(999, 1)
+        assert not model.move(10, 99)
+
+    def test_earlier_payloads_are_not_mutated(self):
+        model = svc.BoardModel(sample_board(), TEAMS, board_config())
+        pool_before = model.state()['pool']
+        model.move(10, 1)
+        assert next(p for p in pool_before if p['id'] == 10)['team_id'] is None
+
+    def test_gender_override_derived_once_and_snapshot_round_trips(self):
+        config = board_config()
+        model = svc.BoardModel(sample_board(), TEAMS, config, version=4)
+        model.move(10, 2)
+        restored = svc.BoardModel.from_snapshot(copy.deepcopy(model.to_snapshot()), config)
+        assert restored.state() == model.state()
+        p12 = next(p for p in restored.state()['pool'] if p['id'] == 12)
+        assert p12['gender'] == 'N' and 'balance_gender' not in p12
+
+
+class FakeBoardLog:
+    """In-memory stand-in for DraftCacheService's board log + snapshot."""
+
+    def __init__(self):
+        self.version = 0
+        self.log = []
+        self.snapshot = None
+        self.available = True
+
+    def append(self, league_name, delta):
+        if not self.available:
+            return None
+        self.version += 1
+        self.log.append({**delta, 'v': self.version})
+        self.log = self.log[-DraftCacheService.BOARD_LOG_SIZE:]
+        return self.version
+
+    def get_version(self, league_name):
+        return self.version if self.available else None
+
+    def get_deltas(self, league_name, after, upto):
+        by_version = {e['v']: e for e in self.log}
+        wanted = range(after + 1, upto + 1)
+        if any(v not in by_version for v in wanted):
+            return None
+        return [by_version[v] for v in wanted]
+
+
+@pytest.fixture
+def board_log(monkeypatch):
+    fake = FakeBoardLog()
+    loads = []
+
+    def load(session, version=None):
+        loads.append(version)
+        return svc.BoardModel(copy.deepcopy(session['board']), TEAMS, board_config(), version=version)
+
+    monkeypatch.setattr(DraftCacheService, 'append_board_delta', staticmethod(fake.append))
+    monkeypatch.setattr(DraftCacheService, 'get_board_version', staticmethod(fake.get_version))
+    monkeypatch.setattr(DraftCacheService, 'get_board_deltas', staticmethod(fake.get_deltas))
+    monkeypatch.setattr(DraftCacheService, 'get_board_snapshot', staticmethod(lambda name: fake.snapshot))
+    monkeypatch.setattr(DraftCacheService, 'set_board_snapshot',
+                        staticmethod(lambda name, snap: setattr(fake, 'snapshot', copy.deepcopy(snap))))
+    monkeypatch.setattr(svc, '_load_board_model', load)
+    monkeypatch.setattr(svc.rating_service, 'get_rating_config', board_config)
+    monkeypatch.setattr(svc, '_board_model', None)
+    fake.loads = loads
+    return fake
+
+
+class TestBoardStore:
+    def test_picks_apply_without_rebuilding(self, board_log):
+        session = {'board': sample_board()}
+        assert svc.get_board_state(session)['version'] == 0
+        assert svc.record_board_move(10, 2) == 1
+        assert svc.record_board_move(11, 1) == 2
+        model = svc.current_board(session)
+        assert model.version == 2
+        assert model.location(10) == 2 and model.location(11) == 1
+        assert board_log.loads == [0]
+
+    def test_other_worker_catches_up_from_snapshot(self, board_log, monkeypatch):
+        session = {'board': sample_board()}
+        svc.get_board_state(session)
+        board_log.append('classic', {'player_id': 10, 'team_id': 1})  # another worker's pick
+        monkeypatch.setattr(svc, '_board_model', None)                # fresh process
+        model = svc.current_board(session)
+        assert model.version == 1 and model.location(10) == 1
+        assert board_log.loads == [0]
+
+    def test_reset_forces_rebuild(self, board_log):
+        session = {'board': sample_board()}
+        svc.get_board_state(session)
+        board_log.append('classic', {'reset': True})
+        assert svc.current_board(session).version == 1
+        assert board_log.loads == [0, 1]
+
+    def test_changes_since_is_compact(self, board_log):
+        session = {'board': sample_board()}
+        svc.get_board_state(session)
+        svc.record_board_move(10, 2)
+        svc.record_board_move(10, None)
+        svc.record_board_move(11, 1)
+        diff = svc.board_changes_since(session, 0)
+        assert diff['full'] is False
+        assert diff['version'] == 3
+        assert diff['moves'] == [{'player_id': 10, 'team_id': None},
+                                 {'player_id': 11, 'team_id': 1}]
+        assert set(diff['teams']) == {1, 2}
+        assert svc.board_changes_since(session, 3)['moves'] == []
+
+    def test_changes_since_falls_back_to_full(self, board_log):
+        session = {'board': sample_board()}
+        svc.get_board_state(session)
+        svc.record_board_move(10, 2)
+        assert svc.board_changes_since(session, 99)['full'] is True
+        board_log.log = []  # trimmed/expired
+        assert svc.board_changes_since(session, 0)['full'] is True
+
+    def test_without_redis_every_read_rebuilds(self, board_log):
+        board_log.available = False
+        session = {'board': sample_board()}
+        assert svc.record_board_move(10, 2) is None
+        state = svc.board_changes_since(session, 0)
+        assert state['full'] is True and state['version'] is None
+        svc.current_board(session)
+        assert board_log.loads == [None, None]
@@ -0,0 +1,178 @@
+"""
+Bulk Discord role sync (app/services/discord_role_sync_service.py): one member
+fetch per role, only the add/remove difference sent, pacing from the route's
+rate-limit headers, and a dry run that sends nothing.
+"""
+import threading
+
+import pytest
+
+from app.services import discord_role_sync_service
+from app.services.discord_role_sync_service import DiscordRoleSyncService, RouteRateLimit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body if body is not None else {'success': True}
+        self.headers = headers or {}
+        self.text = str(self._body)
+
+    def json(self):
+        return self._body
+
+
+class FakeBotApi:
+    """The bot REST API's role endpoints, recording every call."""
+
+    def __init__(self, holders=None, members_response=None):
+        self.holders = set(holders or ())
+        self.members_response = members_response
+        self.gets = []
+        self.posts = []
+        self.responses = []  # queued responses for the next POSTs
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None):
+        self.gets.append(url)
+        if self.members_response is not None:
+            return self.members_response
+        return FakeResponse(body={'success': True, 'members': [
+            {'id': did, 'username': f'member-{did}'} for did in sorted(self.holders)]})
+
+    def post(self, url, json=None, timeout=None):
+        with self._lock:
+            self.posts.append((url.rsplit('/', 1)[-1], json['user_id']))
+            return self.responses.pop(0) if self.responses else FakeResponse()
+
+
+@pytest.fixture
+def bot(monkeypatch):
+    api = FakeBotApi()
+    monkeypatch.setattr(discord_role_sync_service.requests, 'get', api.get)
+    monkeypatch.setattr(discord_role_sync_service.requests, 'post', api.post)
+    # Nothing in a bulk sync should sleep on a fixed timer any more.
+    monkeypatch.setattr(discord_role_sync_service.time, 'sleep',
+                        lambda seconds: pytest.fail(f'slept {seconds}s'))
+    return api
+
+
+@pytest.fixture
+def mapped_role(db):
+    """'pl-classic' mapped to a Discord role, with a mix of linked and unlinked users."""
+    from app.models import Player, Role, User
+
+    role = Role(name='pl-classic', description='Classic', discord_role_id='900', sync_enabled=True)
+    db.session.add(role)
+
+    def person(name, discord_id=None, with_role=True):
+        user = User(username=name, email=f'{name}@example.com', approval_status='approved')
+        user.set_password('password123')
+        if with_role:
+            user.roles.append(role)
+        db.session.add(user)
+        db.session.flush()
+        if discord_id:
+            db.session.add(Player(name=name, user_id=user.id, discord_id=discord_id))
+        return user
+
+    person('has_it', '101')
+    person('needs_it', '102')
+    person('also_needs_it', '103')
+    person('unlinked')
+    person('left_league', '201', with_role=False)
+    db.session.commit()
+    return role
+
+
+@pytest.mark.unit
+class TestPlan:
+
+    def test_plan_is_the_minimal_diff_from_one_member_fetch(self, db, bot, mapped_role):
+        bot.holders = {'101', '201', '999'}  # 999 is not linked to any account
+        plan = DiscordRoleSyncService().plan_role_sync(mapped_role)
+
+        assert len(bot.gets) == 1
+        assert sorted(op.discord_user_id for op in plan.to_add) == ['102', '103']
+        assert [(op.discord_user_id, op.username) for op in plan.to_remove] == [('201', 'left_league')]
+        assert (plan.total_users, plan.skipped, plan.already_synced, plan.unmanaged) == (4, 1, 1, 1)
+
+    def test_unreadable_members_plan_add_only(self, db, bot, mapped_role):
+        bot.members_response = FakeResponse(body={'success': False, 'error': 'Bot not ready',
+                                                  'members': []})
+        plan = DiscordRoleSyncService().plan_role_sync(mapped_role)
+        assert plan.members_known is False and plan.to_remove == []
+        assert sorted(op.discord_user_id for op in plan.to_add) == ['101', '102', '103']
+
+
+@pytest.mark.unit
+class TestSync:
+
+    def test_dry_run_sends_nothing(self, db, bot, mapped_role):
+        bot.holders = {'101', '201'}
+        result = DiscordRoleSyncService().sync_flask_role_to_discord(mapped_role, dry_run=True)
+
+        assert result['success'] and result['dry_run'] and bot.posts == []
+        assert [op['discord_user_id'] for op in result['plan']['to_remove']] == ['201']
+        assert mapped_role.last_synced_at is None
+
+    def test_only_the_diff_is_sent(self, db, bot, mapped_role):
+        bot.holders = {'101', '201'}
+        bot.responses = [FakeResponse(body={'success': False, 'error': 'Member 103 not found in guild'})]
+        result = DiscordRoleSyncService().sync_flask_role_to_discord(mapped_role)
+
+        assert sorted(bot.posts) == [('assign', '102'), ('assign', '103')]
+        assert (result['added'], result['removed'], result['failed']) == (1, 0, 1)
+        assert result['synced'] == 2 and result['already_synced'] == 1
+        assert 'not found' in result['errors'][0]['error']
+        assert mapped_role.last_synced_at is not None
+
+        bot.posts.clear()
+        result = DiscordRoleSyncService().sync_flask_role_to_discord(mapped_role, prune=True)
+        assert ('remove', '201') in bot.posts and result['removed'] == 1
+
+    def test_all_mapped_roles_without_fixed_sleeps(self, db, bot, mapped_role):
+        bot.holders = {'101', '102', '103'}
+        result = DiscordRoleSyncService().sync_all_mapped_roles()
+        assert result['roles_synced'] == 1 and bot.posts == []
+
+
+@pytest.mark.unit
+class TestRouteRateLimit:
+
+    def test_unknown_budget_does_not_wait(self):
+        clock = FakeClock()
+        limit = RouteRateLimit(clock=clock, sleep=clock.sleep)
+        assert [limit.acquire() for _ in range(5)] == [0.0] * 5
+
+    def test_waits_out_an_exhausted_bucket(self):
+        clock = FakeClock()
+        limit = RouteRateLimit(clock=clock, sleep=clock.sleep)
+        limit.acquire()
+        limit.update(200, {'X-RateLimit-Remaining': '1', 'X-RateLimit-Reset-After': '2.5'})
+        assert limit.acquire() == 0.0
+        assert limit.acquire() == pytest.approx(2.5)
+        assert limit.acquire() == 0.0  # new window, budget unknown again
+
+    def test_429_backs_off_and_retries(self, db, bot, mapped_role):
+        clock = FakeClock()
+        limits = {'add': RouteRateLimit(clock=clock, sleep=clock.sleep)}
+        bot.holders = {'101', '103'}
+        bot.responses = [FakeResponse(429, headers={'Retry-After': '1.5'})]
+        result = DiscordRoleSyncService().sync_flask_role_to_discord(mapped_role, limits=limits)
+
+        assert bot.posts == [('assign', '102'), ('assign', '102')]
+        assert result['added'] == 1 and clock.slept == [pytest.approx(1.5)]
@@ -0,0 +1,258 @@
+"""
+Unit tests for the email broadcast delivery engine: persistent SMTP sessions
+against a local sink, token-bucket pacing, batched outcome reporting,
+mid-send cancellation, and the individual-mode campaign send built on it
+(bulk personalization preload + compiled template).
+"""
+import email
+import socketserver
+import threading
+import time
+
+import pytest
+
+from app.services.email_broadcast_service import CompiledEmail, email_broadcast_service
+from app.services.email_delivery import (
+    EmailDeliveryEngine,
+    EmailTransport,
+    OutgoingEmail,
+    SmtpTransport,
+    transport_factory_from_config,
+)
+
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO/MAIL/RCPT/DATA/RSET/NOOP/QUIT."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        sink = self.server.sink
+        with sink.lock:
+            sink.connections += 1
+        self.reply('220 sink ready')
+        recipients = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line.decode().strip()[:4].upper()
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250 sink')
+            elif verb == 'MAIL':
+                recipients = []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(line.decode().split(':', 1)[1].strip().strip('<>'))
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 end with .')
+                data = []
+                for raw in iter(self.rfile.readline, b''):
+                    if raw == b'.\r\n':
+                        break
+                    data.append(raw[1:] if raw.startswith(b'..') else raw)
+                with sink.lock:
+                    sink.messages.append((recipients, email.message_from_bytes(b''.join(data))))
+                self.reply('250 queued')
+            elif verb in ('RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('502 not implemented')
+
+
+class SmtpSink:
+    """Threaded local SMTP server that records every message it accepts."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.messages = []
+        self.connections = 0
+        self.server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _SinkHandler)
+        self.server.daemon_threads = True
+        self.server.sink = self
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def transport(self):
+        return SmtpTransport('127.0.0.1', self.port, use_tls=False, timeout=5)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def sink():
+    server = SmtpSink()
+    yield server
+    server.close()
+
+
+def outgoing(count):
+    return [OutgoingEmail(i, f'user{i}@example.com', f'Hello {i}', f'<p>Body {i}</p>')
+            for i in range(count)]
+
+
+class Collector:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, outcomes):
+        self.batches.append(list(outcomes))
+
+    @property
+    def outcomes(self):
+        return [o for batch in self.batches for o in batch]
+
+
+@pytest.mark.unit
+class TestEmailDeliveryEngine:
+
+    def test_delivers_over_persistent_connections(self, sink):
+        engine = EmailDeliveryEngine(sink.transport, connections=2, rate_per_second=1000, burst=1000,
+                                     status_batch_size=4)
+        results = Collector()
+        summary = engine.deliver(outgoing(12), results)
+
+        assert (summary.sent, summary.failed, summary.cancelled) == (12, 0, False)
+        assert sink.connections <= 2
+        assert sorted(o.key for o in results.outcomes) == list(range(12))
+        assert all(o.ok and o.sent_at for o in results.outcomes)
+        assert all(len(batch) <= 4 for batch in results.batches)
+        by_rcpt = {rcpt[0]: msg for rcpt, msg in sink.messages}
+        assert by_rcpt['user7@example.com']['subject'] == 'Hello 7'
+        assert 'Body 7' in by_rcpt['user7@example.com'].get_payload(decode=True).decode()
+
+    def test_rate_limit_paces_sends(self, sink):
+        engine = EmailDeliveryEngine(sink.transport, connections=3, rate_per_second=20, burst=1)
+        started = time.monotonic()
+        summary = engine.deliver(outgoing(9), Collector())
+        # burst of 1 then 8 more at 20/s
+        assert time.monotonic() - started >= 0.35
+        assert summary.sent == 9
+        assert summary.throttled_seconds > 0
+
+    def test_cancel_stops_taking_messages_but_reports_sent_ones(self, sink):
+        engine = EmailDeliveryEngine(sink.transport, connections=2, rate_per_second=10, burst=2,
+                                     status_batch_size=2, flush_interval=0.05)
+        results = Collector()
+        summary = engine.deliver(outgoing(40), results, should_cancel=lambda: len(results.batches) >= 1)
+
+        assert summary.cancelled
+        assert summary.sent < 40
+        # Everything that reached the server was reported, and nothing else.
+        assert len(sink.messages) == summary.sent == len(results.outcomes)
+
+    def test_failures_are_reported_and_transport_reopened(self):
+        opened = []
+
+        class Flaky(EmailTransport):
+            def open(self):
+                opened.append(self)
+
+            def send_email(self, to, subject, html):
+                if to.startswith('user3@'):
+                    raise ConnectionError('connection reset')
+                return None if to.startswith('user5@') else {'id': to}
+
+        results = Collector()
+        summary = EmailDeliveryEngine(Flaky, connections=1, rate_per_second=1000, burst=1000).deliver(
+            outgoing(8), results)
+
+        failed = {o.key: o.error for o in results.outcomes if not o.ok}
+        assert failed == {3: 'connection reset', 5: 'Send failed'}
+        assert (summary.sent, summary.failed) == (6, 2)
+        assert len(opened) == 2  # reconnected after the exception, not after a soft failure
+
+    def test_transport_selected_from_config(self):
+        from app.services.email_delivery import GmailTransport
+        assert transport_factory_from_config({}) is GmailTransport
+        smtp = transport_factory_from_config({
+            'EMAIL_BROADCAST_TRANSPORT': 'smtp', 'SMTP_SERVER': 'mail.local', 'SMTP_PORT': '2525',
+        })()
+        assert isinstance(smtp, SmtpTransport)
+        assert (smtp.host, smtp.port) == ('mail.local', 2525)
+
+
+@pytest.mark.unit
+class TestCompiledEmail:
+
+    def test_matches_sequential_replace(self):
+        subject = 'Hi {first_name} - {season}'
+        html = '<h1>{subject}</h1><p>{name} plays for {team} in {league}. {unknown}</p>'
+        values = {'{name}': 'Ada Lovelace', '{first_name}': 'Ada', '{team}': 'Reds',
+                  '{league}': 'Premier', '{season}': 'Fall'}
+        expected_subject, expected_html = subject, html
+        for token, value in values.items():
+            expected_subject = expected_subject.replace(token, value)
+            expected_html = expected_html.replace(token, value)
+        assert CompiledEmail(subject, html).render(values) == (expected_subject, expected_html)
+
+
+@pytest.mark.unit
+class TestIndividualCampaignSend:
+
+    def _campaign(self, db, admin_user, users):
+        from app.models.email_campaigns import EmailCampaign, EmailCampaignRecipient
+        campaign = EmailCampaign(
+            name='Kickoff', subject='Welcome {first_name}',
+            body_html='<p>Hi {name} of {team} ({league}, {season}) https://example.com</p>',
+            send_mode='individual', filter_criteria={'type': 'all_active'},
+            status='sending', total_recipients=len(users), created_by_id=admin_user.id,
+        )
+        db.session.add(campaign)
+        db.session.flush()
+        for u in users:
+            db.session.add(EmailCampaignRecipient(campaign_id=campaign.id, user_id=u.id,
+                                                  recipient_name=u.username))
+        db.session.flush()
+        return campaign
+
+    def test_bulk_context_matches_personalize_content(self, db, user, player, team, admin_user):
+        player.primary_team_id = team.id
+        player.primary_league_id = team.league_id
+        db.session.flush()
+        context = email_broadcast_service.load_personalization_context(
+            db.session, [user.id, admin_user.id, 999999])
+        assert set(context) == {user.id, admin_user.id}
+        for u in (user, admin_user):
+            expected = email_broadcast_service.personalize_content(
+                db.session, '{first_name}', '{name}|{team}|{league}|{season}', u.id)
+            values = context[u.id]['values']
+            assert (values['{first_name}'],
+                    '|'.join(values[t] for t in ('{name}', '{team}', '{league}', '{season}'))) == expected
+        assert context[user.id]['email'] == 'test@example.com'
+
+    def test_send_individual_through_smtp_sink(self, db, app, sink, user, player, team, admin_user,
+                                               monkeypatch):
+        from app.models.email_campaigns import EmailCampaignRecipient
+        from app.tasks import tasks_email_broadcast as tasks
+
+        player.primary_team_id = team.id
+        admin_user.email = None  # no address: skipped
+        db.session.flush()
+        campaign = self._campaign(db, admin_user, [user, admin_user])
+        monkeypatch.setitem(app.config, 'EMAIL_BROADCAST_TRANSPORT', 'smtp')
+        monkeypatch.setitem(app.config, 'SMTP_SERVER', '127.0.0.1')
+        monkeypatch.setitem(app.config, 'SMTP_PORT', sink.port)
+        monkeypatch.setitem(app.config, 'SMTP_USE_TLS', False)
+        monkeypatch.setitem(app.config, 'EMAIL_BROADCAST_RATE_PER_SECOND', 100.0)
+
+        wrapper = tasks.linkify_urls(campaign.body_html)
+        tasks._send_individual(db.session, campaign, wrapper)
+
+        statuses = dict(db.session.query(EmailCampaignRecipient.user_id, EmailCampaignRecipient.status)
+                        .filter_by(campaign_id=campaign.id))
+        assert statuses == {user.id: 'sent', admin_user.id: 'skipped'}
+        assert (campaign.sent_count, campaign.failed_count) == (1, 1)
+        (rcpt, message), = sink.messages
+        assert rcpt == ['test@example.com']
+        assert message['subject'] == 'Welcome Test'
+        body = message.get_payload(decode=True).decode()
+        assert 'Hi Test Player of Test Team' in body
+        assert '<a href="https://example.com"' in body
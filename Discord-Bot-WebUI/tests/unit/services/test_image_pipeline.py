@@ -0,0 +1,182 @@
+"""
+Unit tests for the bulk image optimization pipeline
+(app/services/image_pipeline.py, ImageCacheService.bulk_optimize_images):
+concurrent fetch, content-addressed variants rendered once per distinct source,
+and batched cache-status writes.
+"""
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from app.image_cache_service import ImageCacheService
+from app.services import image_pipeline
+from app.services.image_pipeline import (
+    ImageJob,
+    ImagePipeline,
+    RenderSpec,
+    VariantStore,
+    render_variants,
+)
+
+
+def png_bytes(color, size=(320, 240), mode='RGB'):
+    out = io.BytesIO()
+    Image.new(mode, size, color).save(out, 'PNG')
+    return out.getvalue()
+
+
+class DictFetcher:
+    def __init__(self, sources):
+        self.sources = sources
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def fetch(self, url):
+        with self.lock:
+            self.calls.append(url)
+        if url not in self.sources:
+            raise ConnectionError(f'404 for {url}')
+        return self.sources[url]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def threads_pool():
+    pool = ThreadPoolExecutor(max_workers=2)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+@pytest.mark.unit
+class TestRenderVariants:
+
+    def test_flattens_transparency_and_fits_sizes(self):
+        rendered = render_variants(png_bytes((255, 0, 0, 0), mode='RGBA'), RenderSpec())
+        assert (rendered['width'], rendered['height']) == (200, 150)
+        with Image.open(io.BytesIO(rendered['thumbnail'])) as thumb:
+            assert thumb.format == 'JPEG' and thumb.size == (80, 60)
+        with Image.open(io.BytesIO(rendered['webp'])) as webp:
+            assert webp.format == 'WEBP' and webp.getpixel((0, 0)) == (255, 255, 255)
+
+
+@pytest.mark.unit
+class TestImagePipeline:
+
+    def test_identical_sources_render_once_and_status_is_batched(self, tmp_path, threads_pool):
+        photo, other = png_bytes((10, 120, 200)), png_bytes((200, 40, 40))
+        fetcher = DictFetcher({'https://cdn/a.png': photo, 'https://cdn/a-copy.png': photo,
+                               'https://cdn/b.png': other})
+        store = VariantStore(tmp_path)
+        batches = []
+        pipeline = ImagePipeline(store, download_workers=3, transform_workers=2, queue_size=2,
+                                 status_batch_size=2, fetcher=fetcher, transform_pool=threads_pool)
+        jobs = [ImageJob('https://cdn/a.png', [1, 2]), ImageJob('https://cdn/a-copy.png', [3]),
+                ImageJob('https://cdn/b.png', [4]), ImageJob('https://cdn/missing.png', [5])]
+
+        summary = pipeline.run(jobs, lambda outcomes: batches.append(list(outcomes)))
+
+        assert (summary.success, summary.failed, summary.downloaded) == (4, 1, 3)
+        assert summary.rendered == 2  # two distinct sources, four players
+        assert [len(b) for b in batches] == [2, 2, 1] and summary.status_batches == 3
+        outcomes = {o.player_id: o for batch in batches for o in batch}
+        assert outcomes[1].content_hash == outcomes[2].content_hash == outcomes[3].content_hash
+        assert outcomes[4].content_hash != outcomes[1].content_hash
+        assert not outcomes[5].ok and 'download' in outcomes[5].error
+        assert store.lookup(outcomes[4].content_hash)[:2] == (200, 150)
+        assert sorted(fetcher.calls) == sorted(job.url for job in jobs)
+
+        # A later run (another season's import) finds the variants on disk.
+        again = pipeline.run([ImageJob('https://cdn/b.png', [9])], lambda outcomes: None)
+        assert (again.rendered, again.reused, again.success) == (0, 1, 1)
+
+    def test_undecodable_source_fails_only_its_players(self, tmp_path, threads_pool):
+        fetcher = DictFetcher({'https://cdn/bad': b'not an image', 'https://cdn/ok': png_bytes('blue')})
+        outcomes = []
+        summary = ImagePipeline(VariantStore(tmp_path), fetcher=fetcher, transform_pool=threads_pool,
+                                download_workers=2).run(
+            [ImageJob('https://cdn/bad', [1, 2]), ImageJob('https://cdn/ok', [3])], outcomes.extend)
+        assert (summary.success, summary.failed) == (1, 2)
+        assert {o.player_id for o in outcomes if not o.ok} == {1, 2}
+
+    def test_process_pool_is_reused_across_runs(self):
+        try:
+            pool = image_pipeline.get_transform_pool(1)
+            assert image_pipeline.get_transform_pool(1) is pool
+            rendered = pool.submit(render_variants, png_bytes('green'), RenderSpec()).result(timeout=60)
+            assert rendered['width'] == 200
+        finally:
+            image_pipeline.shutdown_transform_pool()
+
+    def test_broken_process_pool_is_rebuilt(self):
+        import os
+        from concurrent.futures.process import BrokenProcessPool
+        try:
+            pool = image_pipeline.get_transform_pool(1)
+            with pytest.raises(BrokenProcessPool):
+                pool.submit(os._exit, 1).result(timeout=60)
+            rebuilt = image_pipeline.get_transform_pool(1)
+            assert rebuilt is not pool
+            assert rebuilt.submit(int, '7').result(timeout=60) == 7
+        finally:
+            image_pipeline.shutdown_transform_pool()
+
+    def test_zero_workers_means_threads(self):
+        try:
+            assert isinstance(image_pipeline.get_transform_pool(0), ThreadPoolExecutor)
+        finally:
+            image_pipeline.shutdown_transform_pool()
+
+
+@pytest.mark.unit
+class TestBulkOptimizeImages:
+
+    def test_updates_cache_rows_and_shares_variant_files(self, db, monkeypatch, tmp_path,
+                                                         threads_pool, player):
+        from app.models import Player, PlayerImageCache, User
+        user = User(username='twin', email='twin@example.com')
+        user.set_password('password123')
+        db.session.add(user)
+        db.session.flush()
+        twin = Player(name='Twin', user_id=user.id, discord_id='twin_discord',
+                      profile_picture_url='https://cdn/shared.png', is_current_player=True)
+        player.profile_picture_url = 'https://cdn/shared.png'
+        db.session.add(twin)
+        db.session.commit()
+
+        fetcher = DictFetcher({'https://cdn/shared.png': png_bytes((1, 2, 3))})
+        monkeypatch.setattr(ImageCacheService, 'CACHE_DIR', tmp_path)
+        monkeypatch.setattr(image_pipeline, 'ImageFetcher', lambda pool_size: fetcher)
+        monkeypatch.setattr(image_pipeline, 'get_transform_pool', lambda workers: threads_pool)
+        try:
+            result = ImageCacheService.bulk_optimize_images([player.id, twin.id])
+            assert (result['success'], result['failed'], result['rendered']) == (2, 0, 1)
+            assert fetcher.calls == ['https://cdn/shared.png']
+
+            rows = {r.player_id: r for r in db.session.query(PlayerImageCache)}
+            assert {r.cache_status for r in rows.values()} == {'ready'}
+            assert rows[player.id].webp_url == rows[twin.id].webp_url
+            assert rows[player.id].webp_url.startswith('/static/img/cache/players/webp/')
+
+            # Already optimized rows are skipped unless forced.
+            assert ImageCacheService.bulk_optimize_images([player.id, twin.id])['skipped'] == 2
+
+            # A forced refresh that dies mid-run doesn't leave rows 'processing'.
+            def crash(self, jobs, on_results):
+                raise RuntimeError('pipeline crashed')
+            monkeypatch.setattr(image_pipeline.ImagePipeline, 'run', crash)
+            ImageCacheService.bulk_optimize_images([player.id, twin.id], force_refresh=True)
+            db.session.expire_all()
+            assert {r.cache_status for r in db.session.query(PlayerImageCache)} == {'failed'}
+
+            # Invalidating one player must keep the files the other still uses.
+            from app.image_cache_service import _referenced_variant_urls
+            assert _referenced_variant_urls(db.session, [rows[player.id]]) == {
+                rows[twin.id].thumbnail_url, rows[twin.id].cached_url, rows[twin.id].webp_url}
+        finally:
+            db.session.query(PlayerImageCache).delete()
+            db.session.commit()
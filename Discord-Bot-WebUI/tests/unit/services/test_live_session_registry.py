@@ -0,0 +1,152 @@
+"""
+Live reporting session change feed (app/services/live_session_registry.py):
+commits publish start/stop entries, and RealtimeReportingService follows them
+without querying the database on quiet ticks.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import update
+
+from app.services.live_session_registry import RECONCILE, START, STOP, STREAM_KEY
+
+
+def entries(redis):
+    return redis.streams.get(STREAM_KEY, [])
+
+
+def actions(redis):
+    return [(fields['action'], fields['session_id']) for _, fields in entries(redis)]
+
+
+def add_session(db, match_id, thread_id='t-1', started_minutes_ago=0):
+    from app.models import LiveReportingSession
+    live = LiveReportingSession(match_id=match_id, competition='usa.1', thread_id=thread_id,
+                                started_at=datetime.utcnow() - timedelta(minutes=started_minutes_ago))
+    db.session.add(live)
+    db.session.commit()
+    return live
+
+
+def add_match(db, match_id, opponent='Portland Timbers'):
+    from app.models import MLSMatch
+    db.session.add(MLSMatch(match_id=match_id, opponent=opponent, is_home_game=True,
+                            date_time=datetime.utcnow(), competition='usa.1', venue='Lumen Field'))
+    db.session.commit()
+
+
+@pytest.mark.unit
+class TestChangeFeed:
+
+    def test_commits_publish_starts_and_stops(self, db, fake_redis):
+        from app.models import LiveReportingSession
+        live = add_session(db, '700001')
+        assert actions(fake_redis) == [(START, str(live.id))]
+
+        # Per-poll bookkeeping is not a registry event.
+        live.update_state(db.session, status='IN_PLAY', score='1-0')
+        db.session.commit()
+        assert len(entries(fake_redis)) == 1
+
+        live.deactivate(db.session, reason='Match ended')
+        db.session.flush()
+        assert len(entries(fake_redis)) == 1  # not until commit
+        db.session.commit()
+        assert actions(fake_redis)[-1] == (STOP, str(live.id))
+
+        db.session.add(LiveReportingSession(match_id='700002', competition='usa.1', thread_id='t-2'))
+        db.session.flush()
+        db.session.rollback()
+        assert len(entries(fake_redis)) == 2
+
+    def test_bulk_writes_ask_for_reconciliation(self, db, fake_redis):
+        from app.models import LiveReportingSession
+        add_session(db, '700001')
+        db.session.execute(update(LiveReportingSession).values(error_count=0))
+        db.session.commit()
+        assert len(entries(fake_redis)) == 1
+        db.session.execute(update(LiveReportingSession).values(is_active=False))
+        db.session.commit()
+        assert actions(fake_redis)[-1] == (RECONCILE, '')
+
+
+@pytest.mark.unit
+class TestRealtimeServiceRegistry:
+
+    @pytest.fixture
+    def service(self, db, fake_redis):
+        from app.services.realtime_reporting_service import RealtimeReportingService
+        svc = RealtimeReportingService()
+        svc.redis_service = MagicMock()
+        return svc
+
+    async def test_quiet_ticks_do_not_touch_the_database(self, service, db, fake_redis, statements):
+        add_match(db, '700001')
+        first = add_session(db, '700001', started_minutes_ago=30)
+
+        await service._refresh_active_sessions()  # first call: full reload
+        assert service.active_sessions[first.id]['home_team'] == 'Seattle Sounders FC'
+        assert service.active_sessions[first.id]['espn_match_id'] == '700001'
+        assert first.id in service._catchup_sessions
+
+        statements.clear()
+        for _ in range(3):
+            await service._refresh_active_sessions()
+        assert statements == []
+
+        # A start loads just that session; a stop needs no query at all.
+        add_match(db, '700002', opponent='LA Galaxy')
+        second = add_session(db, '700002', thread_id='t-2')
+        statements.clear()
+        await service._refresh_active_sessions()
+        assert service.active_sessions[second.id]['away_team'] == 'LA Galaxy'
+        assert statements
+
+        first.deactivate(db.session)
+        db.session.commit()
+        service.last_events[first.id] = {'k'}
+        statements.clear()
+        await service._refresh_active_sessions()
+        assert list(service.active_sessions) == [second.id]
+        assert first.id not in service.last_events and statements == []
+
+    async def test_reconciliation_catches_missed_events(self, service, db, fake_redis, statements):
+        from app.models import LiveReportingSession
+        add_match(db, '700001')
+        live = add_session(db, '700001')
+        await service._refresh_active_sessions()
+        service.active_sessions[live.id]['home_score'] = 2
+
+        # A write the hooks never see (raw connection, no ORM session events).
+        db.session.connection().execute(update(LiveReportingSession.__table__)
+                                        .values(thread_id='t-moved'))
+        db.session.commit()
+        await service._refresh_active_sessions()
+        assert service.active_sessions[live.id]['thread_id'] == 't-1'
+
+        service._reconciled_at -= service.RECONCILE_SECONDS
+        statements.clear()
+        await service._refresh_active_sessions()
+        session_data = service.active_sessions[live.id]
+        assert session_data['thread_id'] == 't-moved' and session_data['home_score'] == 2
+        # Match metadata came from the cache.
+        assert not [s for s in statements if 'mls_matches' in s]
+
+    async def test_template_overrides_load_off_loop_and_apply_on_it(self, service, db, fake_redis,
+                                                                    monkeypatch):
+        import threading
+        from app.models.ai_prompt_config import AIPromptConfig
+        db.session.add(AIPromptConfig(name='goal lines', prompt_type='goal', system_prompt='-',
+                                      template_lines='What a strike!\n\n  Unreal.  '))
+        db.session.commit()
+        applied = []
+        monkeypatch.setattr(service.template_engine, 'set_overrides',
+                            lambda overrides: applied.append((overrides, threading.current_thread())))
+
+        await service._refresh_active_sessions()
+        assert applied == [({'goal': ['What a strike!', 'Unreal.']}, threading.current_thread())]
+
+        service._reconciled_at -= service.RECONCILE_SECONDS
+        await service._refresh_active_sessions()
+        assert len(applied) == 1  # throttled
@@ -0,0 +1,112 @@
+"""
+Unit tests for the notification delivery engine: token bucket pacing, batching,
+per-channel concurrency limits, cross-channel parallelism and failure
+accounting. Uses FakeChannelProvider; no network, no DB.
+"""
+import time
+
+import pytest
+
+from app.services.notification_delivery import (
+    ChannelPolicy,
+    DeliveryEngine,
+    FakeChannelProvider,
+    TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+
+    def test_burst_then_paced(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=3, clock=clock, sleep=clock.sleep)
+        waits = [bucket.acquire() for _ in range(5)]
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] == pytest.approx(0.5)
+        assert clock.now == pytest.approx(1.0)
+
+    def test_refills_over_time_up_to_capacity(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, burst=2, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+        bucket.acquire()
+        clock.now += 10
+        assert [bucket.acquire() for _ in range(2)] == [0.0, 0.0]
+        assert bucket.acquire() == pytest.approx(1.0)
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0, burst=1)
+
+
+@pytest.mark.unit
+class TestDeliveryEngine:
+
+    def _engine(self, **policies):
+        return DeliveryEngine({
+            channel: ChannelPolicy(rate_per_second=1000.0, burst=1000, **kwargs)
+            for channel, kwargs in policies.items()
+        })
+
+    def test_batches_by_channel_size(self):
+        provider = FakeChannelProvider(latency=0)
+        engine = self._engine(push=dict(batch_size=250, max_concurrency=2))
+        summary = engine.deliver({'push': list(range(600))}, {'push': provider.send})['push']
+        assert sorted(provider.calls) == [100, 250, 250]
+        assert (summary.recipients, summary.success, summary.batches) == (600, 600, 3)
+
+    def test_concurrency_limit_is_respected(self):
+        provider = FakeChannelProvider(latency=0.02)
+        engine = self._engine(email=dict(max_concurrency=3))
+        engine.deliver({'email': [f'u{i}@x.com' for i in range(30)]}, {'email': provider.send})
+        assert provider.peak_in_flight <= 3
+        assert len(provider.calls) == 30
+
+    def test_slow_channel_does_not_block_others(self):
+        slow = FakeChannelProvider(latency=0.3)
+        fast = FakeChannelProvider(latency=0.01)
+        engine = self._engine(sms=dict(max_concurrency=1), push=dict(batch_size=100))
+        summaries = engine.deliver(
+            {'sms': [1, 2, 3], 'push': list(range(50))},
+            {'sms': slow.send, 'push': fast.send},
+        )
+        assert summaries['push'].elapsed < 0.3
+        assert summaries['sms'].elapsed >= 0.9
+
+    def test_rate_limit_paces_batches(self):
+        provider = FakeChannelProvider(latency=0)
+        engine = DeliveryEngine({'discord': ChannelPolicy(max_concurrency=4, rate_per_second=20.0,
+                                                          burst=2)})
+        started = time.monotonic()
+        summary = engine.deliver({'discord': list(range(8))}, {'discord': provider.send})['discord']
+        # 2 immediately, then 6 more at 20/s
+        assert time.monotonic() - started >= 0.25
+        assert summary.throttled_seconds > 0
+
+    def test_failures_and_exceptions_are_counted(self):
+        def broken(batch):
+            raise RuntimeError("provider down")
+
+        flaky = FakeChannelProvider(latency=0, failure_rate=1.0)
+        engine = self._engine(email=dict(), sms=dict(batch_size=5))
+        summaries = engine.deliver(
+            {'email': ['a', 'b'], 'sms': list(range(7)), 'discord': []},
+            {'email': flaky.send, 'sms': broken, 'discord': broken},
+        )
+        assert (summaries['email'].success, summaries['email'].failure) == (0, 2)
+        assert (summaries['sms'].failure, summaries['sms'].batches) == (7, 2)
+        assert summaries['discord'].to_dict()['recipients'] == 0
@@ -1160,6 +1160,35 @@ class TestAnalyticsTracking:
 
         assert 'match_reminder' in caplog.text or len(caplog.records) >= 0
 
+    def test_track_notification_sent_logs_delivery_summaries_at_info(self, orchestrator, caplog):
+        import logging
+        caplog.set_level(logging.INFO, logger='app.services.notification_orchestrator')
+
+        payload = NotificationPayload(
+            notification_type=NotificationType.MATCH_REMINDER,
+            title='Test',
+            message='Test',
+            user_ids=[1, 2],
+        )
+        channel = {'success': 0, 'failure': 0, 'skipped': 0}
+        results = {
+            'total_users': 2,
+            'in_app': {'created': 2, 'skipped': 0},
+            'push': channel, 'email': channel, 'sms': channel, 'discord': channel,
+            'delivery': {
+                'push': {'recipients': 2, 'success': 2, 'failure': 0, 'batches': 1,
+                         'throttled_seconds': 0.0, 'elapsed': 0.12},
+                'email': {'recipients': 0, 'success': 0, 'failure': 0, 'batches': 0,
+                          'throttled_seconds': 0.0, 'elapsed': 0.0},
+            },
+        }
+
+        orchestrator._track_notification_sent(payload, results)
+
+        delivery = [r for r in caplog.records if r.getMessage().startswith('Notification delivery')]
+        assert [r.levelno for r in delivery] == [logging.INFO]
+        assert 'channel=push' in delivery[0].getMessage()
+
 
 # =============================================================================
 # INTEGRATION-STYLE TESTS (with mocked external services)
@@ -1251,6 +1280,118 @@ class TestMultiChannelCoordination:
         assert results['push']['skipped'] >= 0
 
 
+# =============================================================================
+# BULK LOADING TESTS
+# =============================================================================
+
+def _make_recipients(db, count, prefix):
+    """Create users with a player profile and FCM tokens (one debug, one real)."""
+    from app.models import User, Player
+    from app.models.notifications import UserFCMToken
+    users = []
+    for i in range(count):
+        user = User(
+            username=f'{prefix}_{i}',
+            email=f'{prefix}_{i}@example.com',
+            is_approved=True,
+            approval_status='approved',
+            email_notifications=True,
+            sms_notifications=True,
+            discord_notifications=True,
+        )
+        user.set_password('password123')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Player(
+            name=f'{prefix} player {i}',
+            user_id=user.id,
+            discord_id=f'{prefix}_discord_{i}',
+            phone=f'+1555000{i:04d}',
+            is_phone_verified=True,
+        ))
+        db.session.add(UserFCMToken(user_id=user.id, fcm_token=f'{prefix}_token_{i}', platform='ios'))
+        db.session.add(UserFCMToken(user_id=user.id, fcm_token=f'DEBUG_SIMULATOR_TOKEN_{prefix}_{i}',
+                                    platform='ios'))
+        users.append(user)
+    db.session.commit()
+    return users
+
+
+@pytest.mark.unit
+class TestBulkPreferenceLoading:
+    """Preferences, contacts and tokens load in a fixed number of queries."""
+
+    def test_query_count_does_not_grow_with_recipients(self, orchestrator, db):
+        """
+        GIVEN 2 and then 10 recipients with player profiles and tokens
+        WHEN loading preferences
+        THEN both loads issue the same small number of queries
+        """
+        small = [u.id for u in _make_recipients(db, 2, 'bulk_small')]
+        large = [u.id for u in _make_recipients(db, 10, 'bulk_large')]
+        db.session.expire_all()
+
+        counts = []
+        with patch.object(orchestrator, '_get_db', return_value=db):
+            for user_ids in (small, large):
+                with orchestrator._count_queries() as queries:
+                    prefs = orchestrator._get_users_with_preferences(user_ids)
+                assert set(prefs) == set(user_ids)
+                counts.append(queries['count'])
+
+        assert counts[0] == counts[1]
+        assert counts[1] <= 3
+
+    def test_loads_decrypted_contacts_and_tokens(self, orchestrator, db):
+        """
+        GIVEN a recipient with an encrypted phone and active FCM tokens
+        WHEN loading preferences
+        THEN contacts are decrypted and tokens preloaded
+        """
+        user = _make_recipients(db, 1, 'bulk_contact')[0]
+
+        with patch.object(orchestrator, '_get_db', return_value=db):
+            prefs = orchestrator._get_users_with_preferences([user.id, user.id])[user.id]
+
+        assert prefs['email'] == 'bulk_contact_0@example.com'
+        assert prefs['phone'] == '+15550000000'
+        assert prefs['discord_id'] == 'bulk_contact_discord_0'
+        assert prefs['is_phone_verified'] is True
+        assert sorted(prefs['fcm_tokens']) == [
+            'DEBUG_SIMULATOR_TOKEN_bulk_contact_0', 'bulk_contact_token_0',
+        ]
+
+    def test_send_reuses_loaded_context(self, orchestrator, db):
+        """
+        GIVEN a tiered push notification to several users
+        WHEN sending
+        THEN tier checks and push delivery issue no further queries and
+             debug tokens are dropped
+        """
+        users = _make_recipients(db, 4, 'bulk_send')
+        payload = NotificationPayload(
+            notification_type=NotificationType.ADMIN_ANNOUNCEMENT,
+            title='Announcement',
+            message='Hello',
+            user_ids=[u.id for u in users],
+        )
+        push_service = MagicMock()
+        push_service.send_push_notification.return_value = {'success': 4, 'failure': 0}
+
+        with patch.object(orchestrator, '_get_db', return_value=db), \
+             patch.object(orchestrator, '_get_push_service', return_value=push_service), \
+             patch.object(orchestrator, '_create_in_app_notification', return_value=True), \
+             patch.object(orchestrator, '_send_discord_notification', return_value=True):
+            with orchestrator._count_queries() as load:
+                orchestrator._get_users_with_preferences(payload.user_ids)
+            results = orchestrator.send(payload)
+
+        assert results['push']['success'] == 4
+        assert results['db_queries'] == load['count']
+        tokens = push_service.send_push_notification.call_args[1]['tokens']
+        assert sorted(tokens) == [f'bulk_send_token_{i}' for i in range(4)]
+
+
 # =============================================================================
 # SINGLETON INSTANCE TEST
 # =============================================================================
@@ -0,0 +1,169 @@
+"""
+Unit tests for incremental participation rollup maintenance
+(app/services/participation_rollup.py): commit-time dirty marks from RSVP,
+check-in and roster writes, per-member coalescing, resolution to
+(player, season, league) rows, and the stream consumer that feeds it.
+
+The row recompute itself is Postgres SQL (participation_service), so it is
+replaced by a recorder here; what is under test is WHICH rows get recomputed
+and WHEN.
+"""
+import asyncio
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from app.services import participation_rollup as rollup
+
+
+def dirty(redis):
+    return set(redis.zsets.get(rollup.DIRTY_KEY, {}))
+
+
+@pytest.fixture
+def refreshed(monkeypatch):
+    """Record refresh_participation_rows calls instead of running Postgres SQL."""
+    from app.services import participation_service
+    calls = []
+
+    def record(session, season_id, player_ids, league_ids, as_of=None, league_type='Pub League'):
+        calls.append((season_id, tuple(player_ids), tuple(league_ids), league_type))
+        return 0
+    monkeypatch.setattr(participation_service, 'refresh_participation_rows', record)
+    return calls
+
+
+def _ecs_match(db, team, day):
+    from app.models.ecs_fc import EcsFcMatch
+    now = datetime.utcnow()
+    match = EcsFcMatch(team_id=team.id, opponent_name='Visitors', match_date=day,
+                       match_time=time(19), location='Field', is_home_match=True,
+                       created_at=now, updated_at=now)
+    db.session.add(match)
+    db.session.flush()
+    return match
+
+
+@pytest.mark.unit
+class TestCommitHooks:
+
+    def test_rsvp_checkin_and_roster_writes_mark_after_commit(self, db, fake_redis, match, player,
+                                                              team, opponent_team, season):
+        from app.models import Availability, MatchAttendance
+        from app.models.players import PlayerTeamSeason
+
+        db.session.add(Availability(match_id=match.id, player_id=player.id,
+                                    discord_id=player.discord_id, response='yes'))
+        db.session.add(MatchAttendance(match_id=match.id, league_type='pub_league',
+                                       player_id=player.id, checked_in_by='qr'))
+        roster = PlayerTeamSeason(player_id=player.id, team_id=team.id, season_id=season.id)
+        db.session.add(roster)
+        db.session.flush()
+        assert dirty(fake_redis) == set()  # nothing until the transaction commits
+
+        db.session.commit()
+        assert dirty(fake_redis) == {rollup.rsvp_member(player.id, match.id),
+                                      rollup.roster_member(player.id, team.id)}
+
+        # A roster move dirties both the team left and the team joined.
+        roster.team_id = opponent_team.id
+        db.session.commit()
+        assert rollup.roster_member(player.id, opponent_team.id) in dirty(fake_redis)
+
+    def test_rollback_drops_marks(self, db, fake_redis, match, player):
+        from app.models import Availability
+        db.session.add(Availability(match_id=match.id, player_id=player.id,
+                                    discord_id=player.discord_id, response='no'))
+        db.session.flush()
+        db.session.rollback()
+        db.session.commit()
+        assert dirty(fake_redis) == set()
+
+
+@pytest.mark.unit
+class TestFlush:
+
+    def test_coalesces_within_window_then_refreshes_resolved_rows(self, db, fake_redis, refreshed,
+                                                                   match, player, team, league,
+                                                                   season):
+        member = rollup.rsvp_member(player.id, match.id)
+        rollup.mark_dirty([member])
+        first_score = fake_redis.zsets[rollup.DIRTY_KEY][member]
+        rollup.mark_dirty([member, rollup.roster_member(player.id, team.id)])
+        assert fake_redis.zsets[rollup.DIRTY_KEY][member] == first_score  # first mark wins
+
+        assert rollup.flush_dirty_rows(db.session, window_seconds=60) == \
+            {'members': 0, 'rows': 0, 'seasons': 0}
+        assert refreshed == []
+
+        result = rollup.flush_dirty_rows(db.session, window_seconds=60, now=first_score + 61)
+        # Three marks (both sides of the match + roster) collapse to ONE row.
+        assert result == {'members': 2, 'rows': 1, 'seasons': 1}
+        assert refreshed == [(season.id, (player.id,), (league.id,), season.league_type)]
+        assert dirty(fake_redis) == set()
+
+    def test_groups_by_season_and_resolves_ecs_fc_matches(self, db, fake_redis, refreshed, player):
+        from app.models import League, Season, Team
+        ecs_season = Season(name='ECS FC 2024', league_type='ECS FC', is_current=True)
+        db.session.add(ecs_season)
+        db.session.flush()
+        ecs_league = League(name='ECS FC', season_id=ecs_season.id)
+        db.session.add(ecs_league)
+        db.session.flush()
+        ecs_team = Team(name='ECS FC Reds', league_id=ecs_league.id)
+        db.session.add(ecs_team)
+        db.session.flush()
+        ecs_match = _ecs_match(db, ecs_team, date.today())
+
+        rollup.mark_dirty([rollup.ecs_fc_member(player.id, ecs_match.id),
+                           rollup.rsvp_member(player.id, 987654)])  # unknown match: dropped
+        result = rollup.flush_dirty_rows(db.session, window_seconds=0)
+        assert result['rows'] == 1
+        assert refreshed == [(ecs_season.id, (player.id,), (ecs_league.id,), 'ECS FC')]
+
+    def test_failed_flush_puts_marks_back(self, db, fake_redis, monkeypatch, player, team):
+        from app.services import participation_service
+
+        def boom(*args, **kwargs):
+            raise RuntimeError('database went away')
+        monkeypatch.setattr(participation_service, 'refresh_participation_rows', boom)
+
+        member = rollup.roster_member(player.id, team.id)
+        rollup.mark_dirty([member])
+        with pytest.raises(RuntimeError):
+            rollup.flush_dirty_rows(db.session, window_seconds=0)
+        assert dirty(fake_redis) == {member}
+
+    def test_played_fixtures_marked_once_per_day(self, db, fake_redis, match, player, team,
+                                                 opponent_team, season):
+        from app.models.players import PlayerTeamSeason
+        db.session.add(PlayerTeamSeason(player_id=player.id, team_id=team.id, season_id=season.id))
+        db.session.flush()
+        match.week_type = 'REGULAR'
+        db.session.flush()
+        fake_redis.zsets.clear()
+
+        day = match.date
+        fake_redis.set(rollup.AS_OF_KEY, (day - timedelta(days=3)).isoformat())
+        assert rollup.mark_played_fixtures(db.session, today=day) == 1
+        assert dirty(fake_redis) == {rollup.roster_member(player.id, team.id)}
+        assert rollup.mark_played_fixtures(db.session, today=day) == 0
+        assert rollup.mark_played_fixtures(db.session, today=day + timedelta(days=1)) == 0
+
+
+@pytest.mark.unit
+class TestParticipationRollupUpdater:
+
+    def test_marks_rsvp_changes_and_skips_no_ops(self, fake_redis):
+        from app.events.rsvp_events import RSVPEvent
+        from app.services.event_consumer import ParticipationRollupUpdater
+
+        updater = ParticipationRollupUpdater()
+        assert updater.config.stream_name == 'rsvp:analytics'
+        changed = RSVPEvent.create_rsvp_updated(match_id=7, player_id=3, old_response='no',
+                                                new_response='yes')
+        unchanged = RSVPEvent.create_rsvp_updated(match_id=8, player_id=3, old_response='yes',
+                                                  new_response='yes')
+        assert asyncio.run(updater.process_event(changed, changed.to_dict()))
+        assert asyncio.run(updater.process_event(unchanged, unchanged.to_dict()))
+        assert dirty(fake_redis) == {rollup.rsvp_member(3, 7)}
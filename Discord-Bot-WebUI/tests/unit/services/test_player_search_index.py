@@ -0,0 +1,169 @@
+"""
+Unit tests for the player search index (app/services/player_search_index.py):
+ranking, field coverage, and freshness through the commit hooks and the
+cross-process change feed.
+"""
+import time
+
+import pytest
+from sqlalchemy import update
+
+from app.services import player_search_index
+from app.services.player_search_index import PlayerDoc, PlayerSearchIndex
+
+
+@pytest.fixture
+def feed(fake_redis):
+    player_search_index.invalidate_index()
+    yield fake_redis
+    player_search_index.invalidate_index()
+
+
+def build(*docs, teams=None):
+    index = PlayerSearchIndex()
+    index.load(docs, teams or {})
+    return index
+
+
+@pytest.mark.unit
+class TestRanking:
+
+    def test_current_players_then_prefix_then_substring(self):
+        index = build(
+            PlayerDoc(1, 'Sam Johnson', is_current=True),
+            PlayerDoc(2, 'John Smith', is_current=False),
+            PlayerDoc(3, 'Johnny Walker', is_current=True),
+            PlayerDoc(4, 'Pat Doe', is_current=True, discord_username='johnd'),
+            PlayerDoc(5, 'Alex Jones', is_current=True),
+        )
+        # Current first; among them name prefix, name word prefix, other field prefix.
+        assert index.search('john', fuzzy=False) == [3, 1, 4, 2]
+
+    def test_fuzzy_matches_only_top_up_exact_ones(self):
+        index = build(PlayerDoc(1, 'Jonathan Smyth', is_current=True),
+                      PlayerDoc(2, 'Xavier Smith', is_current=False))
+        assert index.search('smith') == [2, 1]
+        assert index.search('smith', limit=1) == [2]
+        assert index.search('smith', fuzzy=False) == [2]
+
+    def test_covers_teams_usernames_and_email_for_admins(self):
+        index = build(
+            PlayerDoc(1, 'Ana', username='ana_k', email='ana.k@example.com', team_ids=(10,)),
+            PlayerDoc(2, 'Bo', team_ids=(11,)),
+            teams={10: 'Sounders Reserves', 11: 'Timbers'},
+        )
+        assert index.search('reserv') == [1]
+        assert index.search('ana_') == [1]
+        assert index.search('example.com') == []
+        assert index.search('example.com', include_email=True) == [1]
+
+    def test_emails_are_decrypted_on_first_admin_lookup(self):
+        from app.utils.pii_encryption import encrypt_value
+        index = build(PlayerDoc(1, 'Ana', encrypted_email=encrypt_value('ana.k@example.com')))
+        assert index.search('example.com') == [] and not index.emails_loaded
+        assert index.search('example.com', include_email=True) == [1]
+        assert index.emails_loaded
+
+        # Documents loaded afterwards are decrypted as they arrive.
+        index.load([PlayerDoc(2, 'Bo', encrypted_email=encrypt_value('bo@example.org'))], {})
+        assert index.search('example.org', include_email=True) == [2]
+
+    def test_accents_and_case_are_ignored(self):
+        index = build(PlayerDoc(1, 'José Núñez'))
+        assert index.search('NUNEZ') == [1]
+        assert index.search('jo') == [1]  # two letters: bigram postings
+
+    def test_remove_drops_postings(self):
+        index = build(PlayerDoc(1, 'Kim Lee', team_ids=(3,)), teams={3: 'Orcas'})
+        index.remove([1], [3])
+        assert index.search('kim') == [] and index.search('orcas') == []
+        assert not index._grams and not index._team_grams
+
+
+@pytest.mark.unit
+class TestFreshness:
+
+    def test_committed_edits_reload_only_changed_rows(self, db, feed, player, team):
+        from app.models import Player
+        db.session.commit()
+        search = player_search_index.search_player_ids
+        assert search(db.session, 'test player') == [player.id]
+
+        player.name = 'Renamed Striker'
+        db.session.flush()
+        assert search(db.session, 'striker') == []  # not committed yet
+        db.session.commit()
+        assert search(db.session, 'striker') == [player.id]
+        assert search(db.session, 'test player', fuzzy=False) == []
+
+        team.name = 'Kraken FC'
+        db.session.commit()
+        assert search(db.session, 'kraken') == [player.id]
+
+        # Bulk writes to unrelated columns don't rebuild; searchable ones do.
+        built = player_search_index._index.built_at
+        db.session.execute(update(Player).values(discord_needs_update=True))
+        db.session.commit()
+        search(db.session, 'kraken')
+        assert player_search_index._index.built_at == built
+        db.session.execute(update(Player).where(Player.id == player.id).values(name='Bulk Name'))
+        db.session.commit()
+        # The rebuild runs in the background; lookups meanwhile read the old index.
+        assert search(db.session, 'kraken') == [player.id]
+        player_search_index.wait_for_rebuild(timeout=30)
+        assert search(db.session, 'bulk name') == [player.id]
+        assert player_search_index._index.built_at != built
+        rebuilt = player_search_index._index
+        search(db.session, 'bulk name')
+        assert player_search_index._index is rebuilt  # the feed's copy doesn't rebuild again
+
+    def test_changes_from_other_workers_arrive_through_redis(self, db, feed, player):
+        from app.models import Player
+        db.session.commit()
+        search = player_search_index.search_player_ids
+        assert search(db.session, 'test player') == [player.id]
+
+        # Another worker renames the player: this process sees neither the
+        # flush nor the commit, only the change feed entry.
+        db.session.connection().execute(update(Player.__table__)
+                                        .where(Player.id == player.id).values(name='Remote Name'))
+        db.session.commit()
+        assert search(db.session, 'remote') == []
+        feed.zadd(player_search_index.CHANGES_KEY,
+                  {player_search_index.player_member(player.id): time.time()})
+        assert search(db.session, 'remote') == [player.id]
+
+
+@pytest.mark.unit
+class TestFilters:
+
+    def test_terms_too_short_for_the_index_fall_back_to_sql(self, db, feed, player):
+        from app.admin_panel.routes.user_management.member_hub import _person_search_clause
+        from app.models import Player, User
+        db.session.commit()
+        people = db.session.query(User.username).outerjoin(Player, Player.user_id == User.id)
+
+        assert people.filter(_person_search_clause(db.session, 'P')).all() == [('testuser',)]
+        assert people.filter(_person_search_clause(db.session, 'q')).all() == []
+        assert people.filter(_person_search_clause(db.session, 'test pl')).all() == [('testuser',)]
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestSearchEndpoint:
+
+    def test_autocomplete_uses_index_ranking(self, authenticated_client, db, feed, player):
+        from app.models import Player, User
+        legend = User(username='legend', email='legend@example.com')
+        legend.set_password('password123')
+        db.session.add(legend)
+        db.session.flush()
+        db.session.add(Player(name='Test Legend', user_id=legend.id, discord_id='legend',
+                              is_current_player=False))
+        player.is_current_player = True
+        db.session.commit()
+
+        response = authenticated_client.get('/search/players?term=test')
+        assert response.status_code == 200
+        assert [p['name'] for p in response.get_json()] == ['Test Player', 'Test Legend']
+        assert authenticated_client.get('/search/players?term=t').get_json() == []
@@ -0,0 +1,366 @@
+"""
+Equivalence tests for the incremental schedule scorer (app/schedule_scoring.py).
+
+The dict-of-sets validators it replaced are kept below verbatim as frozen
+references; random valid and deliberately broken schedules must produce the
+same violation strings (same order), score and summary. Incremental updates
+(week rewrites, position/slot/week swaps) must match a from-scratch rebuild.
+"""
+import random
+from collections import defaultdict
+
+import pytest
+
+from app.schedule_scoring import ScheduleScorer, pair_key
+from app.schedule_search import ScheduleSearchEngine
+
+
+# ---------------------------------------------------------------------------
+# Frozen references (AutoScheduleGenerator before the incremental scorer)
+# ---------------------------------------------------------------------------
+
+def legacy_evaluate_generic(weeks, team_ids, num_fields, slot_count):
+    n = len(team_ids)
+    hard = []
+
+    pair = defaultdict(int)
+    for week in weeks:
+        for h, a in week:
+            pair[pair_key(h, a)] += 1
+    for k, c in pair.items():
+        if c != 2:
+            hard.append(f"C1: pair {k} plays {c} times (expected 2)")
+
+    for wi, week in enumerate(weeks):
+        gpt = defaultdict(int)
+        slots = defaultdict(list)
+        for p, (h, a) in enumerate(week):
+            gpt[h] += 1
+            gpt[a] += 1
+            slots[h].append(p // num_fields)
+            slots[a].append(p // num_fields)
+        for t in team_ids:
+            if gpt[t] != 2:
+                hard.append(f"C2: team {t} plays {gpt[t]} games in week {wi+1}")
+            if len(set(slots[t])) != len(slots[t]):
+                hard.append(f"C2: team {t} has two games in the same slot in week {wi+1}")
+
+    for w in range(1, len(weeks)):
+        prev = defaultdict(set)
+        for h, a in weeks[w - 1]:
+            prev[h].add(a)
+            prev[a].add(h)
+        cur = defaultdict(set)
+        for h, a in weeks[w]:
+            cur[h].add(a)
+            cur[a].add(h)
+        for t in team_ids:
+            if prev[t] & cur[t]:
+                hard.append(f"C3: team {t} rematch in weeks {w} and {w+1}")
+
+    home = defaultdict(int)
+    away = defaultdict(int)
+    for week in weeks:
+        for h, a in week:
+            home[h] += 1
+            away[a] += 1
+    for t in team_ids:
+        if home[t] != n - 1 or away[t] != n - 1:
+            hard.append(f"C4: team {t} has {home[t]}H/{away[t]}A (expected {n-1}/{n-1})")
+
+    def opps_of(team, week):
+        out = []
+        for h, a in week:
+            if h == team:
+                out.append(a)
+            elif a == team:
+                out.append(h)
+        return out
+
+    for t in team_ids:
+        seen = set()
+        w_complete = None
+        for wi, week in enumerate(weeks):
+            for opp in opps_of(t, week):
+                seen.add(opp)
+            if w_complete is None and len(seen) >= n - 1:
+                w_complete = wi
+        if len(seen) != n - 1:
+            hard.append(f"C7: team {t} plays {len(seen)} opponents (expected {n-1})")
+            continue
+        seen = set()
+        for wi, week in enumerate(weeks):
+            wk = opps_of(t, week)
+            for opp in wk:
+                if opp in seen and wi < w_complete:
+                    hard.append(f"C7: team {t} repeats an opponent before completing the round-robin")
+                    break
+            for opp in wk:
+                seen.add(opp)
+
+    field = {t: [0] * num_fields for t in team_ids}
+    slot = {t: [0] * slot_count for t in team_ids}
+    window = {t: [0, 0] for t in team_ids}
+    for week in weeks:
+        for p, (h, a) in enumerate(week):
+            s = p // num_fields
+            f = p % num_fields
+            half = 0 if s < slot_count / 2 else 1
+            for x in (h, a):
+                field[x][f] += 1
+                slot[x][s] += 1
+                window[x][half] += 1
+    field_dev = max(max(field[t]) - min(field[t]) for t in team_ids)
+    slot_dev = max(max(slot[t]) - min(slot[t]) for t in team_ids)
+    window_dev = max(abs(window[t][0] - window[t][1]) for t in team_ids) if slot_count % 2 == 0 else 0
+
+    btb_ok = btb_tot = 0
+    for week in weeks:
+        slots_of = defaultdict(list)
+        for p, (h, a) in enumerate(week):
+            slots_of[h].append(p // num_fields)
+            slots_of[a].append(p // num_fields)
+        for t in team_ids:
+            btb_tot += 1
+            s = sorted(slots_of[t])
+            if len(s) == 2 and abs(s[0] - s[1]) == 1:
+                btb_ok += 1
+    btb_pct = (100 * btb_ok / btb_tot) if btb_tot else 0
+    score = field_dev + slot_dev + window_dev * 2 - btb_pct / 100.0
+    summary = (f"back-to-back={btb_pct:.0f}%, field_dev={field_dev}, "
+               f"slot_dev={slot_dev}, morning/afternoon_dev={window_dev}")
+    return hard, score, summary
+
+
+def legacy_premier_violations(weeks, team_ids):
+    violations = []
+    all_matches = [(w, h, a) for w, week in enumerate(weeks) for h, a in week]
+
+    pair_count = defaultdict(int)
+    for _, h, a in all_matches:
+        pair_count[pair_key(h, a)] += 1
+    for key, count in pair_count.items():
+        if count != 2:
+            violations.append(f"C1: Pair {key} plays {count} times (expected 2)")
+
+    for w, week in enumerate(weeks):
+        games_per_team = defaultdict(int)
+        for h, a in week:
+            games_per_team[h] += 1
+            games_per_team[a] += 1
+        for tid in team_ids:
+            if games_per_team[tid] != 2:
+                violations.append(f"C2: Team {tid} plays {games_per_team[tid]} games in week {w+1}")
+
+    for w in range(1, len(weeks)):
+        prev_opp = defaultdict(set)
+        for h, a in weeks[w - 1]:
+            prev_opp[h].add(a)
+            prev_opp[a].add(h)
+        curr_opp = defaultdict(set)
+        for h, a in weeks[w]:
+            curr_opp[h].add(a)
+            curr_opp[a].add(h)
+        for tid in team_ids:
+            common = prev_opp[tid] & curr_opp[tid]
+            if common:
+                violations.append(f"C3: Team {tid} plays {common} in weeks {w} and {w+1}")
+
+    home_count = defaultdict(int)
+    away_count = defaultdict(int)
+    for _, h, a in all_matches:
+        home_count[h] += 1
+        away_count[a] += 1
+    for tid in team_ids:
+        if home_count[tid] != 7 or away_count[tid] != 7:
+            violations.append(f"C4: Team {tid} has {home_count[tid]}H/{away_count[tid]}A (expected 7/7)")
+
+    north_count = defaultdict(int)
+    south_count = defaultdict(int)
+    for week in weeks:
+        for i, (h, a) in enumerate(week):
+            target = north_count if i % 2 == 0 else south_count
+            target[h] += 1
+            target[a] += 1
+    for tid in team_ids:
+        n, s = north_count.get(tid, 0), south_count.get(tid, 0)
+        if abs(n - s) > 2:
+            violations.append(f"C5: Team {tid} has {n}N/{s}S (max deviation ±2)")
+
+    early_count = defaultdict(int)
+    late_count = defaultdict(int)
+    for week in weeks:
+        for i, (h, a) in enumerate(week):
+            target = early_count if i < 4 else late_count
+            target[h] += 1
+            target[a] += 1
+    for tid in team_ids:
+        e, l = early_count.get(tid, 0), late_count.get(tid, 0)
+        if abs(e - l) > 2:
+            violations.append(f"C6: Team {tid} has {e} early/{l} late (max deviation ±2)")
+
+    for tid in team_ids:
+        opponent_first_week = {}
+        for w_idx, week in enumerate(weeks):
+            week_opponents = []
+            for h, a in week:
+                if h == tid:
+                    week_opponents.append(a)
+                elif a == tid:
+                    week_opponents.append(h)
+            for opp in week_opponents:
+                if opp in opponent_first_week:
+                    first_week = opponent_first_week[opp]
+                    if first_week < 3 and w_idx < 3:
+                        violations.append(
+                            f"C7: Team {tid} plays {opp} in week {first_week+1} "
+                            f"and week {w_idx+1} (no repeats before week 4)"
+                        )
+                else:
+                    opponent_first_week[opp] = w_idx
+        if len(opponent_first_week) < len(team_ids) - 1:
+            violations.append(
+                f"C7: Team {tid} only plays {len(opponent_first_week)} "
+                f"unique opponents (expected {len(team_ids) - 1})"
+            )
+    return violations
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def valid_schedule(num_teams, num_fields, seed):
+    team_ids = [100 + 7 * i for i in range(num_teams)]
+    result = ScheduleSearchEngine(team_ids, num_fields, time_budget=None,
+                                  max_iterations=200, seed=seed).search()
+    return [list(week) for week in result.weeks], team_ids
+
+
+def mutate(weeks, team_ids, rng, count):
+    """Apply random edits that typically break several hard constraints."""
+    weeks = [list(week) for week in weeks]
+    for _ in range(count):
+        w = rng.randrange(len(weeks))
+        p = rng.randrange(len(weeks[w]))
+        kind = rng.randrange(5)
+        h, a = weeks[w][p]
+        if kind == 0:  # flip home/away
+            weeks[w][p] = (a, h)
+        elif kind == 1:  # replace one side with a random team
+            weeks[w][p] = (h, rng.choice([t for t in team_ids if t != h]))
+        elif kind == 2:  # move a match to another week
+            w2 = rng.randrange(len(weeks))
+            weeks[w2][rng.randrange(len(weeks[w2]))] = weeks[w][p]
+        elif kind == 3:  # swap two weeks
+            w2 = rng.randrange(len(weeks))
+            weeks[w], weeks[w2] = weeks[w2], weeks[w]
+        else:  # swap two positions in a week
+            p2 = rng.randrange(len(weeks[w]))
+            weeks[w][p], weeks[w][p2] = weeks[w][p2], weeks[w][p]
+    return weeks
+
+
+def assert_matches_rebuild(scorer, team_ids, num_fields, slot_count):
+    fresh = ScheduleScorer.from_weeks(scorer.weeks, team_ids, num_fields, slot_count)
+    assert scorer.violations() == fresh.violations()
+    assert scorer.score() == pytest.approx(fresh.score())
+    assert scorer.summary() == fresh.summary()
+    assert scorer.sq_total == fresh.sq_total
+    assert scorer.opp_bits == fresh.opp_bits
+    assert scorer.btb_ok == fresh.btb_ok
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+class TestGenericEquivalence:
+
+    @pytest.mark.parametrize('num_teams,num_fields', [(4, 2), (6, 3), (8, 2), (10, 5), (12, 4)])
+    @pytest.mark.parametrize('edits', [0, 1, 3, 12])
+    def test_matches_legacy_evaluator(self, num_teams, num_fields, edits):
+        for seed in range(4):
+            weeks, team_ids = valid_schedule(num_teams, num_fields, seed)
+            weeks = mutate(weeks, team_ids, random.Random(seed * 31 + edits), edits)
+            slot_count = num_teams // num_fields
+            expected = legacy_evaluate_generic(weeks, team_ids, num_fields, slot_count)
+            scorer = ScheduleScorer.from_weeks(weeks, team_ids, num_fields, slot_count)
+            assert scorer.violations() == expected[0]
+            assert scorer.score() == pytest.approx(expected[1])
+            assert scorer.summary() == expected[2]
+
+    def test_valid_schedule_has_no_violations(self):
+        weeks, team_ids = valid_schedule(8, 4, seed=5)
+        assert ScheduleScorer.from_weeks(weeks, team_ids, 4, 2).violations() == []
+
+
+@pytest.mark.unit
+class TestPremierEquivalence:
+
+    def _template(self, team_ids):
+        A, B, C, D, E, F, G, H = team_ids
+        return [
+            [(A, B), (C, D), (A, C), (B, D), (E, F), (G, H), (E, G), (F, H)],
+            [(A, E), (B, F), (A, F), (B, E), (C, G), (D, H), (C, H), (D, G)],
+            [(A, G), (B, H), (A, H), (B, G), (C, E), (D, F), (C, F), (D, E)],
+            [(B, A), (D, C), (A, D), (B, C), (F, E), (H, G), (E, H), (F, G)],
+            [(G, C), (H, D), (H, C), (G, D), (E, A), (F, B), (F, A), (E, B)],
+            [(E, C), (F, D), (F, C), (E, D), (G, A), (H, B), (H, A), (G, B)],
+            [(G, E), (H, F), (H, E), (G, F), (C, A), (D, B), (D, A), (C, B)],
+        ]
+
+    @pytest.mark.parametrize('edits', [0, 1, 2, 6, 20])
+    def test_matches_legacy_validator(self, edits):
+        team_ids = [11, 4, 27, 9, 30, 15, 2, 8]
+        for seed in range(10):
+            rng = random.Random(seed * 17 + edits)
+            weeks = mutate(self._template(rng.sample(team_ids, 8)), team_ids, rng, edits)
+            scorer = ScheduleScorer.from_weeks(weeks, team_ids, num_fields=2, slot_count=4)
+            assert scorer.premier_violations() == legacy_premier_violations(weeks, team_ids)
+
+
+@pytest.mark.unit
+class TestIncrementalUpdates:
+
+    @pytest.mark.parametrize('num_teams,num_fields', [(6, 2), (8, 4), (12, 3)])
+    def test_moves_match_full_rebuild(self, num_teams, num_fields):
+        weeks, team_ids = valid_schedule(num_teams, num_fields, seed=2)
+        slot_count = num_teams // num_fields
+        scorer = ScheduleScorer.from_weeks(weeks, team_ids, num_fields, slot_count)
+        rng = random.Random(9)
+        for step in range(300):
+            w = rng.randrange(len(weeks))
+            move = step % 4
+            if move == 0:
+                scorer.swap_positions(w, rng.randrange(num_teams), rng.randrange(num_teams))
+            elif move == 1:
+                scorer.swap_slots(w, rng.randrange(slot_count), rng.randrange(slot_count))
+            elif move == 2:
+                scorer.swap_weeks(w, rng.randrange(len(weeks)))
+            else:
+                replacement = mutate([scorer.weeks[w]], team_ids, rng, 2)[0]
+                scorer.set_week(w, replacement)
+            if step % 25 == 0:
+                assert_matches_rebuild(scorer, team_ids, num_fields, slot_count)
+        assert_matches_rebuild(scorer, team_ids, num_fields, slot_count)
+
+    def test_swap_positions_is_self_inverse(self):
+        weeks, team_ids = valid_schedule(10, 2, seed=4)
+        scorer = ScheduleScorer.from_weeks(weeks, team_ids, 2, 5)
+        before = (scorer.score(), scorer.sq_total, [list(w) for w in scorer.weeks])
+        scorer.swap_positions(3, 1, 8)
+        scorer.swap_positions(3, 1, 8)
+        assert (scorer.score(), scorer.sq_total, scorer.weeks) == before
+
+    def test_can_swap_agrees_with_same_slot_check(self):
+        weeks, team_ids = valid_schedule(12, 3, seed=6)
+        scorer = ScheduleScorer.from_weeks(weeks, team_ids, 3, 4)
+        for p1 in range(12):
+            for p2 in range(12):
+                allowed = scorer.can_swap(0, p1, p2)
+                scorer.swap_positions(0, p1, p2)
+                clashes = any(scorer._same_slot(0, t) for t in range(12))
+                scorer.swap_positions(0, p1, p2)
+                assert allowed == (not clashes)
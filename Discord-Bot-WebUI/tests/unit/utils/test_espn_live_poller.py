@@ -0,0 +1,216 @@
+"""
+Live ESPN polling (app/utils/espn_live_poller.py): conditional requests over a
+shared session, section fingerprints that skip re-parsing unchanged parts,
+per-match scheduling, and the realtime service skipping the event diff on
+quiet polls.
+"""
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.utils.espn_api_client import ESPNAPIClient
+from app.utils.espn_live_poller import ALL_SECTIONS, ESPNLivePoller
+
+
+def summary(status='STATUS_FIRST_HALF', score=(0, 0), events=(), clock="12'", possession='55'):
+    competitors = [
+        {'homeAway': 'home', 'score': str(score[0]),
+         'team': {'id': '9726', 'displayName': 'Seattle Sounders FC', 'logos': [{'href': 'sea.png'}]}},
+        {'homeAway': 'away', 'score': str(score[1]),
+         'team': {'id': '184', 'displayName': 'Portland Timbers', 'logos': [{'href': 'por.png'}]}},
+    ]
+    return {
+        'header': {'competitions': [{
+            'competitors': competitors,
+            'status': {'displayClock': clock, 'period': 1,
+                       'type': {'name': status, 'state': 'in', 'completed': False}},
+        }]},
+        'keyEvents': [{'id': str(i), 'type': {'text': 'Goal'}, 'scoringPlay': True,
+                       'clock': {'displayValue': minute}, 'team': {'id': '9726'},
+                       'participants': [{'athlete': {'id': '77', 'displayName': 'Jordan Morris'}}]}
+                      for i, minute in enumerate(events, start=1)],
+        'rosters': [{'team': {'displayName': 'Seattle Sounders FC'},
+                     'roster': [{'jersey': '13', 'athlete': {'id': '77', 'headshot': {'href': 'jm.png'}}}]}],
+        'boxscore': {'teams': [{'homeAway': 'home', 'statistics': [
+            {'name': 'possessionPct', 'displayValue': possession}]}]},
+    }
+
+
+def body(payload):
+    return json.dumps(payload).encode()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def client():
+    espn = ESPNAPIClient()
+    espn.redis_service = MagicMock()
+    return espn
+
+
+@pytest.mark.unit
+class TestIngest:
+
+    def test_unchanged_sections_are_not_rebuilt(self, client, monkeypatch):
+        poller = ESPNLivePoller(client)
+        first = poller.ingest('1', 200, body(summary(events=["20'"])))
+        assert first.changed == ALL_SECTIONS and not first.quiet
+        (goal,) = first.data['events']
+        assert (goal['type'], goal['player'], goal['player_jersey']) == ('GOAL', 'Jordan Morris', '13')
+
+        # Byte-identical body: no JSON decode at all.
+        monkeypatch.setattr('app.utils.espn_live_poller.json.loads', None)
+        again = poller.ingest('1', 200, body(summary(events=["20'"])))
+        assert again.not_modified and again.quiet and again.data is first.data
+        monkeypatch.undo()
+
+        # Clock and stats moved: the event list is reused, the rest is fresh.
+        rebuilt = []
+        monkeypatch.setattr(client, '_extract_events_from_summary',
+                            lambda *a: rebuilt.append(a) or ESPNAPIClient._extract_events_from_summary(client, *a))
+        ticked = poller.ingest('1', 200, body(summary(events=["20'"], clock="31'", possession='61')))
+        assert ticked.changed == {'stats'} and ticked.quiet
+        assert ticked.data['events'] is first.data['events'] and rebuilt == []
+        assert ticked.data['minute'] == "31'" and ticked.data['stats']['home']['possessionPct'] == '61'
+
+        scored = poller.ingest('1', 200, body(summary(score=(2, 0), events=["20'", "44'"],
+                                                          possession='61')))
+        assert scored.changed == {'score', 'events'} and not scored.quiet
+        assert len(rebuilt) == 1 and [e['minute'] for e in scored.data['events']] == ["20'", "44'"]
+
+    def test_304_and_errors(self, client):
+        poller = ESPNLivePoller(client)
+        assert poller.ingest('1', 304, b'') is None  # nothing to reuse yet
+        first = poller.ingest('1', 200, body(summary()), {'ETag': '"v1"'})
+        assert poller.ingest('1', 304, b'').data is first.data
+        assert poller.ingest('1', 503, b'') is None
+        assert poller.ingest('1', 200, b'<html>') is None
+
+
+@pytest.mark.unit
+class TestPolling:
+
+    async def test_conditional_requests_over_a_shared_session(self, client):
+        seen = []
+        payload = {'body': body(summary())}
+
+        async def handler(request):
+            seen.append(request.headers.get('If-None-Match'))
+            etag = f'"{hash(payload["body"])}"'
+            if request.headers.get('If-None-Match') == etag:
+                return web.Response(status=304)
+            return web.Response(body=payload['body'], content_type='application/json',
+                                headers={'ETag': etag})
+
+        app = web.Application()
+        app.router.add_get('/{league}/summary', handler)
+        server = TestServer(app)
+        await server.start_server()
+        clock = FakeClock()
+        client.BASE_URL = str(server.make_url('')).rstrip('/')
+        poller = ESPNLivePoller(client, clock=clock)
+        try:
+            first = await poller.poll('42', 'usa.1')
+            assert first.data['home_team'] == 'Seattle Sounders FC' and seen == [None]
+            assert not poller.is_due('42') and poller.seconds_until_due(['42']) == 10.0
+
+            # Too soon after the last request: no request, no sleep.
+            clock.now += 1
+            assert (await poller.poll('42', 'usa.1')).not_modified and len(seen) == 1
+
+            clock.now += 10
+            assert poller.is_due('42')
+            unchanged = await poller.poll('42', 'usa.1')
+            assert unchanged.not_modified and seen[-1] is not None
+            session = poller._session
+
+            payload['body'] = body(summary(score=(1, 0), events=["50'"]))
+            clock.now += 10
+            changed = await poller.poll('42', 'usa.1')
+            assert not changed.quiet and changed.data['home_score'] == 1
+            assert poller._session is session
+        finally:
+            await poller.close()
+            await server.close()
+
+    async def test_failures_back_off(self, client):
+        clock = FakeClock()
+        client.BASE_URL = 'http://127.0.0.1:9'  # nothing listens on discard
+        poller = ESPNLivePoller(client, clock=clock)
+        try:
+            assert await poller.poll('7', 'usa.1') is None
+            assert poller.seconds_until_due(['7']) == poller.FAILURE_BACKOFF[0]
+            clock.now += poller.FAILURE_BACKOFF[0]
+            assert await poller.poll('7', 'usa.1') is None
+            assert poller.seconds_until_due(['7']) == poller.FAILURE_BACKOFF[1]
+            poller.forget('7')
+            assert poller.is_due('7')
+        finally:
+            await poller.close()
+
+
+@pytest.mark.unit
+class TestRealtimeServiceQuietPolls:
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        from app.services.realtime_reporting_service import RealtimeReportingService
+        svc = RealtimeReportingService()
+        svc.redis_service = MagicMock()
+        svc.redis_service.get.return_value = '0-0'
+        svc._update_session_stats = AsyncMock()
+        svc._send_lifecycle_event = AsyncMock()
+        svc._last_statuses[1] = 'IN_PLAY'
+        return svc
+
+    def poll_results(self, client, *payloads):
+        poller = ESPNLivePoller(client)
+        return [poller.ingest('42', 200, body(p)) for p in payloads]
+
+    async def test_quiet_poll_skips_event_diff_once_everything_posted(self, service, client):
+        results = self.poll_results(client, summary(score=(1, 0), events=["20'"]),
+                                    summary(score=(1, 0), events=["20'"], possession='60'))
+        service.espn_poller.poll = AsyncMock(side_effect=results)
+        service._send_events_to_discord = AsyncMock(
+            side_effect=lambda sid, data, events: {e['_dedup_key'] for e in events})
+        extract = AsyncMock(wraps=service._extract_new_events)
+        service._extract_new_events = extract
+        session = {'espn_match_id': '42', 'competition': 'usa.1'}
+
+        await service._process_session_realtime(1, session)
+        assert service._send_events_to_discord.await_count == 1 and 1 in service._settled_sessions
+        await service._process_session_realtime(1, session)
+        assert extract.await_count == 1 and service._send_events_to_discord.await_count == 1
+
+    async def test_failed_post_is_retried_on_a_quiet_poll(self, service, client):
+        results = self.poll_results(client, summary(score=(1, 0), events=["20'"]),
+                                    summary(score=(1, 0), events=["20'"], possession='60'))
+        service.espn_poller.poll = AsyncMock(side_effect=results)
+        outcomes = iter([False, True])
+        service._send_events_to_discord = AsyncMock(
+            side_effect=lambda sid, data, events: {e['_dedup_key'] for e in events} if next(outcomes) else set())
+        session = {'espn_match_id': '42', 'competition': 'usa.1'}
+
+        await service._process_session_realtime(1, session)
+        assert 1 not in service._settled_sessions
+        await service._process_session_realtime(1, session)
+        retried = service._send_events_to_discord.await_args_list[1].args[2]
+        assert [e['type'] for e in retried] == ['GOAL'] and 1 in service._settled_sessions
+
+    async def test_poller_reuses_the_client_result_schema(self, client):
+        raw = summary(score=(1, 1), events=["20'"])
+        expected = client._process_summary_data(raw, '42')
+        got = ESPNLivePoller(client).ingest('42', 200, body(raw)).data
+        expected.pop('cached_at'), got.pop('cached_at')
+        assert [e.pop('_dedup_key') for e in got['events']] == ["1_GOAL_20'_Jordan Morris_Seattle Sounders FC"]
+        assert got == expected
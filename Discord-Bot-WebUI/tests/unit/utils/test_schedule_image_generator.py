@@ -0,0 +1,187 @@
+"""
+Schedule poster rendering (app/utils/schedule_image_generator.py): assets come
+from the on-disk bundle without network, emoji caching is bounded, static
+layers are composed once per canvas size, and a week of team posters renders
+in one pass.
+"""
+import io
+from datetime import date, time
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from app.utils import schedule_image_generator as gen
+
+
+def png_bytes(color, size=(72, 72)):
+    out = io.BytesIO()
+    Image.new('RGBA', size, color).save(out, 'PNG')
+    return out.getvalue()
+
+
+@pytest.fixture
+def bundle(tmp_path, monkeypatch):
+    """An asset bundle with a logo and the calendar emoji; the network is off."""
+    (tmp_path / 'twemoji').mkdir()
+    (tmp_path / 'logo.png').write_bytes(png_bytes((20, 120, 60, 255), size=(224, 146)))
+    (tmp_path / 'twemoji' / f"{gen.emoji_to_twemoji_filename('📅')}.png").write_bytes(
+        png_bytes((200, 0, 0, 255)))
+
+    requested = []
+
+    def no_network(url, *args, **kwargs):
+        requested.append(url)
+        raise ConnectionError('network disabled in tests')
+
+    monkeypatch.setattr(gen, 'ASSET_BUNDLE_DIR', str(tmp_path))
+    monkeypatch.setattr(gen.requests, 'get', no_network)
+    monkeypatch.setattr(gen, '_logo_cache', None)
+    monkeypatch.setattr(gen, '_emoji_cache', gen._LRUCache(gen.EMOJI_CACHE_SIZE))
+    monkeypatch.setattr(gen, '_layer_cache', gen._LRUCache(gen.LAYER_CACHE_SIZE))
+    monkeypatch.setattr(gen, '_canvas_cache', gen._LRUCache(gen.CANVAS_CACHE_SIZE))
+    return requested
+
+
+def match_rows(count, start_day=1):
+    return [{'date': f'2026-03-{start_day + i:02d}', 'time': '19:00:00', 'home_team': 'Reds',
+             'away_team': f'Team {i}', 'is_home': True, 'location': 'Field 1',
+             'week_type': 'REGULAR'} for i in range(count)]
+
+
+@pytest.mark.unit
+class TestAssetBundle:
+
+    def test_preload_reads_bundle_without_network(self, bundle):
+        loaded = gen.preload_assets()
+        assert loaded['logo'] == 1
+        assert loaded['emoji'] == len(gen.PRELOAD_EMOJI_SIZES)  # only 📅 is bundled
+        assert bundle == []
+        assert gen.download_twemoji('📅', 24).size == (24, 24)
+
+    def test_missing_emoji_is_cached_as_absent_on_404(self, bundle, monkeypatch):
+        calls = []
+
+        def not_found(url, *args, **kwargs):
+            calls.append(url)
+            return SimpleNamespace(status_code=404, content=b'')
+
+        monkeypatch.setattr(gen.requests, 'get', not_found)
+        assert gen.download_twemoji('🦄', 24) is None
+        assert gen.download_twemoji('🦄', 24) is None
+        assert len(calls) == 1
+
+    def test_emoji_cache_is_bounded(self, bundle, monkeypatch):
+        monkeypatch.setattr(gen, '_emoji_cache', gen._LRUCache(2))
+        for size in (18, 20, 24):
+            gen.download_twemoji('📅', size)
+        assert len(gen._emoji_cache) == 2
+        assert ('📅', 18) not in gen._emoji_cache
+
+
+@pytest.mark.unit
+class TestLayerCache:
+
+    def test_static_layers_are_composed_once_per_canvas_size(self, bundle, monkeypatch):
+        gradients = []
+        real_gradient = gen.create_gradient
+        monkeypatch.setattr(gen, 'create_gradient',
+                            lambda *args, **kwargs: gradients.append(args[:2]) or real_gradient(*args, **kwargs))
+
+        first = gen.generate_match_schedule_image(match_rows(3), team_names=['Reds'])
+        built = len(gradients)
+        assert built == 3  # background, header band, footer band
+        assert gen.generate_match_schedule_image(match_rows(3), team_names=['Reds']) == first
+        assert len(gradients) == built
+
+        # Another row count is another canvas height; the bands are reused.
+        gen.generate_match_schedule_image(match_rows(5), team_names=['Reds'])
+        assert len(gradients) == built + 1
+        # Only the logo is fetched up front; it came from the bundle.
+        assert not any('weareecs' in url for url in bundle)
+
+    def test_cached_canvas_is_not_mutated_by_a_render(self, bundle):
+        canvas = gen.base_canvas(400, 300, 60, 120, 50)
+        canvas.paste((255, 0, 255), (0, 100, 400, 200))
+        assert gen.base_canvas(400, 300, 60, 120, 50).getpixel((10, 150)) != (255, 0, 255)
+
+
+@pytest.mark.unit
+class TestTeamScheduleBatch:
+
+    def test_week_of_team_posters_in_one_pass(self, bundle):
+        reds = SimpleNamespace(id=1, name='Reds')
+        blues = SimpleNamespace(id=2, name='Blues')
+        greens = SimpleNamespace(id=3, name='Greens')
+        week = [SimpleNamespace(date=date(2026, 3, 1), time=time(19), location='Field 1',
+                                home_team=reds, away_team=blues, home_team_id=1, away_team_id=2,
+                                week_type=None),
+                SimpleNamespace(date=date(2026, 3, 1), time=time(20), location='Field 2',
+                                home_team=greens, away_team=None, home_team_id=3, away_team_id=4,
+                                week_type='PLAYOFF')]
+
+        schedules = gen.team_week_schedules(week)
+        assert sorted(schedules) == [1, 2, 3]
+        (blue_match,) = schedules[2]['matches']
+        assert (blue_match['is_home'], blue_match['home_team'], blue_match['week_type']) == (
+            False, 'Reds', 'REGULAR')
+
+        images = gen.generate_team_schedule_images(schedules, footer_url='portal.ecsfc.com')
+        assert sorted(images) == [1, 2, 3]
+        for png in images.values():
+            with Image.open(io.BytesIO(png)) as img:
+                assert img.format == 'PNG' and img.width == 1100
+        assert len(gen._canvas_cache) == 1  # every team has one match in one month
+
+
+@pytest.mark.unit
+class TestWeeklyTeamPosting:
+
+    @pytest.fixture
+    def global_admin_client(self, client, db):
+        from app.models import Role, User
+
+        role = Role(name='Global Admin', description='Global Admin')
+        admin = User(username='posting_admin', email='posting_admin@example.com',
+                     is_approved=True, approval_status='approved')
+        admin.set_password('admin123')
+        admin.roles.append(role)
+        db.session.add_all([role, admin])
+        db.session.commit()
+        with client.session_transaction() as session:
+            session['_user_id'] = admin.id
+            session['_fresh'] = True
+        return client
+
+    def test_week_is_rendered_in_one_batch_and_posted_per_channel(
+            self, bundle, db, match, team, global_admin_client, monkeypatch):
+        from app.routes.calendar import league_events
+
+        db.session.merge(team).discord_channel_id = '555'
+        db.session.commit()
+
+        batches = []
+        render = league_events.generate_team_schedule_images
+
+        def spy(schedules, **kwargs):
+            batches.append(sorted(schedules))
+            return render(schedules, **kwargs)
+
+        posts = []
+
+        class FakeDiscord:
+            async def post_schedule_image_announcement(self, image_bytes, title, **kwargs):
+                posts.append((title, kwargs['channel_id'], image_bytes[:8]))
+                return {'message_id': 1}
+
+        monkeypatch.setattr(league_events, 'generate_team_schedule_images', spy)
+        monkeypatch.setattr(league_events, 'get_discord_service', lambda: FakeDiscord())
+
+        resp = global_admin_client.post('/api/calendar/league-events/team-schedules',
+                                        json={'week_start': match.date.isoformat()})
+        body = resp.get_json()
+
+        assert resp.status_code == 200, body
+        assert batches == [[team.id]]  # the opponent has no channel
+        assert body['posted'] == ['Test Team'] and body['skipped'] == ['Opponent Team']
+        assert [(channel, png) for _t, channel, png in posts] == [(555, b'\x89PNG\r\n\x1a\n')]
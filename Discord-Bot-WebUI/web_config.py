@@ -145,9 +145,35 @@ class Config:
     TWILIO_PHONE_NUMBER = os.getenv('TWILIO_PHONE_NUMBER')
     TWILIO_STATUS_CALLBACK = os.getenv('TWILIO_STATUS_CALLBACK', 'https://portal.ecsfc.com/account/webhook/sms-status')
     GOOGLE_APPLICATION_CREDENTIALS = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
+
+    # Email broadcast delivery (app/services/email_delivery.py). Individual-mode
+    # campaigns send over EMAIL_BROADCAST_CONNECTIONS persistent transports at
+    # no more than EMAIL_BROADCAST_RATE_PER_SECOND messages/second. Transport is
+    # the Gmail API unless set to 'smtp', which uses the SMTP_* settings.
+    EMAIL_BROADCAST_TRANSPORT = os.getenv('EMAIL_BROADCAST_TRANSPORT', 'gmail')
+    EMAIL_BROADCAST_CONNECTIONS = int(os.getenv('EMAIL_BROADCAST_CONNECTIONS', 3))
+    EMAIL_BROADCAST_RATE_PER_SECOND = float(os.getenv('EMAIL_BROADCAST_RATE_PER_SECOND', 2.0))
+    EMAIL_BROADCAST_BURST = int(os.getenv('EMAIL_BROADCAST_BURST', 5))
+    EMAIL_BROADCAST_STATUS_BATCH = int(os.getenv('EMAIL_BROADCAST_STATUS_BATCH', 25))
+    SMTP_SERVER = os.getenv('SMTP_SERVER') or os.getenv('MAIL_SERVER')
+    SMTP_PORT = int(os.getenv('SMTP_PORT') or os.getenv('MAIL_PORT') or 587)
+    SMTP_USERNAME = os.getenv('SMTP_USERNAME') or os.getenv('MAIL_USERNAME')
+    SMTP_PASSWORD = os.getenv('SMTP_PASSWORD') or os.getenv('MAIL_PASSWORD')
+    SMTP_USE_TLS = os.getenv('SMTP_USE_TLS', 'true').lower() in ('true', '1', 'yes')
+    SMTP_SENDER = os.getenv('SMTP_SENDER')
     TEXTMAGIC_USERNAME = os.getenv('TEXTMAGIC_USERNAME')
     TEXTMAGIC_API_KEY = os.getenv('TEXTMAGIC_API_KEY')
 
+    # /api/* request logging (app/services/api_log_buffer.py): rows are buffered
+    # per process and written API_LOG_BATCH_SIZE at a time, at least every
+    # API_LOG_FLUSH_INTERVAL seconds. Sink 'db' inserts directly; 'redis' queues
+    # one stream entry per batch for the drain_api_log_stream beat task.
+    API_LOG_SINK = os.getenv('API_LOG_SINK', 'db')
+    API_LOG_BATCH_SIZE = int(os.getenv('API_LOG_BATCH_SIZE', 200))
+    API_LOG_FLUSH_INTERVAL = float(os.getenv('API_LOG_FLUSH_INTERVAL', 5.0))
+    API_LOG_BUFFER_CAPACITY = int(os.getenv('API_LOG_BUFFER_CAPACITY', 5000))
+    API_LOG_FLUSH_IN_BACKGROUND = True
+
     # Wallet Pass / WooCommerce Integration
     WALLET_WEBHOOK_SECRET = os.getenv('WALLET_WEBHOOK_SECRET')
     WOOCOMMERCE_SITE_URL = os.getenv('WOOCOMMERCE_SITE_URL')
@@ -234,6 +260,10 @@ class TestingConfig(Config):
     
     # Disable CSRF for testing
     WTF_CSRF_ENABLED = False
+
+    # No API-log flusher thread: it would share the StaticPool connection with
+    # the test; tests flush the buffer explicitly.
+    API_LOG_FLUSH_IN_BACKGROUND = False
     
     # Disable Redis session storage for tests - use Flask's default
     SESSION_TYPE = None  # Use Flask's default session implementation  
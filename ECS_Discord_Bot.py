@@ -16,9 +16,17 @@ from common import bot_token, server_id, is_pl_tracked_channel
 import uvicorn
 from bot_rest_api import app
 from shared_states import bot_ready
-from api.utils.rsvp_utils import update_embed_for_message
+from api.utils.rsvp_utils import (
+    update_embed_for_message,
+    build_rsvp_embed,
+    rsvp_embed_fields,
+    rsvp_embed_hash,
+)
 from api.utils.discord_utils import get_team_id_for_message, poll_task_result
 from api.utils.api_client import get_session
+from api_helpers import close_http_client
+from embed_coalescer import embed_coalescer
+from keyed_registry import KeyedRegistry
 import signal
 import sys
 import traceback
@@ -171,6 +179,9 @@ class ECSBot(commands.Bot):
             await self.session.close()
             self.session = None
             logger.info("Bot session closed")
+
+        # Close the pooled WooCommerce/HTTP client
+        await close_http_client()
         
         # Call the parent's close method
         await super().close()
@@ -617,115 +628,237 @@ async def get_message_ids_for_match(match_id: int) -> Optional[Dict]:
         logger.error(f"Error getting message IDs for match {match_id}: {str(e)}")
         return None
 
+# Message ids per bulk sync-state request (the Web UI accepts up to 500).
+RSVP_SYNC_BATCH_SIZE = 200
+# Discord channels read, and messages reconciled, at the same time.
+RSVP_SYNC_CONCURRENCY = 3
+RSVP_REACTION_EMOJI = {"👍": "yes", "👎": "no", "🤷": "maybe"}
+
+async def get_rsvp_sync_state(message_ids):
+    """
+    Channel, match, team and current RSVPs for a batch of message ids in one
+    Web UI round trip. Returns {message_id: info}, or None if the call failed.
+    """
+    api_url = f"{WEBUI_API_URL}/get_rsvp_sync_state"
+    try:
+        global session
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+
+        async with session.post(api_url, json={'message_ids': [str(m) for m in message_ids]}) as response:
+            if response.status != 200:
+                logger.error(f"Failed to get RSVP sync state: {await response.text()}")
+                return None
+            data = await response.json()
+            messages = data.get('messages') if isinstance(data, dict) else None
+            if not isinstance(messages, dict):
+                logger.warning(f"Invalid RSVP sync state format: {data}")
+                return None
+            if data.get('missing'):
+                logger.debug(f"No scheduled message found for {len(data['missing'])} managed message(s)")
+            return messages
+    except Exception as e:
+        logger.error(f"Error fetching RSVP sync state for {len(message_ids)} messages: {str(e)}", exc_info=True)
+        return None
+
+def flask_rsvps_from_state(rsvps):
+    """{discord_id: response} from sync-state RSVP lists (same shape as get_flask_rsvps)."""
+    result = {}
+    for response in ('yes', 'no', 'maybe'):
+        for player in rsvps.get(response, []):
+            if player.get('discord_id'):
+                result[player['discord_id']] = response
+    return result
+
+async def read_message_reactions(message):
+    """
+    {discord_id: response} for an already-fetched message. Reaction user
+    lists are only requested for emojis someone other than the bot used.
+    """
+    result = {}
+    for reaction in message.reactions:
+        response = RSVP_REACTION_EMOJI.get(str(reaction.emoji))
+        if not response or reaction.count <= (1 if reaction.me else 0):
+            continue
+        async for user in reaction.users():
+            if user.id != bot.user.id:  # Skip bot's own reactions
+                result[str(user.id)] = response
+    return result
+
+async def collect_channel_reactions(channel_id, message_ids):
+    """
+    Resolve a channel once and read the reactions of all its managed
+    messages. Returns {message_id: (message, discord_rsvps)}; messages that
+    could not be fetched are left out.
+    """
+    found = {}
+    channel = bot.get_channel(channel_id)
+    if not channel:
+        try:
+            channel = await bot.fetch_channel(channel_id)
+        except Exception as e:
+            logger.error(f"Could not fetch channel {channel_id}: {str(e)}")
+            return found
+    for message_id in message_ids:
+        try:
+            message = await channel.fetch_message(int(message_id))
+            found[message_id] = (message, await read_message_reactions(message))
+        except Exception as e:
+            logger.error(f"Could not read reactions for message {message_id}: {str(e)}")
+    return found
+
 async def full_rsvp_sync(force_sync=False):
     """
     Performs a full synchronization between Discord reactions/embeds and Flask RSVPs.
     This ensures consistency even after bot downtime or network failures.
-    
+
+    Runs in phases, each timed:
+      lookup    - one bulk Web UI call per batch of messages for channel,
+                  match, team and current RSVPs
+      reactions - each channel resolved once, reactions read for all of its
+                  messages
+      reconcile - in-memory diff; reconcile_rsvps only for messages whose
+                  reactions disagree with Flask
+      embeds    - an embed is edited only when its tally fields' hash differs
+                  from what Flask says they should be
+
     Args:
         force_sync: If True, update all messages even if no discrepancy detected.
     """
     logger.info(f"Starting full RSVP synchronization (force_sync={force_sync}) - processing only matches from last 7 days")
-    message_ids = list(bot_state.get_managed_message_ids())
+    message_ids = [str(message_id) for message_id in bot_state.get_managed_message_ids()]
     synced_count = 0
     failed_count = 0
-    
-    # Limit concurrent operations to avoid overloading Discord API or causing deadlocks
-    # Process messages in batches with semaphores to control concurrency
-    semaphore = asyncio.Semaphore(3)  # Process up to 3 messages concurrently
-    
-    async def process_message(message_id):
-        nonlocal synced_count, failed_count
-        
-        # Using semaphore to limit concurrent processing
+    embeds_updated = 0
+    timings = {}
+
+    # Phase 1: bulk lookup
+    started = time.perf_counter()
+    state = {}
+    for i in range(0, len(message_ids), RSVP_SYNC_BATCH_SIZE):
+        batch = message_ids[i:i + RSVP_SYNC_BATCH_SIZE]
+        batch_state = await get_rsvp_sync_state(batch)
+        if batch_state is None:
+            failed_count += len(batch)
+            continue
+        state.update(batch_state)
+
+    targets = {}
+    for message_id, info in state.items():
+        if not info or not info.get('channel_id'):
+            logger.warning(f"Could not find channel ID for message {message_id}")
+            continue
+        # Skip old matches (older than 7 days) to avoid processing massive backlogs
+        if not info.get('is_recent_match', True):
+            logger.debug(f"Skipping old match (date: {info.get('match_date')}) for message {message_id}")
+            continue
+        if not info.get('match_id') or not info.get('team_id'):
+            logger.warning(f"Missing match_id or team_id for message {message_id}")
+            continue
+        if info.get('rsvps') is None:
+            logger.warning(f"Could not fetch RSVPs from Flask for match {info['match_id']}")
+            continue
+        targets[message_id] = info
+    timings['lookup'] = time.perf_counter() - started
+
+    # Phase 2: reactions, one channel resolution per channel
+    started = time.perf_counter()
+    by_channel = {}
+    for message_id, info in targets.items():
+        by_channel.setdefault(int(info['channel_id']), []).append(message_id)
+    semaphore = asyncio.Semaphore(RSVP_SYNC_CONCURRENCY)
+
+    async def read_channel(channel_id, channel_message_ids):
         async with semaphore:
-            try:
-                # For each managed message, get its channel ID with timeout
-                try:
-                    match_data = await asyncio.wait_for(
-                        get_message_channel_from_web_ui(message_id),
-                        timeout=10.0
-                    )
-                    if not match_data or not isinstance(match_data, dict):
-                        logger.warning(f"Could not find message info for message {message_id}")
-                        return
-                    
-                    if 'channel_id' not in match_data:
-                        logger.warning(f"Could not find channel ID for message {message_id}")
-                        return
-                        
-                    # Skip old matches (older than 7 days) to avoid processing massive backlogs
-                    if not match_data.get('is_recent_match', True):
-                        logger.debug(f"Skipping old match (date: {match_data.get('match_date')}) for message {message_id}")
-                        return
-                except asyncio.TimeoutError:
-                    logger.error(f"Timeout getting channel for message {message_id}")
-                    failed_count += 1
-                    return
-                    
-                channel_id = int(match_data['channel_id'])
-                match_id = match_data.get('match_id')
-                team_id = match_data.get('team_id')
-                
-                if not match_id or not team_id:
-                    logger.warning(f"Missing match_id or team_id for message {message_id}")
-                    return
-                    
-                # Get Discord reactions for this message
-                discord_rsvps = await get_message_reactions(channel_id, message_id)
-                
-                # Get Flask RSVPs for the match
-                flask_rsvps = await get_flask_rsvps(match_id, team_id)
-                
-                if not flask_rsvps:
-                    logger.warning(f"Could not fetch RSVPs from Flask for match {match_id}")
-                    return
-                    
-                # Add a short yield to prevent blocking the event loop for too long
-                await asyncio.sleep(0.1)
-                
-                # Compare and reconcile differences
-                reconciliation_needed = await reconcile_rsvps(
-                    match_id, team_id, discord_rsvps, flask_rsvps, channel_id, message_id, force_sync
-                )
-                
-                # Add another short yield
-                await asyncio.sleep(0.1)
-                
-                if reconciliation_needed or force_sync:
-                    # Update the embed with latest data from Flask (source of truth)
-                    success = await update_embed_for_message(message_id, channel_id, match_id, team_id, bot)
-                    if success:
-                        synced_count += 1
-                        logger.info(f"Successfully synced RSVPs for match {match_id}, message {message_id}")
-                    else:
-                        failed_count += 1
-                        logger.error(f"Failed to sync RSVPs for match {match_id}, message {message_id}")
-                else:
-                    synced_count += 1
-                    logger.debug(f"No sync needed for match {match_id}, message {message_id}")
-                    
-            except Exception as e:
-                logger.error(f"Error syncing message {message_id}: {str(e)}")
-                failed_count += 1
-    
-    # Create tasks for all messages and wait for them to complete with a timeout
-    tasks = [process_message(message_id) for message_id in message_ids]
-    
-    # Break the sync operation into smaller chunks with yields to prevent blocking
-    # This way even if RSVP sync takes a long time, it won't block the heartbeat
-    for i in range(0, len(tasks), 5):
-        chunk = tasks[i:i+5]
-        try:
-            # Process each chunk with a timeout to prevent blocking too long
-            await asyncio.gather(*chunk, return_exceptions=True)
-            # Short yield after each chunk
-            await asyncio.sleep(0.5)
-        except Exception as e:
-            logger.error(f"Error processing chunk {i//5}: {e}")
-    
-    logger.info(f"RSVP sync completed: {synced_count} synced, {failed_count} failed")
-    return {'synced': synced_count, 'failed': failed_count}
+            return await collect_channel_reactions(channel_id, channel_message_ids)
+
+    fetched = {}
+    for result in await asyncio.gather(
+        *(read_channel(channel_id, ids) for channel_id, ids in by_channel.items()),
+        return_exceptions=True,
+    ):
+        if isinstance(result, Exception):
+            logger.error(f"Error reading channel reactions: {result}")
+            continue
+        fetched.update(result)
+    failed_count += len(targets) - len(fetched)
+    timings['reactions'] = time.perf_counter() - started
+
+    # Phase 3: diff in memory, reconcile only real mismatches
+    started = time.perf_counter()
+    reconciled = set()
+
+    async def reconcile_message(message_id):
+        info = targets[message_id]
+        _, discord_rsvps = fetched[message_id]
+        flask_rsvps = flask_rsvps_from_state(info['rsvps'])
+        if discord_rsvps == flask_rsvps and not force_sync:
+            return
+        async with semaphore:
+            if await reconcile_rsvps(
+                info['match_id'], info['team_id'], discord_rsvps, flask_rsvps,
+                int(info['channel_id']), message_id, force_sync
+            ):
+                reconciled.add(message_id)
+
+    results = await asyncio.gather(*(reconcile_message(m) for m in fetched), return_exceptions=True)
+    for message_id, result in zip(list(fetched), results):
+        if isinstance(result, Exception):
+            logger.error(f"Error syncing message {message_id}: {str(result)}")
+            failed_count += 1
+            fetched.pop(message_id)
+    timings['reconcile'] = time.perf_counter() - started
+
+    # Phase 4: embeds whose tallies changed
+    started = time.perf_counter()
+
+    async def refresh_embed(message_id):
+        info = targets[message_id]
+        message, _ = fetched[message_id]
+        match_id, team_id, channel_id = info['match_id'], info['team_id'], int(info['channel_id'])
+        async with semaphore:
+            if message_id in reconciled or not message.embeds:
+                # Flask may have changed during reconciliation; re-read it.
+                return await update_embed_for_message(message_id, channel_id, match_id, team_id, bot)
+            existing = message.embeds[0]
+            expected = rsvp_embed_fields(info['rsvps'])
+            current = [(field.name, field.value) for field in existing.fields]
+            if not force_sync and rsvp_embed_hash(current) == rsvp_embed_hash(expected):
+                embed_coalescer.record_patch(skipped=True)
+                return None
+            embed = build_rsvp_embed(existing, info['rsvps'], existing.title, existing.description)
+            await message.edit(embed=embed)
+            embed_coalescer.record_patch(skipped=False)
+            return True
+
+    results = await asyncio.gather(*(refresh_embed(m) for m in fetched), return_exceptions=True)
+    for message_id, result in zip(list(fetched), results):
+        match_id = targets[message_id]['match_id']
+        if isinstance(result, Exception) or result is False:
+            failed_count += 1
+            logger.error(f"Failed to sync RSVPs for match {match_id}, message {message_id}: {result}")
+            continue
+        synced_count += 1
+        if result:
+            embeds_updated += 1
+            logger.info(f"Successfully synced RSVPs for match {match_id}, message {message_id}")
+        else:
+            logger.debug(f"No sync needed for match {match_id}, message {message_id}")
+    timings['embeds'] = time.perf_counter() - started
+
+    timings = {phase: round(seconds, 3) for phase, seconds in timings.items()}
+    logger.info(
+        f"RSVP sync completed: {synced_count} synced, {failed_count} failed, "
+        f"{len(reconciled)} reconciled, {embeds_updated} embeds updated; "
+        f"timings {timings}"
+    )
+    return {
+        'synced': synced_count,
+        'failed': failed_count,
+        'reconciled': len(reconciled),
+        'embeds_updated': embeds_updated,
+        'timings': timings,
+    }
 
 async def get_message_channel_from_web_ui(message_id):
     """
@@ -1117,31 +1250,18 @@ class RsvpSemaphore:
     """
     Semaphore to limit concurrent RSVP operations per match.
     This prevents too many operations happening at once for the same match.
+    A match's semaphore only exists while an RSVP for it is in flight.
     """
     def __init__(self):
-        self.semaphores = {}  # match_id -> semaphore
-        
-    def get_semaphore(self, match_id, max_concurrent=2):
-        """Get a semaphore for the given match ID, creating one if it doesn't exist."""
-        if match_id not in self.semaphores:
-            self.semaphores[match_id] = asyncio.Semaphore(max_concurrent)
-        return self.semaphores[match_id]
-    
-    def release_semaphore(self, match_id):
-        """Release the semaphore for a match ID if it exists."""
-        if match_id in self.semaphores:
-            try:
-                self.semaphores[match_id].release()
-            except ValueError:  # Released too many times
-                pass
-    
+        self.semaphores = KeyedRegistry()  # match_id -> semaphore, while held
+
+    def hold(self, match_id, max_concurrent=2):
+        """Async context manager limiting concurrent RSVP operations for match_id."""
+        return self.semaphores.hold(match_id, limit=max_concurrent)
+
     def cleanup(self, match_id=None):
         """Remove semaphores to free memory."""
-        if match_id:
-            if match_id in self.semaphores:
-                del self.semaphores[match_id]
-        else:
-            self.semaphores.clear()
+        self.semaphores.release_holds(match_id)
 
 # Create a global semaphore manager
 rsvp_semaphore = RsvpSemaphore()
@@ -1186,11 +1306,8 @@ async def sync_rsvp_with_web_ui(match_id, discord_id, response):
         }
         logger.info(f"🤖 Processing Pub League RSVP (Enterprise) for match {match_id}, operation_id={operation_id}")
 
-    # Get the semaphore for this match
-    semaphore = rsvp_semaphore.get_semaphore(match_id)
-    
-    # Use the semaphore to limit concurrent operations
-    async with semaphore:
+    # Use the match's semaphore to limit concurrent operations
+    async with rsvp_semaphore.hold(match_id):
         # Try with retries and exponential backoff
         max_retries = 3
         base_delay = 1  # Start with 1 second delay
@@ -1440,6 +1557,14 @@ async def get_user_team_id(discord_id: str, match_id: int) -> int:
 async def update_discord_embed(match_id):
     """
     Updates the Discord embed for a given match.
+    Requests within a short window are coalesced into a single refresh
+    (see embed_coalescer), so a burst of RSVPs costs one round of edits.
+    """
+    return await embed_coalescer.request(match_id, lambda: _refresh_discord_embed(match_id))
+
+async def _refresh_discord_embed(match_id):
+    """
+    Asks the REST API to re-render the match's embeds.
     Has retry logic for failed connections.
     Handles both regular pub league and ECS FC matches.
     """
@@ -335,6 +335,17 @@ async def update_availability_embed(match_id: str, bot: commands.Bot = Depends(g
         return {"status": "error", "message": f"Internal error: {str(e)}"}
 
 
+@router.get("/api/embed_updates/stats")
+async def get_embed_update_stats():
+    """
+    Counts from the RSVP embed coalescer: refresh requests, how many were
+    merged into an already-pending refresh, and message edits sent vs skipped
+    because the rendered embed was unchanged.
+    """
+    from embed_coalescer import embed_coalescer
+    return {"status": "success", "stats": embed_coalescer.get_stats()}
+
+
 @router.post("/channels/{channel_id}/threads")
 async def create_thread(channel_id: int, request: dict, bot: commands.Bot = Depends(get_bot)):
     logger.info(f"Attempting to create thread '{request['name']}' in channel {channel_id}")
@@ -4,6 +4,7 @@ import logging
 import discord
 import asyncio
 import aiohttp
+import hashlib
 import os
 from datetime import datetime
 from typing import Tuple, Optional, Union
@@ -11,6 +12,7 @@ from pydantic import BaseModel, Field
 from discord.ext import commands
 from aiohttp import ClientError
 from api.models.schemas import AvailabilityRequest, EmbedField, EmbedData
+from embed_coalescer import embed_coalescer, embed_content_hash
 
 # Environment variables
 WEBUI_API_URL = os.getenv("WEBUI_API_URL")
@@ -84,6 +86,47 @@ def _embed_colour(embed, default=0x00ff00):
     return default
 
 
+def rsvp_embed_fields(rsvp_data):
+    """The (name, value) of the three tally fields an RSVP embed shows."""
+    fields = []
+    for status in ['yes', 'no', 'maybe']:
+        players = rsvp_data.get(status, [])
+        player_names = ', '.join([player.get('player_name', 'Unknown') for player in players]) or "None"
+        emoji = get_emoji_for_response(status)
+        fields.append((f"{emoji} {status.capitalize()} ({len(players)})", player_names))
+    return fields
+
+
+def rsvp_embed_hash(fields):
+    """Stable digest of embed tally fields, to tell whether an edit would change anything."""
+    digest = hashlib.sha1()
+    for name, value in fields:
+        digest.update(f"{name}\x1f{value}\x1e".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def build_rsvp_embed(existing, rsvp_data, fallback_title, fallback_description):
+    """
+    Rebuild an RSVP embed with fresh tallies, keeping the title, description,
+    colour and footer the original post carried (they are admin-editable in
+    the web app and only rendered at post time).
+    """
+    embed = discord.Embed(
+        title=(existing.title if existing and existing.title else fallback_title),
+        description=(existing.description if existing and existing.description
+                     else fallback_description),
+        # Only a Colour/int is valid here. Reading .color off an arbitrary
+        # embed object and passing it straight through raises TypeError for
+        # anything else, which would fail the whole update.
+        color=_embed_colour(existing)
+    )
+    if existing and existing.footer and existing.footer.text:
+        embed.set_footer(text=existing.footer.text)
+    for name, value in rsvp_embed_fields(rsvp_data):
+        embed.add_field(name=name, value=value, inline=False)
+    return embed
+
+
 async def update_embed_message_with_players(message, rsvp_data):
     """
     Update the embed with both the current reaction counts and the player names.
@@ -332,34 +375,22 @@ async def update_embed_for_message(message_id: str, channel_id: str, match_id: i
         # back rather than trying to re-derive it (the bot has no access to the
         # settings that produced it).
         existing = message.embeds[0] if message.embeds else None
-        embed = discord.Embed(
-            title=(existing.title if existing and existing.title
-                   else f"{team_name} vs {opponent_name}"),
-            description=(existing.description if existing and existing.description
-                         else f"Date: {match_date}\nTime: {match_time}"),
-            # Only a Colour/int is valid here. Reading .color off an arbitrary
-            # embed object and passing it straight through raises TypeError for
-            # anything else, which would fail the whole update.
-            color=_embed_colour(existing)
+        embed = build_rsvp_embed(
+            existing, rsvp_data,
+            f"{team_name} vs {opponent_name}",
+            f"Date: {match_date}\nTime: {match_time}",
         )
-        if existing and existing.footer and existing.footer.text:
-            embed.set_footer(text=existing.footer.text)
 
-        # Add fields for each RSVP status with proper player lists
-        for status in ['yes', 'no', 'maybe']:
-            players = rsvp_data.get(status, [])
-            player_names = ', '.join([player.get('player_name', 'Unknown') for player in players]) or "None"
-            emoji = get_emoji_for_response(status)
-            embed.add_field(
-                name=f"{emoji} {status.capitalize()} ({len(players)})",
-                value=player_names,
-                inline=False
-            )
-            logger.debug(f"Added {status} field with {len(players)} players")
+        # Nothing to PATCH if the posted embed already shows exactly this.
+        if existing is not None and embed_content_hash(existing) == embed_content_hash(embed):
+            embed_coalescer.record_patch(skipped=True)
+            logger.debug(f"Embed for message {message_id} unchanged, skipping edit")
+            return True
 
         # Update the message with the new embed
         try:
             await message.edit(embed=embed)
+            embed_coalescer.record_patch(skipped=False)
             logger.info(f"Successfully updated embed for message {message_id} in channel {channel_id}")
             return True
         except discord.HTTPException as e:
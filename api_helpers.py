@@ -1,42 +1,137 @@
 # api_helpers.py
 
 import aiohttp
+import asyncio
 import json
+import logging
+import random
 from datetime import datetime, timedelta
 from config import BOT_CONFIG
 from database import (
     get_latest_order_id, 
-    update_woo_orders, 
-    insert_order_extract, 
+    get_orders_for_product,
+    get_orders_modified_after,
+    insert_order_extracts,
     update_latest_order_id,
+    upsert_woo_orders,
 )
 
+logger = logging.getLogger(__name__)
+
 wc_url = BOT_CONFIG["wc_url"]
 wc_key = BOT_CONFIG["wc_key"]
 wc_secret = BOT_CONFIG["wc_secret"]
 openweather_api = BOT_CONFIG["openweather_api"]
 serpapi_api = BOT_CONFIG["serpapi_api"]
 
+# Connection pool shared by every outbound request from the bot.
+HTTP_POOL_LIMIT = 20
+HTTP_POOL_LIMIT_PER_HOST = 8
+HTTP_TIMEOUT_SECONDS = 30
 
-async def send_async_http_request(
-    url, method="GET", headers=None, auth=None, data=None, params=None
-):
-    async with aiohttp.ClientSession() as session:
-        try:
+# Retry policy for rate limiting (429) and transient server errors (5xx).
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 0.5
+MAX_RETRY_AFTER_SECONDS = 30
+
+# WooCommerce pages fetched at once after the first page reports the total.
+WC_PAGE_WINDOW = 4
+WC_PER_PAGE = 100
+
+
+class SharedHttpClient:
+    """
+    One pooled aiohttp session for the bot's outbound API calls.
+
+    Keep-alive connections (and their TLS sessions) are reused across
+    requests instead of opening a new ClientSession per call. The session is
+    created lazily on the running loop and recreated if it was closed or the
+    loop changed.
+    """
+
+    def __init__(self, limit=HTTP_POOL_LIMIT, limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                 timeout=HTTP_TIMEOUT_SECONDS):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self._session = None
+        self._loop = None
+
+    def get_session(self):
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host, ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._loop = loop
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    async def request(self, method, url, headers=None, auth=None, data=None, params=None):
+        """
+        Send a request, retrying 429/5xx responses with exponential backoff
+        (honouring Retry-After when the server sends one).
+
+        Returns (status, json_body_or_None, response_headers).
+        """
+        session = self.get_session()
+        for attempt in range(MAX_RETRIES + 1):
             async with session.request(
                 method, url, headers=headers, auth=auth, data=data, params=params
             ) as response:
                 if response.status == 200:
-                    return await response.json()
-                else:
-                    print(f"Request failed with status code: {response.status}")
-                    return None
-        except aiohttp.ClientError as e:
-            print(f"Client error occurred: {e}")
-            return None
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-            return None
+                    return response.status, await response.json(), response.headers
+                if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    return response.status, None, response.headers
+                delay = _retry_delay(response.headers.get("Retry-After"), attempt)
+            logger.warning(
+                f"{method} {url.split('?')[0]} returned {response.status}; "
+                f"retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+
+def _retry_delay(retry_after, attempt):
+    try:
+        return min(float(retry_after), MAX_RETRY_AFTER_SECONDS)
+    except (TypeError, ValueError):
+        backoff = BACKOFF_BASE_SECONDS * (2 ** attempt)
+        return backoff + random.uniform(0, BACKOFF_BASE_SECONDS)
+
+
+http_client = SharedHttpClient()
+
+
+async def close_http_client():
+    await http_client.close()
+
+
+async def send_async_http_request(
+    url, method="GET", headers=None, auth=None, data=None, params=None
+):
+    try:
+        status, body, _ = await http_client.request(
+            method, url, headers=headers, auth=auth, data=data, params=params
+        )
+        if status == 200:
+            return body
+        print(f"Request failed with status code: {status}")
+        return None
+    except aiohttp.ClientError as e:
+        print(f"Client error occurred: {e}")
+        return None
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return None
 
 
 async def call_woocommerce_api(url):
@@ -44,6 +139,66 @@ async def call_woocommerce_api(url):
     return await send_async_http_request(url, auth=auth)
 
 
+async def fetch_woocommerce_pages(url, per_page=WC_PER_PAGE, window=WC_PAGE_WINDOW, strict=False):
+    """
+    Fetch every page of a WooCommerce list endpoint and return the items in
+    page order.
+
+    The first page's X-WP-TotalPages header gives the page count; the
+    remaining pages are then fetched concurrently, at most `window` at a
+    time. Without the header, pages are walked one by one until a short page.
+    As with the serial pagers, a failed page ends the list there; with
+    strict=True any failed page returns None instead.
+    """
+    separator = "&" if "?" in url else "?"
+
+    def page_url(page):
+        return f"{url}{separator}page={page}&per_page={per_page}"
+
+    auth = aiohttp.BasicAuth(wc_key, wc_secret)
+    try:
+        status, first_page, headers = await http_client.request("GET", page_url(1), auth=auth)
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return []
+    if status != 200 or not isinstance(first_page, list):
+        print(f"Request failed with status code: {status}")
+        return None if strict else []
+
+    items = list(first_page)
+    try:
+        total_pages = int(headers.get("X-WP-TotalPages"))
+    except (TypeError, ValueError):
+        total_pages = None
+
+    if total_pages is None:
+        page, last_page = 1, first_page
+        while len(last_page) >= per_page:
+            page += 1
+            last_page = await call_woocommerce_api(page_url(page))
+            if not isinstance(last_page, list):
+                if strict:
+                    return None
+                break
+            items.extend(last_page)
+        return items
+
+    semaphore = asyncio.Semaphore(window)
+
+    async def fetch(page):
+        async with semaphore:
+            return await call_woocommerce_api(page_url(page))
+
+    remaining = await asyncio.gather(*(fetch(page) for page in range(2, total_pages + 1)))
+    for page_items in remaining:
+        if not isinstance(page_items, list):
+            if strict:
+                return None
+            break
+        items.extend(page_items)
+    return items
+
+
 async def fetch_espn_data(endpoint):
     base_url = "https://site.api.espn.com/apis/site/v2/"
     full_url = base_url + endpoint
@@ -98,55 +253,73 @@ async def check_new_orders(product_id):
         return False
 
 
+# How far back each sync's high-water mark is set from the moment it started.
+# Pages are fetched concurrently, so an order modified mid-sync can move to a
+# page already read; the next sync re-reads this window and picks it up. The
+# margin also absorbs clock skew between us and the store.
+WOO_SYNC_OVERLAP = timedelta(minutes=10)
+
+
+async def sync_woo_orders():
+    """
+    Bring the local order mirror up to date: fetch orders modified since the
+    last sync (everything on the first run) and write them in one bulk
+    transaction. Returns the number of orders written, or None if any page
+    failed (the high-water mark is then left where it was).
+
+    The next mark is this sync's start time less WOO_SYNC_OVERLAP, not the
+    newest date_modified seen: anything modified after the sync started may
+    have been missed, so it must fall inside the next window.
+    """
+    started = datetime.utcnow()
+    modified_after = get_orders_modified_after()
+    query = "orderby=modified&order=desc&status=any"
+    if modified_after:
+        query += f"&modified_after={modified_after}&dates_are_gmt=true"
+    orders_url = f"{wc_url.rstrip('/')}?{query}"
+    orders = await fetch_woocommerce_pages(orders_url, strict=True)
+    if orders is None:
+        logger.warning("WooCommerce order sync incomplete; keeping previous high-water mark")
+        return None
+    synced_through = (started - WOO_SYNC_OVERLAP).strftime("%Y-%m-%dT%H:%M:%S")
+    written = await asyncio.to_thread(upsert_woo_orders, orders, synced_through)
+    logger.info(f"Synced {written} WooCommerce orders modified after {modified_after or 'the beginning'}")
+    return written
+
+
 async def update_orders_from_api(product_id):
-    new_orders_count = 0
-    page = 1
-    latest_order_updated = False
+    await sync_woo_orders()
+    product_id = int(product_id)
+    orders = get_orders_for_product(product_id)
+    if orders:
+        update_latest_order_id(str(orders[0].get("id", "")))
 
-    while True:
-        orders_url = wc_url.replace("orders/", f"orders?order=desc&product={product_id}&page={page}")
-        fetched_orders = await call_woocommerce_api(orders_url)
+    extract_rows = []
+    for order in orders:
+        billing_info = order.get("billing", {})
+        for item in order.get("line_items", []):
+            if item["product_id"] == product_id:
+                billing_address = ", ".join(
+                    [
+                        billing_info.get(key, "N/A") 
+                        for key in ["address_1", "address_2", "city", "state", "postcode", "country"]
+                    ]
+                )
 
-        if not fetched_orders:
-            break
+                extract_rows.append((
+                    order["number"],
+                    item["name"],
+                    billing_info.get("first_name", "N/A"),
+                    billing_info.get("last_name", "N/A"),
+                    billing_info.get("email", "N/A"),
+                    order.get("date_paid", "N/A"),
+                    str(item.get("quantity", 0)),
+                    str(item.get("price", "N/A")),
+                    order["status"],
+                    order.get("customer_note", "N/A"),
+                    item.get("variation_id", "N/A"),
+                    billing_address,
+                ))
 
-        for index, order in enumerate(fetched_orders):
-            billing_info = order.get("billing", {})
-            order_id = str(order.get("id", ""))
-
-            if index == 0 and not latest_order_updated:
-                update_latest_order_id(order_id)
-                latest_order_updated = True
-
-            order_data = json.dumps(order)
-            update_woo_orders(order_id, order_data)
-
-            for item in order.get("line_items", []):
-                if item["product_id"] == product_id:
-                    billing_address = ", ".join(
-                        [
-                            billing_info.get(key, "N/A") 
-                            for key in ["address_1", "address_2", "city", "state", "postcode", "country"]
-                        ]
-                    )
-
-                    insert_order_extract(
-                        order["number"],
-                        item["name"],
-                        billing_info.get("first_name", "N/A"),
-                        billing_info.get("last_name", "N/A"),
-                        billing_info.get("email", "N/A"),
-                        order.get("date_paid", "N/A"),
-                        str(item.get("quantity", 0)),
-                        str(item.get("price", "N/A")),
-                        order["status"],
-                        order.get("customer_note", "N/A"),
-                        item.get("variation_id", "N/A"),
-                        billing_address
-                    )
-
-            new_orders_count += 1
-
-        page += 1
-
-    return new_orders_count
\ No newline at end of file
+    insert_order_extracts(extract_rows)
+    return len(orders)
@@ -2,12 +2,19 @@
 
 import sqlite3
 import json
+import re
 from contextlib import contextmanager
+from utils import extract_designation, normalize_string
 
 PREDICTIONS_DB_PATH = "predictions.db"
 ORDERS_DB_PATH = "woo_orders.db"
 PUB_LEAGUE_DB_PATH = "pub_league.db"
 
+# Columns extracted from order_data at write time so subgroup, email and
+# product lookups use indexes instead of scanning the JSON.
+WOO_ORDER_COLUMNS = ["email", "first_name", "last_name", "date_created", "date_modified", "status"]
+YEAR_PATTERN = re.compile(r"\b(\d{4})\b")
+
 
 def get_latest_order_id():
     with get_db_connection(ORDERS_DB_PATH) as conn:
@@ -17,54 +24,63 @@ def get_latest_order_id():
         return result[0] if result else None
 
 
-def count_orders_for_multiple_subgroups(subgroups):
-    counts = {}
-    with get_db_connection(ORDERS_DB_PATH) as conn:
-        c = conn.cursor()
-        for subgroup in subgroups:
-            query = """
-                SELECT COUNT(DISTINCT order_id) FROM woo_orders
-                WHERE order_data LIKE ?
-            """
-            wildcard_subgroup_name = (
-                f'%"name": "Subgroup designation", "value": "{subgroup}"%'
-            )
-            c.execute(query, (wildcard_subgroup_name,))
-            result = c.fetchone()
-            counts[subgroup] = result[0] if result else 0
-    return counts
-
-
-def get_members_for_subgroup(subgroup):
-    members = []
+def _match_subgroups(subgroups, designation):
+    """Subgroups whose normalized name appears in a normalized designation
+    (same rule as utils.find_customer_info_in_order)."""
+    return [subgroup for subgroup in subgroups if normalize_string(subgroup) in designation]
+
+
+def get_subgroup_members(subgroups, membership_year=None, created_after=None, created_before=None):
+    """
+    Members per subgroup from the indexed order columns, newest order first,
+    de-duplicated on (first name, last name, email).
+
+    membership_year limits to orders containing that year's ECS Membership;
+    created_after/created_before bound the order creation date (exclusive,
+    WooCommerce's local-time format).
+    """
+    query = """
+        SELECT s.designation, o.first_name, o.last_name, o.email
+        FROM woo_order_subgroups s
+        JOIN woo_orders o ON o.order_id = s.order_id
+        WHERE 1=1
+    """
+    params = []
+    if membership_year is not None:
+        query += " AND s.membership_year = ?"
+        params.append(membership_year)
+    if created_after is not None:
+        query += " AND o.date_created > ?"
+        params.append(created_after)
+    if created_before is not None:
+        query += " AND o.date_created < ?"
+        params.append(created_before)
+    query += """
+        GROUP BY s.designation, o.first_name, o.last_name, o.email
+        ORDER BY MAX(o.date_created) DESC
+    """
+    members = {subgroup: [] for subgroup in subgroups}
     with get_db_connection(ORDERS_DB_PATH) as conn:
         c = conn.cursor()
-        query = """
-            SELECT DISTINCT order_data FROM woo_orders
-            WHERE order_data LIKE ?
-        """
-        wildcard_subgroup_name = (
-            f'%"name": "Subgroup designation", "value": "{subgroup}"%'
-        )
-        c.execute(query, (wildcard_subgroup_name,))
-
-        for row in c.fetchall():
-            order_data = json.loads(row[0])
-            billing_info = order_data.get("billing", {})
+        c.execute(query, params)
+        for designation, first_name, last_name, email in c.fetchall():
             member = {
-                "first_name": billing_info.get("first_name", ""),
-                "last_name": billing_info.get("last_name", ""),
-                "email": billing_info.get("email", ""),
+                "first_name": first_name or "",
+                "last_name": last_name or "",
+                "email": email or "",
             }
-            if member not in members:
-                members.append(member)
-
-    return members
+            for subgroup in _match_subgroups(subgroups, designation):
+                if member not in members[subgroup]:
+                    members[subgroup].append(member)
+    return {subgroup: found for subgroup, found in members.items() if found}
 
 
 @contextmanager
 def get_db_connection(db_path):
     conn = sqlite3.connect(db_path)
+    if db_path == ORDERS_DB_PATH:
+        # WAL is persistent on the file; NORMAL sync is safe under WAL.
+        conn.execute("PRAGMA synchronous=NORMAL")
     try:
         yield conn
     finally:
@@ -164,9 +180,11 @@ def reset_woo_orders_db():
         c.execute(
             """DELETE FROM woo_orders WHERE 1=1"""
         )
+        c.execute("DELETE FROM woo_order_products")
+        c.execute("DELETE FROM woo_order_subgroups")
         c.execute("""
             UPDATE latest_order_info 
-            SET latest_order_id = '0'
+            SET latest_order_id = '0', last_modified = NULL
             WHERE id = 1
         """)
         conn.commit()
@@ -175,10 +193,44 @@ def reset_woo_orders_db():
 def initialize_woo_orders_db():
     with get_db_connection(ORDERS_DB_PATH) as conn:
         c = conn.cursor()
+        c.execute("PRAGMA journal_mode=WAL")
         c.execute(
             """CREATE TABLE IF NOT EXISTS woo_orders
                      (order_id TEXT PRIMARY KEY, order_data TEXT)"""
         )
+        c.execute("PRAGMA table_info(woo_orders)")
+        columns = [row[1] for row in c.fetchall()]
+        added_columns = False
+        for column in WOO_ORDER_COLUMNS:
+            if column not in columns:
+                c.execute(f"ALTER TABLE woo_orders ADD COLUMN {column} TEXT")
+                added_columns = True
+        c.execute("CREATE INDEX IF NOT EXISTS idx_woo_orders_email ON woo_orders (email)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_woo_orders_created ON woo_orders (date_created)")
+        c.execute(
+            """CREATE INDEX IF NOT EXISTS idx_woo_orders_email_order
+                     ON woo_orders (lower(email), CAST(order_id AS INTEGER))"""
+        )
+        c.execute(
+            """CREATE TABLE IF NOT EXISTS woo_order_products
+                     (order_id TEXT,
+                      product_id INTEGER,
+                      PRIMARY KEY (order_id, product_id))"""
+        )
+        c.execute(
+            "CREATE INDEX IF NOT EXISTS idx_woo_order_products_product ON woo_order_products (product_id)"
+        )
+        c.execute(
+            """CREATE TABLE IF NOT EXISTS woo_order_subgroups
+                     (order_id TEXT,
+                      designation TEXT,
+                      membership_year INTEGER,
+                      PRIMARY KEY (order_id, designation, membership_year))"""
+        )
+        c.execute(
+            """CREATE INDEX IF NOT EXISTS idx_woo_order_subgroups_year
+                     ON woo_order_subgroups (membership_year, designation)"""
+        )
         c.execute(
             """CREATE TABLE IF NOT EXISTS order_extract
                      (order_id TEXT PRIMARY KEY,
@@ -199,11 +251,19 @@ def initialize_woo_orders_db():
                      (id INTEGER PRIMARY KEY,
                       latest_order_id TEXT)"""
         )
+        c.execute("PRAGMA table_info(latest_order_info)")
+        if 'last_modified' not in [row[1] for row in c.fetchall()]:
+            c.execute("ALTER TABLE latest_order_info ADD COLUMN last_modified TEXT")
         c.execute("""
             INSERT INTO latest_order_info (id, latest_order_id)
             VALUES (1, '0')
             ON CONFLICT(id) DO NOTHING
         """)
+        if added_columns:
+            # Orders mirrored before the indexed columns existed.
+            c.execute("SELECT order_id, order_data FROM woo_orders")
+            existing = [(order_id, json.loads(data)) for order_id, data in c.fetchall()]
+            _write_orders(c, existing)
         conn.commit()
 
 
@@ -239,6 +299,16 @@ def insert_order_extract(order_id, product_name, first_name, last_name, email_ad
         conn.commit()
 
 
+def insert_order_extracts(rows):
+    """Bulk insert_order_extract: one transaction for many extract rows."""
+    with get_db_connection(ORDERS_DB_PATH) as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO order_extract (order_id, product_name, first_name, last_name, email_address, order_date, item_qty, item_price, order_status, order_note, product_variation, billing_address) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+
+
 def get_order_extract(product_title):
     with get_db_connection(ORDERS_DB_PATH) as conn:
         conn.row_factory = sqlite3.Row
@@ -257,13 +327,146 @@ def prep_order_extract():
 
 
 def update_woo_orders(order_id, order_data):
+    with get_db_connection(ORDERS_DB_PATH) as conn:
+        _write_orders(conn.cursor(), [(order_id, json.loads(order_data))])
+        conn.commit()
+
+
+def upsert_woo_orders(orders, synced_through=None):
+    """
+    Mirror a batch of WooCommerce orders in one transaction. When
+    synced_through is given (GMT, WooCommerce's ISO format), the sync
+    high-water mark advances to it in the same transaction; it never moves
+    backwards. Returns the number of orders written.
+    """
     with get_db_connection(ORDERS_DB_PATH) as conn:
         c = conn.cursor()
-        c.execute(
-            "INSERT OR REPLACE INTO woo_orders (order_id, order_data) VALUES (?, ?)",
-            (order_id, order_data),
-        )
+        if orders:
+            _write_orders(c, [(str(order.get("id", "")), order) for order in orders])
+        if synced_through:
+            c.execute("""
+                UPDATE latest_order_info
+                SET last_modified = ?
+                WHERE id = 1 AND (last_modified IS NULL OR last_modified < ?)
+            """, (synced_through, synced_through))
         conn.commit()
+    return len(orders or [])
+
+
+def get_orders_modified_after():
+    with get_db_connection(ORDERS_DB_PATH) as conn:
+        c = conn.cursor()
+        c.execute("SELECT last_modified FROM latest_order_info WHERE id = 1")
+        result = c.fetchone()
+        return result[0] if result else None
+
+
+def get_orders_for_product(product_id):
+    with get_db_connection(ORDERS_DB_PATH) as conn:
+        c = conn.cursor()
+        c.execute("""
+            SELECT o.order_data FROM woo_order_products p
+            JOIN woo_orders o ON o.order_id = p.order_id
+            WHERE p.product_id = ?
+            ORDER BY CAST(o.order_id AS INTEGER) DESC
+        """, (int(product_id),))
+        return [json.loads(row[0]) for row in c.fetchall()]
+
+
+def iter_orders_for_products(product_ids, statuses=("processing", "completed"), batch_size=200):
+    """
+    Yield mirrored orders containing any of product_ids, ordered by billing
+    email (case-insensitive) then order id, fetching batch_size rows at a
+    time so a large export never holds every order in memory.
+
+    The connection is opened on first iteration, so the generator can be
+    created on one thread and consumed on another.
+    """
+    product_ids = [int(product_id) for product_id in product_ids]
+    if not product_ids:
+        return
+    product_marks = ", ".join("?" * len(product_ids))
+    status_marks = ", ".join("?" * len(statuses))
+    query = f"""
+        SELECT o.order_data FROM woo_orders o
+        WHERE o.status IN ({status_marks})
+          AND o.order_id IN (
+              SELECT order_id FROM woo_order_products WHERE product_id IN ({product_marks})
+          )
+        ORDER BY lower(o.email), CAST(o.order_id AS INTEGER)
+    """
+    with get_db_connection(ORDERS_DB_PATH) as conn:
+        c = conn.cursor()
+        c.execute(query, (*statuses, *product_ids))
+        while True:
+            rows = c.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield json.loads(row[0])
+
+
+def _write_orders(c, orders):
+    """Upsert (order_id, order) pairs with their indexed columns and
+    product/subgroup rows."""
+    order_rows, product_rows, subgroup_rows = [], [], []
+    for order_id, order in orders:
+        billing = order.get("billing") or {}
+        order_rows.append((
+            order_id,
+            json.dumps(order),
+            (billing.get("email") or "").strip(),
+            billing.get("first_name", ""),
+            billing.get("last_name", ""),
+            order.get("date_created"),
+            order.get("date_modified_gmt") or order.get("date_modified"),
+            order.get("status"),
+        ))
+        line_items = order.get("line_items") or []
+        for product_id in {item.get("product_id") for item in line_items}:
+            if product_id:
+                product_rows.append((order_id, product_id))
+        # membership_year 0: subgroup designation without an ECS Membership.
+        years = _membership_years(line_items) or {0}
+        for designation in _subgroup_designations(line_items):
+            for year in years:
+                subgroup_rows.append((order_id, designation, year))
+
+    ids = [(row[0],) for row in order_rows]
+    c.executemany(
+        """INSERT OR REPLACE INTO woo_orders
+           (order_id, order_data, email, first_name, last_name, date_created, date_modified, status)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+        order_rows,
+    )
+    c.executemany("DELETE FROM woo_order_products WHERE order_id = ?", ids)
+    c.executemany("DELETE FROM woo_order_subgroups WHERE order_id = ?", ids)
+    c.executemany("INSERT OR IGNORE INTO woo_order_products VALUES (?, ?)", product_rows)
+    c.executemany("INSERT OR IGNORE INTO woo_order_subgroups VALUES (?, ?, ?)", subgroup_rows)
+
+
+def _subgroup_designations(line_items):
+    """Normalized 'Subgroup designation' meta values across an order's line items."""
+    designations = set()
+    for item in line_items:
+        for meta in item.get("meta_data") or []:
+            if normalize_string(meta.get("key", "")) == "subgroup designation":
+                designation = normalize_string(extract_designation(meta.get("value", "")))
+                if designation:
+                    designations.add(designation)
+    return designations
+
+
+def _membership_years(line_items):
+    """Years of the ECS Memberships in an order, using the same product-name
+    pattern as utils.find_customer_info_in_order."""
+    years = set()
+    for item in line_items:
+        name = normalize_string(item.get("name", ""))
+        for year in set(YEAR_PATTERN.findall(name)):
+            if re.search(rf"ecs membership(?:\s+\w+)*\s+{year}\b", name):
+                years.add(int(year))
+    return years
 
 
 def load_existing_dates():
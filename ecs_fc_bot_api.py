@@ -11,6 +11,7 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from shared_states import get_bot_instance, bot_ready
+from embed_coalescer import embed_coalescer, embed_content_hash
 import logging
 import discord
 import asyncio
@@ -324,8 +325,19 @@ async def update_rsvp_embed(match_id: int, bot: commands.Bot = Depends(get_bot))
         # Create updated embed with player names
         updated_embed = create_ecs_fc_embed(request, rsvp_details)
         
+        # Skip the edit when the posted embed already shows these RSVPs
+        existing = message.embeds[0] if message.embeds else None
+        if existing is not None and embed_content_hash(existing) == embed_content_hash(updated_embed):
+            embed_coalescer.record_patch(skipped=True)
+            logger.debug(f"ECS FC RSVP embed for match {match_id} unchanged, skipping edit")
+            return UpdateEmbedResponse(
+                success=True,
+                updated_message_id=str(message_id)
+            )
+
         # Update the message
         await message.edit(embed=updated_embed)
+        embed_coalescer.record_patch(skipped=False)
         
         logger.info(f"Successfully updated ECS FC RSVP embed for match {match_id}")
         
@@ -0,0 +1,127 @@
+# embed_coalescer.py
+
+"""
+RSVP Embed Update Coalescer
+
+Reactions tend to arrive in bursts before kickoff, and every RSVP used to ask
+for its own embed refresh (optimistic update, post-Flask update, retries).
+Each refresh re-renders and PATCHes the match's messages, spending the same
+Discord rate-limit budget the rest of the bot depends on.
+
+The coalescer debounces refreshes per match: the first request opens a short
+window, every request that arrives before the refresh starts joins it, and a
+single refresh runs when the window closes. Requests that arrive while a
+refresh is running open the next window, so the last change is never lost.
+
+Separately, update_embed_for_message compares a content hash of the rendered
+embed with the one already posted and skips the PATCH when they match; those
+skips are recorded here too so the counts live in one place.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+# How long a refresh waits for more requests to fold in before running.
+EMBED_DEBOUNCE_SECONDS = 0.75
+
+
+def embed_content_hash(embed) -> str:
+    """Stable digest of everything a PATCH would send for this embed."""
+    payload = json.dumps(embed.to_dict(), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class EmbedUpdateCoalescer:
+    """
+    Debounces embed refreshes per key (a match id).
+
+    Usage:
+        result = await embed_coalescer.request(match_id, lambda: refresh(match_id))
+
+    Every caller that joins a window gets the result of the single refresh
+    that served it.
+    """
+
+    def __init__(self, window: float = EMBED_DEBOUNCE_SECONDS):
+        self.window = window
+        # key -> future shared by every request waiting for the next refresh
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        # key -> the refresh currently in flight
+        self._running: Dict[Hashable, asyncio.Task] = {}
+        self.requested = 0
+        self.merged = 0
+        self.refreshed = 0
+        self.failed = 0
+        self.patches_skipped = 0
+        self.patches_sent = 0
+
+    async def request(self, key: Hashable, refresh: Callable[[], Awaitable[bool]]) -> bool:
+        """Ask for a refresh of key; returns the outcome of the refresh that covers it."""
+        self.requested += 1
+        future = self._pending.get(key)
+        if future is not None:
+            self.merged += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            asyncio.create_task(self._run(key, future, refresh))
+        # Shield so one caller giving up doesn't cancel the refresh for the rest.
+        return await asyncio.shield(future)
+
+    async def _run(self, key, future, refresh):
+        result = False
+        try:
+            await asyncio.sleep(self.window)
+            previous = self._running.get(key)
+            if previous is not None:
+                # Never run two refreshes of the same key at once; this one
+                # starts after the in-flight one so it sees the newer state.
+                await asyncio.gather(previous, return_exceptions=True)
+            # From here on, new requests open the next window.
+            if self._pending.get(key) is future:
+                del self._pending[key]
+            task = asyncio.current_task()
+            self._running[key] = task
+            try:
+                result = await refresh()
+                self.refreshed += 1
+            finally:
+                if self._running.get(key) is task:
+                    del self._running[key]
+        except Exception as e:
+            logger.error(f"Embed refresh for {key} failed: {e}")
+            self.failed += 1
+        finally:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+            if not future.done():
+                future.set_result(result)
+
+    def record_patch(self, skipped: bool):
+        """Count one message edit that was sent, or skipped because nothing changed."""
+        if skipped:
+            self.patches_skipped += 1
+        else:
+            self.patches_sent += 1
+
+    def get_stats(self) -> Dict:
+        """Get statistics about embed refreshes."""
+        return {
+            'requested': self.requested,
+            'merged': self.merged,
+            'refreshed': self.refreshed,
+            'failed': self.failed,
+            'patches_sent': self.patches_sent,
+            'patches_skipped': self.patches_skipped,
+            'pending': len(self._pending),
+            'running': len(self._running),
+        }
+
+
+# Shared by the bot and its REST API (they run in the same process).
+embed_coalescer = EmbedUpdateCoalescer()
@@ -0,0 +1,166 @@
+# keyed_registry.py
+
+"""
+Bounded keyed state for a long-running bot.
+
+KeyedRegistry is a dict-like map that forgets entries on its own: the least
+recently used key goes once max_size is reached, and any key left unused for
+ttl seconds is dropped. Keyed reads and writes count as use, so the map's LRU
+order is also its expiry order: every write clears expired keys off the old
+end, and there is no sweeper task to schedule. Scans (items(), values()) and
+peek() do not count as use, so a periodic sweep over the map can't keep every
+entry alive.
+
+It also hands out per-key semaphores through hold(). A key's semaphore exists
+only while someone holds or waits on it and is dropped as soon as the last
+holder leaves, so one-off keys (match ids, message ids) never accumulate.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class KeyedRegistry(MutableMapping):
+    """
+    Dict with LRU and TTL eviction, plus reclaimable per-key semaphores.
+
+    Usage:
+        registry = KeyedRegistry(max_size=1000, ttl=3600)
+        registry['a'] = 1
+        async with registry.hold(match_id, limit=2):
+            ...
+    """
+
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        # key -> (value, expires_at); order is least -> most recently used,
+        # which is also earliest -> latest expiry
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # key -> [semaphore, holders + waiters]
+        self._holds: Dict[Hashable, list] = {}
+        self.evicted = 0
+        self.expired = 0
+
+    def _expires_at(self):
+        return self._clock() + self.ttl if self.ttl is not None else None
+
+    def _is_expired(self, expires_at) -> bool:
+        return expires_at is not None and expires_at <= self._clock()
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry now; returns how many were removed."""
+        if self.ttl is None:
+            return 0
+        now = self._clock()
+        removed = 0
+        while self._data:
+            key, (_, expires_at) = next(iter(self._data.items()))
+            if expires_at > now:
+                break
+            del self._data[key]
+            removed += 1
+        self.expired += removed
+        return removed
+
+    def __getitem__(self, key):
+        value, expires_at = self._data[key]
+        if self._is_expired(expires_at):
+            del self._data[key]
+            self.expired += 1
+            raise KeyError(key)
+        self._data[key] = (value, self._expires_at())
+        self._data.move_to_end(key)
+        return value
+
+    def peek(self, key, default=None):
+        """The value for key without renewing its TTL or LRU position."""
+        entry = self._data.get(key)
+        if entry is None or self._is_expired(entry[1]):
+            return default
+        return entry[0]
+
+    def items(self):
+        """Snapshot of (key, value) pairs; does not count as a use of any key."""
+        self.purge_expired()
+        return [(key, value) for key, (value, _) in self._data.items()]
+
+    def values(self):
+        """Snapshot of the values; does not count as a use of any key."""
+        self.purge_expired()
+        return [value for value, _ in self._data.values()]
+
+    def __setitem__(self, key, value):
+        self.purge_expired()
+        self._data[key] = (value, self._expires_at())
+        self._data.move_to_end(key)
+        if self.max_size is not None:
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evicted += 1
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __contains__(self, key):
+        # A membership test doesn't count as a use.
+        entry = self._data.get(key)
+        return entry is not None and not self._is_expired(entry[1])
+
+    def __iter__(self):
+        self.purge_expired()
+        return iter(list(self._data))
+
+    def __len__(self):
+        self.purge_expired()
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+    def __repr__(self):
+        return f"KeyedRegistry({dict(self.items())!r})"
+
+    def get_or_create(self, key, factory: Callable[[], Any]):
+        """Return the value for key, storing factory() first if it's missing."""
+        try:
+            return self[key]
+        except KeyError:
+            value = factory()
+            self[key] = value
+            return value
+
+    @asynccontextmanager
+    async def hold(self, key, limit: int = 1):
+        """
+        Hold key's semaphore (at most limit holders at once) for the block.
+        The semaphore is discarded once nobody holds or waits on it.
+        """
+        entry = self._holds.get(key)
+        if entry is None:
+            entry = self._holds[key] = [asyncio.Semaphore(limit), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and self._holds.get(key) is entry:
+                del self._holds[key]
+
+    def active_holds(self) -> int:
+        """Number of keys that currently have holders or waiters."""
+        return len(self._holds)
+
+    def release_holds(self, key=None):
+        """Forget per-key semaphores (all of them when key is None). Current holders are unaffected."""
+        if key is None:
+            self._holds.clear()
+        else:
+            self._holds.pop(key, None)
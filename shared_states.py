@@ -17,11 +17,22 @@ bot_ready = asyncio.Event()
 PERSIST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bot_admin_state.json')
 
 from datetime import datetime, timedelta
+from collections import deque
+from keyed_registry import KeyedRegistry
+
+# Bounds for BotState's in-memory maps. managed_messages is also pruned by
+# cleanup_old_messages (by match date); the TTL is a backstop for entries
+# that never get a parseable date.
+MANAGED_MESSAGES_MAX = 5000
+MANAGED_MESSAGES_TTL = 60 * 24 * 3600
+MESSAGE_STATS_TTL = 25 * 3600      # hourly buckets, last 24h are reported
+MEMBER_ACTIVITY_TTL = 8 * 24 * 3600  # daily buckets, last 7 days are kept
+RESPONSE_TIMES_WINDOW = 200
 
 class BotState:
     def __init__(self):
         # Store message_id -> {match_date, team_id, added_at} mapping
-        self.managed_messages = {}
+        self.managed_messages = KeyedRegistry(max_size=MANAGED_MESSAGES_MAX, ttl=MANAGED_MESSAGES_TTL)
         # Store poll message_id -> {poll_id, team_id, channel_id} mapping
         self.poll_messages = {}
         self.bot_instance = None
@@ -31,14 +42,14 @@ class BotState:
         self.start_time = datetime.utcnow()
         # Track recent bot logs
         self.recent_logs = []
-        # Track message activity
-        self.message_stats = {}
-        # Track member join activity
-        self.member_activity = {}
+        # Track message activity by hour
+        self.message_stats = KeyedRegistry(max_size=25, ttl=MESSAGE_STATS_TTL)
+        # Track member join activity by day
+        self.member_activity = KeyedRegistry(max_size=8, ttl=MEMBER_ACTIVITY_TTL)
         # Track per-command usage counts {command_name: count}
         self.command_usage_by_name = {}
         # Track command response times (rolling window)
-        self.response_times = []
+        self.response_times = deque(maxlen=RESPONSE_TIMES_WINDOW)
         # Buffer of per-(user, channel, day) message counts pending flush to the
         # web app. Key: (discord_user_id, channel_id, 'YYYY-MM-DD').
         # Value: {guild_id, channel_name, count, last_message_at}.
@@ -269,10 +280,8 @@ class BotState:
     def track_response_time(self, duration_ms):
         """Track a command response time in milliseconds."""
         try:
+            # The deque keeps only the last RESPONSE_TIMES_WINDOW measurements
             self.response_times.append(duration_ms)
-            # Keep only the last 200 measurements
-            if len(self.response_times) > 200:
-                self.response_times = self.response_times[-200:]
         except Exception as e:
             logger.error(f"Error tracking response time: {e}")
 
@@ -294,19 +303,9 @@ class BotState:
             now = datetime.utcnow()
             hour_key = now.strftime("%Y-%m-%d-%H")
             
-            if hour_key not in self.message_stats:
-                self.message_stats[hour_key] = 0
-            self.message_stats[hour_key] += 1
-            
-            # Keep only last 24 hours of data
-            cutoff = now - timedelta(hours=24)
-            cutoff_key = cutoff.strftime("%Y-%m-%d-%H")
-            
-            # Remove old entries
-            old_keys = [k for k in self.message_stats.keys() if k < cutoff_key]
-            for key in old_keys:
-                del self.message_stats[key]
-                
+            # Buckets older than a day expire on their own
+            self.message_stats[hour_key] = self.message_stats.get(hour_key, 0) + 1
+
         except Exception as e:
             logger.error(f"Error tracking message activity: {e}")
 
@@ -389,25 +388,15 @@ class BotState:
         try:
             today = str(datetime.utcnow().date())
             
-            if today not in self.member_activity:
-                self.member_activity[today] = []
-            
-            self.member_activity[today].append({
+            # Days older than a week expire on their own
+            self.member_activity.get_or_create(today, list).append({
                 'member_id': member_id,
                 'guild_id': guild_id,
                 'joined_at': datetime.utcnow().isoformat()
             })
             
             self.log_activity(f"New member joined: {member_id}")
-            
-            # Keep only last 7 days
-            cutoff = datetime.utcnow() - timedelta(days=7)
-            cutoff_date = str(cutoff.date())
-            
-            old_dates = [d for d in self.member_activity.keys() if d < cutoff_date]
-            for date in old_dates:
-                del self.member_activity[date]
-                
+
         except Exception as e:
             logger.error(f"Error tracking member join: {e}")
 
@@ -2,11 +2,15 @@
 
 import pytest
 import aiohttp
+from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, patch, MagicMock
 from urllib.parse import urlparse
 from api_helpers import (
     send_async_http_request,
     call_woocommerce_api,
+    fetch_woocommerce_pages,
+    sync_woo_orders,
+    WOO_SYNC_OVERLAP,
     fetch_espn_data,
     fetch_openweather_data,
     fetch_serpapi_flight_data,
@@ -126,3 +130,128 @@ async def test_fetch_serpapi_flight_data(mock_aiohttp_session):
     request_url = mock_session.request.call_args[0][1]
     parsed_url = urlparse(request_url)
     assert parsed_url.hostname and parsed_url.hostname.endswith("serpapi.com")
+
+def _response(status, body=None, headers=None):
+    response = AsyncMock()
+    response.status = status
+    response.headers = headers or {}
+    response.json.return_value = body
+    response.__aenter__.return_value = response
+    return response
+
+@pytest.mark.asyncio
+async def test_send_async_http_request_retries_rate_limit(mock_aiohttp_session, monkeypatch):
+    mock_session, _ = mock_aiohttp_session
+    mock_session.request.side_effect = [
+        _response(429, headers={"Retry-After": "2"}),
+        _response(503),
+        _response(200, {"ok": True}),
+    ]
+    sleep = AsyncMock()
+    monkeypatch.setattr("api_helpers.asyncio.sleep", sleep)
+
+    result = await send_async_http_request("https://api.example.com/busy")
+
+    assert result == {"ok": True}
+    assert mock_session.request.call_count == 3
+    assert sleep.await_args_list[0].args == (2.0,)
+
+@pytest.mark.asyncio
+async def test_send_async_http_request_gives_up_after_retries(mock_aiohttp_session, monkeypatch):
+    mock_session, _ = mock_aiohttp_session
+    mock_session.request.side_effect = [_response(503) for _ in range(10)]
+    monkeypatch.setattr("api_helpers.asyncio.sleep", AsyncMock())
+
+    result = await send_async_http_request("https://api.example.com/down")
+
+    assert result is None
+    assert mock_session.request.call_count == 4
+
+@pytest.mark.asyncio
+async def test_fetch_woocommerce_pages_uses_total_pages(monkeypatch):
+    pages = {1: [{"id": 1}, {"id": 2}], 2: [{"id": 3}, {"id": 4}], 3: [{"id": 5}]}
+    requested = []
+
+    async def fake_request(method, url, **kwargs):
+        page = int(url.split("page=")[1].split("&")[0])
+        requested.append(page)
+        return 200, pages[page], {"X-WP-TotalPages": "3"}
+
+    monkeypatch.setattr("api_helpers.http_client.request", fake_request)
+
+    result = await fetch_woocommerce_pages("https://example.com/orders?status=processing", per_page=2)
+
+    assert [order["id"] for order in result] == [1, 2, 3, 4, 5]
+    assert sorted(requested) == [1, 2, 3]
+
+@pytest.mark.asyncio
+async def test_fetch_woocommerce_pages_without_header_walks_serially(monkeypatch):
+    pages = {1: [{"id": 1}, {"id": 2}], 2: [{"id": 3}]}
+
+    async def fake_request(method, url, **kwargs):
+        page = int(url.split("page=")[1].split("&")[0])
+        return 200, pages[page], {}
+
+    monkeypatch.setattr("api_helpers.http_client.request", fake_request)
+
+    result = await fetch_woocommerce_pages("https://example.com/orders", per_page=2)
+
+    assert [order["id"] for order in result] == [1, 2, 3]
+
+@pytest.mark.asyncio
+async def test_fetch_woocommerce_pages_stops_at_failed_page(monkeypatch):
+    async def fake_request(method, url, **kwargs):
+        page = int(url.split("page=")[1].split("&")[0])
+        if page == 2:
+            return 500, None, {}
+        return 200, [{"id": page}], {"X-WP-TotalPages": "3"}
+
+    monkeypatch.setattr("api_helpers.http_client.request", fake_request)
+
+    result = await fetch_woocommerce_pages("https://example.com/orders", per_page=1)
+
+    assert result == [{"id": 1}]
+
+@pytest.mark.asyncio
+async def test_fetch_woocommerce_pages_strict_returns_none_on_failure(monkeypatch):
+    async def fake_request(method, url, **kwargs):
+        page = int(url.split("page=")[1].split("&")[0])
+        if page == 2:
+            return 500, None, {}
+        return 200, [{"id": page}], {"X-WP-TotalPages": "3"}
+
+    monkeypatch.setattr("api_helpers.http_client.request", fake_request)
+
+    result = await fetch_woocommerce_pages("https://example.com/orders", per_page=1, strict=True)
+
+    assert result is None
+
+@pytest.mark.asyncio
+async def test_sync_woo_orders_uses_high_water_mark(monkeypatch):
+    fetch = AsyncMock(return_value=[{"id": 1}, {"id": 2}])
+    upsert = MagicMock(return_value=2)
+    monkeypatch.setattr("api_helpers.fetch_woocommerce_pages", fetch)
+    monkeypatch.setattr("api_helpers.upsert_woo_orders", upsert)
+    monkeypatch.setattr("api_helpers.get_orders_modified_after", MagicMock(return_value="2025-03-01T09:00:00"))
+
+    result = await sync_woo_orders()
+
+    assert result == 2
+    url = fetch.call_args[0][0]
+    assert "modified_after=2025-03-01T09:00:00" in url
+    assert "dates_are_gmt=true" in url
+    orders, synced_through = upsert.call_args[0]
+    assert orders == [{"id": 1}, {"id": 2}]
+    # The next window starts before this sync did, not at the newest order seen.
+    started = datetime.utcnow() - WOO_SYNC_OVERLAP
+    assert abs(datetime.fromisoformat(synced_through) - started) < timedelta(minutes=1)
+
+@pytest.mark.asyncio
+async def test_sync_woo_orders_skips_write_on_partial_fetch(monkeypatch):
+    upsert = MagicMock()
+    monkeypatch.setattr("api_helpers.fetch_woocommerce_pages", AsyncMock(return_value=None))
+    monkeypatch.setattr("api_helpers.upsert_woo_orders", upsert)
+    monkeypatch.setattr("api_helpers.get_orders_modified_after", MagicMock(return_value=None))
+
+    assert await sync_woo_orders() is None
+    upsert.assert_not_called()
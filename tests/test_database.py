@@ -0,0 +1,104 @@
+# tests/test_database.py
+
+import json
+import sqlite3
+import pytest
+import database
+from database import (
+    initialize_woo_orders_db,
+    upsert_woo_orders,
+    update_woo_orders,
+    get_orders_modified_after,
+    get_orders_for_product,
+    get_subgroup_members,
+    reset_woo_orders_db,
+)
+
+
+@pytest.fixture(autouse=True)
+def orders_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "woo_orders.db")
+    monkeypatch.setattr(database, "ORDERS_DB_PATH", path)
+    initialize_woo_orders_db()
+    return path
+
+
+def make_order(order_id, email, subgroup=None, year=2025, product_id=500,
+               created="2025-02-01T10:00:00", modified="2025-02-01T18:00:00"):
+    membership = {"product_id": product_id, "name": f"ECS Membership {year}", "meta_data": []}
+    if subgroup:
+        membership["meta_data"].append({"key": "Subgroup Designation", "value": subgroup})
+    return {
+        "id": order_id,
+        "date_created": created,
+        "date_modified_gmt": modified,
+        "billing": {"first_name": "Pat", "last_name": f"Member{order_id}", "email": email},
+        "line_items": [membership],
+    }
+
+
+def test_initialize_enables_wal(orders_db):
+    conn = sqlite3.connect(orders_db)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        conn.close()
+
+
+def test_upsert_advances_high_water_mark():
+    assert get_orders_modified_after() is None
+    upsert_woo_orders([make_order(1, "a@example.com", modified="2025-03-05T00:00:00")])
+    # Writing orders alone doesn't move the mark; the sync sets it explicitly.
+    assert get_orders_modified_after() is None
+
+    upsert_woo_orders([make_order(2, "b@example.com")], synced_through="2025-03-01T09:00:00")
+    assert get_orders_modified_after() == "2025-03-01T09:00:00"
+
+    # An earlier mark never moves it backwards.
+    upsert_woo_orders([], synced_through="2025-01-01T00:00:00")
+    assert get_orders_modified_after() == "2025-03-01T09:00:00"
+
+
+def test_subgroup_members_grouped_by_year_and_date():
+    upsert_woo_orders([
+        make_order(1, "a@example.com", "Fog City Faithful", created="2025-02-01T10:00:00"),
+        make_order(2, "b@example.com", " fog city  faithful ", created="2025-04-01T10:00:00"),
+        make_order(3, "c@example.com", "Heartland Horde", year=2024, created="2024-03-01T10:00:00"),
+        make_order(4, "d@example.com", None),
+    ])
+
+    members = get_subgroup_members(
+        ["Fog City Faithful", "Heartland Horde"],
+        membership_year=2025,
+        created_after="2025-01-01T00:00:00",
+        created_before="2025-12-31T23:59:59",
+    )
+
+    assert list(members) == ["Fog City Faithful"]
+    assert [m["email"] for m in members["Fog City Faithful"]] == ["b@example.com", "a@example.com"]
+    assert [m["email"] for m in get_subgroup_members(["Heartland Horde"])["Heartland Horde"]] == [
+        "c@example.com"]
+
+
+def test_rewriting_an_order_replaces_its_index_rows():
+    upsert_woo_orders([make_order(1, "a@example.com", "Fog City Faithful")])
+    upsert_woo_orders([make_order(1, "a@example.com", "Heartland Horde")])
+
+    members = get_subgroup_members(["Fog City Faithful", "Heartland Horde"])
+    assert list(members) == ["Heartland Horde"]
+    assert members["Heartland Horde"][0]["email"] == "a@example.com"
+
+
+def test_update_woo_orders_and_product_lookup():
+    update_woo_orders("7", json.dumps(make_order(7, "a@example.com", product_id=900)))
+    upsert_woo_orders([make_order(8, "b@example.com", product_id=901)])
+
+    assert [order["id"] for order in get_orders_for_product(900)] == [7]
+
+
+def test_reset_clears_mirror():
+    upsert_woo_orders([make_order(1, "a@example.com", "Fog City Faithful")])
+    reset_woo_orders_db()
+
+    assert get_orders_modified_after() is None
+    assert get_subgroup_members(["Fog City Faithful"]) == {}
@@ -0,0 +1,84 @@
+# tests/test_embed_coalescer.py
+
+import asyncio
+import discord
+import pytest
+from embed_coalescer import EmbedUpdateCoalescer, embed_content_hash
+
+
+@pytest.mark.asyncio
+async def test_burst_of_requests_runs_one_refresh():
+    coalescer = EmbedUpdateCoalescer(window=0.05)
+    calls = []
+
+    async def refresh():
+        calls.append(1)
+        return True
+
+    results = await asyncio.gather(*(coalescer.request(1, refresh) for _ in range(5)))
+
+    assert results == [True] * 5
+    assert len(calls) == 1
+    stats = coalescer.get_stats()
+    assert stats['requested'] == 5
+    assert stats['merged'] == 4
+    assert stats['refreshed'] == 1
+    assert stats['pending'] == 0
+
+
+@pytest.mark.asyncio
+async def test_request_during_refresh_gets_a_trailing_refresh():
+    coalescer = EmbedUpdateCoalescer(window=0.01)
+    started = asyncio.Event()
+    release = asyncio.Event()
+    calls = []
+
+    async def slow_refresh():
+        calls.append('first')
+        started.set()
+        await release.wait()
+        return True
+
+    async def refresh():
+        calls.append('second')
+        return True
+
+    first = asyncio.create_task(coalescer.request(1, slow_refresh))
+    await started.wait()
+    # Arrives after the first refresh read its state: must not be merged into it.
+    second = asyncio.create_task(coalescer.request(1, refresh))
+    await asyncio.sleep(0.05)
+    assert calls == ['first']
+    release.set()
+
+    assert await first is True
+    assert await second is True
+    assert calls == ['first', 'second']
+    assert coalescer.get_stats()['merged'] == 0
+
+
+@pytest.mark.asyncio
+async def test_keys_are_independent_and_failures_resolve_false():
+    coalescer = EmbedUpdateCoalescer(window=0.01)
+
+    async def ok():
+        return True
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    assert await asyncio.gather(coalescer.request(1, ok), coalescer.request(2, broken)) == [True, False]
+    assert coalescer.get_stats()['failed'] == 1
+
+
+def test_embed_content_hash_sees_every_visible_change():
+    def build(value="Alice"):
+        embed = discord.Embed(title="Sounders vs Timbers", description="Date: today", color=0x00ff00)
+        embed.add_field(name="👍 Yes (1)", value=value, inline=False)
+        return embed
+
+    assert embed_content_hash(build()) == embed_content_hash(build())
+    assert embed_content_hash(build()) != embed_content_hash(build("Bob"))
+    retitled = build()
+    retitled.title = "Sounders — Fun Week!"
+    assert embed_content_hash(retitled) != embed_content_hash(build())
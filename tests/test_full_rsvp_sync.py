@@ -0,0 +1,137 @@
+# tests/test_full_rsvp_sync.py
+
+import pytest
+import discord
+from unittest.mock import AsyncMock, MagicMock
+import ECS_Discord_Bot
+from api.utils.rsvp_utils import rsvp_embed_fields
+
+
+class FakeUsers:
+    def __init__(self, users):
+        self._users = list(users)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._users:
+            raise StopAsyncIteration
+        return self._users.pop(0)
+
+
+def make_reaction(emoji, user_ids, me=True):
+    reaction = MagicMock()
+    reaction.emoji = emoji
+    reaction.me = me
+    reaction.count = len(user_ids) + (1 if me else 0)
+    users = [MagicMock(id=user_id) for user_id in user_ids]
+    reaction.users = MagicMock(side_effect=lambda: FakeUsers(users))
+    return reaction
+
+
+def make_message(reactions, rsvps):
+    embed = discord.Embed(title="Team vs Opponent", description="Date: today")
+    for name, value in rsvp_embed_fields(rsvps):
+        embed.add_field(name=name, value=value, inline=False)
+    message = MagicMock()
+    message.reactions = reactions
+    message.embeds = [embed]
+    message.edit = AsyncMock()
+    return message
+
+
+def state_for(channel_id, match_id, rsvps):
+    return {
+        'channel_id': str(channel_id),
+        'match_id': match_id,
+        'team_id': 7,
+        'is_recent_match': True,
+        'rsvps': rsvps,
+    }
+
+
+@pytest.fixture
+def sync_env(monkeypatch):
+    bot_user = MagicMock(id=1)
+    monkeypatch.setattr(type(ECS_Discord_Bot.bot), "user", property(lambda self: bot_user))
+    channels = {}
+    monkeypatch.setattr(ECS_Discord_Bot.bot, "get_channel", lambda channel_id: channels.get(channel_id))
+    reconcile = AsyncMock(return_value=True)
+    update_embed = AsyncMock(return_value=True)
+    monkeypatch.setattr(ECS_Discord_Bot, "reconcile_rsvps", reconcile)
+    monkeypatch.setattr(ECS_Discord_Bot, "update_embed_for_message", update_embed)
+    return channels, reconcile, update_embed
+
+
+@pytest.mark.asyncio
+async def test_full_rsvp_sync_only_touches_changed_messages(sync_env, monkeypatch):
+    channels, reconcile, update_embed = sync_env
+    in_sync = {'yes': [{'player_name': 'Ann', 'discord_id': '10'}], 'no': [], 'maybe': []}
+    stale_embed = {'yes': [{'player_name': 'Bob', 'discord_id': '20'}], 'no': [], 'maybe': []}
+    mismatched = {'yes': [], 'no': [{'player_name': 'Cy', 'discord_id': '30'}], 'maybe': []}
+
+    bot_only = make_reaction("🤷", [])
+    messages = {
+        100: make_message([make_reaction("👍", [10]), bot_only], in_sync),
+        200: make_message([make_reaction("👍", [20])], {'yes': [], 'no': [], 'maybe': []}),
+        300: make_message([make_reaction("👍", [30])], mismatched),
+    }
+    channel = MagicMock()
+    channel.fetch_message = AsyncMock(side_effect=lambda message_id: messages[message_id])
+    channels[555] = channel
+
+    state = {
+        '100': state_for(555, 1, in_sync),
+        '200': state_for(555, 2, stale_embed),
+        '300': state_for(555, 3, mismatched),
+    }
+    get_state = AsyncMock(return_value=state)
+    monkeypatch.setattr(ECS_Discord_Bot, "get_rsvp_sync_state", get_state)
+    monkeypatch.setattr(ECS_Discord_Bot.bot_state, "get_managed_message_ids", lambda: {100, 200, 300})
+
+    result = await ECS_Discord_Bot.full_rsvp_sync()
+
+    get_state.assert_awaited_once()
+    assert result['synced'] == 3
+    assert result['failed'] == 0
+    assert result['reconciled'] == 1
+    assert result['embeds_updated'] == 2
+    assert set(result['timings']) == {'lookup', 'reactions', 'reconcile', 'embeds'}
+    # Only the message whose reactions disagree with Flask is reconciled...
+    assert reconcile.await_args.args[5] == '300'
+    # ...and re-rendered from Flask; the stale embed is edited in place.
+    assert update_embed.await_args.args[0] == '300'
+    messages[100].edit.assert_not_awaited()
+    messages[200].edit.assert_awaited_once()
+    # One channel lookup serves all three messages, and reactions only the
+    # bot made never need a user listing.
+    assert channel.fetch_message.await_count == 3
+    bot_only.users.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_full_rsvp_sync_skips_old_and_unknown_messages(sync_env, monkeypatch):
+    channels, reconcile, update_embed = sync_env
+    old = state_for(555, 1, None)
+    old['is_recent_match'] = False
+    monkeypatch.setattr(ECS_Discord_Bot, "get_rsvp_sync_state", AsyncMock(return_value={'100': old}))
+    monkeypatch.setattr(ECS_Discord_Bot.bot_state, "get_managed_message_ids", lambda: {100, 200})
+
+    result = await ECS_Discord_Bot.full_rsvp_sync()
+
+    assert result['synced'] == 0
+    assert result['failed'] == 0
+    reconcile.assert_not_awaited()
+    update_embed.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_full_rsvp_sync_counts_failed_lookup(sync_env, monkeypatch):
+    monkeypatch.setattr(ECS_Discord_Bot, "get_rsvp_sync_state", AsyncMock(return_value=None))
+    monkeypatch.setattr(ECS_Discord_Bot.bot_state, "get_managed_message_ids", lambda: {100, 200})
+
+    result = await ECS_Discord_Bot.full_rsvp_sync()
+
+    assert result['failed'] == 2
+    assert result['synced'] == 0
@@ -0,0 +1,154 @@
+# tests/test_keyed_registry.py
+
+import asyncio
+import tracemalloc
+import pytest
+from keyed_registry import KeyedRegistry
+from shared_states import (
+    BotState,
+    MANAGED_MESSAGES_MAX,
+    MANAGED_MESSAGES_TTL,
+    MESSAGE_STATS_TTL,
+    MEMBER_ACTIVITY_TTL,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    registry = KeyedRegistry(max_size=2)
+    registry['a'] = 1
+    registry['b'] = 2
+    assert registry['a'] == 1  # touch: 'b' is now the oldest
+    registry['c'] = 3
+
+    assert set(registry) == {'a', 'c'}
+    assert registry.evicted == 1
+
+
+def test_ttl_expires_idle_entries():
+    clock = FakeClock()
+    registry = KeyedRegistry(ttl=10, clock=clock)
+    registry['a'] = 1
+    registry['b'] = 2
+    clock.now = 5
+    assert registry['b'] == 2  # a read keeps 'b' alive
+    clock.now = 11
+
+    assert 'a' not in registry
+    assert registry.get('a') is None
+    assert 'b' in registry
+    clock.now = 15
+    assert len(registry) == 0
+    assert registry.expired == 2
+
+
+def test_scans_do_not_keep_entries_alive():
+    clock = FakeClock()
+    registry = KeyedRegistry(ttl=10, clock=clock)
+    registry['a'] = 1
+    clock.now = 8
+    assert registry.items() == [('a', 1)] and registry.values() == [1]
+    assert registry.peek('a') == 1
+    clock.now = 10
+
+    assert registry.items() == [] and registry.peek('a') is None
+
+
+def test_managed_message_sweeps_let_the_ttl_backstop_expire():
+    clock = FakeClock()
+    state = BotState()
+    state.managed_messages = KeyedRegistry(max_size=MANAGED_MESSAGES_MAX, ttl=10, clock=clock)
+    state.add_managed_message_id(1)
+    for _ in range(5):
+        state.get_managed_message_ids(days_limit=7)
+        state.cleanup_old_messages()
+        clock.now += 8
+
+    assert 1 not in state.managed_messages
+
+
+@pytest.mark.asyncio
+async def test_hold_limits_concurrency_and_reclaims_semaphore():
+    registry = KeyedRegistry()
+    in_flight = 0
+    peak = 0
+
+    async def work():
+        nonlocal in_flight, peak
+        async with registry.hold('match', limit=2):
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(work() for _ in range(6)))
+
+    assert peak == 2
+    assert registry.active_holds() == 0
+
+
+def test_bot_state_maps_are_bounded():
+    state = BotState()
+    for i in range(MANAGED_MESSAGES_MAX + 10):
+        state.add_managed_message_id(i, match_date='2025-03-01', team_id=1)
+    for ms in range(500):
+        state.track_response_time(ms)
+
+    assert len(state.managed_messages) == MANAGED_MESSAGES_MAX
+    assert 0 not in state.get_managed_message_ids()
+    assert len(state.response_times) == 200
+    assert state.get_avg_response_time() == round(sum(range(300, 500)) / 200)
+
+
+@pytest.mark.asyncio
+async def test_season_memory_footprint_stays_flat():
+    """
+    Simulate a season (34 weeks, 20 matches a week, two RSVP posts per match,
+    40 reactions per post, steady chat and joins) against registries sized
+    like BotState's, and check memory plateaus instead of growing with it.
+    """
+    clock = FakeClock()
+    semaphores = KeyedRegistry(clock=clock)
+    managed = KeyedRegistry(max_size=MANAGED_MESSAGES_MAX, ttl=MANAGED_MESSAGES_TTL, clock=clock)
+    message_stats = KeyedRegistry(max_size=25, ttl=MESSAGE_STATS_TTL, clock=clock)
+    member_activity = KeyedRegistry(max_size=8, ttl=MEMBER_ACTIVITY_TTL, clock=clock)
+
+    async def week(number):
+        for match in range(20):
+            match_id = number * 100 + match
+            for side in range(2):
+                managed[match_id * 10 + side] = {'match_date': f'week-{number}', 'team_id': side}
+            for _ in range(80):
+                async with semaphores.hold(match_id, limit=2):
+                    pass
+        for hour in range(7 * 24):
+            clock.now += 3600
+            key = int(clock.now // 3600)
+            message_stats[key] = message_stats.get(key, 0) + 50
+            if hour % 6 == 0:
+                member_activity.get_or_create(int(clock.now // 86400), list).append({'member_id': hour})
+
+    tracemalloc.start()
+    try:
+        for number in range(9):  # roughly the 60-day TTL
+            await week(number)
+        plateau = tracemalloc.get_traced_memory()[0]
+        for number in range(9, 34):
+            await week(number)
+        end_of_season = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    assert semaphores.active_holds() == 0
+    assert len(managed) <= 9 * 40
+    assert len(message_stats) <= 25
+    assert len(member_activity) <= 8
+    # 25 more weeks of traffic must not grow the footprint meaningfully.
+    assert end_of_season < plateau * 1.25 + 64 * 1024
@@ -15,7 +15,10 @@ def reset_rsvp_session():
 from api.utils.rsvp_utils import (
     get_emoji_for_response,
     extract_channel_and_message_id,
-    update_embed_for_message
+    update_embed_for_message,
+    build_rsvp_embed,
+    rsvp_embed_fields,
+    rsvp_embed_hash,
 )
 
 def test_get_emoji_for_response():
@@ -233,3 +236,46 @@ async def test_update_embed_message_with_players():
 @pytest.fixture
 def mock_bot_fixture():
     return MagicMock()
+
+def test_rsvp_embed_hash_tracks_tally_changes():
+    rsvps = {'yes': [{'player_name': 'Ann'}], 'no': [], 'maybe': []}
+    fields = rsvp_embed_fields(rsvps)
+    assert fields[0] == ("👍 Yes (1)", "Ann")
+    assert fields[1] == ("👎 No (0)", "None")
+    assert rsvp_embed_hash(fields) == rsvp_embed_hash(rsvp_embed_fields(dict(rsvps)))
+    rsvps['maybe'] = [{'player_name': 'Bob'}]
+    assert rsvp_embed_hash(fields) != rsvp_embed_hash(rsvp_embed_fields(rsvps))
+
+def test_build_rsvp_embed_keeps_posted_copy():
+    existing = discord.Embed(title="Custom title", description="Custom copy", color=0x123456)
+    existing.set_footer(text="footer")
+    embed = build_rsvp_embed(existing, {'yes': [], 'no': [], 'maybe': []}, "Fallback", "Fallback")
+    assert embed.title == "Custom title"
+    assert embed.description == "Custom copy"
+    assert embed.footer.text == "footer"
+    assert [field.name for field in embed.fields] == ["👍 Yes (0)", "👎 No (0)", "🤷 Maybe (0)"]
+
+@pytest.mark.asyncio
+async def test_update_embed_for_message_skips_unchanged_embed(mock_aiohttp_session, monkeypatch):
+    from embed_coalescer import embed_coalescer
+    from api.utils.rsvp_utils import build_rsvp_embed
+
+    monkeypatch.setattr("api.utils.rsvp_utils.WEBUI_API_URL", "https://api.example.com")
+    mock_bot = MagicMock()
+    mock_channel = AsyncMock()
+    mock_message = AsyncMock()
+    mock_bot.get_channel.return_value = mock_channel
+    mock_channel.fetch_message.return_value = mock_message
+    rsvp_data = {"yes": [{"player_name": "Alice"}], "no": [], "maybe": []}
+    existing = discord.Embed(title="Sounders vs Timbers", description="Date: today", color=0x00ff00)
+    mock_message.embeds = [build_rsvp_embed(existing, rsvp_data, "", "")]
+    mock_session, mock_response = mock_aiohttp_session
+    mock_response.json.side_effect = [rsvp_data, {"home_team_id": 1}]
+    mock_response.status = 200
+    skipped = embed_coalescer.patches_skipped
+
+    result = await update_embed_for_message("456", "123", 1, 1, mock_bot)
+
+    assert result is True
+    mock_message.edit.assert_not_called()
+    assert embed_coalescer.patches_skipped == skipped + 1
@@ -2,7 +2,13 @@
 
 import pytest
 import csv
-from woocommerce_commands import WooCommerceCommands
+import io
+import database
+from woocommerce_commands import (
+    WooCommerceCommands,
+    export_product_orders_csv,
+    generate_csv_from_orders,
+)
 from unittest.mock import AsyncMock, MagicMock
 from database import insert_order_extract, get_order_extract
 import discord
@@ -134,4 +140,90 @@ async def test_get_product_orders_no_products_found(
 
     mock_interaction.followup.send.assert_called_once_with(
         "Product not found.", ephemeral=True
-    )
\ No newline at end of file
+    )
+
+
+def make_ticket_order(order_id, email, product_id=900, reduced_stock="1"):
+    return {
+        "id": order_id,
+        "status": "processing",
+        "date_paid": "2024-01-21T23:03:50",
+        "billing": {
+            "first_name": "Pat",
+            "last_name": f"Fan{order_id}",
+            "email": email,
+            "address_1": "1 Main St",
+            "city": "Seattle",
+            "state": "WA",
+        },
+        "line_items": [{
+            "product_id": product_id,
+            "name": "Away vs LAFC",
+            "price": 50,
+            "meta_data": [{"key": "_reduced_stock", "value": reduced_stock}],
+        }],
+    }
+
+
+def read_csv(csv_file):
+    return list(csv.reader(io.TextIOWrapper(csv_file, encoding="utf-8", newline="")))
+
+
+@pytest.mark.asyncio
+async def test_generate_csv_sorts_and_fills_alias_once_per_email():
+    orders = [
+        make_ticket_order(30, "b@example.com"),
+        make_ticket_order(20, "A@example.com"),
+        make_ticket_order(10, "a@example.com"),
+        make_ticket_order(40, "c@example.com", reduced_stock="0"),
+        make_ticket_order(50, "d@example.com", product_id=901),
+    ]
+
+    rows = read_csv(await generate_csv_from_orders(orders, [900]))
+
+    assert rows[0][0] == "Product Name"
+    assert [row[7] for row in rows[1:]] == ["10", "20", "30"]
+    assert rows[1][12] == "ecstix-10@weareecs.com"
+    assert rows[1][13] == "Away vs LAFC entry for Pat Fan10"
+    assert rows[2][12:18] == ["", "", "", "", "", ""]
+    assert rows[3][14:18] == ["b@example.com", "MEMBER", "travel@weareecs.com", "OWNER"]
+
+
+@pytest.mark.asyncio
+async def test_export_streams_from_order_mirror(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "ORDERS_DB_PATH", str(tmp_path / "woo_orders.db"))
+    monkeypatch.setattr("woocommerce_commands.sync_woo_orders", AsyncMock(return_value=0))
+    database.initialize_woo_orders_db()
+    cancelled = make_ticket_order(15, "a@example.com")
+    cancelled["status"] = "cancelled"
+    database.upsert_woo_orders([
+        make_ticket_order(30, "b@example.com"),
+        make_ticket_order(10, "a@example.com"),
+        cancelled,
+        make_ticket_order(50, "d@example.com", product_id=901),
+    ])
+
+    csv_file, row_count = await export_product_orders_csv([900])
+
+    assert row_count == 2
+    assert [row[7] for row in read_csv(csv_file)[1:]] == ["10", "30"]
+
+
+
+@pytest.mark.asyncio
+async def test_get_product_orders_closes_export_even_if_send_fails(
+    woocommerce_commands_bot, mock_interaction, mock_role_check, monkeypatch
+):
+    mock_role_check.side_effect = lambda _: True
+    monkeypatch.setattr("woocommerce_commands.get_product_by_name", AsyncMock(return_value={"id": 900}))
+    monkeypatch.setattr("woocommerce_commands.get_product_variations", AsyncMock(return_value=[]))
+    export = io.BytesIO(b"Product Name\n")
+    monkeypatch.setattr("woocommerce_commands.export_product_orders_csv", AsyncMock(return_value=(export, 1)))
+    mock_interaction.followup.send.side_effect = discord.HTTPException(MagicMock(status=500), "boom")
+
+    with pytest.raises(discord.HTTPException):
+        await woocommerce_commands_bot.get_product_orders.callback(
+            woocommerce_commands_bot, mock_interaction, "Away vs LAFC"
+        )
+
+    assert export.closed
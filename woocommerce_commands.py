@@ -5,7 +5,6 @@ from http import server
 import discord
 from discord import app_commands
 from discord.ext import commands
-from collections import defaultdict
 import urllib.parse
 import asyncio
 import csv
@@ -22,18 +21,18 @@ from common import (
 )
 from match_utils import wc_url
 from utils import (
-    find_customer_info_in_order, 
     extract_base_product_title, 
     extract_variation_detail,
 )
 from api_helpers import (
     call_woocommerce_api, 
+    sync_woo_orders,
     update_orders_from_api, 
     check_new_orders,
 )
 from database import (
-    update_woo_orders,
-    get_latest_order_id,
+    get_subgroup_members,
+    iter_orders_for_products,
     get_order_extract,
     insert_order_extract,
     reset_woo_orders_db,
@@ -115,225 +114,134 @@ async def get_product_variations(product_id):
     variations = await call_woocommerce_api(variations_url)
     return variations if isinstance(variations, list) else []
 
-async def get_orders_for_product_ids(product_ids):
-    if debug: print(f"[DEBUG] get_orders_for_product_ids called with: {product_ids}")
-    
-    if len(product_ids) == 1:
-        all_orders = []
-        for product_id in product_ids:
-            orders = await get_single_product_orders_by_id(product_id)
-            if debug: print(f"[DEBUG] Orders for single product_id {product_id}: {len(orders)} orders")
-            all_orders.extend(orders)
-    else:
-        all_orders = await get_all_orders()
-        if debug: print(f"[DEBUG] Total orders retrieved from get_all_orders: {len(all_orders)}")
-
-    relevant_orders = []
-    for order in all_orders:
-        line_items = order.get("line_items", [])
-        for item in line_items:
-            product_in_order = item.get("product_id", None)
-            if product_in_order in product_ids:
-                append_line = True
-                meta_data = item.get("meta_data", [])
-                if debug: print(f"[DEBUG] Item meta_data: {meta_data}")
-                for meta in meta_data:
-                    if meta["key"] == "_reduced_stock": 
-                        if meta["value"] == "0":
-                            append_line = False
-                if append_line:
-                    relevant_orders.append(order)
-                    if debug: print(f"[DEBUG] Appended order id: {order.get('id')}")
-                break
-
-    if debug: print(f"[DEBUG] Returning {len(relevant_orders)} relevant orders.")
-    return relevant_orders
-
-async def get_single_product_orders_by_id(product_id):
-    base_wc_url = wc_url.replace("/orders/", "/")
-    orders_url = f"{base_wc_url}orders"
-    all_orders = []
-    page = 1
-    order_status = "processing"
-    while True:
-        current_url = f"{orders_url}?page={page}&per_page=100&status={order_status}&product={product_id}"
-        page_orders = await call_woocommerce_api(current_url)
-
-        if isinstance(page_orders, list):
-            all_orders.extend(page_orders)
-            if len(page_orders) < 100:
-                if order_status == "processing":
-                    order_status = "completed"
-                    page = 1
-                else:
-                    break
-            else:
-                page += 1
-        else:
-            break
-
-    return all_orders
+CSV_HEADERS = [
+    "Product Name",
+    "First Name",
+    "Last Name",
+    "Email",
+    "Order Date",
+    "Quantity",
+    "Price",
+    "Order #",
+    "Status",
+    "Note",
+    "Variation",
+    "Billing Address",
+    "Alias",
+    "Alias Description",
+    "Alias 1 recipient",
+    "Alias 1 type",
+    "Alias 2 recipient",
+    "Alias 2 type",
+    "Email Sent"
+]
 
-async def get_all_orders():
-    base_wc_url = wc_url.replace("/orders/", "/")
-    orders_url = f"{base_wc_url}orders"
-    all_orders = []
-    page = 1
-    order_status = "processing"
-    while True:
-        current_url = f"{orders_url}?page={page}&per_page=100&status={order_status}"
-        page_orders = await call_woocommerce_api(current_url)
-
-        if isinstance(page_orders, list):
-            all_orders.extend(page_orders)
-            if len(page_orders) < 100:
-                if order_status == "processing":
-                    order_status = "completed"
-                    page = 1
-                else:
-                    break
-            else:
-                page += 1
-        else:
-            break
+# Exports up to this size stay in memory; larger ones spill to a temp file.
+CSV_SPOOL_MAX_BYTES = 1024 * 1024
 
-    return all_orders
+def order_sort_key(order):
+    return (order.get("billing", {}).get("email", "").lower(), int(order.get("id", 0)))
 
-async def generate_csv_from_orders(orders, product_ids):
-    if debug: print(f"[DEBUG] Starting CSV generation for {len(orders)} orders and product_ids: {product_ids}")
-    csv_output = io.StringIO()
-    csv_writer = csv.writer(csv_output)
-
-    headers = [
-        "Product Name",
-        "First Name",
-        "Last Name",
-        "Email",
-        "Order Date",
-        "Quantity",
-        "Price",
-        "Order #",
-        "Status",
-        "Note",
-        "Variation",
-        "Billing Address",
-        "Alias",
-        "Alias Description",
-        "Alias 1 recipient",
-        "Alias 1 type",
-        "Alias 2 recipient",
-        "Alias 2 type",
-        "Email Sent"
-    ]
-    csv_writer.writerow(headers)
-
-    rows = []
-    previous_email = ""
+def iter_order_csv_rows(orders, product_ids):
+    """
+    Yield one CSV row per order (its first line item for product_ids), with
+    the alias columns filled on the first row of each email.
 
+    `orders` must already be ordered by order_sort_key; rows are produced
+    one at a time so the export never holds the whole report.
+    """
+    previous_email = None
     for order in orders:
         billing = order.get("billing", {})
-        line_items = order.get("line_items", [])
-
-        for item in line_items:
-            product_in_order = item.get("product_id", None)
-            if product_in_order in product_ids:
-                # confirm in the line-item metadata the quantity reduced from stock
-                # to account for line-item partial returns See order # 1005693
-                item_quantity = ""
-                item_meta_data = item.get("meta_data")
-                if item_meta_data:
-                    for meta in item_meta_data:
-                        # in the get_orders_for_product_ids, we filter out orders where the item
-                        # was completely returned/refunded. We only need to pay attention to the 
-                        # _reduced_stock metadata item
-                        if (meta["key"]=="_reduced_stock"):
-                            item_quantity = meta["value"]
-                else:
-                    item_quantity = item.get("quantity")
-                # Populate the row with initial values.
-                row = [
-                    item.get("name", ""),
-                    billing.get("first_name", ""),
-                    billing.get("last_name", ""),
-                    billing.get("email", ""),
-                    order.get("date_paid", ""),
-                    item_quantity,
-                    item.get("price", ""),
-                    order.get("id", ""),
-                    order.get("status", ""),
-                    order.get("customer_note", ""),
-                    item.get("variation_name", ""),
-                    billing.get("address_1", "") + ", " + billing.get("city") + " " + billing.get("state"),
-                    "",  # alias placeholder
-                    "",  # alias description placeholder
-                    "",  # alias 1 recipient placeholder
-                    "",  # alias 1 type placeholder
-                    "",  # alias 2 recipient placeholder
-                    "",  # alias 2 type placeholder
-                    ""   # Email Sent placeholder
-                ]
 
-                rows.append(row)
-                if debug: print(f"[DEBUG] Processed order id {order.get('id')} into CSV row.")
+        for item in order.get("line_items", []):
+            if item.get("product_id", None) not in product_ids:
+                continue
+
+            # confirm in the line-item metadata the quantity reduced from stock
+            # to account for line-item partial returns See order # 1005693
+            item_quantity = ""
+            item_meta_data = item.get("meta_data")
+            if item_meta_data:
+                for meta in item_meta_data:
+                    if meta["key"] == "_reduced_stock":
+                        item_quantity = meta["value"]
+            else:
+                item_quantity = item.get("quantity")
+            # Items completely returned/refunded are left out of the report.
+            if item_quantity == "0":
                 break
 
-    if debug: print(f"[DEBUG] Sorting {len(rows)} rows.")
-    rows.sort(key=lambda x: (x[3].lower(), int(x[7])))
-
-    previous_email = ""  # Reset for alias logic.
-    for row in rows:
-        if row[3].lower() != previous_email:
-            alias = f"ecstix-{row[7]}@weareecs.com"
-            alias_description = f"{row[0]} entry for {row[1]} {row[2]}"
-            alias_1_recipient = row[3]
-            alias_2_recipient = "travel@weareecs.com"
-            alias_type_member = "MEMBER"
-            alias_type_owner = "OWNER"
-        else:
-            alias = ""
-            alias_description = ""
-            alias_1_recipient = ""
-            alias_2_recipient = ""
-            alias_type_member = ""
-            alias_type_owner = ""
-
-        row[12] = alias
-        row[13] = alias_description
-        row[14] = alias_1_recipient
-        row[15] = alias_type_member
-        row[16] = alias_2_recipient
-        row[17] = alias_type_owner
-
-        previous_email = row[3].lower()
-
-    for row in rows:
-        csv_writer.writerow(row)
-
-    if debug: print(f"[DEBUG] CSV generation completed. Total rows written: {len(rows)}")
-    return csv_output
-
-async def generate_csv_for_product_variations(product_name):
-    product = await get_product_by_name(product_name)
-    
-    if not product:
-        raise Exception("Product not found")
+            email = billing.get("email", "")
+            if email.lower() != previous_email:
+                alias_columns = [
+                    f"ecstix-{order.get('id', '')}@weareecs.com",
+                    f"{item.get('name', '')} entry for {billing.get('first_name', '')} {billing.get('last_name', '')}",
+                    email,
+                    "MEMBER",
+                    "travel@weareecs.com",
+                    "OWNER",
+                ]
+            else:
+                alias_columns = ["", "", "", "", "", ""]
+            previous_email = email.lower()
+
+            yield [
+                item.get("name", ""),
+                billing.get("first_name", ""),
+                billing.get("last_name", ""),
+                email,
+                order.get("date_paid", ""),
+                item_quantity,
+                item.get("price", ""),
+                order.get("id", ""),
+                order.get("status", ""),
+                order.get("customer_note", ""),
+                item.get("variation_name", ""),
+                billing.get("address_1", "") + ", " + billing.get("city") + " " + billing.get("state"),
+                *alias_columns,
+                ""   # Email Sent placeholder
+            ]
+            if debug: print(f"[DEBUG] Processed order id {order.get('id')} into CSV row.")
+            break
 
-    product_id = product.get("id")
-    variations = await get_product_variations(product_id)
+def write_order_csv(orders, product_ids):
+    """
+    Write the order report to a spooled temp file, row by row. Blocking:
+    call through asyncio.to_thread. Returns (binary file at offset 0, row count).
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=CSV_SPOOL_MAX_BYTES)
+    text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+    csv_writer = csv.writer(text)
+    csv_writer.writerow(CSV_HEADERS)
+    row_count = 0
+    for row in iter_order_csv_rows(orders, product_ids):
+        csv_writer.writerow(row)
+        row_count += 1
+    text.flush()
+    text.detach()
+    spool.seek(0)
+    if debug: print(f"[DEBUG] CSV generation completed. Total rows written: {row_count}")
+    return spool, row_count
 
-    all_orders = []
-    for variation in variations:
-        variation_id = variation.get("id")
-        orders = await get_orders_for_product_ids(variation_id)
-        
-        if orders:
-            all_orders.extend(orders)
-    
-    if not all_orders:
-        raise Exception("No orders found for product variations")
+async def generate_csv_from_orders(orders, product_ids):
+    """CSV report for orders already in memory (sorted here by email/order id)."""
+    if debug: print(f"[DEBUG] Starting CSV generation for {len(orders)} orders and product_ids: {product_ids}")
+    ordered = sorted(orders, key=order_sort_key)
+    csv_file, _ = await asyncio.to_thread(write_order_csv, ordered, product_ids)
+    return csv_file
 
-    csv_output = await generate_csv_from_orders(all_orders, product_id)
-    return csv_output
+async def export_product_orders_csv(product_ids):
+    """
+    CSV report streamed from the local order mirror after bringing it up to
+    date. Formatting runs on a worker thread so the gateway heartbeat is never
+    starved. Returns (binary file, row count).
+    """
+    if await sync_woo_orders() is None:
+        logger.warning("Order sync failed; exporting from the existing mirror.")
+    return await asyncio.to_thread(
+        write_order_csv, iter_orders_for_products(product_ids), product_ids
+    )
 
 class WooCommerceCommands(commands.Cog):
     def __init__(self, bot):
@@ -456,35 +364,28 @@ class WooCommerceCommands(commands.Cog):
         product_ids = [product_id] + [variation["id"] for variation in variations]
         if debug: print(f"[DEBUG] Searching orders for product_ids: {product_ids}")
 
-        relevant_orders = await get_orders_for_product_ids(product_ids)
-        if debug: print(f"[DEBUG] Number of relevant orders found: {len(relevant_orders)}")
+        if debug: print("[DEBUG] Starting CSV export...")
+        csv_output, row_count = await export_product_orders_csv(product_ids)
+        if debug: print(f"[DEBUG] CSV export complete: {row_count} rows.")
 
-        if not relevant_orders:
+        if not row_count:
+            csv_output.close()
             await interaction.followup.send("No orders found for this product or its variations.", ephemeral=True)
             return
 
-        if debug: print("[DEBUG] Starting CSV generation...")
-        csv_output = await generate_csv_from_orders(relevant_orders, product_ids)
-        if debug: print("[DEBUG] CSV generation complete.")
-
-        # Save StringIO content to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            temp_file.write(csv_output.getvalue().encode())
-            temp_file.flush()
-            csv_filename = f"{product_title.replace('/', '_')}_orders.csv"
-            csv_file = discord.File(fp=temp_file.name, filename=csv_filename)
-
-        # Ensure temporary file is cleaned up after use
-        import atexit
-        atexit.register(lambda: os.remove(temp_file.name))
-
-        await interaction.followup.send(
-            f"Orders for product '{product_title}':", file=csv_file, ephemeral=True
-        )
+        csv_filename = f"{product_title.replace('/', '_')}_orders.csv"
+        csv_file = discord.File(fp=csv_output, filename=csv_filename)
+        try:
+            await interaction.followup.send(
+                f"Orders for product '{product_title}':", file=csv_file, ephemeral=True
+            )
+        finally:
+            # discord.File stubs out fp.close while it holds the export; hand
+            # it back first or the spooled temp file is never closed.
+            csv_file.close()
+            csv_output.close()
         if debug: print(f"[DEBUG] Followup message with CSV sent: {csv_filename}")
 
-        csv_output.close()
-
     @app_commands.command(
         name="updateorders", description="Update local orders database from WooCommerce"
     )
@@ -498,33 +399,11 @@ class WooCommerceCommands(commands.Cog):
 
         await interaction.response.defer(ephemeral=True)
 
-        latest_order_id_in_db = get_latest_order_id()
-        new_orders_count = 0
-        page = 1
-        done = False
-
-        while not done:
-            orders_url = wc_url.replace("orders/", f"orders?order=desc&page={page}")
-            fetched_orders = await call_woocommerce_api(orders_url)
-
-            if not fetched_orders:
-                break
-
-            for order in fetched_orders:
-                order_id = str(order.get("id", ""))
-
-                if order_id == latest_order_id_in_db:
-                    done = True
-                    break
-
-                order_data = json.dumps(order)
-                update_woo_orders(order_id, order_data)
-                new_orders_count += 1
-
-            page += 1
-            await asyncio.sleep(1)
-
-        message = f"Orders database updated. Added {new_orders_count} new orders."
+        synced_count = await sync_woo_orders()
+        if synced_count is None:
+            message = "Orders database update failed partway; please try again."
+        else:
+            message = f"Orders database updated. Synced {synced_count} new or changed orders."
         await interaction.followup.send(message, ephemeral=True)
 
     @app_commands.command(
@@ -565,49 +444,16 @@ class WooCommerceCommands(commands.Cog):
             start_of_time = start_date.strftime("%Y-%m-%dT%H:%M:%S")
             end_of_time = end_date.strftime("%Y-%m-%dT%H:%M:%S")
 
-            page = 1
-            per_page = 100
-            member_info_by_subgroup = defaultdict(list)
-
-            # Continue paging until no orders are returned.
-            while True:
-                orders_url = (
-                    f"{wc_url}?order=desc&page={page}&per_page={per_page}"
-                    f"&status=any&after={start_of_time}&before={end_of_time}"
-                )
-                logger.info(f"Fetching orders from page {page}.")
-                fetched_orders = await call_woocommerce_api(orders_url)
-
-                if not fetched_orders:
-                    logger.info(f"No orders fetched from page {page}. Ending pagination.")
-                    break
-
-                # Process each order.
-                for order in fetched_orders:
-                    order_id = order.get("id", "Unknown")
-                    # Pass the specified 'year' as membership_year to the customer info lookup.
-                    subgroup_info = await find_customer_info_in_order(order, SUBGROUPS, membership_year=year)
-                    if subgroup_info:
-                        matched_subgroups, customer_info = subgroup_info
-
-                        if not isinstance(matched_subgroups, list):
-                            logger.error(f"'matched_subgroups' is not a list for Order ID {order_id}.")
-                            continue
-
-                        for subgroup in matched_subgroups:
-                            if not isinstance(subgroup, str):
-                                logger.error(f"Subgroup is not a string for Order ID {order_id}: {subgroup}")
-                                continue
-                            member_info_by_subgroup[subgroup].append(customer_info)
-
-                # If fewer orders than requested are returned, we assume it's the last page.
-                if len(fetched_orders) < per_page:
-                    logger.info(f"Fetched {len(fetched_orders)} orders on page {page}. Assuming this is the last page.")
-                    break
-
-                page += 1
-                # Respect API rate limits.
-                await asyncio.sleep(1)
+            # Bring the local order mirror up to date, then read members
+            # from its indexed subgroup columns in one grouped query.
+            if await sync_woo_orders() is None:
+                logger.warning("Order sync failed; listing members from the existing mirror.")
+            member_info_by_subgroup = get_subgroup_members(
+                SUBGROUPS,
+                membership_year=year,
+                created_after=start_of_time,
+                created_before=end_of_time,
+            )
 
             # If no members were found, inform the user.
             if not member_info_by_subgroup: